@@ -0,0 +1,49 @@
+"""Roster keyset index + pg_trgm search indexes on users.
+
+Revision ID: 0025_student_roster_search
+Revises: 0024_student_whiteboard
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0025_student_roster_search"
+down_revision: Union[str, None] = "0024_student_whiteboard"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Keyset pagination: (created_at DESC, id DESC) within an org, live rows only.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_users_org_created_id_live
+        ON users (organization_id, created_at DESC, id DESC)
+        WHERE deleted_at IS NULL
+        """
+    )
+    # Expression must match students_service._student_filters exactly.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_users_full_name_trgm
+        ON users USING gin ((first_name || ' ' || last_name) gin_trgm_ops)
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING gin (email gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_roll_number_trgm "
+        "ON users USING gin (roll_number gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_roll_number_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_users_email_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_users_full_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_users_org_created_id_live")
@@ -0,0 +1,40 @@
+"""Denormalized recipient count on notifications (set-based fan-out).
+
+Revision ID: 0028_notification_recipients_n
+Revises: 0027_email_outbox
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0028_notification_recipients_n"
+down_revision: Union[str, None] = "0027_email_outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "notifications",
+        sa.Column("recipient_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE notifications n
+        SET recipient_count = r.cnt
+        FROM (
+            SELECT notification_id, COUNT(*) AS cnt
+            FROM notification_recipients
+            GROUP BY notification_id
+        ) r
+        WHERE r.notification_id = n.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("notifications", "recipient_count")
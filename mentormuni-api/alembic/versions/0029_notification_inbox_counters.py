@@ -0,0 +1,63 @@
+"""Per-user unread counters + inbox keyset index.
+
+Revision ID: 0029_notification_inbox_counters
+Revises: 0028_notification_recipients_n
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0029_notification_inbox_counters"
+down_revision: Union[str, None] = "0028_notification_recipients_n"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_inbox_counters",
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("unread_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    # Inbox pages: WHERE user_id = ? [AND status = ?] ORDER BY created_at DESC, id DESC
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_notification_recipients_user_status_created
+        ON notification_recipients (user_id, status, created_at DESC, id DESC)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_notification_recipients_user_created
+        ON notification_recipients (user_id, created_at DESC, id DESC)
+        """
+    )
+    # Backfill: unread rows on live, active notifications only (same rule as the inbox).
+    op.execute(
+        """
+        INSERT INTO notification_inbox_counters (user_id, unread_count)
+        SELECT r.user_id, COUNT(*)
+        FROM notification_recipients r
+        JOIN notifications n ON n.id = r.notification_id
+        WHERE r.status = 'UNREAD' AND n.deleted_at IS NULL AND n.status = 'ACTIVE'
+        GROUP BY r.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_notification_recipients_user_created")
+    op.execute("DROP INDEX IF EXISTS ix_notification_recipients_user_status_created")
+    op.drop_table("notification_inbox_counters")
@@ -0,0 +1,32 @@
+"""Partial index for the Fear → Fearless dispatcher's due-row claims.
+
+Revision ID: 0030_private_notifications_due
+Revises: 0029_notification_inbox_counters
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0030_private_notifications_due"
+down_revision: Union[str, None] = "0029_notification_inbox_counters"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Claim: WHERE sent_date IS NULL AND scheduled_date <= now ORDER BY scheduled_date, id
+    # Next tick: MIN(scheduled_date) WHERE sent_date IS NULL
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_private_student_notifications_pending_due
+        ON private_student_notifications (scheduled_date, id)
+        WHERE sent_date IS NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_private_student_notifications_pending_due")
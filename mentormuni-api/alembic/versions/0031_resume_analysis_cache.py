@@ -0,0 +1,41 @@
+"""Shared tier for the resume ATS analysis cache.
+
+Revision ID: 0031_resume_analysis_cache
+Revises: 0030_private_notifications_due
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0031_resume_analysis_cache"
+down_revision: Union[str, None] = "0030_private_notifications_due"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "resume_analysis_cache",
+        sa.Column("cache_key", sa.String(length=96), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("cache_key"),
+    )
+    op.create_index(
+        "ix_resume_analysis_cache_expires_at", "resume_analysis_cache", ["expires_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_resume_analysis_cache_expires_at", table_name="resume_analysis_cache")
+    op.drop_table("resume_analysis_cache")
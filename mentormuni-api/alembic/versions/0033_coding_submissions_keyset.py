@@ -0,0 +1,30 @@
+"""Keyset index for the student submission history.
+
+Revision ID: 0033_coding_submissions_keyset
+Revises: 0032_rate_limit_buckets
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0033_coding_submissions_keyset"
+down_revision: Union[str, None] = "0032_rate_limit_buckets"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # History pages: WHERE student_id = ? [AND …] ORDER BY submitted_at DESC, id DESC
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_coding_submissions_student_submitted
+        ON coding_submissions (student_id, submitted_at DESC, id DESC)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_coding_submissions_student_submitted")
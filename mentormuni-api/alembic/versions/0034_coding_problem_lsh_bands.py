@@ -0,0 +1,122 @@
+"""Duplicate-candidate index: MinHash/LSH band keys per problem.
+
+Revision ID: 0034_coding_problem_lsh_bands
+Revises: 0033_coding_submissions_keyset
+
+Backfills band keys for every non-archived problem from its current version.
+
+The MinHash/LSH code below is a frozen copy of ``app.coding_bank.validators.similarity``
+(+ ``duplicate.normalize_text``) as of this revision, so the migration does not import
+app code. Keys must match what the app writes at publish time; if that scheme ever
+changes, ship a new migration that re-indexes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0034_coding_problem_lsh_bands"
+down_revision: Union[str, None] = "0033_coding_submissions_keyset"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BANDS = 32
+_ROWS = 3
+_NUM_PERM = _BANDS * _ROWS
+_TITLE_SHINGLE = 3
+_STATEMENT_SHINGLE = 5
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _permutations() -> list[tuple[int, int]]:
+    params: list[tuple[int, int]] = []
+    for i in range(_NUM_PERM):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a, b = struct.unpack(">QQ", digest)
+        params.append((a % (_MERSENNE - 1) + 1, b % _MERSENNE))
+    return params
+
+
+_PERMUTATIONS = _permutations()
+
+
+def _normalize(text: str) -> str:
+    t = re.sub(r"\s+", " ", text.lower().strip())
+    return re.sub(r"[^a-z0-9\s]", "", t)
+
+
+def _shingles(text: str, k: int) -> set[str]:
+    norm = _normalize(text or "")
+    if not norm:
+        return set()
+    if len(norm) <= k:
+        return {norm}
+    return {norm[i : i + k] for i in range(len(norm) - k + 1)}
+
+
+def _minhash(items: set[str]) -> list[int]:
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in items]
+    if not hashes:
+        return [_MAX_HASH] * _NUM_PERM
+    return [min(((a * h + b) % _MERSENNE) & _MAX_HASH for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def _band_keys(kind: str, signature: list[int]) -> list[int]:
+    keys: list[int] = []
+    for band in range(_BANDS):
+        rows = signature[band * _ROWS : (band + 1) * _ROWS]
+        raw = f"{kind}:{band}:" + ",".join(map(str, rows))
+        keys.append(int.from_bytes(hashlib.blake2b(raw.encode(), digest_size=8).digest(), "big") >> 1)
+    return keys
+
+
+def _problem_band_keys(title: str, statement: str) -> list[int]:
+    keys = _band_keys("t", _minhash(_shingles(title, _TITLE_SHINGLE)))
+    if _normalize(statement or ""):
+        keys.extend(_band_keys("s", _minhash(_shingles(statement, _STATEMENT_SHINGLE))))
+    return keys
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coding_problem_lsh_bands",
+        sa.Column("problem_id", sa.BigInteger(), nullable=False),
+        sa.Column("band_key", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["problem_id"], ["coding_problems.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("problem_id", "band_key"),
+    )
+    op.create_index("ix_coding_problem_lsh_bands_band_key", "coding_problem_lsh_bands", ["band_key"])
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            """
+            SELECT p.id, v.title, v.description
+            FROM coding_problems p
+            JOIN coding_problem_versions v ON v.id = p.current_version_id
+            WHERE p.status <> 'archived'
+            """
+        )
+    ).all()
+    bands = sa.table(
+        "coding_problem_lsh_bands",
+        sa.column("problem_id", sa.BigInteger()),
+        sa.column("band_key", sa.BigInteger()),
+    )
+    for problem_id, title, description in rows:
+        if not title:
+            continue
+        keys = sorted(set(_problem_band_keys(title, description or "")))
+        op.bulk_insert(bands, [{"problem_id": problem_id, "band_key": k} for k in keys])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_coding_problem_lsh_bands_band_key", table_name="coding_problem_lsh_bands")
+    op.drop_table("coding_problem_lsh_bands")
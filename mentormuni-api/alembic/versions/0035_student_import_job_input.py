@@ -0,0 +1,36 @@
+"""Persist student import job input so interrupted jobs resume.
+
+Revision ID: 0035_student_import_job_input
+Revises: 0034_coding_problem_lsh_bands
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0035_student_import_job_input"
+down_revision: Union[str, None] = "0034_coding_problem_lsh_bands"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "student_import_jobs",
+        sa.Column("input_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    op.create_index(
+        "ix_student_import_jobs_active",
+        "student_import_jobs",
+        ["status", "updated_at"],
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_student_import_jobs_active", table_name="student_import_jobs")
+    op.drop_column("student_import_jobs", "input_json")
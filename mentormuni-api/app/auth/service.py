@@ -17,7 +17,11 @@ from app.common.organization_access import (
     OrganizationAccessError,
     ensure_organization_active_for_login,
 )
-from app.common.security.passwords import hash_password, verify_password
+from app.common.security.passwords import (
+    hash_password_async,
+    verify_password_and_update_async,
+    verify_password_async,
+)
 from app.common.tenant.deps import load_permissions_for_role
 from app.core.config import settings
 from app.models.enums import DeptAdminTitle, RoleCode, UserStatus
@@ -130,7 +134,8 @@ async def authenticate_user(
         )
 
     user = users[0]
-    if not user.password_hash or not verify_password(password, user.password_hash):
+    ok, new_hash = await verify_password_and_update_async(password, user.password_hash or "")
+    if not ok:
         raise AuthError(
             "Invalid credentials.",
             status_code=401,
@@ -177,6 +182,9 @@ async def authenticate_user(
             code="ORG_SUSPENDED",
         ) from exc
 
+    if new_hash:
+        # Stored hash predates the current bcrypt cost; get_db commits the upgrade.
+        user.password_hash = new_hash
     return user
 
 
@@ -192,9 +200,9 @@ async def change_password(
     current_password: str,
     new_password: str,
 ) -> None:
-    if not user.password_hash or not verify_password(current_password, user.password_hash):
+    if not user.password_hash or not await verify_password_async(current_password, user.password_hash):
         raise AuthError("Current password is incorrect.", status_code=400)
-    user.password_hash = hash_password(new_password)
+    user.password_hash = await hash_password_async(new_password)
     user.must_change_password = False
     await db.flush()
 
@@ -315,7 +323,7 @@ async def reset_password(db: AsyncSession, *, token: str, new_password: str) ->
     except OrganizationAccessError as exc:
         raise AuthError(exc.message, status_code=exc.status_code) from exc
 
-    user.password_hash = hash_password(new_password)
+    user.password_hash = await hash_password_async(new_password)
     user.password_reset_token_hash = None
     user.password_reset_expires_at = None
     await db.flush()
@@ -367,7 +375,7 @@ async def activate_invited_user(
                 code="ORG_SUSPENDED",
             ) from exc
 
-    user.password_hash = hash_password(new_password)
+    user.password_hash = await hash_password_async(new_password)
     user.status = UserStatus.ACTIVE.value
     user.activation_token_hash = None
     user.activation_expires_at = None
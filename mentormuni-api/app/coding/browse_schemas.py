@@ -68,3 +68,17 @@ class PracticeResolveOut(BaseModel):
     generated: bool = False
     message: Optional[str] = None
     problems: list[BankProblemOut] = Field(default_factory=list)
+
+
+class PracticeGenerationOut(BaseModel):
+    """Handle for a queued practice generation (202 from resolve; poll or stream until done)."""
+
+    job_id: int
+    status: str  # pending | running | succeeded | failed
+    topic: str
+    difficulty: str
+    company_key: Optional[str] = None
+    # True when this request joined a generation already in flight for the same key.
+    deduplicated: bool = False
+    error: Optional[str] = None
+    result: Optional[PracticeResolveOut] = None
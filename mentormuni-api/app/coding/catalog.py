@@ -0,0 +1,166 @@
+"""
+Student assessment catalog (``GET /api/coding/assessments``) as one set-based query.
+
+The listing used to loop over every active assessment with an access check, a problem
+count and two queries for the first problem's topic/pattern — over 1,000 queries for a
+few hundred assessments. ``catalog_rows`` now reads everything in one statement:
+
+- problem count and the first problem (``order_index, id``) per assessment come from
+  window functions over ``coding_assessment_problems`` joined to ``coding_problems``;
+- tenant rules are applied in SQL: platform assessments for everyone, org-scoped ones
+  only when the student's org matches *and* has the coding feature (checked once per
+  request, not once per assessment);
+- company / difficulty / topic filters are SQL predicates (topic: case-insensitive
+  substring of the first problem's topic, as before).
+
+``CatalogCache`` keeps the built listing per (org, feature flag, filters) for
+``coding_catalog_cache_seconds`` together with its ETag, so repeated page loads cost one
+feature lookup and, with ``If-None-Match``, an empty 304. The cache is never
+invalidated explicitly: assessments and problems change in other processes (practice
+worker, bank scripts) and inside uncommitted transactions, so a local clear could not be
+trusted anyway. Changes show up once the entry expires — at most
+``CODING_CATALOG_CACHE_SECONDS`` (default 60) after the commit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.coding.enums import AssessmentStatus
+from app.coding.models import CodingAssessment, CodingAssessmentProblem, CodingProblem
+from app.coding.schemas import AssessmentListOut
+from app.core.config import settings
+
+# Distinct (org, filters) entries kept per process.
+CATALOG_CACHE_MAX_ENTRIES = 512
+
+
+def normalize_filter(value: Optional[str]) -> Optional[str]:
+    return (value or "").strip().lower() or None
+
+
+@dataclass(frozen=True)
+class CatalogKey:
+    organization_id: Optional[int]
+    org_feature: bool
+    company_key: Optional[str]
+    topic: Optional[str]
+    difficulty: Optional[str]
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    payload: AssessmentListOut
+    etag: str
+    built_at: float
+
+
+def catalog_etag(payload: AssessmentListOut) -> str:
+    digest = hashlib.sha256(payload.model_dump_json().encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def catalog_query(key: CatalogKey):
+    link = CodingAssessmentProblem
+    ranked = (
+        select(
+            link.assessment_id.label("assessment_id"),
+            func.count().over(partition_by=link.assessment_id).label("problem_count"),
+            func.row_number()
+            .over(partition_by=link.assessment_id, order_by=(link.order_index.asc(), link.id.asc()))
+            .label("rn"),
+            CodingProblem.topic.label("topic"),
+            CodingProblem.pattern.label("pattern"),
+        )
+        .select_from(link)
+        .outerjoin(CodingProblem, CodingProblem.id == link.problem_id)
+        .subquery("ranked")
+    )
+    visible = [CodingAssessment.organization_id.is_(None)]
+    if key.organization_id is not None and key.org_feature:
+        visible.append(CodingAssessment.organization_id == key.organization_id)
+    q = (
+        select(
+            CodingAssessment,
+            func.coalesce(ranked.c.problem_count, 0).label("problem_count"),
+            ranked.c.topic,
+            ranked.c.pattern,
+        )
+        .outerjoin(
+            ranked, and_(ranked.c.assessment_id == CodingAssessment.id, ranked.c.rn == 1)
+        )
+        .where(CodingAssessment.status == AssessmentStatus.ACTIVE.value)
+        .where(or_(*visible))
+    )
+    if key.company_key:
+        q = q.where(func.lower(CodingAssessment.company_key) == key.company_key)
+    if key.difficulty:
+        q = q.where(func.lower(CodingAssessment.difficulty) == key.difficulty)
+    if key.topic:
+        q = q.where(func.lower(ranked.c.topic).contains(key.topic, autoescape=True))
+    # Evidence-backed ranking (internal confidence) — never returned raw
+    return q.order_by(
+        CodingAssessment.evidence_confidence.desc().nulls_last(),
+        CodingAssessment.id.asc(),
+    )
+
+
+async def catalog_rows(
+    db: AsyncSession, key: CatalogKey
+) -> list[tuple[CodingAssessment, int, Optional[str], Optional[str]]]:
+    """(assessment, problem_count, first topic, first pattern) in catalog order."""
+    rows = (await db.execute(catalog_query(key))).all()
+    return [(r[0], int(r.problem_count or 0), r.topic, r.pattern) for r in rows]
+
+
+class CatalogCache:
+    def __init__(self, *, ttl_seconds: float, max_entries: int = CATALOG_CACHE_MAX_ENTRIES) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CatalogKey, CatalogEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def get(self, key: CatalogKey) -> Optional[CatalogEntry]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.built_at > self.ttl_seconds:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: CatalogKey, payload: AssessmentListOut) -> CatalogEntry:
+        entry = CatalogEntry(payload=payload, etag=catalog_etag(payload), built_at=time.monotonic())
+        if self.ttl_seconds <= 0:
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_cache: Optional[CatalogCache] = None
+
+
+def get_catalog_cache() -> CatalogCache:
+    global _cache
+    if _cache is None:
+        _cache = CatalogCache(ttl_seconds=settings.coding_catalog_cache_seconds)
+    return _cache
@@ -81,6 +81,7 @@ class JobType(str, Enum):
     RUN = "run"
     SUBMIT_EVALUATE = "submit_evaluate"
     ANALYZE = "analyze"
+    PRACTICE_GENERATE = "practice_generate"
 
 
 class JobStatus(str, Enum):
@@ -1,11 +1,13 @@
-"""Job handlers: run, submit_evaluate, analyze."""
+"""Job handlers: run, submit_evaluate, analyze, practice_generate."""
 
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from typing import Any
 
 from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.coding.analysis import CodingAnalysisService
@@ -19,6 +21,8 @@ from app.services.coding_analysis_prompt import PROMPT_VERSION
 from app.coding.execution.factory import get_code_execution_service
 from app.coding.execution.types import ExecuteRequest, LanguageConfig, TestCaseInput
 from app.coding.jobs import queue as job_queue
+from app.coding.jobs.progress import ProviderProgress, notify_job_finished
+from app.coding.jobs.testcase_cache import TestCaseLike, get_test_case_cache
 from app.coding.limits import get_coding_limits
 from app.coding.models import (
     CodingAiAnalysis,
@@ -27,13 +31,24 @@ from app.coding.models import (
     CodingProblemVersion,
     CodingRun,
     CodingSubmission,
-    CodingTestCase,
     CodingTestResult,
 )
+from app.coding.practice import run_practice_generation
 from app.coding.scoring import WeightedOutcome, score_from_test_outcomes
 
 logger = logging.getLogger("coding.handlers")
 
+# Rows per INSERT; 8 binds per row stays far below Postgres' 32767-parameter limit.
+RESULT_INSERT_CHUNK = 1000
+_RESULT_UPDATE_COLUMNS = (
+    "status",
+    "execution_time_ms",
+    "memory_used_kb",
+    "actual_output",
+    "error_type",
+    "error_message",
+)
+
 
 def _public_result_summary(report_summary: dict[str, Any], results: list[Any]) -> dict[str, Any]:
     cases = []
@@ -53,7 +68,65 @@ def _public_result_summary(report_summary: dict[str, Any], results: list[Any]) -
     return {"cases": cases, **(report_summary or {})}
 
 
+def build_test_result_rows(
+    submission_id: int, cases: Sequence[TestCaseLike], results: Sequence[Any]
+) -> list[dict[str, Any]]:
+    """coding_test_results rows for one submission (actual_output hidden for hidden cases)."""
+    rows = []
+    for tc, result in zip(cases, results):
+        status = (
+            TestResultStatus.PASSED.value
+            if result.status == TestResultStatus.PASSED
+            else (
+                TestResultStatus.ERROR.value
+                if result.status == TestResultStatus.ERROR
+                else TestResultStatus.FAILED.value
+            )
+        )
+        rows.append(
+            {
+                "submission_id": submission_id,
+                "test_case_id": tc.id,
+                "status": status,
+                "execution_time_ms": result.execution_time_ms,
+                "memory_used_kb": result.memory_used_kb,
+                "actual_output": (result.stdout or "")[:4000] if not tc.is_hidden else None,
+                "error_type": result.error_type,
+                "error_message": (result.error_message or "")[:2000] if result.error_message else None,
+            }
+        )
+    return rows
+
+
+async def persist_test_results(
+    db: AsyncSession,
+    submission_id: int,
+    rows: list[dict[str, Any]],
+    *,
+    replace_existing: bool = False,
+) -> None:
+    """Multi-row UPSERT (one statement per RESULT_INSERT_CHUNK rows) instead of one INSERT per test."""
+    if replace_existing:
+        stale = delete(CodingTestResult).where(CodingTestResult.submission_id == submission_id)
+        if rows:
+            stale = stale.where(CodingTestResult.test_case_id.not_in([r["test_case_id"] for r in rows]))
+        await db.execute(stale)
+    for start in range(0, len(rows), RESULT_INSERT_CHUNK):
+        stmt = pg_insert(CodingTestResult).values(rows[start : start + RESULT_INSERT_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_coding_test_results_submission_case",
+            set_={col: stmt.excluded[col] for col in _RESULT_UPDATE_COLUMNS},
+        )
+        await db.execute(stmt)
+
+
 async def handle_job(db: AsyncSession, job: CodingJob) -> None:
+    await _dispatch_job(db, job)
+    # Delivered to SSE streams when the worker commits this job's results.
+    await notify_job_finished(db, job)
+
+
+async def _dispatch_job(db: AsyncSession, job: CodingJob) -> None:
     await job_queue.mark_running(db, job)
     if job.job_type == JobType.RUN.value:
         await _handle_run(db, job)
@@ -64,6 +137,9 @@ async def handle_job(db: AsyncSession, job: CodingJob) -> None:
     if job.job_type == JobType.ANALYZE.value:
         await _handle_analyze(db, job)
         return
+    if job.job_type == JobType.PRACTICE_GENERATE.value:
+        await run_practice_generation(db, job)
+        return
     await job_queue.mark_failed(
         db, job, error=f"Unsupported job_type: {job.job_type}", retryable=False
     )
@@ -86,7 +162,7 @@ async def _execute_cases(
     *,
     source: str,
     language: CodingLanguage,
-    cases: list[CodingTestCase],
+    cases: list[TestCaseLike],
 ) -> Any:
     limits = get_coding_limits()
     request = ExecuteRequest(
@@ -115,13 +191,20 @@ async def _execute_cases(
         max_stdout_bytes=limits.max_stdout_bytes,
     )
 
-    async def _on_provider(provider: str, token: str | None, status: str | None) -> None:
-        await job_queue.update_provider_meta(
-            db, job, provider=provider, token=token, provider_status=status
-        )
-
+    # Provider polls are coalesced in memory; the job row is written on transitions,
+    # at most every CODING_PROVIDER_META_FLUSH_MS, and once more with the mark_* flush.
+    progress = ProviderProgress(db, job, total_cases=len(cases))
     service = get_code_execution_service()
-    return await service.execute_batch(request, on_provider_update=_on_provider)
+    try:
+        return await service.execute_batch(request, on_provider_update=progress)
+    finally:
+        progress.finish()
+        logger.info(
+            "coding_provider_progress job_id=%s updates=%s writes=%s",
+            job.id,
+            progress.updates,
+            progress.writes,
+        )
 
 
 async def _handle_run(db: AsyncSession, job: CodingJob) -> None:
@@ -145,16 +228,8 @@ async def _handle_run(db: AsyncSession, job: CodingJob) -> None:
         await job_queue.mark_failed(db, job, error="language not active", retryable=False)
         return
 
-    cases = (
-        await db.execute(
-            select(CodingTestCase)
-            .where(
-                CodingTestCase.problem_version_id == run.problem_version_id,
-                CodingTestCase.is_hidden.is_(False),
-            )
-            .order_by(CodingTestCase.order_index.asc(), CodingTestCase.id.asc())
-        )
-    ).scalars().all()
+    bundle = await get_test_case_cache().get(db, run.problem_version_id)
+    cases = [tc for tc in bundle if not tc.is_hidden]
 
     try:
         report = await _execute_cases(
@@ -176,7 +251,7 @@ async def _handle_run(db: AsyncSession, job: CodingJob) -> None:
     run.verdict = report.overall_verdict.value if report.overall_verdict else None
     run.execution_status = report.execution_status
     run.result_summary_json = _public_result_summary(report.summary, report.results)
-    await db.flush()
+    # Flushed together with the job row by mark_succeeded / mark_failed.
     if report.execution_status == ExecutionStatus.SYSTEM_ERROR.value:
         await job_queue.mark_failed(db, job, error="Execution provider failure", retryable=False)
         return
@@ -211,13 +286,7 @@ async def _handle_submit_evaluate(db: AsyncSession, job: CodingJob) -> None:
         await job_queue.mark_failed(db, job, error="language not active", retryable=False)
         return
 
-    cases = (
-        await db.execute(
-            select(CodingTestCase)
-            .where(CodingTestCase.problem_version_id == sub.problem_version_id)
-            .order_by(CodingTestCase.order_index.asc(), CodingTestCase.id.asc())
-        )
-    ).scalars().all()
+    cases = await get_test_case_cache().get(db, sub.problem_version_id)
 
     try:
         report = await _execute_cases(
@@ -232,32 +301,13 @@ async def _handle_submit_evaluate(db: AsyncSession, job: CodingJob) -> None:
         await job_queue.mark_failed(db, job, error=msg, retryable=not non_retry)
         return
 
-    # Replace prior results on retry (unique on submission_id + test_case_id)
-    await db.execute(delete(CodingTestResult).where(CodingTestResult.submission_id == sub.id))
-
-    # Persist per-test results (hide actual_output for hidden cases)
-    for tc, result in zip(cases, report.results):
-        status = (
-            TestResultStatus.PASSED.value
-            if result.status == TestResultStatus.PASSED
-            else (
-                TestResultStatus.ERROR.value
-                if result.status == TestResultStatus.ERROR
-                else TestResultStatus.FAILED.value
-            )
-        )
-        db.add(
-            CodingTestResult(
-                submission_id=sub.id,
-                test_case_id=tc.id,
-                status=status,
-                execution_time_ms=result.execution_time_ms,
-                memory_used_kb=result.memory_used_kb,
-                actual_output=(result.stdout or "")[:4000] if not tc.is_hidden else None,
-                error_type=result.error_type,
-                error_message=(result.error_message or "")[:2000] if result.error_message else None,
-            )
-        )
+    await persist_test_results(
+        db,
+        sub.id,
+        build_test_result_rows(sub.id, cases, report.results),
+        # Only a re-run can leave rows behind (unique on submission_id + test_case_id).
+        replace_existing=int(job.attempt_count or 0) > 1,
+    )
 
     outcomes = [
         WeightedOutcome(
@@ -281,7 +331,7 @@ async def _handle_submit_evaluate(db: AsyncSession, job: CodingJob) -> None:
     sub.execution_time_ms = report.max_execution_time_ms
     sub.memory_used_kb = report.max_memory_used_kb
     sub.analysis_status = AnalysisStatus.PENDING.value
-    await db.flush()
+    # No flush here: the mark_* flush below writes the submission and job rows together.
 
     if sub.execution_status == ExecutionStatus.SYSTEM_ERROR.value:
         await job_queue.mark_failed(db, job, error="Execution provider failure", retryable=False)
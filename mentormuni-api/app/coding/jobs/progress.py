@@ -0,0 +1,223 @@
+"""Coalesced provider progress for running coding jobs.
+
+Judge0 reports status on create and on every poll (~5 polls per test). Writing each one
+to ``coding_jobs`` meant ~90 UPDATEs for a 15-test submission, all inside the job
+transaction where nobody else could see them anyway. ``ProviderProgress`` keeps the
+latest provider/token/status in memory and only touches the job row:
+
+- on a state transition (first provider update, a ``poll_error_*`` status);
+- at most once every ``coding_provider_meta_flush_ms`` otherwise;
+- in ``finish()``, which stages the final state for the ``mark_*`` flush that follows.
+
+Every update is also published to a process-local channel (``latest_progress``) so
+readers in the same process — ``GET /coding/runs/{id}`` when the worker runs in-process —
+see per-test progress without a DB round-trip.
+
+Across processes, progress goes out as Postgres ``NOTIFY coding_progress`` (JSON payload,
+see ``event_payload``): mid-job events (a new test started, a transition) on a short
+AUTOCOMMIT connection, and the final ``done`` event from ``notify_job_finished`` inside
+the job transaction, so it is delivered exactly when the result is committed. The API's
+``ProgressHub`` (``app.coding.streaming``) LISTENs and fans out to SSE streams.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.coding.enums import JobStatus, JobType
+from app.coding.jobs import queue as job_queue
+from app.coding.models import CodingJob
+from app.core.config import settings
+
+logger = logging.getLogger("coding.progress")
+
+PROGRESS_CHANNEL = "coding_progress"
+KIND_RUN = "run"
+KIND_SUBMISSION = "submission"
+KIND_PRACTICE = "practice"
+
+# Finished jobs are dropped from the channel after this long.
+PROGRESS_RETENTION_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class JobProgress:
+    job_id: int
+    kind: Optional[str] = None
+    target_id: Optional[int] = None
+    provider: Optional[str] = None
+    provider_status: Optional[str] = None
+    cases_started: int = 0
+    total_cases: int = 0
+    finished: bool = False
+    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+_channel: dict[int, tuple[float, JobProgress]] = {}
+
+
+def publish_progress(progress: JobProgress) -> None:
+    now = time.monotonic()
+    _channel[progress.job_id] = (now, progress)
+    for job_id, (ts, item) in list(_channel.items()):
+        if item.finished and now - ts > PROGRESS_RETENTION_SECONDS:
+            del _channel[job_id]
+
+
+def latest_progress(job_id: int) -> Optional[JobProgress]:
+    entry = _channel.get(job_id)
+    return entry[1] if entry else None
+
+
+def job_target(job: CodingJob) -> tuple[Optional[str], Optional[int]]:
+    """(kind, id) a client streams for this job; (None, None) for analyze jobs."""
+    if job.job_type == JobType.PRACTICE_GENERATE.value:
+        return KIND_PRACTICE, job.id
+    if job.run_id:
+        return KIND_RUN, job.run_id
+    if job.submission_id and job.job_type != JobType.ANALYZE.value:
+        return KIND_SUBMISSION, job.submission_id
+    return None, None
+
+
+def event_payload(progress: JobProgress, *, event: str = "progress") -> dict[str, Any]:
+    return {
+        "event": event,
+        "kind": progress.kind,
+        "id": progress.target_id,
+        "job_id": progress.job_id,
+        "provider_status": progress.provider_status,
+        "cases_started": progress.cases_started,
+        "total_cases": progress.total_cases,
+        "updated_at": progress.updated_at.isoformat(),
+    }
+
+
+def _notify_enabled() -> bool:
+    return settings.coding_progress_notify and settings.is_database_configured
+
+
+async def notify_progress(payload: dict[str, Any]) -> None:
+    """NOTIFY outside the job transaction (visible immediately). Best effort."""
+    if not _notify_enabled() or payload.get("kind") is None:
+        return
+    from app.common.database.session import get_engine
+
+    try:
+        async with get_engine().connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": PROGRESS_CHANNEL, "payload": json.dumps(payload)},
+            )
+    except Exception:
+        logger.debug("coding_progress_notify_failed", exc_info=True)
+
+
+async def notify_job_finished(db: AsyncSession, job: CodingJob) -> None:
+    """Queue the job's outcome event on the job transaction; delivered on commit."""
+    kind, target_id = job_target(job)
+    if not _notify_enabled() or kind is None:
+        return
+    final = job.status in (JobStatus.SUCCEEDED.value, JobStatus.DEAD.value)
+    live = latest_progress(job.id)
+    progress = live or JobProgress(job_id=job.id)
+    progress = replace(
+        progress, kind=kind, target_id=target_id, provider_status=job.provider_status
+    )
+    payload = event_payload(progress, event="done" if final else "progress")
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": PROGRESS_CHANNEL, "payload": json.dumps(payload)},
+    )
+
+
+class ProviderProgress:
+    """``on_provider_update`` sink that coalesces job-row writes."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        job: CodingJob,
+        *,
+        total_cases: int = 0,
+        min_interval_ms: Optional[int] = None,
+        notify: Callable[[dict[str, Any]], Awaitable[None]] = notify_progress,
+    ) -> None:
+        self.db = db
+        self.job = job
+        self.notify = notify
+        interval = settings.coding_provider_meta_flush_ms if min_interval_ms is None else min_interval_ms
+        self.min_interval_s = interval / 1000.0
+        self._last_write = 0.0
+        self._written: Optional[tuple[Optional[str], Optional[str], Optional[str]]] = None
+        self._pending: Optional[tuple[Optional[str], Optional[str], Optional[str]]] = None
+        self._tokens: set[str] = set()
+        kind, target_id = job_target(job)
+        self.progress = JobProgress(
+            job_id=job.id, kind=kind, target_id=target_id, total_cases=total_cases
+        )
+        self.updates = 0
+        self.writes = 0
+
+    def _is_transition(self, provider: str, status: Optional[str]) -> bool:
+        if self._written is None or self._written[0] != provider:
+            return True
+        return bool(status and status.startswith("poll_error"))
+
+    async def __call__(self, provider: str, token: Optional[str], status: Optional[str]) -> None:
+        self.updates += 1
+        new_case = bool(token) and token not in self._tokens
+        if token:
+            self._tokens.add(token)
+        self.progress = replace(
+            self.progress,
+            provider=provider,
+            provider_status=status,
+            cases_started=len(self._tokens),
+            updated_at=datetime.now(timezone.utc),
+        )
+        publish_progress(self.progress)
+
+        state = (provider, token, status)
+        if state == self._written:
+            self._pending = None
+            return
+        self._pending = state
+        transition = self._is_transition(provider, status)
+        if new_case or transition:
+            await self.notify(event_payload(self.progress))
+        now = time.monotonic()
+        if transition or now - self._last_write >= self.min_interval_s:
+            await self._write(now)
+
+    async def _write(self, now: float) -> None:
+        if self._pending is None:
+            return
+        provider, token, status = self._pending
+        await job_queue.update_provider_meta(
+            self.db, self.job, provider=provider, token=token, provider_status=status
+        )
+        self._written, self._pending = self._pending, None
+        self._last_write = now
+        self.writes += 1
+
+    def finish(self) -> None:
+        """Stage the latest state on the job; the caller's mark_* flush persists it."""
+        if self._pending is not None:
+            provider, token, status = self._pending
+            job_queue.apply_provider_meta(
+                self.job, provider=provider, token=token, provider_status=status
+            )
+            self._written, self._pending = self._pending, None
+        self.progress = replace(self.progress, finished=True)
+        publish_progress(self.progress)
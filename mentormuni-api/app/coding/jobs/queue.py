@@ -6,7 +6,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
-from sqlalchemy import func, or_, select, update
+from sqlalchemy import ColumnElement, func, or_, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.coding.enums import JobStatus, JobType
@@ -16,6 +16,14 @@ from app.core.config import settings
 
 logger = logging.getLogger("coding.jobs")
 
+# Worker lanes (``coding_worker_lane``): each lane claims only its job types and has its
+# own concurrency budget, so minutes-long practice generations never hold up Judge0 work.
+LANE_ALL = "all"
+LANE_JUDGE = "judge"
+LANE_PRACTICE = "practice"
+LANES = (LANE_ALL, LANE_JUDGE, LANE_PRACTICE)
+_PRACTICE_JOB_TYPES = (JobType.PRACTICE_GENERATE.value,)
+
 
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
@@ -53,11 +61,31 @@ async def enqueue_job(
     return job
 
 
-async def count_active_jobs(db: AsyncSession) -> int:
+def lane_filter(lane: str) -> ColumnElement[bool]:
+    if lane == LANE_JUDGE:
+        return CodingJob.job_type.not_in(_PRACTICE_JOB_TYPES)
+    if lane == LANE_PRACTICE:
+        return CodingJob.job_type.in_(_PRACTICE_JOB_TYPES)
+    if lane == LANE_ALL:
+        return true()
+    raise ValueError(f"unknown coding worker lane: {lane!r}")
+
+
+def lane_max_concurrent(lane: str) -> int:
+    limits = get_coding_limits()
+    if lane == LANE_PRACTICE:
+        return limits.practice_max_concurrent_jobs
+    return limits.max_concurrent_jobs
+
+
+async def count_active_jobs(db: AsyncSession, *, lane: str = LANE_ALL) -> int:
     result = await db.execute(
         select(func.count())
         .select_from(CodingJob)
-        .where(CodingJob.status.in_([JobStatus.CLAIMED.value, JobStatus.RUNNING.value]))
+        .where(
+            CodingJob.status.in_([JobStatus.CLAIMED.value, JobStatus.RUNNING.value]),
+            lane_filter(lane),
+        )
     )
     return int(result.scalar_one() or 0)
 
@@ -89,11 +117,10 @@ async def recover_stale_jobs(db: AsyncSession) -> int:
     return len(ids)
 
 
-async def claim_next_job(db: AsyncSession) -> CodingJob | None:
-    """Claim one due pending job under concurrency limit (SKIP LOCKED)."""
-    limits = get_coding_limits()
-    active = await count_active_jobs(db)
-    if active >= limits.max_concurrent_jobs:
+async def claim_next_job(db: AsyncSession, *, lane: str = LANE_ALL) -> CodingJob | None:
+    """Claim one due pending job of ``lane`` under that lane's concurrency limit (SKIP LOCKED)."""
+    active = await count_active_jobs(db, lane=lane)
+    if active >= lane_max_concurrent(lane):
         return None
 
     now = utcnow()
@@ -102,6 +129,7 @@ async def claim_next_job(db: AsyncSession) -> CodingJob | None:
         .where(
             CodingJob.status == JobStatus.PENDING.value,
             or_(CodingJob.next_retry_at.is_(None), CodingJob.next_retry_at <= now),
+            lane_filter(lane),
         )
         .order_by(CodingJob.id.asc())
         .limit(1)
@@ -126,8 +154,7 @@ async def mark_running(db: AsyncSession, job: CodingJob) -> None:
     await db.flush()
 
 
-async def update_provider_meta(
-    db: AsyncSession,
+def apply_provider_meta(
     job: CodingJob,
     *,
     provider: str | None = None,
@@ -141,6 +168,17 @@ async def update_provider_meta(
     if provider_status is not None:
         job.provider_status = provider_status[:64]
     job.updated_at = utcnow()
+
+
+async def update_provider_meta(
+    db: AsyncSession,
+    job: CodingJob,
+    *,
+    provider: str | None = None,
+    token: str | None = None,
+    provider_status: str | None = None,
+) -> None:
+    apply_provider_meta(job, provider=provider, token=token, provider_status=provider_status)
     await db.flush()
 
 
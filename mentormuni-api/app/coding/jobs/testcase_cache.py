@@ -0,0 +1,303 @@
+"""
+Worker-side cache of test-case bundles (all cases of one problem version).
+
+Published problem versions are immutable and executed thousands of times a day, yet each
+job used to re-select every ``coding_test_cases`` row including the (possibly large)
+``input`` / ``expected_output`` text. Here a job issues one tiny *stamp* query —
+``(problem.published_at, case count, max case id)`` — and reuses the bundle when the
+stamp matches:
+
+- bundles live in an LRU bounded by ``coding_testcase_cache_max_mb`` of text;
+- with ``CODING_TESTCASE_BUNDLE_DIR`` set, bundles of at least
+  ``coding_testcase_disk_threshold_kb`` are written once as a compressed bundle file
+  (per-field zlib + JSON index) and memory-mapped; case text is decompressed on access
+  and only the small index counts against the LRU budget;
+- publishing (``coding_bank.promote``) changes ``published_at`` and therefore the stamp,
+  so every worker picks up new content; ``invalidate_version`` additionally drops the
+  bundle in the publishing process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.coding.models import CodingProblem, CodingProblemVersion, CodingTestCase
+from app.core.config import settings
+
+logger = logging.getLogger("coding.testcase_cache")
+
+_HEADER = struct.Struct(">Q")  # length of the JSON index that follows
+
+
+class TestCaseLike(Protocol):
+    """What the job handlers read from a test case (ORM row or cached copy)."""
+
+    id: int
+    input: str
+    expected_output: str
+    is_hidden: bool
+    weight: float
+    order_index: int
+
+
+@dataclass(frozen=True)
+class CachedTestCase:
+    id: int
+    input: str
+    expected_output: str
+    is_hidden: bool
+    weight: float
+    order_index: int
+
+
+class MappedTestCase:
+    """Test case backed by a memory-mapped bundle file; text is inflated on access."""
+
+    __slots__ = ("id", "is_hidden", "weight", "order_index", "_mm", "_in", "_out")
+
+    def __init__(self, mm: mmap.mmap, entry: dict[str, Any], base: int) -> None:
+        self.id = int(entry["id"])
+        self.is_hidden = bool(entry["is_hidden"])
+        self.weight = float(entry["weight"])
+        self.order_index = int(entry["order_index"])
+        self._mm = mm
+        self._in = (base + entry["in"][0], entry["in"][1])
+        self._out = (base + entry["out"][0], entry["out"][1])
+
+    def _read(self, span: tuple[int, int]) -> str:
+        start, length = span
+        return zlib.decompress(self._mm[start : start + length]).decode("utf-8")
+
+    @property
+    def input(self) -> str:
+        return self._read(self._in)
+
+    @property
+    def expected_output(self) -> str:
+        return self._read(self._out)
+
+
+@dataclass(frozen=True)
+class TestCaseBundle:
+    version_id: int
+    stamp: str
+    cases: tuple[Any, ...]
+    # Bytes this bundle holds in memory (text for in-memory bundles, index for mapped ones).
+    nbytes: int
+
+
+def _bundle_path(root: Path, version_id: int, stamp: str) -> Path:
+    digest = hashlib.sha256(stamp.encode()).hexdigest()[:16]
+    return root / f"v{version_id}-{digest}.bundle"
+
+
+def write_bundle_file(path: Path, cases: Sequence[TestCaseLike]) -> None:
+    index: list[dict[str, Any]] = []
+    blobs: list[bytes] = []
+    offset = 0
+    for tc in cases:
+        entry: dict[str, Any] = {
+            "id": tc.id,
+            "is_hidden": bool(tc.is_hidden),
+            "weight": float(tc.weight or 1.0),
+            "order_index": int(tc.order_index or 0),
+        }
+        for field, text in (("in", tc.input), ("out", tc.expected_output)):
+            blob = zlib.compress((text or "").encode("utf-8"), 6)
+            entry[field] = [offset, len(blob)]
+            blobs.append(blob)
+            offset += len(blob)
+        index.append(entry)
+    header = json.dumps(index, separators=(",", ":")).encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(_HEADER.pack(len(header)))
+            fh.write(header)
+            for blob in blobs:
+                fh.write(blob)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def open_bundle_file(path: Path) -> tuple[tuple[MappedTestCase, ...], int]:
+    """(cases, index size in bytes) for a bundle written by ``write_bundle_file``."""
+    with open(path, "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    (header_len,) = _HEADER.unpack(mm[: _HEADER.size])
+    base = _HEADER.size + header_len
+    index = json.loads(mm[_HEADER.size : base])
+    return tuple(MappedTestCase(mm, entry, base) for entry in index), header_len
+
+
+class TestCaseBundleCache:
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        disk_dir: Optional[str] = None,
+        disk_threshold_bytes: int = 256 * 1024,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_threshold_bytes = disk_threshold_bytes
+        self._bundles: OrderedDict[int, TestCaseBundle] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "bundles": len(self._bundles),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+        }
+
+    def invalidate_version(self, version_id: int) -> None:
+        bundle = self._bundles.pop(version_id, None)
+        if bundle is not None:
+            self._bytes -= bundle.nbytes
+
+    def _put(self, bundle: TestCaseBundle) -> None:
+        self.invalidate_version(bundle.version_id)
+        if bundle.nbytes > self.max_bytes:
+            return
+        self._bundles[bundle.version_id] = bundle
+        self._bytes += bundle.nbytes
+        while self._bytes > self.max_bytes:
+            _vid, evicted = self._bundles.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    async def _stamp(self, db: AsyncSession, version_id: int) -> str:
+        row = (
+            await db.execute(
+                select(
+                    CodingProblem.published_at,
+                    func.count(CodingTestCase.id),
+                    func.max(CodingTestCase.id),
+                )
+                .select_from(CodingProblemVersion)
+                .join(CodingProblem, CodingProblem.id == CodingProblemVersion.problem_id)
+                .outerjoin(
+                    CodingTestCase, CodingTestCase.problem_version_id == CodingProblemVersion.id
+                )
+                .where(CodingProblemVersion.id == version_id)
+                .group_by(CodingProblem.published_at)
+            )
+        ).first()
+        if row is None:
+            return "missing"
+        published_at, count, max_id = row
+        published = published_at.isoformat() if published_at else "-"
+        return f"{published}|{int(count or 0)}|{int(max_id or 0)}"
+
+    async def _load_rows(self, db: AsyncSession, version_id: int) -> list[CachedTestCase]:
+        rows = (
+            await db.execute(
+                select(
+                    CodingTestCase.id,
+                    CodingTestCase.input,
+                    CodingTestCase.expected_output,
+                    CodingTestCase.is_hidden,
+                    CodingTestCase.weight,
+                    CodingTestCase.order_index,
+                )
+                .where(CodingTestCase.problem_version_id == version_id)
+                .order_by(CodingTestCase.order_index.asc(), CodingTestCase.id.asc())
+            )
+        ).all()
+        return [
+            CachedTestCase(
+                id=r.id,
+                input=r.input,
+                expected_output=r.expected_output,
+                is_hidden=bool(r.is_hidden),
+                weight=float(r.weight or 1.0),
+                order_index=int(r.order_index or 0),
+            )
+            for r in rows
+        ]
+
+    def _from_disk(self, version_id: int, stamp: str) -> Optional[TestCaseBundle]:
+        if self.disk_dir is None:
+            return None
+        path = _bundle_path(self.disk_dir, version_id, stamp)
+        if not path.exists():
+            return None
+        try:
+            cases, index_bytes = open_bundle_file(path)
+        except (OSError, ValueError, struct.error):
+            logger.warning("testcase_bundle_unreadable path=%s", path, exc_info=True)
+            return None
+        return TestCaseBundle(version_id, stamp, cases, index_bytes)
+
+    def _build(self, version_id: int, stamp: str, rows: list[CachedTestCase]) -> TestCaseBundle:
+        text_bytes = sum(len(r.input) + len(r.expected_output) for r in rows)
+        if self.disk_dir is not None and text_bytes >= self.disk_threshold_bytes:
+            path = _bundle_path(self.disk_dir, version_id, stamp)
+            try:
+                write_bundle_file(path, rows)
+                cases, index_bytes = open_bundle_file(path)
+                return TestCaseBundle(version_id, stamp, cases, index_bytes)
+            except OSError:
+                logger.warning("testcase_bundle_write_failed path=%s", path, exc_info=True)
+        return TestCaseBundle(version_id, stamp, tuple(rows), text_bytes)
+
+    async def get(self, db: AsyncSession, version_id: int) -> list[Any]:
+        """All test cases of the version, ordered by (order_index, id)."""
+        stamp = await self._stamp(db, version_id)
+        bundle = self._bundles.get(version_id)
+        if bundle is not None and bundle.stamp == stamp:
+            self._bundles.move_to_end(version_id)
+            self.hits += 1
+            return list(bundle.cases)
+        bundle = self._from_disk(version_id, stamp)
+        if bundle is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            bundle = self._build(version_id, stamp, await self._load_rows(db, version_id))
+        if self.max_bytes > 0:
+            self._put(bundle)
+        return list(bundle.cases)
+
+
+_cache: Optional[TestCaseBundleCache] = None
+
+
+def get_test_case_cache() -> TestCaseBundleCache:
+    global _cache
+    if _cache is None:
+        _cache = TestCaseBundleCache(
+            max_bytes=settings.coding_testcase_cache_max_mb * 1024 * 1024,
+            disk_dir=settings.coding_testcase_bundle_dir or None,
+            disk_threshold_bytes=settings.coding_testcase_disk_threshold_kb * 1024,
+        )
+    return _cache
+
+
+def invalidate_version(version_id: int) -> None:
+    """Drop a version's bundle in this process (other workers notice via the stamp)."""
+    if _cache is not None:
+        _cache.invalidate_version(version_id)
@@ -30,13 +30,13 @@ def _request_stop(*_args: object) -> None:
     logger.info("coding_worker_stop_requested")
 
 
-async def process_once() -> bool:
-    """Claim and process one job. Returns True if work was done."""
+async def process_once(lane: str = job_queue.LANE_ALL) -> bool:
+    """Claim and process one job of ``lane``. Returns True if work was done."""
     factory = async_session_factory()
     async with factory() as db:
         try:
             await job_queue.recover_stale_jobs(db)
-            job = await job_queue.claim_next_job(db)
+            job = await job_queue.claim_next_job(db, lane=lane)
             if job is None:
                 await db.commit()
                 return False
@@ -50,18 +50,22 @@ async def process_once() -> bool:
 
 
 async def run_worker_loop(*, idle_sleep_ms: int | None = None) -> None:
+    lane = settings.coding_worker_lane
+    if lane not in job_queue.LANES:
+        raise ValueError(f"CODING_WORKER_LANE must be one of {job_queue.LANES}, got {lane!r}")
     await init_db()
-    if not settings.judge0_base_url:
+    if lane != job_queue.LANE_PRACTICE and not settings.judge0_base_url:
         logger.warning("JUDGE0_BASE_URL is empty — run jobs will fail until configured")
     limits = get_coding_limits()
     sleep_ms = idle_sleep_ms if idle_sleep_ms is not None else limits.job_poll_interval_ms
     logger.info(
-        "coding_worker_started max_concurrent=%s poll_ms=%s",
-        limits.max_concurrent_jobs,
+        "coding_worker_started lane=%s max_concurrent=%s poll_ms=%s",
+        lane,
+        job_queue.lane_max_concurrent(lane),
         sleep_ms,
     )
     while not _stop:
-        worked = await process_once()
+        worked = await process_once(lane)
         if not worked:
             await asyncio.sleep(sleep_ms / 1000.0)
     await close_db()
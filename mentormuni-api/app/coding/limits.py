@@ -18,6 +18,7 @@ class CodingLimits:
     execution_timeout_ms: int
     memory_limit_kb: int
     max_concurrent_jobs: int
+    practice_max_concurrent_jobs: int
     job_max_attempts: int
     job_poll_interval_ms: int
     compile_timeout_ms: int
@@ -34,6 +35,7 @@ def get_coding_limits() -> CodingLimits:
         execution_timeout_ms=settings.coding_execution_timeout_ms,
         memory_limit_kb=settings.coding_memory_limit_kb,
         max_concurrent_jobs=settings.coding_max_concurrent_jobs,
+        practice_max_concurrent_jobs=settings.coding_practice_max_concurrent_jobs,
         job_max_attempts=settings.coding_job_max_attempts,
         job_poll_interval_ms=settings.coding_job_poll_interval_ms,
         compile_timeout_ms=settings.coding_compile_timeout_ms,
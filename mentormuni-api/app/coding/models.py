@@ -652,3 +652,14 @@ class CodingValidationResult(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
     )
+
+
+class CodingProblemLshBand(Base):
+    """MinHash/LSH band keys per non-archived problem (duplicate-candidate index)."""
+
+    __tablename__ = "coding_problem_lsh_bands"
+
+    problem_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("coding_problems.id", ondelete="CASCADE"), primary_key=True
+    )
+    band_key: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True)
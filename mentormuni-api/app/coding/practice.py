@@ -1,7 +1,14 @@
-"""Topic browser + practice resolve (bank-first, guarded generate on miss)."""
+"""Topic browser + practice resolve (bank-first, guarded generate on miss).
+
+A bank miss with ``allow_generate`` no longer generates inside the request: it queues a
+``JobType.PRACTICE_GENERATE`` job for the coding worker (one per topic / difficulty /
+company at a time) and returns a handle to poll (``GET /practice/jobs/{id}``) or stream
+(``GET /practice/jobs/{id}/events``).
+"""
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 import re
@@ -9,34 +16,49 @@ from typing import Any, Optional
 
 from fastapi import HTTPException
 from openai import AsyncOpenAI
-from sqlalchemy import func, select
+from sqlalchemy import cast, func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.coding.access import ensure_student
 from app.coding.browse_schemas import (
     BankProblemListOut,
     BankProblemOut,
+    PracticeGenerationOut,
     PracticeResolveOut,
     PracticeResolveRequest,
     TopicCatalogOut,
     TopicCountOut,
 )
-from app.coding.enums import AssessmentStatus, ProblemStatus
+from app.coding.enums import AssessmentStatus, JobStatus, JobType, ProblemStatus
+from app.coding.jobs import queue as job_queue
+from app.coding.jobs.progress import KIND_PRACTICE, JobProgress, event_payload, notify_progress
 from app.coding.models import (
     CodingAssessment,
     CodingAssessmentProblem,
+    CodingJob,
     CodingProblem,
     CodingProblemRelevance,
     CodingProblemVersion,
     CodingReferenceSolution,
     CodingTestCase,
 )
+from app.coding.snapshots import invalidate_snapshots
 from app.coding_bank import PROMPT_VERSION
 from app.coding_bank.curriculum import GenerationSpec
 from app.coding_bank.generator import CodingProblemGenerator, GenerationError
 from app.coding_bank.schemas import GeneratedProblemContract
-from app.coding_bank.validators.duplicate import ExistingProblemRef, content_fingerprint
+from app.coding_bank.similarity_index import (
+    avoid_lists_from_rows,
+    avoid_select,
+    contract_candidates_select,
+    index_problem,
+    refs_from_rows,
+)
+from app.coding_bank.validators.duplicate import content_fingerprint
 from app.coding_bank.validators.pipeline import ProblemValidator
+from app.common.scheduler import advisory_lock_key
 from app.core.config import settings
 from app.models.user import User
 
@@ -278,44 +300,6 @@ async def list_bank_problems(
     )
 
 
-async def _existing_refs(db: AsyncSession) -> list[ExistingProblemRef]:
-    rows = (
-        await db.execute(
-            select(
-                CodingProblem.id,
-                CodingProblem.topic,
-                CodingProblem.pattern,
-                CodingProblem.content_fingerprint,
-                CodingProblemVersion.title,
-                CodingProblemVersion.description,
-                CodingProblemVersion.constraints_text,
-            )
-            .join(
-                CodingProblemVersion,
-                CodingProblemVersion.id == CodingProblem.current_version_id,
-                isouter=True,
-            )
-            .where(CodingProblem.status != "archived")
-        )
-    ).all()
-    out: list[ExistingProblemRef] = []
-    for r in rows:
-        if not r.title:
-            continue
-        out.append(
-            ExistingProblemRef(
-                id=r.id,
-                title=r.title,
-                statement=r.description or "",
-                topic=r.topic,
-                pattern=r.pattern,
-                constraints=r.constraints_text,
-                fingerprint=r.content_fingerprint,
-            )
-        )
-    return out
-
-
 async def _find_published(
     db: AsyncSession,
     *,
@@ -381,6 +365,7 @@ async def ensure_practice_assessment(
             existing.company_key = company_key
             existing.company_name = company_name
         await db.flush()
+        invalidate_snapshots(existing.id)
         return existing
 
     assessment = CodingAssessment(
@@ -517,6 +502,8 @@ async def _persist_and_publish_generated(
             )
         )
     problem.current_version_id = version.id
+    await db.flush()
+    await db.run_sync(index_problem, problem.id, contract.title, contract.problem_statement)
 
     if company_key:
         db.add(
@@ -569,49 +556,119 @@ def _guess_complexity(difficulty: str) -> tuple[str, str]:
     return "O(n)", "O(1)"
 
 
-async def resolve_practice(
-    db: AsyncSession,
-    user: User,
-    body: PracticeResolveRequest,
-) -> PracticeResolveOut:
-    ensure_student(user)
+class PracticeGenerationError(Exception):
+    """A generation attempt failed; ``retryable`` decides whether the worker tries again."""
+
+    def __init__(self, message: str, *, retryable: bool) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+
+
+_ACTIVE_JOB_STATUSES = (JobStatus.PENDING.value, JobStatus.CLAIMED.value, JobStatus.RUNNING.value)
+_PUBLIC_JOB_STATUS = {
+    JobStatus.PENDING.value: "pending",
+    JobStatus.CLAIMED.value: "pending",
+    JobStatus.RUNNING.value: "running",
+    JobStatus.SUCCEEDED.value: "succeeded",
+    JobStatus.FAILED.value: "pending",  # retry scheduled
+    JobStatus.DEAD.value: "failed",
+}
+_GENERATED_MESSAGE = (
+    "Created an original campus-placement practice problem for your topic. "
+    "Validated before publish — not an official company question."
+)
+
+
+def _resolve_params(body: PracticeResolveRequest) -> tuple[str, str, str | None, str | None]:
     topic = normalize_topic_label(body.topic)
     difficulty = normalize_difficulty(body.difficulty)
     company_key = (body.company_key or "").strip().lower() or None
     company_name = (body.company_name or "").strip() or None
     if company_key and not company_name:
         company_name = company_key.replace("-", " ").title()
+    return topic, difficulty, company_key, company_name
 
-    matched = await _find_published(
-        db, topic=topic, difficulty=difficulty, limit=body.max_problems
-    )
-    generated = False
-    source = "bank"
-    message = None
 
-    if not matched:
-        # Soft fallback: same topic, any difficulty
-        soft = list(
-            (
-                await db.execute(
-                    select(CodingProblem, CodingProblemVersion)
-                    .join(
-                        CodingProblemVersion,
-                        CodingProblemVersion.id == CodingProblem.current_version_id,
-                    )
-                    .where(CodingProblem.status == ProblemStatus.PUBLISHED.value)
-                    .where(func.lower(CodingProblem.topic) == topic.lower())
-                    .order_by(CodingProblem.id.asc())
-                    .limit(body.max_problems)
+async def _match_bank(
+    db: AsyncSession,
+    *,
+    topic: str,
+    difficulty: str,
+    max_problems: int,
+) -> tuple[list[tuple[CodingProblem, CodingProblemVersion]], str | None]:
+    matched = await _find_published(db, topic=topic, difficulty=difficulty, limit=max_problems)
+    if matched:
+        return matched, None
+    # Soft fallback: same topic, any difficulty
+    soft = list(
+        (
+            await db.execute(
+                select(CodingProblem, CodingProblemVersion)
+                .join(
+                    CodingProblemVersion,
+                    CodingProblemVersion.id == CodingProblem.current_version_id,
                 )
-            ).all()
-        )
-        if soft:
-            matched = soft
-            message = (
-                f"No exact {difficulty} problems for {topic}; showing closest published set."
+                .where(CodingProblem.status == ProblemStatus.PUBLISHED.value)
+                .where(func.lower(CodingProblem.topic) == topic.lower())
+                .order_by(CodingProblem.id.asc())
+                .limit(max_problems)
             )
-            source = "bank"
+        ).all()
+    )
+    if soft:
+        return soft, f"No exact {difficulty} problems for {topic}; showing closest published set."
+    return [], None
+
+
+async def _practice_out(
+    db: AsyncSession,
+    matched: list[tuple[CodingProblem, CodingProblemVersion]],
+    *,
+    topic: str,
+    difficulty: str,
+    company_key: str | None,
+    company_name: str | None,
+    source: str,
+    generated: bool,
+    message: str | None,
+) -> PracticeResolveOut:
+    assessment = await ensure_practice_assessment(
+        db,
+        problems=[p for p, _ in matched],
+        topic=topic,
+        difficulty=difficulty,
+        company_key=company_key,
+        company_name=company_name,
+    )
+    cards = [
+        _bank_card(p, v, assessment_slug=assessment.slug, company_name_override=company_name)
+        for p, v in matched
+    ]
+    return PracticeResolveOut(
+        source=source,
+        assessment_id=assessment.id,
+        assessment_slug=assessment.slug,
+        title=assessment.title,
+        topic=topic,
+        difficulty=difficulty,
+        problem_count=len(cards),
+        generated=generated,
+        message=message,
+        problems=cards,
+    )
+
+
+async def resolve_practice(
+    db: AsyncSession,
+    user: User,
+    body: PracticeResolveRequest,
+) -> PracticeResolveOut | PracticeGenerationOut:
+    """Bank match → practice assessment now; a miss with ``allow_generate`` queues a job."""
+    ensure_student(user)
+    topic, difficulty, company_key, company_name = _resolve_params(body)
+    matched, message = await _match_bank(
+        db, topic=topic, difficulty=difficulty, max_problems=body.max_problems
+    )
 
     if not matched and body.allow_generate:
         if not settings.openai_api_key:
@@ -622,66 +679,14 @@ async def resolve_practice(
                     "unavailable (OPENAI_API_KEY missing)."
                 ),
             )
-        t_c, s_c = _guess_complexity(difficulty)
-        pattern = _guess_pattern(topic)
-        spec = GenerationSpec(
-            slot_id=f"student-{_slugify(topic)}-{difficulty}",
-            difficulty=difficulty,  # type: ignore[arg-type]
-            topic=topic.lower(),
-            pattern=pattern,
-            expected_time_complexity=t_c,
-            expected_space_complexity=s_c,
-            notes=(
-                "Audience: 4th-year engineering campus placement. "
-                "Original wording only. Fair OA-style problem."
-            ),
-        )
-        client = AsyncOpenAI(api_key=settings.openai_api_key)
-        generator = CodingProblemGenerator(openai_client=client, model="gpt-4.1-mini")
-        avoid_titles = [r.title for r in await _existing_refs(db)]
-        avoid_slugs = list((await db.execute(select(CodingProblem.slug))).scalars().all())
-        try:
-            contract = await generator.generate_one(
-                spec,
-                avoid_titles=avoid_titles,
-                avoid_slugs=avoid_slugs,
-                company_name=company_name,
-            )
-        except GenerationError as e:
-            logger.exception("practice generate failed")
-            raise HTTPException(status_code=502, detail=f"Generation failed: {e}") from e
-
-        validator = ProblemValidator()  # no Judge0 coupling
-        _c, report = await validator.validate(contract, existing=await _existing_refs(db))
-        if _c is None or not report.ok:
-            raise HTTPException(
-                status_code=422,
-                detail={
-                    "message": "Generated problem failed validation guardrails.",
-                    "errors": report.errors[:8],
-                },
-            )
-        # Apply canonical outputs if any (none without executor)
-        problem = await _persist_and_publish_generated(
+        return await enqueue_practice_generation(
             db,
-            contract,
+            user,
+            topic=topic,
+            difficulty=difficulty,
             company_key=company_key,
             company_name=company_name,
-            model=generator.model,
-        )
-        version = (
-            await db.execute(
-                select(CodingProblemVersion).where(
-                    CodingProblemVersion.id == problem.current_version_id
-                )
-            )
-        ).scalar_one()
-        matched = [(problem, version)]
-        generated = True
-        source = "generated"
-        message = (
-            "Created an original campus-placement practice problem for your topic. "
-            "Validated before publish — not an official company question."
+            max_problems=body.max_problems,
         )
 
     if not matched:
@@ -693,37 +698,315 @@ async def resolve_practice(
             ),
         )
 
-    problems = [p for p, _ in matched]
-    assessment = await ensure_practice_assessment(
+    out = await _practice_out(
         db,
-        problems=problems,
+        matched,
         topic=topic,
         difficulty=difficulty,
         company_key=company_key,
         company_name=company_name,
+        source="bank",
+        generated=False,
+        message=message,
     )
     await db.commit()
+    return out
+
+
+# --- queued generation (JobType.PRACTICE_GENERATE) ---------------------------
+
+
+def practice_generation_key(topic: str, difficulty: str, company_key: str | None) -> str:
+    return f"{topic.lower()}|{difficulty}|{company_key or ''}"
 
-    cards: list[BankProblemOut] = []
-    for p, v in matched:
-        cards.append(
-            _bank_card(
-                p,
-                v,
-                assessment_slug=assessment.slug,
-                company_name_override=company_name,
+
+def _generation_out(job: CodingJob, *, deduplicated: bool = False) -> PracticeGenerationOut:
+    payload = job.payload_json or {}
+    result = payload.get("result") if job.status == JobStatus.SUCCEEDED.value else None
+    return PracticeGenerationOut(
+        job_id=job.id,
+        status=_PUBLIC_JOB_STATUS.get(job.status, job.status),
+        topic=str(payload.get("topic") or ""),
+        difficulty=str(payload.get("difficulty") or ""),
+        company_key=payload.get("company_key"),
+        deduplicated=deduplicated,
+        error=job.last_error if job.status == JobStatus.DEAD.value else None,
+        result=PracticeResolveOut.model_validate(result) if result else None,
+    )
+
+
+async def _merge_payload(db: AsyncSession, job: CodingJob, patch: dict[str, Any]) -> None:
+    """``payload_json || patch`` in SQL, so keys another session wrote meanwhile survive.
+
+    The worker holds ``job`` across the LLM call while joiners append to ``requested_by``;
+    rewriting the whole column from either side's stale copy would drop the other's write.
+    """
+    await db.execute(
+        update(CodingJob)
+        .where(CodingJob.id == job.id)
+        .values(payload_json=CodingJob.payload_json.op("||")(cast(patch, JSONB)))
+        .execution_options(synchronize_session=False)
+    )
+    set_committed_value(job, "payload_json", {**(job.payload_json or {}), **patch})
+
+
+async def _add_requester(db: AsyncSession, job: CodingJob, user_id: int) -> None:
+    """Append ``user_id`` to ``requested_by`` against the current row, not a copy of it."""
+    requesters = func.coalesce(CodingJob.payload_json["requested_by"], cast([], JSONB))
+    await db.execute(
+        update(CodingJob)
+        .where(CodingJob.id == job.id, ~requesters.contains([user_id]))
+        .values(
+            payload_json=CodingJob.payload_json.op("||")(
+                func.jsonb_build_object("requested_by", requesters.op("||")(cast([user_id], JSONB)))
             )
         )
+        .execution_options(synchronize_session=False)
+    )
+    payload = job.payload_json or {}
+    set_committed_value(
+        job, "payload_json", {**payload, "requested_by": [*(payload.get("requested_by") or []), user_id]}
+    )
 
-    return PracticeResolveOut(
-        source=source,
-        assessment_id=assessment.id,
-        assessment_slug=assessment.slug,
-        title=assessment.title,
+
+async def _active_generation_job(db: AsyncSession, key: str) -> CodingJob | None:
+    return (
+        await db.execute(
+            select(CodingJob)
+            .where(
+                CodingJob.job_type == JobType.PRACTICE_GENERATE.value,
+                CodingJob.status.in_(_ACTIVE_JOB_STATUSES),
+                CodingJob.payload_json["dedupe_key"].astext == key,
+            )
+            .order_by(CodingJob.id.desc())
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+
+
+async def enqueue_practice_generation(
+    db: AsyncSession,
+    user: User,
+    *,
+    topic: str,
+    difficulty: str,
+    company_key: str | None,
+    company_name: str | None,
+    max_problems: int = 1,
+) -> PracticeGenerationOut:
+    """Queue one generation per (topic, difficulty, company); concurrent callers share it."""
+    key = practice_generation_key(topic, difficulty, company_key)
+    if settings.database_url.startswith("postgresql"):
+        # Serializes check-then-enqueue per key until this transaction commits.
+        await db.execute(
+            text("SELECT pg_advisory_xact_lock(:k)"),
+            {"k": advisory_lock_key(f"practice_generate:{key}")},
+        )
+    job = await _active_generation_job(db, key)
+    deduplicated = job is not None
+    if job is None:
+        job = await job_queue.enqueue_job(
+            db,
+            job_type=JobType.PRACTICE_GENERATE,
+            student_id=user.id,
+            payload={
+                "dedupe_key": key,
+                "topic": topic,
+                "difficulty": difficulty,
+                "company_key": company_key,
+                "company_name": company_name,
+                "max_problems": max_problems,
+                "requested_by": [user.id],
+            },
+        )
+    elif user.id not in ((job.payload_json or {}).get("requested_by") or []):
+        # Joiners may poll / stream the shared job too (see ``_load_generation_job``).
+        await _add_requester(db, job, user.id)
+    out = _generation_out(job, deduplicated=deduplicated)
+    await db.commit()
+    logger.info(
+        "practice_generation_queued job_id=%s key=%s deduplicated=%s", job.id, key, deduplicated
+    )
+    return out
+
+
+async def _load_generation_job(db: AsyncSession, user: User, job_id: int) -> CodingJob:
+    """The job, if ``user`` started or joined it; 404 otherwise (ids are not enumerable)."""
+    ensure_student(user)
+    job = (
+        await db.execute(
+            select(CodingJob).where(
+                CodingJob.id == job_id,
+                CodingJob.job_type == JobType.PRACTICE_GENERATE.value,
+                or_(
+                    CodingJob.student_id == user.id,
+                    CodingJob.payload_json["requested_by"].contains([user.id]),
+                ),
+            )
+        )
+    ).scalar_one_or_none()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Practice generation not found.")
+    return job
+
+
+async def get_practice_generation(db: AsyncSession, user: User, job_id: int) -> PracticeGenerationOut:
+    return _generation_out(await _load_generation_job(db, user, job_id))
+
+
+async def practice_generation_stream_state(
+    db: AsyncSession, user: User, job_id: int
+) -> tuple[PracticeGenerationOut, bool]:
+    job = await _load_generation_job(db, user, job_id)
+    return _generation_out(job), job.status in (JobStatus.SUCCEEDED.value, JobStatus.DEAD.value)
+
+
+def _generation_timeout_seconds() -> int:
+    # At most half the stale window: a running generation must finish (or fail) well
+    # before ``recover_stale_jobs`` would requeue it for a second worker.
+    return min(settings.coding_practice_generate_timeout_seconds, settings.coding_job_stale_seconds // 2)
+
+
+async def _report_stage(job: CodingJob, stage: str) -> None:
+    job_queue.apply_provider_meta(job, provider="openai", provider_status=stage)
+    await notify_progress(
+        event_payload(
+            JobProgress(
+                job_id=job.id,
+                kind=KIND_PRACTICE,
+                target_id=job.id,
+                provider="openai",
+                provider_status=stage,
+            )
+        )
+    )
+
+
+async def _generate_and_publish(
+    db: AsyncSession,
+    job: CodingJob,
+    *,
+    topic: str,
+    difficulty: str,
+    company_key: str | None,
+    company_name: str | None,
+) -> tuple[CodingProblem, CodingProblemVersion]:
+    t_c, s_c = _guess_complexity(difficulty)
+    spec = GenerationSpec(
+        slot_id=f"student-{_slugify(topic)}-{difficulty}",
+        difficulty=difficulty,  # type: ignore[arg-type]
+        topic=topic.lower(),
+        pattern=_guess_pattern(topic),
+        expected_time_complexity=t_c,
+        expected_space_complexity=s_c,
+        notes=(
+            "Audience: 4th-year engineering campus placement. "
+            "Original wording only. Fair OA-style problem."
+        ),
+    )
+    timeout = _generation_timeout_seconds()
+    # No SDK retries: a failed attempt is retried by the job queue with backoff.
+    client = AsyncOpenAI(api_key=settings.openai_api_key, timeout=timeout, max_retries=0)
+    generator = CodingProblemGenerator(openai_client=client, model="gpt-4.1-mini")
+    avoid_titles, avoid_slugs = avoid_lists_from_rows((await db.execute(avoid_select(topic))).all())
+    await _report_stage(job, "generating")
+    # Commit the claim (status running) before the LLM call: no transaction or pooled
+    # connection is held across it, and pollers / the lane's concurrency count see the job.
+    await db.commit()
+    try:
+        contract = await asyncio.wait_for(
+            generator.generate_one(
+                spec,
+                avoid_titles=avoid_titles,
+                avoid_slugs=avoid_slugs,
+                company_name=company_name,
+            ),
+            timeout,
+        )
+    except GenerationError as e:
+        logger.warning("practice_generate_failed job_id=%s err=%s", job.id, e)
+        raise PracticeGenerationError(f"Generation failed: {e}", retryable=True) from e
+    except asyncio.TimeoutError as e:
+        logger.warning("practice_generate_timeout job_id=%s timeout=%s", job.id, timeout)
+        raise PracticeGenerationError(f"Generation timed out after {timeout}s", retryable=True) from e
+
+    await _report_stage(job, "validating")
+    validator = ProblemValidator()  # no Judge0 coupling
+    existing = refs_from_rows((await db.execute(contract_candidates_select(contract))).all())
+    _c, report = await validator.validate(contract, existing=existing)
+    if _c is None or not report.ok:
+        raise PracticeGenerationError(
+            "Generated problem failed validation guardrails: " + "; ".join(report.errors[:8]),
+            retryable=False,
+        )
+
+    await _report_stage(job, "publishing")
+    problem = await _persist_and_publish_generated(
+        db,
+        contract,
+        company_key=company_key,
+        company_name=company_name,
+        model=generator.model,
+    )
+    version = (
+        await db.execute(
+            select(CodingProblemVersion).where(CodingProblemVersion.id == problem.current_version_id)
+        )
+    ).scalar_one()
+    return problem, version
+
+
+async def run_practice_generation(db: AsyncSession, job: CodingJob) -> None:
+    """Worker side of a practice generation: re-check the bank, else generate and publish.
+
+    The published problem and its practice assessment stay in the bank, so the next
+    student asking for the same topic is served synchronously by ``resolve_practice``.
+    """
+    payload = dict(job.payload_json or {})
+    topic = payload.get("topic")
+    difficulty = payload.get("difficulty")
+    if not topic or not difficulty:
+        await job_queue.mark_failed(db, job, error="practice job missing topic/difficulty", retryable=False)
+        return
+    company_key = payload.get("company_key")
+    company_name = payload.get("company_name")
+
+    # A concurrent job (or an admin publish) may already have filled the gap.
+    matched, message = await _match_bank(
+        db, topic=topic, difficulty=difficulty, max_problems=int(payload.get("max_problems") or 1)
+    )
+    generated = not matched
+    if generated:
+        if not settings.openai_api_key:
+            await job_queue.mark_failed(db, job, error="OPENAI_API_KEY missing", retryable=False)
+            return
+        try:
+            matched = [
+                await _generate_and_publish(
+                    db,
+                    job,
+                    topic=topic,
+                    difficulty=difficulty,
+                    company_key=company_key,
+                    company_name=company_name,
+                )
+            ]
+        except PracticeGenerationError as exc:
+            await job_queue.mark_failed(db, job, error=str(exc), retryable=exc.retryable)
+            return
+        message = _GENERATED_MESSAGE
+
+    out = await _practice_out(
+        db,
+        matched,
         topic=topic,
         difficulty=difficulty,
-        problem_count=len(cards),
+        company_key=company_key,
+        company_name=company_name,
+        source="generated" if generated else "bank",
         generated=generated,
         message=message,
-        problems=cards,
     )
+    # Only the result key: students who joined during generation stay in ``requested_by``.
+    await _merge_payload(db, job, {"result": out.model_dump(mode="json")})
+    await job_queue.mark_succeeded(db, job)
@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.coding import practice as coding_practice
 from app.coding import service as coding_service
+from app.coding import streaming as coding_streaming
 from app.coding.browse_schemas import (
     BankProblemListOut,
+    PracticeGenerationOut,
     PracticeResolveOut,
     PracticeResolveRequest,
     TopicCatalogOut,
 )
+from app.coding.jobs.progress import KIND_PRACTICE, KIND_RUN, KIND_SUBMISSION
 from app.coding.schemas import (
     AnalysisOut,
     AssessmentListOut,
@@ -27,6 +33,7 @@ from app.coding.schemas import (
     SubmissionListOut,
     SubmissionOut,
 )
+from app.common.http import etag_matches
 from app.common.deps import get_db, require_api_key, require_roles
 from app.models.enums import RoleCode
 from app.models.user import User
@@ -40,20 +47,30 @@ router = APIRouter(
 
 @router.get("/assessments", response_model=AssessmentListOut)
 async def list_assessments(
+    request: Request,
+    response: Response,
     company_key: str | None = Query(default=None, max_length=160),
     topic: str | None = Query(default=None, max_length=80),
     difficulty: str | None = Query(default=None, max_length=32),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_roles(RoleCode.STUDENT.value)),
-) -> AssessmentListOut:
-    """List assessments ranked by evidence-backed relevance. Optional company/skill/level filters."""
-    return await coding_service.list_assessments(
+) -> AssessmentListOut | Response:
+    """List assessments ranked by evidence-backed relevance. Optional company/skill/level filters.
+
+    Sends an ETag; a matching ``If-None-Match`` gets an empty 304.
+    """
+    entry = await coding_service.assessment_catalog(
         db,
         user,
         company_key=company_key,
         topic=topic,
         difficulty=difficulty,
     )
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return entry.payload
 
 
 @router.get("/topics", response_model=TopicCatalogOut)
@@ -79,18 +96,45 @@ async def list_bank_problems(
     )
 
 
-@router.post("/practice/resolve", response_model=PracticeResolveOut)
+@router.post("/practice/resolve", response_model=PracticeResolveOut | PracticeGenerationOut)
 async def resolve_practice(
     body: PracticeResolveRequest,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_roles(RoleCode.STUDENT.value)),
-) -> PracticeResolveOut:
+) -> PracticeResolveOut | PracticeGenerationOut:
     """
     Free-text topic + difficulty → practice assessment.
-    Prefers published bank; optionally generates an original campus-placement problem
-    through validation guardrails when the bank has no match.
+    Prefers published bank. On a miss (with ``allow_generate``) an original campus-placement
+    problem is generated on the coding worker: responds 202 with a job handle — stream
+    GET /practice/jobs/{id}/events (or poll GET /practice/jobs/{id}) for the result.
     """
-    return await coding_practice.resolve_practice(db, user, body)
+    out = await coding_practice.resolve_practice(db, user, body)
+    if isinstance(out, PracticeGenerationOut):
+        response.status_code = 202
+    return out
+
+
+@router.get("/practice/jobs/{job_id}", response_model=PracticeGenerationOut)
+async def get_practice_generation(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(require_roles(RoleCode.STUDENT.value)),
+) -> PracticeGenerationOut:
+    return await coding_practice.get_practice_generation(db, user, job_id)
+
+
+@router.get("/practice/jobs/{job_id}/events", response_class=StreamingResponse)
+async def stream_practice_generation(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(require_roles(RoleCode.STUDENT.value)),
+) -> StreamingResponse:
+    """SSE: `snapshot`, stage `progress` (generating / validating / publishing), then `done`."""
+    await coding_practice.get_practice_generation(db, user, job_id)
+    return await coding_streaming.stream_response(
+        db, KIND_PRACTICE, job_id, coding_practice.practice_generation_stream_state, user
+    )
 
 
 @router.get("/assessments/{assessment_ref}", response_model=AssessmentSummaryOut)
@@ -167,7 +211,7 @@ async def create_run(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_roles(RoleCode.STUDENT.value)),
 ) -> RunOut:
-    """Enqueue public-test execution. Poll GET /runs/{id}. No OpenAI."""
+    """Enqueue public-test execution. Stream GET /runs/{id}/events (or poll GET /runs/{id})."""
     return await coding_service.enqueue_run(db, user, body)
 
 
@@ -180,6 +224,19 @@ async def get_run(
     return await coding_service.get_run(db, user, run_id)
 
 
+@router.get("/runs/{run_id}/events", response_class=StreamingResponse)
+async def stream_run_events(
+    run_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(require_roles(RoleCode.STUDENT.value)),
+) -> StreamingResponse:
+    """SSE: `snapshot`, per-test `progress`, then `done` with the final run."""
+    await coding_service.get_run(db, user, run_id)  # 404 / 403 before the stream starts
+    return await coding_streaming.stream_response(
+        db, KIND_RUN, run_id, coding_service.run_stream_state, user
+    )
+
+
 @router.post("/submissions", response_model=SubmissionOut)
 async def create_submission(
     body: SubmissionCreateRequest,
@@ -194,12 +251,25 @@ async def create_submission(
 async def list_submissions(
     limit: int = Query(default=20, ge=1, le=50),
     company_key: str | None = Query(default=None, max_length=160),
+    verdict: str | None = Query(default=None, max_length=64),
+    language: str | None = Query(default=None, max_length=32),
+    submitted_from: datetime | None = Query(default=None),
+    submitted_to: datetime | None = Query(default=None),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_roles(RoleCode.STUDENT.value)),
 ) -> SubmissionListOut:
-    """Past submissions for result revisit."""
+    """Past submissions for result revisit (newest first; page with ``cursor``)."""
     return await coding_service.list_submissions(
-        db, user, limit=limit, company_key=company_key
+        db,
+        user,
+        limit=limit,
+        company_key=company_key,
+        verdict=verdict,
+        language_code=language,
+        submitted_from=submitted_from,
+        submitted_to=submitted_to,
+        cursor=cursor,
     )
 
 
@@ -212,6 +282,23 @@ async def get_submission(
     return await coding_service.get_submission(db, user, submission_id)
 
 
+@router.get("/submissions/{submission_id}/events", response_class=StreamingResponse)
+async def stream_submission_events(
+    submission_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(require_roles(RoleCode.STUDENT.value)),
+) -> StreamingResponse:
+    """SSE: `snapshot`, per-test `progress`, then `done` with the final submission."""
+    await coding_service.get_submission(db, user, submission_id)
+    return await coding_streaming.stream_response(
+        db,
+        KIND_SUBMISSION,
+        submission_id,
+        coding_service.submission_stream_state,
+        user,
+    )
+
+
 @router.get("/submissions/{submission_id}/analysis", response_model=AnalysisOut)
 async def get_submission_analysis(
     submission_id: int,
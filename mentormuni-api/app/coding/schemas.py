@@ -57,6 +57,8 @@ class SubmissionSummaryOut(BaseModel):
 
 class SubmissionListOut(BaseModel):
     items: list[SubmissionSummaryOut]
+    # Pass back as ?cursor= for the next (older) page; None on the last page.
+    next_cursor: Optional[str] = None
 
 
 class AttemptProblemSummaryOut(BaseModel):
@@ -153,6 +155,13 @@ class RunCreateRequest(BaseModel):
     source_code: str = Field(default="")
 
 
+class RunProgressOut(BaseModel):
+    provider_status: Optional[str] = None
+    cases_started: int = 0
+    total_cases: int = 0
+    updated_at: datetime
+
+
 class RunCaseResultOut(BaseModel):
     index: int
     status: str
@@ -178,6 +187,8 @@ class RunOut(BaseModel):
     execution_time_ms: Optional[int] = None
     memory_used_kb: Optional[int] = None
     cases: list[RunCaseResultOut] = Field(default_factory=list)
+    # Live provider progress while queued/running (only when visible to this process).
+    progress: Optional[RunProgressOut] = None
     created_at: datetime
     # Never includes hidden tests / reference solutions / official score
 
@@ -4,11 +4,11 @@ from __future__ import annotations
 
 import hashlib
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Any, Optional
 
 from fastapi import HTTPException
-from sqlalchemy import Select, func, or_, select
+from sqlalchemy import Select, func, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -20,10 +20,19 @@ from app.coding.access import (
     get_owned_attempt,
     is_attempt_expired,
     mark_expired_if_needed,
+    org_has_coding_feature,
     utcnow,
 )
-from app.coding.enums import AnalysisStatus, AssessmentStatus, AttemptStatus, ExecutionStatus, JobType, ProblemStatus
+from app.coding.catalog import (
+    CatalogEntry,
+    CatalogKey,
+    catalog_rows,
+    get_catalog_cache,
+    normalize_filter,
+)
+from app.coding.enums import AnalysisStatus, AttemptStatus, ExecutionStatus, JobStatus, JobType, ProblemStatus
 from app.coding.jobs import queue as job_queue
+from app.coding.jobs.progress import latest_progress
 from app.coding.limits import get_coding_limits
 from app.coding.models import (
     CodingAiAnalysis,
@@ -55,6 +64,7 @@ from app.coding.schemas import (
     DraftUpsertRequest,
     ProblemExampleOut,
     RunCaseResultOut,
+    RunProgressOut,
     RunCreateRequest,
     RunOut,
     SnapshotProblem,
@@ -64,6 +74,9 @@ from app.coding.schemas import (
     SubmissionSummaryOut,
     SubmissionTestResultOut,
 )
+from app.coding.snapshots import CachedSnapshot, get_snapshot_cache, snapshot_key, snapshot_rows
+from app.common.pagination import keyset_before, next_cursor_for
+from app.common.rate_limit import get_rate_limit_store
 from app.models.user import User
 
 logger = logging.getLogger("coding")
@@ -176,10 +189,12 @@ async def _first_problem_meta(
     return problem.topic, problem.pattern
 
 
-async def _assessment_summary(
-    db: AsyncSession, assessment: CodingAssessment, problem_count: int
+def _summary_out(
+    assessment: CodingAssessment,
+    problem_count: int,
+    topic: str | None,
+    pattern: str | None,
 ) -> AssessmentSummaryOut:
-    topic, pattern = await _first_problem_meta(db, assessment.id)
     return AssessmentSummaryOut(
         id=assessment.id,
         slug=assessment.slug,
@@ -205,97 +220,82 @@ async def _assessment_summary(
     )
 
 
-async def list_assessments(
+async def _assessment_summary(
+    db: AsyncSession, assessment: CodingAssessment, problem_count: int
+) -> AssessmentSummaryOut:
+    topic, pattern = await _first_problem_meta(db, assessment.id)
+    return _summary_out(assessment, problem_count, topic, pattern)
+
+
+async def assessment_catalog(
     db: AsyncSession,
     user: User,
     *,
     company_key: str | None = None,
     topic: str | None = None,
     difficulty: str | None = None,
-) -> AssessmentListOut:
+) -> CatalogEntry:
+    """Catalog listing plus its ETag; see ``app.coding.catalog``."""
     ensure_student(user)
-    q = (
-        select(CodingAssessment)
-        .where(CodingAssessment.status == AssessmentStatus.ACTIVE.value)
-        .where(
-            or_(
-                CodingAssessment.organization_id.is_(None),
-                CodingAssessment.organization_id == user.organization_id,
-            )
-        )
+    org_id = user.organization_id
+    key = CatalogKey(
+        organization_id=org_id,
+        org_feature=bool(org_id is not None and await org_has_coding_feature(db, org_id)),
+        company_key=normalize_filter(company_key),
+        topic=normalize_filter(topic),
+        difficulty=normalize_filter(difficulty),
     )
-    key = (company_key or "").strip().lower() or None
-    if key:
-        q = q.where(func.lower(CodingAssessment.company_key) == key)
-    diff = (difficulty or "").strip().lower() or None
-    if diff:
-        q = q.where(func.lower(CodingAssessment.difficulty) == diff)
-    # Evidence-backed ranking (internal confidence) — never returned raw
-    q = q.order_by(
-        CodingAssessment.evidence_confidence.desc().nulls_last(),
-        CodingAssessment.id.asc(),
+    cache = get_catalog_cache()
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+    items = [
+        _summary_out(a, count, first_topic, first_pattern)
+        for a, count, first_topic, first_pattern in await catalog_rows(db, key)
+    ]
+    return cache.put(key, AssessmentListOut(items=items, company_key=key.company_key))
+
+
+async def list_assessments(
+    db: AsyncSession,
+    user: User,
+    *,
+    company_key: str | None = None,
+    topic: str | None = None,
+    difficulty: str | None = None,
+) -> AssessmentListOut:
+    entry = await assessment_catalog(
+        db, user, company_key=company_key, topic=topic, difficulty=difficulty
     )
-    assessments = list((await db.execute(q)).scalars().all())
-    topic_filter = (topic or "").strip().lower() or None
-    items: list[AssessmentSummaryOut] = []
-    for a in assessments:
-        try:
-            await assert_assessment_accessible(db, user, a, require_active=True)
-        except HTTPException:
-            continue
-        count_row = await db.execute(
-            select(CodingAssessmentProblem.id).where(CodingAssessmentProblem.assessment_id == a.id)
-        )
-        problem_count = len(count_row.all())
-        summary = await _assessment_summary(db, a, problem_count)
-        if topic_filter:
-            t = (summary.topic or "").strip().lower()
-            if t != topic_filter and topic_filter not in t:
-                continue
-        items.append(summary)
-    return AssessmentListOut(items=items, company_key=key)
+    return entry.payload
 
 
 async def get_assessment(db: AsyncSession, user: User, assessment_ref: str) -> AssessmentSummaryOut:
     assessment = await _load_assessment(db, assessment_ref)
     await assert_assessment_accessible(db, user, assessment, require_active=True)
-    count_row = await db.execute(
-        select(CodingAssessmentProblem.id).where(
-            CodingAssessmentProblem.assessment_id == assessment.id
+    problem_count = (
+        await db.execute(
+            select(func.count(CodingAssessmentProblem.id)).where(
+                CodingAssessmentProblem.assessment_id == assessment.id
+            )
         )
-    )
-    return await _assessment_summary(db, assessment, len(count_row.all()))
+    ).scalar_one()
+    return await _assessment_summary(db, assessment, int(problem_count or 0))
 
 
 async def _build_snapshot_payload(
     db: AsyncSession, assessment: CodingAssessment
 ) -> AttemptSnapshotPayload:
-    links = (
-        await db.execute(
-            select(CodingAssessmentProblem)
-            .where(CodingAssessmentProblem.assessment_id == assessment.id)
-            .order_by(CodingAssessmentProblem.order_index.asc(), CodingAssessmentProblem.id.asc())
-        )
-    ).scalars().all()
-    if not links:
+    rows = await snapshot_rows(db, assessment.id)
+    if not rows:
         raise HTTPException(status_code=400, detail="Assessment has no problems.")
 
     problems: list[SnapshotProblem] = []
-    for link in links:
-        problem = (
-            await db.execute(select(CodingProblem).where(CodingProblem.id == link.problem_id))
-        ).scalar_one_or_none()
+    for link, problem, version in rows:
         if problem is None or problem.status != ProblemStatus.PUBLISHED.value:
             raise HTTPException(status_code=400, detail="Assessment contains an unavailable problem.")
         if problem.current_version_id is None:
             raise HTTPException(status_code=400, detail="Problem has no published version.")
-        version = (
-            await db.execute(
-                select(CodingProblemVersion).where(
-                    CodingProblemVersion.id == problem.current_version_id
-                )
-            )
-        ).scalar_one_or_none()
         if version is None:
             raise HTTPException(status_code=400, detail="Problem version missing.")
         problems.append(
@@ -338,6 +338,16 @@ async def _build_snapshot_payload(
     )
 
 
+async def _attempt_snapshot(db: AsyncSession, assessment: CodingAssessment) -> CachedSnapshot:
+    """Snapshot for a new attempt; memoized per assessment + link/version stamp."""
+    key = await snapshot_key(db, assessment)
+    cache = get_snapshot_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    return cache.put(key, await _build_snapshot_payload(db, assessment))
+
+
 async def _attempt_out(db: AsyncSession, attempt: CodingAttempt) -> AttemptOut:
     now = utcnow()
     await mark_expired_if_needed(db, attempt)
@@ -476,7 +486,7 @@ async def start_assessment(db: AsyncSession, user: User, assessment_ref: str) ->
             return await _attempt_out(db, att)
         att.status = AttemptStatus.EXPIRED.value
 
-    snapshot = await _build_snapshot_payload(db, assessment)
+    snapshot = await _attempt_snapshot(db, assessment)
     # ends_at is server-only (never accepted from the client)
     ends_at = None
     if assessment.duration_minutes and assessment.duration_minutes > 0:
@@ -514,10 +524,10 @@ async def start_assessment(db: AsyncSession, user: User, assessment_ref: str) ->
     db.add(
         CodingAttemptSnapshot(
             attempt_id=attempt.id,
-            snapshot_json=snapshot.model_dump(mode="json"),
+            snapshot_json=snapshot.snapshot_json,
         )
     )
-    for p in snapshot.problems:
+    for p in snapshot.payload.problems:
         db.add(
             CodingAttemptProblem(
                 attempt_id=attempt.id,
@@ -761,20 +771,18 @@ def _source_hash(source: str) -> str:
     return hashlib.sha256(source.encode("utf-8")).hexdigest()
 
 
-async def _assert_run_rate_limit(db: AsyncSession, student_id: int) -> None:
+async def _assert_run_rate_limit(student_id: int) -> None:
     limits = get_coding_limits()
-    since = utcnow() - timedelta(seconds=limits.run_rate_window_seconds)
-    count = (
-        await db.execute(
-            select(func.count())
-            .select_from(CodingRun)
-            .where(CodingRun.student_id == student_id, CodingRun.created_at >= since)
-        )
-    ).scalar_one()
-    if int(count or 0) >= limits.run_rate_per_student:
+    retry_after = await get_rate_limit_store().hit(
+        f"coding:run:{student_id}",
+        limit=limits.run_rate_per_student,
+        window_seconds=limits.run_rate_window_seconds,
+    )
+    if retry_after is not None:
         raise HTTPException(
             status_code=429,
             detail="Too many Run Code requests. Please wait and try again.",
+            headers={"Retry-After": str(retry_after)},
         )
 
 
@@ -797,6 +805,15 @@ def _run_out(run: CodingRun, *, problem_id: int, job_id: int | None = None) -> R
                 stderr=(str(item["stderr"]) if item.get("stderr") else None),
             )
         )
+    progress = None
+    live = latest_progress(job_id) if job_id else None
+    if live is not None and not live.finished:
+        progress = RunProgressOut(
+            provider_status=live.provider_status,
+            cases_started=live.cases_started,
+            total_cases=live.total_cases,
+            updated_at=live.updated_at,
+        )
     return RunOut(
         id=run.id,
         job_id=job_id,
@@ -811,6 +828,7 @@ def _run_out(run: CodingRun, *, problem_id: int, job_id: int | None = None) -> R
         execution_time_ms=run.execution_time_ms,
         memory_used_kb=run.memory_used_kb,
         cases=cases,
+        progress=progress,
         created_at=run.created_at,
     )
 
@@ -824,7 +842,6 @@ async def enqueue_run(db: AsyncSession, user: User, body: RunCreateRequest) -> R
             await mark_expired_if_needed(db, attempt)
         raise HTTPException(status_code=409, detail="Cannot run code for this attempt state.")
 
-    await _assert_run_rate_limit(db, user.id)
     ap = await _resolve_attempt_problem_version(db, attempt, body.problem_id)
 
     lang = body.language_code.strip().lower()
@@ -856,6 +873,8 @@ async def enqueue_run(db: AsyncSession, user: User, body: RunCreateRequest) -> R
         raise HTTPException(status_code=400, detail="Source code is empty.")
     if len(source.encode("utf-8")) > limits.max_source_bytes:
         raise HTTPException(status_code=413, detail="Source code exceeds maximum allowed size.")
+    # Only requests that would actually queue work spend the budget.
+    await _assert_run_rate_limit(user.id)
 
     run = CodingRun(
         student_id=user.id,
@@ -890,6 +909,28 @@ async def enqueue_run(db: AsyncSession, user: User, body: RunCreateRequest) -> R
 
 
 async def get_run(db: AsyncSession, user: User, run_id: int) -> RunOut:
+    out, _job = await _load_run(db, user, run_id)
+    return out
+
+
+def _stream_finished(execution_status: str, job: CodingJob | None) -> bool:
+    """True once no further worker events will arrive for this run / submission."""
+    if job is None:
+        return execution_status in (
+            ExecutionStatus.COMPLETED.value,
+            ExecutionStatus.SYSTEM_ERROR.value,
+        )
+    return job.status in (JobStatus.SUCCEEDED.value, JobStatus.DEAD.value)
+
+
+async def run_stream_state(db: AsyncSession, user: User, run_id: int) -> tuple[RunOut, bool]:
+    out, job = await _load_run(db, user, run_id)
+    return out, _stream_finished(out.execution_status, job)
+
+
+async def _load_run(
+    db: AsyncSession, user: User, run_id: int
+) -> tuple[RunOut, CodingJob | None]:
     ensure_student(user)
     run = (await db.execute(select(CodingRun).where(CodingRun.id == run_id))).scalar_one_or_none()
     if run is None or run.student_id != user.id:
@@ -913,23 +954,21 @@ async def get_run(db: AsyncSession, user: User, run_id: int) -> RunOut:
             .limit(1)
         )
     ).scalar_one_or_none()
-    return _run_out(run, problem_id=problem_id, job_id=job.id if job else None)
+    return _run_out(run, problem_id=problem_id, job_id=job.id if job else None), job
 
 
-async def _assert_submit_rate_limit(db: AsyncSession, student_id: int) -> None:
+async def _assert_submit_rate_limit(student_id: int) -> None:
     limits = get_coding_limits()
-    since = utcnow() - timedelta(seconds=limits.submit_rate_window_seconds)
-    count = (
-        await db.execute(
-            select(func.count())
-            .select_from(CodingSubmission)
-            .where(CodingSubmission.student_id == student_id, CodingSubmission.created_at >= since)
-        )
-    ).scalar_one()
-    if int(count or 0) >= limits.submit_rate_per_student:
+    retry_after = await get_rate_limit_store().hit(
+        f"coding:submit:{student_id}",
+        limit=limits.submit_rate_per_student,
+        window_seconds=limits.submit_rate_window_seconds,
+    )
+    if retry_after is not None:
         raise HTTPException(
             status_code=429,
             detail="Too many submissions. Please wait and try again.",
+            headers={"Retry-After": str(retry_after)},
         )
 
 
@@ -1032,7 +1071,6 @@ async def enqueue_submission(
             await mark_expired_if_needed(db, attempt)
         raise HTTPException(status_code=409, detail="Cannot submit for this attempt state.")
 
-    await _assert_submit_rate_limit(db, user.id)
     ap = await _resolve_attempt_problem_version(db, attempt, body.problem_id)
 
     lang = body.language_code.strip().lower()
@@ -1064,6 +1102,7 @@ async def enqueue_submission(
         raise HTTPException(status_code=400, detail="Source code is empty.")
     if len(source.encode("utf-8")) > limits.max_source_bytes:
         raise HTTPException(status_code=413, detail="Source code exceeds maximum allowed size.")
+    await _assert_submit_rate_limit(user.id)
 
     now = utcnow()
     sub = CodingSubmission(
@@ -1105,6 +1144,20 @@ async def enqueue_submission(
 
 
 async def get_submission(db: AsyncSession, user: User, submission_id: int) -> SubmissionOut:
+    out, _job = await _load_submission(db, user, submission_id)
+    return out
+
+
+async def submission_stream_state(
+    db: AsyncSession, user: User, submission_id: int
+) -> tuple[SubmissionOut, bool]:
+    out, job = await _load_submission(db, user, submission_id)
+    return out, _stream_finished(out.execution_status, job)
+
+
+async def _load_submission(
+    db: AsyncSession, user: User, submission_id: int
+) -> tuple[SubmissionOut, CodingJob | None]:
     ensure_student(user)
     sub = (
         await db.execute(select(CodingSubmission).where(CodingSubmission.id == submission_id))
@@ -1123,7 +1176,7 @@ async def get_submission(db: AsyncSession, user: User, submission_id: int) -> Su
             .limit(1)
         )
     ).scalar_one_or_none()
-    return await _submission_out(db, sub, job_id=job.id if job else None)
+    return await _submission_out(db, sub, job_id=job.id if job else None), job
 
 
 async def get_submission_analysis(
@@ -1193,56 +1246,79 @@ async def list_submissions(
     *,
     limit: int = 20,
     company_key: str | None = None,
+    verdict: str | None = None,
+    language_code: str | None = None,
+    submitted_from: datetime | None = None,
+    submitted_to: datetime | None = None,
+    cursor: str | None = None,
 ) -> SubmissionListOut:
-    """Past submissions for result revisit (newest first)."""
+    """Past submissions for result revisit (newest first, keyset-paginated).
+
+    One joined select of summary columns per page (no source code, no per-row lookups).
+    """
     ensure_student(user)
     lim = max(1, min(int(limit or 20), 50))
+    sub = CodingSubmission
     q = (
-        select(CodingSubmission)
-        .where(CodingSubmission.student_id == user.id)
-        .order_by(CodingSubmission.submitted_at.desc(), CodingSubmission.id.desc())
-        .limit(lim)
+        select(
+            sub.id,
+            sub.attempt_id,
+            sub.assessment_id,
+            sub.problem_id,
+            sub.language_code,
+            sub.execution_status,
+            sub.verdict,
+            sub.analysis_status,
+            sub.score,
+            sub.submitted_at,
+            CodingAssessment.slug.label("assessment_slug"),
+            CodingAssessment.title.label("assessment_title"),
+            CodingAssessment.company_name,
+            CodingAssessment.role_name,
+            CodingProblemVersion.title.label("problem_title"),
+        )
+        .outerjoin(CodingAssessment, CodingAssessment.id == sub.assessment_id)
+        .outerjoin(CodingProblemVersion, CodingProblemVersion.id == sub.problem_version_id)
+        .where(sub.student_id == user.id)
+        .order_by(sub.submitted_at.desc(), sub.id.desc())
+        .limit(lim + 1)
     )
     key = (company_key or "").strip().lower() or None
     if key:
-        q = (
-            select(CodingSubmission)
-            .join(CodingAssessment, CodingAssessment.id == CodingSubmission.assessment_id)
-            .where(
-                CodingSubmission.student_id == user.id,
-                func.lower(CodingAssessment.company_key) == key,
-            )
-            .order_by(CodingSubmission.submitted_at.desc(), CodingSubmission.id.desc())
-            .limit(lim)
-        )
-    rows = list((await db.execute(q)).scalars().all())
-    items: list[SubmissionSummaryOut] = []
-    for sub in rows:
-        assessment = (
-            await db.execute(select(CodingAssessment).where(CodingAssessment.id == sub.assessment_id))
-        ).scalar_one_or_none()
-        version = (
-            await db.execute(
-                select(CodingProblemVersion).where(CodingProblemVersion.id == sub.problem_version_id)
-            )
-        ).scalar_one_or_none()
-        items.append(
-            SubmissionSummaryOut(
-                id=sub.id,
-                attempt_id=sub.attempt_id,
-                assessment_id=sub.assessment_id,
-                assessment_slug=assessment.slug if assessment else None,
-                assessment_title=assessment.title if assessment else None,
-                problem_id=sub.problem_id,
-                problem_title=version.title if version else None,
-                company_name=assessment.company_name if assessment else None,
-                role_name=assessment.role_name if assessment else None,
-                language_code=sub.language_code,
-                execution_status=sub.execution_status,
-                verdict=sub.verdict,
-                analysis_status=sub.analysis_status,
-                official_score=float(sub.score) if sub.score is not None else None,
-                submitted_at=sub.submitted_at,
-            )
+        q = q.where(func.lower(CodingAssessment.company_key) == key)
+    verdict_filter = (verdict or "").strip().lower() or None
+    if verdict_filter:
+        q = q.where(sub.verdict == verdict_filter)
+    lang = (language_code or "").strip().lower() or None
+    if lang:
+        q = q.where(sub.language_code == lang)
+    if submitted_from is not None:
+        q = q.where(sub.submitted_at >= submitted_from)
+    if submitted_to is not None:
+        q = q.where(sub.submitted_at < submitted_to)
+    if cursor:
+        q = q.where(keyset_before(sub.submitted_at, sub.id, cursor))
+    rows = list((await db.execute(q)).all())
+    items = [
+        SubmissionSummaryOut(
+            id=r.id,
+            attempt_id=r.attempt_id,
+            assessment_id=r.assessment_id,
+            assessment_slug=r.assessment_slug,
+            assessment_title=r.assessment_title,
+            problem_id=r.problem_id,
+            problem_title=r.problem_title,
+            company_name=r.company_name,
+            role_name=r.role_name,
+            language_code=r.language_code,
+            execution_status=r.execution_status,
+            verdict=r.verdict,
+            analysis_status=r.analysis_status,
+            official_score=float(r.score) if r.score is not None else None,
+            submitted_at=r.submitted_at,
         )
-    return SubmissionListOut(items=items)
+        for r in rows[:lim]
+    ]
+    return SubmissionListOut(
+        items=items, next_cursor=next_cursor_for(rows, lim, created_attr="submitted_at")
+    )
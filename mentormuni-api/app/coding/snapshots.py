@@ -0,0 +1,146 @@
+"""
+Memoized attempt snapshots (the frozen problem/version list written on start).
+
+``_build_snapshot_payload`` used to run two queries per linked problem on every start;
+when a whole class starts the same assessment at once the identical snapshot was built
+hundreds of times. Now a start issues one small *stamp* query — per link: link id,
+order, points, problem status and ``current_version_id`` (integers only, no version
+text) — and reuses the cached payload when the stamp and the assessment's
+``updated_at`` are unchanged. A miss loads links, problems and versions in one joined
+query.
+
+Publishing a problem moves ``current_version_id`` / status and changing an assessment's
+links changes the link rows, so every API process notices on its next start; the
+publishing process additionally calls ``invalidate_snapshots``.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.coding.models import CodingAssessmentProblem, CodingProblem, CodingProblemVersion
+from app.coding.schemas import AttemptSnapshotPayload
+
+# Assessments whose snapshot is kept per process.
+SNAPSHOT_CACHE_MAX_ENTRIES = 256
+
+# (link id, problem id, order_index, points, problem status, current_version_id)
+StampRow = tuple[int, int, int, float, Optional[str], Optional[int]]
+
+
+@dataclass(frozen=True)
+class SnapshotKey:
+    assessment_id: int
+    assessment_updated_at: Optional[datetime]
+    links: tuple[StampRow, ...]
+
+
+@dataclass(frozen=True)
+class CachedSnapshot:
+    payload: AttemptSnapshotPayload
+    # model_dump(mode="json") of the payload, stored on coding_attempt_snapshots.
+    snapshot_json: dict[str, Any]
+
+
+async def snapshot_key(db: AsyncSession, assessment: Any) -> SnapshotKey:
+    link = CodingAssessmentProblem
+    rows = (
+        await db.execute(
+            select(
+                link.id,
+                link.problem_id,
+                link.order_index,
+                link.points,
+                CodingProblem.status,
+                CodingProblem.current_version_id,
+            )
+            .outerjoin(CodingProblem, CodingProblem.id == link.problem_id)
+            .where(link.assessment_id == assessment.id)
+            .order_by(link.order_index.asc(), link.id.asc())
+        )
+    ).all()
+    return SnapshotKey(
+        assessment_id=assessment.id,
+        assessment_updated_at=assessment.updated_at,
+        links=tuple(
+            (int(r[0]), int(r[1]), int(r[2] or 0), float(r[3]), r[4], r[5]) for r in rows
+        ),
+    )
+
+
+async def snapshot_rows(
+    db: AsyncSession, assessment_id: int
+) -> list[tuple[CodingAssessmentProblem, Optional[CodingProblem], Optional[CodingProblemVersion]]]:
+    """(link, problem, current version) per link in snapshot order, one query."""
+    link = CodingAssessmentProblem
+    rows = (
+        await db.execute(
+            select(link, CodingProblem, CodingProblemVersion)
+            .outerjoin(CodingProblem, CodingProblem.id == link.problem_id)
+            .outerjoin(
+                CodingProblemVersion,
+                CodingProblemVersion.id == CodingProblem.current_version_id,
+            )
+            .where(link.assessment_id == assessment_id)
+            .order_by(link.order_index.asc(), link.id.asc())
+        )
+    ).all()
+    return [(r[0], r[1], r[2]) for r in rows]
+
+
+class SnapshotCache:
+    def __init__(self, *, max_entries: int = SNAPSHOT_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[SnapshotKey, CachedSnapshot]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def get(self, key: SnapshotKey) -> Optional[CachedSnapshot]:
+        entry = self._entries.get(key.assessment_id)
+        if entry is None or entry[0] != key:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key.assessment_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: SnapshotKey, payload: AttemptSnapshotPayload) -> CachedSnapshot:
+        cached = CachedSnapshot(payload=payload, snapshot_json=payload.model_dump(mode="json"))
+        if self.max_entries <= 0:
+            return cached
+        self._entries[key.assessment_id] = (key, cached)
+        self._entries.move_to_end(key.assessment_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return cached
+
+    def invalidate(self, assessment_id: Optional[int] = None) -> None:
+        if assessment_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(assessment_id, None)
+
+
+_cache: Optional[SnapshotCache] = None
+
+
+def get_snapshot_cache() -> SnapshotCache:
+    global _cache
+    if _cache is None:
+        _cache = SnapshotCache()
+    return _cache
+
+
+def invalidate_snapshots(assessment_id: Optional[int] = None) -> None:
+    """Drop cached snapshots in this process (others notice via the stamp)."""
+    if _cache is not None:
+        _cache.invalidate(assessment_id)
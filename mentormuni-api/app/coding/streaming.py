@@ -0,0 +1,228 @@
+"""
+Server-sent events for run / submission status (replaces client polling).
+
+``ProgressHub`` holds one ``LISTEN coding_progress`` connection per API process and
+fans worker NOTIFY payloads (see ``app.coding.jobs.progress``) out to in-process
+subscribers keyed by ``(kind, id)``. It starts on the first subscriber and reconnects
+with backoff if the connection drops.
+
+``event_stream`` is the SSE body for one run or submission:
+
+- ``snapshot`` — the current RunOut / SubmissionOut, sent right after subscribing (so no
+  event between subscribe and first read is lost);
+- ``progress`` — per-test provider progress from the worker;
+- ``done`` — the final RunOut / SubmissionOut, re-read once the worker committed it;
+  the stream then closes.
+
+Every ``coding_stream_keepalive_seconds`` without events the stream re-reads the row
+(covers a missed NOTIFY) and sends a comment line to keep proxies from timing out.
+Streams close after ``coding_stream_max_seconds``; EventSource reconnects on its own.
+``GET /coding/runs/{id}`` and ``GET /coding/submissions/{id}`` remain for polling clients.
+The request's own session is released before the stream starts (``stream_response``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.coding.jobs.progress import PROGRESS_CHANNEL, JobProgress, publish_progress
+from app.core.config import settings
+
+logger = logging.getLogger("coding.streaming")
+
+SUBSCRIBER_QUEUE_SIZE = 64
+RECONNECT_MAX_SECONDS = 30.0
+
+# Returns (payload, finished) for one run / submission, read in a fresh session.
+SnapshotLoader = Callable[[], Awaitable[tuple[BaseModel, bool]]]
+
+
+def _parse_ts(value: Any) -> datetime:
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return datetime.now(timezone.utc)
+
+
+class ProgressHub:
+    def __init__(self, channel: str = PROGRESS_CHANNEL) -> None:
+        self.channel = channel
+        self._subscribers: dict[tuple[str, int], set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+        self.delivered = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "streams": sum(len(qs) for qs in self._subscribers.values()),
+            "delivered": self.delivered,
+        }
+
+    def subscribe(self, kind: str, target_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault((kind, target_id), set()).add(queue)
+        self._ensure_listener()
+        return queue
+
+    def unsubscribe(self, kind: str, target_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get((kind, target_id))
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[(kind, target_id)]
+
+    def dispatch(self, raw: str) -> None:
+        try:
+            event = json.loads(raw)
+            key = (str(event["kind"]), int(event["id"]))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("coding_progress_bad_payload %r", raw[:200])
+            return
+        if event.get("job_id"):
+            # Keeps GET /runs/{id} progress current in this process as well.
+            publish_progress(
+                JobProgress(
+                    job_id=int(event["job_id"]),
+                    kind=key[0],
+                    target_id=key[1],
+                    provider_status=event.get("provider_status"),
+                    cases_started=int(event.get("cases_started") or 0),
+                    total_cases=int(event.get("total_cases") or 0),
+                    finished=event.get("event") == "done",
+                    updated_at=_parse_ts(event.get("updated_at")),
+                )
+            )
+        for queue in self._subscribers.get(key, ()):
+            if queue.full():
+                # A slow client only needs the newest state.
+                queue.get_nowait()
+            queue.put_nowait(event)
+            self.delivered += 1
+
+    def _ensure_listener(self) -> None:
+        if self._task is None or self._task.done():
+            if not settings.is_database_configured:
+                return
+            self._task = asyncio.create_task(self._listen(), name="coding-progress-hub")
+
+    async def _listen(self) -> None:
+        from app.common.database.session import get_engine
+
+        backoff = 1.0
+        while True:
+            try:
+                async with get_engine().connect() as conn:
+                    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+
+                    def _on_notify(_conn: Any, _pid: int, _channel: str, payload: str) -> None:
+                        self.dispatch(payload)
+
+                    await driver.add_listener(self.channel, _on_notify)
+                    self.connected = True
+                    backoff = 1.0
+                    try:
+                        while not driver.is_closed():
+                            await asyncio.sleep(5.0)
+                    finally:
+                        self.connected = False
+                        if not driver.is_closed():
+                            await driver.remove_listener(self.channel, _on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("coding_progress_hub_disconnected", exc_info=True)
+            await asyncio.sleep(backoff)
+            backoff = min(RECONNECT_MAX_SECONDS, backoff * 2)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+
+hub = ProgressHub()
+
+
+def sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+async def event_stream(kind: str, target_id: int, load: SnapshotLoader) -> AsyncIterator[str]:
+    queue = hub.subscribe(kind, target_id)
+    try:
+        snapshot, finished = await load()
+        yield sse("snapshot", snapshot.model_dump(mode="json"))
+        if finished:
+            yield sse("done", snapshot.model_dump(mode="json"))
+            return
+        deadline = time.monotonic() + settings.coding_stream_max_seconds
+        keepalive = settings.coding_stream_keepalive_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=min(keepalive, remaining))
+            except asyncio.TimeoutError:
+                snapshot, finished = await load()
+                if finished:
+                    yield sse("done", snapshot.model_dump(mode="json"))
+                    return
+                yield ": keepalive\n\n"
+                continue
+            if event.get("event") == "done":
+                snapshot, _finished = await load()
+                yield sse("done", snapshot.model_dump(mode="json"))
+                return
+            yield sse("progress", event)
+    finally:
+        hub.unsubscribe(kind, target_id, queue)
+
+
+async def stream_response(
+    db: AsyncSession,
+    kind: str,
+    target_id: int,
+    state: Callable[[Any, Any, int], Awaitable[tuple[BaseModel, bool]]],
+    user: Any,
+) -> StreamingResponse:
+    """SSE response; each snapshot read uses its own short session (none held open).
+
+    ``db`` is the request session (``get_db``, also behind ``require_roles``). FastAPI
+    only runs its cleanup after the streamed body ends, so it is committed and closed
+    here — otherwise every open stream would pin a pooled connection idle in
+    transaction for up to ``coding_stream_max_seconds``.
+    """
+    from app.common.database.session import async_session_factory
+
+    await db.commit()
+    await db.close()
+
+    async def load() -> tuple[BaseModel, bool]:
+        async with async_session_factory()() as session:
+            return await state(session, user, target_id)
+
+    return StreamingResponse(
+        event_stream(kind, target_id, load),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,229 @@
+"""
+Concurrent generation of a whole curriculum into one ``CodingGenerationRun``.
+
+``CodingBankService.generate_slot`` handles one slot at a time, so filling a curriculum
+was sequential. ``BatchGenerationRunner``:
+
+- reads the bank once into a ``ReferenceIndex`` and appends each persisted problem to it,
+  so avoid-lists and duplicate checks see sibling slots without re-querying; the duplicate
+  check only scores the index's LSH candidates, not the whole bank;
+- generates and validates up to ``concurrency`` slots at once, spending at most
+  ``max_llm_calls`` generation calls per invocation;
+- validates with the injected executor — use ``sandboxed_reference_executor()`` to run
+  references on the student execution provider (Judge0) instead of the static-only
+  default;
+- checkpoints each finished slot under ``config_json["progress"]`` and commits, so a
+  crashed or budget-limited run resumes where it stopped (finished slots are skipped,
+  failed ones retried);
+- on a database error in any slot, cancels the sibling slots and rolls back, so nothing
+  keeps writing to a failed session; already checkpointed slots stay committed.
+
+Persistence stays on the service's synchronous ``Session``; only LLM and executor calls
+overlap. CLI: ``python ../scripts/generate_curriculum.py`` (from ``mentormuni-api/``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.coding.enums import GenerationRunStatus
+from app.coding.models import CodingGenerationRun
+from app.coding_bank.curriculum import GenerationSpec, curriculum_from_override
+from app.coding_bank.generator import GenerationError
+from app.coding_bank.schemas import GeneratedProblemContract
+from app.coding_bank.service import CodingBankService
+from app.coding_bank.validators.duplicate import ExistingProblemRef, content_fingerprint
+from app.coding_bank.validators.reference import ProviderReferenceExecutor
+from app.coding_bank.validators.similarity import InMemorySimilarityIndex
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = "progress"
+BUDGET_EXHAUSTED = "llm_budget_exhausted"
+
+
+def sandboxed_reference_executor() -> ProviderReferenceExecutor:
+    """Reference executor on the configured student execution provider."""
+    from app.coding.execution.factory import get_code_execution_service
+
+    return ProviderReferenceExecutor(get_code_execution_service().provider)
+
+
+@dataclass
+class SlotOutcome:
+    slot_id: str
+    problem_id: Optional[int] = None
+    passed: bool = False
+    error: Optional[str] = None
+
+
+def _fingerprint(contract: GeneratedProblemContract) -> str:
+    return content_fingerprint(
+        contract.title, contract.problem_statement, contract.primary_topic(), contract.primary_pattern()
+    )
+
+
+class ReferenceIndex:
+    """Existing problems for avoid-lists and duplicate checks, extended in memory."""
+
+    def __init__(self, refs: list[ExistingProblemRef], slugs: set[str]) -> None:
+        self.similar = InMemorySimilarityIndex(refs)
+        self.slugs = set(slugs)
+
+    @classmethod
+    def load(cls, service: CodingBankService) -> "ReferenceIndex":
+        return cls(service.list_existing_refs(), service.list_slugs())
+
+    def titles(self) -> list[str]:
+        return [r.title for r in self.similar.refs()]
+
+    def candidates(self, contract: GeneratedProblemContract) -> Iterator[ExistingProblemRef]:
+        """Near-duplicate candidates for ``contract``, looked up when first iterated.
+
+        Lazy on purpose: the duplicate step runs after validation's awaits, so the lookup
+        also sees problems that sibling slots persisted in the meantime.
+        """
+        yield from self.similar.candidates(
+            contract.title, contract.problem_statement, fingerprint=_fingerprint(contract)
+        )
+
+    def add(self, problem_id: int, contract: GeneratedProblemContract) -> None:
+        self.slugs.add(contract.slug)
+        self.similar.add(
+            ExistingProblemRef(
+                id=problem_id,
+                title=contract.title,
+                statement=contract.problem_statement,
+                topic=contract.primary_topic(),
+                pattern=contract.primary_pattern(),
+                constraints=contract.constraints,
+                fingerprint=_fingerprint(contract),
+            )
+        )
+
+
+class BatchGenerationRunner:
+    def __init__(
+        self,
+        service: CodingBankService,
+        *,
+        concurrency: int = 4,
+        max_llm_calls: Optional[int] = None,
+        commit: bool = True,
+    ) -> None:
+        self.service = service
+        self.concurrency = max(1, concurrency)
+        self.max_llm_calls = max_llm_calls
+        self.commit = commit
+        self.llm_calls = 0
+
+    def _take_llm_call(self) -> bool:
+        if self.max_llm_calls is not None and self.llm_calls >= self.max_llm_calls:
+            return False
+        self.llm_calls += 1
+        return True
+
+    @staticmethod
+    def progress(run: CodingGenerationRun) -> dict[str, Any]:
+        return dict((run.config_json or {}).get(PROGRESS_KEY) or {})
+
+    def _checkpoint(self, run: CodingGenerationRun, outcome: SlotOutcome) -> None:
+        config = dict(run.config_json or {})
+        progress = dict(config.get(PROGRESS_KEY) or {})
+        done = dict(progress.get("done") or {})
+        failed = dict(progress.get("failed") or {})
+        if outcome.error is None:
+            done[outcome.slot_id] = {"problem_id": outcome.problem_id, "passed": outcome.passed}
+            failed.pop(outcome.slot_id, None)
+        else:
+            failed[outcome.slot_id] = outcome.error[:500]
+            run.last_error = f"slot {outcome.slot_id}: {outcome.error[:200]}"
+        progress["done"] = done
+        progress["failed"] = failed
+        progress["llm_calls"] = int(progress.get("llm_calls") or 0) + 1
+        config[PROGRESS_KEY] = progress
+        # Reassign: config_json is plain JSONB (in-place edits are not tracked).
+        run.config_json = config
+        self.service.db.flush()
+        if self.commit:
+            self.service.db.commit()
+
+    async def run(
+        self, run: CodingGenerationRun, specs: Optional[list[GenerationSpec]] = None
+    ) -> list[SlotOutcome]:
+        """Generate every unfinished slot of ``run``; returns this invocation's outcomes."""
+        specs = specs if specs is not None else curriculum_from_override(run.config_json).specs
+        done = self.progress(run).get("done") or {}
+        pending = [s for s in specs if s.slot_id not in done]
+        if run.status != GenerationRunStatus.RUNNING.value:
+            run.status = GenerationRunStatus.RUNNING.value
+            run.started_at = run.started_at or datetime.now(timezone.utc)
+            run.completed_at = None
+        index = ReferenceIndex.load(self.service)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(spec: GenerationSpec) -> SlotOutcome:
+            async with semaphore:
+                try:
+                    outcome = await self._generate(run, spec, index)
+                except SQLAlchemyError:
+                    raise
+                except Exception as exc:  # noqa: BLE001 — one bad slot must not sink the batch
+                    logger.exception("coding_bank_batch_slot_failed slot=%s", spec.slot_id)
+                    outcome = SlotOutcome(spec.slot_id, error=f"{type(exc).__name__}: {exc}")
+            if outcome.error != BUDGET_EXHAUSTED:
+                self._checkpoint(run, outcome)
+            return outcome
+
+        tasks = [asyncio.create_task(one(spec)) for spec in pending]
+        try:
+            outcomes = list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.service.db.rollback()
+            raise
+        finished = self.progress(run).get("done") or {}
+        if all(s.slot_id in finished for s in specs):
+            self.service.complete_run(run)
+        elif not any(o.error == BUDGET_EXHAUSTED for o in outcomes):
+            self.service.complete_run(run, failed=True)
+        # else: left RUNNING — resume with a fresh budget.
+        if self.commit:
+            self.service.db.commit()
+        logger.info(
+            "coding_bank_batch run_id=%s slots=%s done=%s llm_calls=%s",
+            run.id,
+            len(specs),
+            len(finished),
+            self.llm_calls,
+        )
+        return outcomes
+
+    async def _generate(
+        self, run: CodingGenerationRun, spec: GenerationSpec, index: ReferenceIndex
+    ) -> SlotOutcome:
+        if not self._take_llm_call():
+            return SlotOutcome(spec.slot_id, error=BUDGET_EXHAUSTED)
+        try:
+            contract = await self.service.generator.generate_one(
+                spec, avoid_titles=index.titles(), avoid_slugs=sorted(index.slugs)
+            )
+        except GenerationError as exc:
+            return SlotOutcome(spec.slot_id, error=f"generation failed: {exc}")
+        _c, report = await self.service.validator.validate(
+            contract, existing=index.candidates(contract)
+        )
+        if contract.slug in index.slugs:
+            return SlotOutcome(spec.slot_id, error=f"slug already exists: {contract.slug}")
+        problem = self.service.record_validated(contract, report, run=run)
+        index.add(problem.id, contract)
+        return SlotOutcome(spec.slot_id, problem_id=problem.id, passed=report.ok)
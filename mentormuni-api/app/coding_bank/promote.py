@@ -13,6 +13,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.coding.enums import ProblemStatus, ValidationVerdict
+from app.coding.jobs.testcase_cache import invalidate_version as invalidate_test_case_bundle
 from app.coding.models import (
     CodingProblem,
     CodingProblemVersion,
@@ -20,8 +21,10 @@ from app.coding.models import (
     CodingTestCase,
     CodingValidationResult,
 )
+from app.coding.snapshots import invalidate_snapshots
 from app.coding_bank.lifecycle import LifecycleError, assert_transition, can_publish
 from app.coding_bank.schemas import GeneratedProblemContract
+from app.coding_bank.similarity_index import index_current_version, index_problem, remove_problem
 from app.coding_bank.validators.duplicate import content_fingerprint
 from app.coding_bank.validators.types import ValidationReport
 
@@ -111,6 +114,7 @@ def persist_generated_problem(
 
     problem.current_version_id = version.id
     db.flush()
+    index_problem(db, problem.id, contract.title, contract.problem_statement)
     return problem, version
 
 
@@ -134,6 +138,7 @@ def apply_canonical_outputs(
         if key in canonical_outputs:
             case.expected_output = canonical_outputs[key]
     db.flush()
+    invalidate_test_case_bundle(version.id)
 
 
 def record_validation(
@@ -205,8 +210,23 @@ def promote_to_published(db: Session, problem: CodingProblem) -> CodingProblem:
 
     assert_transition(problem.status, ProblemStatus.PUBLISHED)
     problem.status = ProblemStatus.PUBLISHED.value
+    # published_at is part of the worker test-case bundle stamp: bumping it invalidates
+    # cached bundles everywhere; the call below also drops this process's copy.
     problem.published_at = _utcnow()
     db.flush()
+    index_current_version(db, problem)
+    invalidate_test_case_bundle(problem.current_version_id)
+    invalidate_snapshots()
+    return problem
+
+
+def archive_problem(db: Session, problem: CodingProblem) -> CodingProblem:
+    """Retire a problem: hidden from students and dropped from the duplicate index."""
+    assert_transition(problem.status, ProblemStatus.ARCHIVED)
+    problem.status = ProblemStatus.ARCHIVED.value
+    db.flush()
+    remove_problem(db, problem.id)
+    invalidate_snapshots()
     return problem
 
 
@@ -253,6 +273,7 @@ def create_new_draft_version_from_approved(
     db.add(version)
     db.flush()
     problem.current_version_id = version.id
+    index_problem(db, problem.id, contract.title, contract.problem_statement)
     return version
 
 
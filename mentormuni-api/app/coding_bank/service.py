@@ -6,6 +6,7 @@ generation after pipeline review.
 
 from __future__ import annotations
 
+import hashlib
 from datetime import datetime, timezone
 from typing import Any, Optional
 
@@ -25,6 +26,7 @@ from app.coding_bank.generator import CodingProblemGenerator, GenerationError
 from app.coding_bank.promote import (
     apply_canonical_outputs,
     approve_problem,
+    archive_problem,
     attach_relevance,
     mark_validating,
     mark_validation_outcome,
@@ -34,6 +36,7 @@ from app.coding_bank.promote import (
     reject_problem,
 )
 from app.coding_bank.schemas import GeneratedProblemContract
+from app.coding_bank.similarity_index import avoid_lists, candidate_refs, refs_from_rows, refs_select
 from app.coding_bank.validators.duplicate import ExistingProblemRef
 from app.coding_bank.validators.pipeline import ProblemValidator
 from app.coding_bank.validators.reference import ReferenceExecutor
@@ -79,49 +82,40 @@ class CodingBankService:
         return run
 
     def list_existing_refs(self) -> list[ExistingProblemRef]:
-        rows = self.db.execute(
-            select(
-                CodingProblem.id,
-                CodingProblem.topic,
-                CodingProblem.pattern,
-                CodingProblem.content_fingerprint,
-                CodingProblemVersion.title,
-                CodingProblemVersion.description,
-                CodingProblemVersion.constraints_text,
-            )
-            .join(
-                CodingProblemVersion,
-                CodingProblemVersion.id == CodingProblem.current_version_id,
-                isouter=True,
-            )
-            .where(CodingProblem.status != ProblemStatus.ARCHIVED.value)
-        ).all()
-        out: list[ExistingProblemRef] = []
-        for r in rows:
-            if r.title is None:
-                continue
-            out.append(
-                ExistingProblemRef(
-                    id=r.id,
-                    title=r.title,
-                    statement=r.description or "",
-                    topic=r.topic,
-                    pattern=r.pattern,
-                    constraints=r.constraints_text,
-                    fingerprint=r.content_fingerprint,
-                )
-            )
-        return out
+        """Full scan of the bank; per-contract checks use ``candidate_refs`` instead."""
+        return refs_from_rows(self.db.execute(refs_select()).all())
+
+    def candidate_refs(self, contract: GeneratedProblemContract) -> list[ExistingProblemRef]:
+        return candidate_refs(self.db, contract)
+
+    def list_slugs(self) -> set[str]:
+        return set(self.db.scalars(select(CodingProblem.slug)).all())
+
+    def with_free_slug(self, contract: GeneratedProblemContract) -> GeneratedProblemContract:
+        """Suffix ``contract.slug`` if any problem already has it (as practice auto-publish does).
+
+        The generator's avoid-list only covers recent same-topic problems, so the slug is
+        checked bank-wide here with one unique-index lookup.
+        """
+        taken = self.db.scalar(select(CodingProblem.id).where(CodingProblem.slug == contract.slug).limit(1))
+        if taken is None:
+            return contract
+        suffix = hashlib.sha1(contract.problem_statement.encode()).hexdigest()[:6]
+        return contract.model_copy(update={"slug": f"{contract.slug}-{suffix}"})
 
     async def ingest_and_validate(
         self,
         contract: GeneratedProblemContract,
         *,
+        existing: list[ExistingProblemRef] | None = None,
         generation_run_id: int | None = None,
         prompt_version: str = PROMPT_VERSION,
         generation_model: str | None = None,
     ) -> tuple[CodingProblem, Any]:
         """Persist as GENERATED, run validation pipeline, move to pending_review or validation_failed."""
+        if existing is None:
+            # Before persisting, so the problem is not its own duplicate candidate.
+            existing = self.candidate_refs(contract)
         problem, version = persist_generated_problem(
             self.db,
             contract,
@@ -131,35 +125,69 @@ class CodingBankService:
             status=ProblemStatus.GENERATED.value,
         )
         mark_validating(self.db, problem)
-        _c, report = await self.validator.validate(contract, existing=self.list_existing_refs())
+        _c, report = await self.validator.validate(contract, existing=existing)
+        self._record_outcome(problem, version, report, generation_run_id=generation_run_id)
+        return problem, report
+
+    def record_validated(
+        self,
+        contract: GeneratedProblemContract,
+        report: Any,
+        *,
+        run: CodingGenerationRun,
+    ) -> CodingProblem:
+        """Persist a contract validated before persistence (batch runner); same end state."""
+        problem, version = persist_generated_problem(
+            self.db,
+            contract,
+            generation_run_id=run.id,
+            prompt_version=run.prompt_version,
+            generation_model=run.model,
+            status=ProblemStatus.GENERATED.value,
+        )
+        mark_validating(self.db, problem)
+        self._record_outcome(problem, version, report, generation_run_id=run.id)
+        run.generated_count = int(run.generated_count or 0) + 1
+        self.db.flush()
+        return problem
+
+    def _record_outcome(
+        self,
+        problem: CodingProblem,
+        version: CodingProblemVersion,
+        report: Any,
+        *,
+        generation_run_id: int | None,
+    ) -> None:
         record_validation(self.db, problem, version, report, generation_run_id=generation_run_id)
         if report.ok and report.canonical_outputs:
             apply_canonical_outputs(self.db, version, report.canonical_outputs)
         mark_validation_outcome(self.db, problem, passed=report.ok)
-        return problem, report
 
     async def generate_slot(
         self,
         run: CodingGenerationRun,
         spec: GenerationSpec,
     ) -> CodingProblem:
-        """Generate one curriculum slot. Requires configured OpenAI client — not for auto-batch yet."""
+        """Generate one curriculum slot. Requires configured OpenAI client.
+
+        For whole curricula use ``app.coding_bank.batch.BatchGenerationRunner``.
+        """
         if run.status == GenerationRunStatus.PENDING.value:
             run.status = GenerationRunStatus.RUNNING.value
             run.started_at = datetime.now(timezone.utc)
-        avoid_titles = [r.title for r in self.list_existing_refs()]
-        avoid_slugs = [
-            s for s in self.db.scalars(select(CodingProblem.slug)).all()
-        ]
+        avoid_titles, avoid_slugs = avoid_lists(self.db, spec.topic)
         try:
             contract = await self.generator.generate_one(
-                spec, avoid_titles=avoid_titles, avoid_slugs=avoid_slugs
+                spec,
+                avoid_titles=avoid_titles,
+                avoid_slugs=avoid_slugs,
             )
         except GenerationError:
             run.last_error = f"slot {spec.slot_id} generation failed"
             raise
         problem, _report = await self.ingest_and_validate(
-            contract,
+            self.with_free_slug(contract),
             generation_run_id=run.id,
             prompt_version=run.prompt_version,
             generation_model=run.model,
@@ -186,6 +214,12 @@ class CodingBankService:
             raise ValueError("problem not found")
         return promote_to_published(self.db, problem)
 
+    def archive(self, problem_id: int) -> CodingProblem:
+        problem = self.db.get(CodingProblem, problem_id)
+        if problem is None:
+            raise ValueError("problem not found")
+        return archive_problem(self.db, problem)
+
     def add_relevance(self, problem_id: int, **kwargs: Any) -> Any:
         return attach_relevance(self.db, problem_id, **kwargs)
 
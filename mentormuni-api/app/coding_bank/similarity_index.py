@@ -0,0 +1,134 @@
+"""Persistent duplicate-candidate index for the question bank.
+
+Every non-archived problem has its LSH band keys (``validators.similarity``) in
+``coding_problem_lsh_bands``; ``content_fingerprint`` on ``coding_problems`` is the exact
+map. A lookup is one indexed select: problems sharing a band key or the fingerprint. The
+unchanged ``DuplicateDetector`` then scores only those candidates, instead of every row
+in the bank.
+
+Maintained on write: ``persist_generated_problem`` and the practice auto-publish index a
+problem, publishing re-indexes its current version, archiving removes it.
+
+Functions take a sync ``Session``; async callers use ``await db.run_sync(fn, ...)`` or
+execute the ``*_select`` statements directly.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import Select, delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.coding.enums import ProblemStatus
+from app.coding.models import CodingProblem, CodingProblemLshBand, CodingProblemVersion
+from app.coding_bank.schemas import GeneratedProblemContract
+from app.coding_bank.validators.duplicate import ExistingProblemRef, content_fingerprint
+from app.coding_bank.validators.similarity import problem_band_keys
+
+# Same-topic titles sent to the generator as "do not repeat" hints.
+AVOID_LIST_LIMIT = 200
+
+
+def refs_select() -> Select[Any]:
+    return (
+        select(
+            CodingProblem.id,
+            CodingProblem.topic,
+            CodingProblem.pattern,
+            CodingProblem.content_fingerprint,
+            CodingProblemVersion.title,
+            CodingProblemVersion.description,
+            CodingProblemVersion.constraints_text,
+        )
+        .join(
+            CodingProblemVersion,
+            CodingProblemVersion.id == CodingProblem.current_version_id,
+            isouter=True,
+        )
+        .where(CodingProblem.status != ProblemStatus.ARCHIVED.value)
+    )
+
+
+def refs_from_rows(rows: Iterable[Any]) -> list[ExistingProblemRef]:
+    out: list[ExistingProblemRef] = []
+    for r in rows:
+        if not r.title:
+            continue
+        out.append(
+            ExistingProblemRef(
+                id=r.id,
+                title=r.title,
+                statement=r.description or "",
+                topic=r.topic,
+                pattern=r.pattern,
+                constraints=r.constraints_text,
+                fingerprint=r.content_fingerprint,
+            )
+        )
+    return out
+
+
+def candidates_select(title: str, statement: str, fingerprint: Optional[str]) -> Select[Any]:
+    keys = sorted(set(problem_band_keys(title, statement)))
+    in_bucket = select(CodingProblemLshBand.problem_id).where(CodingProblemLshBand.band_key.in_(keys))
+    match = CodingProblem.id.in_(in_bucket)
+    if fingerprint:
+        match = or_(match, CodingProblem.content_fingerprint == fingerprint)
+    return refs_select().where(match).order_by(CodingProblem.id.asc())
+
+
+def contract_candidates_select(contract: GeneratedProblemContract) -> Select[Any]:
+    fp = content_fingerprint(
+        contract.title, contract.problem_statement, contract.primary_topic(), contract.primary_pattern()
+    )
+    return candidates_select(contract.title, contract.problem_statement, fp)
+
+
+def candidate_refs(db: Session, contract: GeneratedProblemContract) -> list[ExistingProblemRef]:
+    """Existing problems that may duplicate ``contract`` (superset of detector hits)."""
+    return refs_from_rows(db.execute(contract_candidates_select(contract)).all())
+
+
+def avoid_select(topic: str, *, limit: int = AVOID_LIST_LIMIT) -> Select[Any]:
+    return (
+        select(CodingProblem.slug, CodingProblemVersion.title)
+        .join(CodingProblemVersion, CodingProblemVersion.id == CodingProblem.current_version_id)
+        .where(CodingProblem.status != ProblemStatus.ARCHIVED.value)
+        .where(func.lower(CodingProblem.topic) == topic.strip().lower())
+        .order_by(CodingProblem.id.desc())
+        .limit(limit)
+    )
+
+
+def avoid_lists_from_rows(rows: Iterable[Any]) -> tuple[list[str], list[str]]:
+    rows = list(rows)
+    return [r.title for r in rows if r.title], [r.slug for r in rows]
+
+
+def avoid_lists(db: Session, topic: str, *, limit: int = AVOID_LIST_LIMIT) -> tuple[list[str], list[str]]:
+    """(titles, slugs) of the most recent same-topic problems, for generator prompts."""
+    return avoid_lists_from_rows(db.execute(avoid_select(topic, limit=limit)).all())
+
+
+def index_problem(db: Session, problem_id: int, title: str, statement: str) -> None:
+    """(Re)write the band keys of one problem."""
+    remove_problem(db, problem_id)
+    keys = sorted(set(problem_band_keys(title, statement)))
+    if keys:
+        db.execute(
+            insert(CodingProblemLshBand),
+            [{"problem_id": problem_id, "band_key": k} for k in keys],
+        )
+
+
+def index_current_version(db: Session, problem: CodingProblem) -> None:
+    version = db.get(CodingProblemVersion, problem.current_version_id) if problem.current_version_id else None
+    if version is None:
+        remove_problem(db, problem.id)
+        return
+    index_problem(db, problem.id, version.title, version.description or "")
+
+
+def remove_problem(db: Session, problem_id: int) -> None:
+    db.execute(delete(CodingProblemLshBand).where(CodingProblemLshBand.problem_id == problem_id))
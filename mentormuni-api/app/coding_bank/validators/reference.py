@@ -11,8 +11,9 @@ from __future__ import annotations
 import ast
 import asyncio
 from dataclasses import dataclass
-from typing import Optional, Protocol
+from typing import Any, Optional, Protocol
 
+from app.coding.enums import TestResultStatus
 from app.coding_bank.schemas import GeneratedProblemContract, GeneratedTestCase
 from app.coding_bank.validators.types import CheckResult, ValidationReport
 
@@ -55,6 +56,54 @@ class NullReferenceExecutor:
         return ExecutionProbe(ok=False, error="reference_executor_not_configured")
 
 
+class ProviderReferenceExecutor:
+    """Runs references on a student-execution provider (Judge0 sandbox; local Python in dev).
+
+    Same isolation and limits as student code — generated references are untrusted too.
+    """
+
+    def __init__(
+        self,
+        provider: Any,
+        *,
+        language_ids: dict[str, int] | None = None,
+        max_stdout_bytes: int = 64 * 1024,
+    ) -> None:
+        self.provider = provider
+        self.language_ids = language_ids or {"python": 71}
+        self.max_stdout_bytes = max_stdout_bytes
+
+    async def run_stdin(
+        self,
+        *,
+        language: str,
+        source_code: str,
+        stdin: str,
+        time_limit_ms: int = 2000,
+        memory_limit_kb: int = 256000,
+    ) -> ExecutionProbe:
+        language_id = self.language_ids.get(language)
+        if language_id is None:
+            return ExecutionProbe(ok=False, error=f"unsupported_language:{language}")
+        result = await self.provider.execute_one(
+            source_code=source_code,
+            language_id=language_id,
+            stdin=stdin,
+            expected_output=None,
+            cpu_time_limit_s=time_limit_ms / 1000.0,
+            wall_time_limit_s=max(1.0, time_limit_ms * 2 / 1000.0),
+            memory_limit_kb=memory_limit_kb,
+            max_stdout_bytes=self.max_stdout_bytes,
+        )
+        ok = result.status == TestResultStatus.PASSED
+        return ExecutionProbe(
+            ok=ok,
+            stdout=result.stdout or "",
+            stderr=result.stderr or result.compile_output or "",
+            error="" if ok else (result.error_type or result.error_message or "execution_failed"),
+        )
+
+
 class LocalPythonAstGuard:
     """Static safety/shape checks on Python reference (deterministic, no exec)."""
 
@@ -0,0 +1,132 @@
+"""MinHash / LSH candidate search for duplicate detection.
+
+``DuplicateDetector`` decides with ``SequenceMatcher`` ratios (title ≥ 0.92 or statement
+≥ 0.86), which is too slow to run against every problem in a growing bank. Here each
+problem gets LSH *band keys* over character shingles of its normalized title and
+statement; two problems are candidates when they share a band key. The detector then
+runs unchanged on the (few) candidates, so verdicts match the brute-force scan as long
+as LSH recall holds — with 32 bands × 3 rows a pair with shingle Jaccard ≥ 0.5 collides
+with probability ≥ 0.98, well below what the ratio thresholds need.
+
+``InMemorySimilarityIndex`` is the per-process form; ``app.coding_bank.similarity_index``
+persists the same band keys in Postgres.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+from collections.abc import Iterable
+from typing import Optional
+
+from app.coding_bank.validators.duplicate import ExistingProblemRef, normalize_text
+
+BANDS = 32
+ROWS = 3
+NUM_PERM = BANDS * ROWS
+TITLE_SHINGLE = 3
+STATEMENT_SHINGLE = 5
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _seeded_params(count: int) -> list[tuple[int, int]]:
+    params: list[tuple[int, int]] = []
+    for i in range(count):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a, b = struct.unpack(">QQ", digest)
+        params.append((a % (_MERSENNE - 1) + 1, b % _MERSENNE))
+    return params
+
+
+# Fixed permutations: band keys are persisted, so they must be stable across processes.
+_PERMUTATIONS = _seeded_params(NUM_PERM)
+
+
+def shingles(text: str, k: int) -> set[str]:
+    norm = normalize_text(text or "")
+    if not norm:
+        return set()
+    if len(norm) <= k:
+        return {norm}
+    return {norm[i : i + k] for i in range(len(norm) - k + 1)}
+
+
+def minhash(items: Iterable[str]) -> list[int]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+        for s in items
+    ]
+    if not hashes:
+        return [_MAX_HASH] * NUM_PERM
+    return [min(((a * h + b) % _MERSENNE) & _MAX_HASH for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_keys(kind: str, signature: list[int]) -> list[int]:
+    """One signed 63-bit key per band (fits BIGINT); ``kind`` separates title/statement."""
+    keys: list[int] = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS : (band + 1) * ROWS]
+        raw = f"{kind}:{band}:" + ",".join(map(str, rows))
+        digest = hashlib.blake2b(raw.encode(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big") >> 1)
+    return keys
+
+
+def problem_band_keys(title: str, statement: str) -> list[int]:
+    keys = band_keys("t", minhash(shingles(title, TITLE_SHINGLE)))
+    if normalize_text(statement or ""):
+        keys.extend(band_keys("s", minhash(shingles(statement, STATEMENT_SHINGLE))))
+    return keys
+
+
+class InMemorySimilarityIndex:
+    """Band-key → problem ids, plus an exact fingerprint map."""
+
+    def __init__(self, refs: Iterable[ExistingProblemRef] = ()) -> None:
+        self._refs: dict[int, ExistingProblemRef] = {}
+        self._keys: dict[int, list[int]] = {}
+        self._buckets: dict[int, set[int]] = {}
+        self._fingerprints: dict[str, int] = {}
+        for ref in refs:
+            self.add(ref)
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def refs(self) -> list[ExistingProblemRef]:
+        return list(self._refs.values())
+
+    def add(self, ref: ExistingProblemRef) -> None:
+        self.remove(ref.id)
+        keys = problem_band_keys(ref.title, ref.statement)
+        self._refs[ref.id] = ref
+        self._keys[ref.id] = keys
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(ref.id)
+        if ref.fingerprint:
+            self._fingerprints[ref.fingerprint] = ref.id
+
+    def remove(self, problem_id: int) -> None:
+        ref = self._refs.pop(problem_id, None)
+        if ref is None:
+            return
+        for key in self._keys.pop(problem_id, []):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(problem_id)
+                if not bucket:
+                    del self._buckets[key]
+        if ref.fingerprint and self._fingerprints.get(ref.fingerprint) == problem_id:
+            del self._fingerprints[ref.fingerprint]
+
+    def candidates(
+        self, title: str, statement: str, *, fingerprint: Optional[str] = None
+    ) -> list[ExistingProblemRef]:
+        ids: set[int] = set()
+        if fingerprint and fingerprint in self._fingerprints:
+            ids.add(self._fingerprints[fingerprint])
+        for key in problem_band_keys(title, statement):
+            ids.update(self._buckets.get(key, ()))
+        return [self._refs[i] for i in sorted(ids)]
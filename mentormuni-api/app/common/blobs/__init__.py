@@ -0,0 +1,29 @@
+"""Content-addressed blob storage (local filesystem or S3-compatible) with HTTP serving."""
+
+from app.common.blobs.http import blob_response, parse_range
+from app.common.blobs.store import (
+    BlobNotFoundError,
+    BlobRef,
+    BlobStore,
+    LocalBlobStore,
+    S3BlobStore,
+    check_blob_store_config,
+    get_blob_store,
+    sha256_hex,
+)
+from app.common.blobs.thumbnails import ensure_thumbnail, thumbnail_key
+
+__all__ = [
+    "BlobNotFoundError",
+    "BlobRef",
+    "BlobStore",
+    "LocalBlobStore",
+    "S3BlobStore",
+    "blob_response",
+    "check_blob_store_config",
+    "ensure_thumbnail",
+    "get_blob_store",
+    "parse_range",
+    "sha256_hex",
+    "thumbnail_key",
+]
@@ -0,0 +1,88 @@
+"""Serve blobs over HTTP: strong ETag (the content hash), conditional GET, single Range."""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.common.blobs.store import BlobNotFoundError, BlobStore
+from app.common.http import etag_matches
+
+# Content-addressed: a key's bytes never change.
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """``(start, end)`` inclusive for a single ``bytes=`` range; None to serve everything."""
+    if not header:
+        return None
+    m = _RANGE_RE.match(header.strip())
+    if not m:
+        return None  # multi-range / other units: fall back to a full 200
+    first, last = m.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+async def blob_response(
+    request: Request,
+    store: BlobStore,
+    key: str,
+    *,
+    content_type: str,
+    filename: Optional[str] = None,
+) -> Response:
+    size = await store.size(key)
+    if size is None:
+        raise BlobNotFoundError(key)
+    etag = f'"{key.rsplit("/", 1)[-1]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if filename:
+        safe = filename.replace('"', "").replace("\r", "").replace("\n", "")
+        headers["Content-Disposition"] = f'inline; filename="{safe}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    if byte_range is not None and request.headers.get("if-range") not in (None, etag):
+        byte_range = None
+
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    status = 200
+    if byte_range is not None:
+        status = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    if size == 0:
+        return Response(status_code=200, headers=headers, media_type=content_type)
+    return StreamingResponse(
+        store.iter_range(key, start, end),
+        status_code=status,
+        headers=headers,
+        media_type=content_type,
+    )
@@ -0,0 +1,247 @@
+"""
+Content-addressed blob storage.
+
+Blobs are keyed by the SHA-256 of their bytes, so the same screenshot uploaded twice
+is stored once and a key never changes meaning (safe for strong ETags and immutable
+caching). Derived objects (thumbnails) use their own keys under ``derived/``.
+
+Backends:
+
+- ``LocalBlobStore`` — files under ``BLOB_STORE_LOCAL_DIR`` (``ab/cd/<sha256>``),
+  written atomically via a temp file + ``os.replace``.
+- ``S3BlobStore`` — any S3-compatible bucket through ``boto3`` (optional dependency,
+  imported lazily); calls run in a worker thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+from app.core.config import settings
+
+CHUNK_BYTES = 64 * 1024
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+_DERIVED_RE = re.compile(r"^derived/[0-9a-f]{64}[-.\w]*$")
+
+
+class BlobNotFoundError(Exception):
+    pass
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_valid_key(key: str) -> bool:
+    return bool(_SHA256_RE.match(key) or _DERIVED_RE.match(key))
+
+
+def _check_key(key: str) -> str:
+    if not is_valid_key(key):
+        raise BlobNotFoundError(key)
+    return key
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    key: str
+    size: int
+
+
+class BlobStore(Protocol):
+    async def put(self, data: bytes, *, key: Optional[str] = None, content_type: Optional[str] = None) -> BlobRef: ...
+
+    async def size(self, key: str) -> Optional[int]: ...
+
+    async def read(self, key: str) -> bytes: ...
+
+    def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]: ...
+
+
+class LocalBlobStore:
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        _check_key(key)
+        name = key.rsplit("/", 1)[-1]
+        return self.root / name[:2] / name[2:4] / key.replace("/", "_")
+
+    def _write(self, path: Path, data: bytes) -> None:
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    async def put(self, data: bytes, *, key: Optional[str] = None, content_type: Optional[str] = None) -> BlobRef:
+        key = key or sha256_hex(data)
+        await asyncio.to_thread(self._write, self._path(key), data)
+        return BlobRef(key=key, size=len(data))
+
+    async def size(self, key: str) -> Optional[int]:
+        try:
+            return (await asyncio.to_thread(self._path(key).stat)).st_size
+        except (OSError, BlobNotFoundError):
+            return None
+
+    async def read(self, key: str) -> bytes:
+        try:
+            return await asyncio.to_thread(self._path(key).read_bytes)
+        except OSError as exc:
+            raise BlobNotFoundError(key) from exc
+
+    async def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        """Yield bytes ``start..end`` inclusive."""
+        try:
+            fh = await asyncio.to_thread(open, self._path(key), "rb")
+        except OSError as exc:
+            raise BlobNotFoundError(key) from exc
+        try:
+            await asyncio.to_thread(fh.seek, start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await asyncio.to_thread(fh.read, min(CHUNK_BYTES, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(fh.close)
+
+
+class S3BlobStore:
+    def __init__(
+        self,
+        *,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+    ) -> None:
+        try:
+            import boto3
+        except ImportError as exc:
+            raise RuntimeError("BLOB_STORE_BACKEND=s3 requires the boto3 package.") from exc
+        if not bucket:
+            raise RuntimeError("BLOB_STORE_S3_BUCKET is missing.")
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client: Any = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+        )
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{_check_key(key)}"
+
+    def _head(self, key: str) -> Optional[dict]:
+        try:
+            return self._client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except self._client.exceptions.ClientError as exc:
+            if str(exc.response.get("Error", {}).get("Code")) in {"404", "NoSuchKey", "NotFound"}:
+                return None
+            raise
+
+    def _put(self, key: str, data: bytes, content_type: Optional[str]) -> None:
+        if self._head(key) is not None:
+            return
+        extra = {"ContentType": content_type} if content_type else {}
+        self._client.put_object(Bucket=self.bucket, Key=self._object_key(key), Body=data, **extra)
+
+    async def put(self, data: bytes, *, key: Optional[str] = None, content_type: Optional[str] = None) -> BlobRef:
+        key = key or sha256_hex(data)
+        await asyncio.to_thread(self._put, key, data, content_type)
+        return BlobRef(key=key, size=len(data))
+
+    async def size(self, key: str) -> Optional[int]:
+        try:
+            head = await asyncio.to_thread(self._head, key)
+        except BlobNotFoundError:
+            return None
+        return int(head["ContentLength"]) if head else None
+
+    def _get(self, key: str, range_header: Optional[str] = None) -> Any:
+        kwargs = {"Range": range_header} if range_header else {}
+        try:
+            return self._client.get_object(Bucket=self.bucket, Key=self._object_key(key), **kwargs)["Body"]
+        except self._client.exceptions.NoSuchKey as exc:
+            raise BlobNotFoundError(key) from exc
+
+    async def read(self, key: str) -> bytes:
+        body = await asyncio.to_thread(self._get, key)
+        try:
+            return await asyncio.to_thread(body.read)
+        finally:
+            body.close()
+
+    async def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        body = await asyncio.to_thread(self._get, key, f"bytes={start}-{end}")
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+
+_store: Optional[BlobStore] = None
+
+
+def check_blob_store_config() -> None:
+    """Fail at startup instead of silently losing screenshots (called from the app lifespan)."""
+    backend = settings.blob_store_backend
+    if not backend and not settings.is_development_env:
+        raise RuntimeError(
+            "BLOB_STORE_BACKEND must be set outside development: s3, or local with a "
+            "persistent volume mounted at BLOB_STORE_LOCAL_DIR."
+        )
+    if backend == "s3" and not settings.blob_store_s3_bucket:
+        raise RuntimeError("BLOB_STORE_S3_BUCKET is missing.")
+    if backend != "s3" and settings.web_concurrency > 1:
+        raise RuntimeError(
+            f"BLOB_STORE_BACKEND=local is per-instance disk; with WEB_CONCURRENCY="
+            f"{settings.web_concurrency} use BLOB_STORE_BACKEND=s3."
+        )
+
+
+def get_blob_store() -> BlobStore:
+    """Process-wide store for the configured backend (unset = local)."""
+    global _store
+    if _store is None:
+        if settings.blob_store_backend == "s3":
+            _store = S3BlobStore(
+                bucket=settings.blob_store_s3_bucket,
+                prefix=settings.blob_store_s3_prefix,
+                endpoint_url=settings.blob_store_s3_endpoint_url,
+                region=settings.blob_store_s3_region,
+                access_key_id=settings.blob_store_s3_access_key_id,
+                secret_access_key=settings.blob_store_s3_secret_access_key,
+            )
+        else:
+            _store = LocalBlobStore(settings.blob_store_local_dir)
+    return _store
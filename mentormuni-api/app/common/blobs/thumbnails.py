@@ -0,0 +1,68 @@
+"""
+Image thumbnails, generated once per (blob, size) and stored as derived blobs.
+
+Pillow is optional: without it (or for an image it cannot decode) ``ensure_thumbnail``
+returns None and callers serve the original.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+from typing import Optional
+
+from app.common.blobs.store import BlobNotFoundError, BlobStore
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_CONTENT_TYPE = "image/webp"
+
+# One generation per key at a time inside this process; stores are idempotent anyway.
+_locks: dict[str, asyncio.Lock] = {}
+
+
+def thumbnail_key(source_key: str, max_px: int) -> str:
+    return f"derived/{source_key}-{max_px}.webp"
+
+
+def _render(data: bytes, max_px: int) -> Optional[bytes]:
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.thumbnail((max_px, max_px))
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+            out = io.BytesIO()
+            img.save(out, format="WEBP", quality=80, method=4)
+            return out.getvalue()
+    except Exception:
+        logger.warning("thumbnail_render_failed", exc_info=True)
+        return None
+
+
+async def ensure_thumbnail(store: BlobStore, source_key: str, max_px: int) -> Optional[str]:
+    """Return the thumbnail's blob key, rendering and storing it on first use."""
+    key = thumbnail_key(source_key, max_px)
+    if await store.size(key) is not None:
+        return key
+    lock = _locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            if await store.size(key) is not None:
+                return key
+            try:
+                original = await store.read(source_key)
+            except BlobNotFoundError:
+                return None
+            rendered = await asyncio.to_thread(_render, original, max_px)
+            if rendered is None:
+                return None
+            await store.put(rendered, key=key, content_type=THUMBNAIL_CONTENT_TYPE)
+            return key
+    finally:
+        if not lock.locked():
+            _locks.pop(key, None)
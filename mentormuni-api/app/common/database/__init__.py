@@ -1,4 +1,5 @@
 from app.common.database.base import Base
+from app.common.database.parallel import run_parallel_reads
 from app.common.database.session import (
     async_session_factory,
     close_db,
@@ -12,4 +13,5 @@ __all__ = [
     "close_db",
     "get_db",
     "init_db",
+    "run_parallel_reads",
 ]
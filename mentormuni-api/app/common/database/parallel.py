@@ -0,0 +1,110 @@
+"""
+Run independent read queries concurrently on separate pooled connections.
+
+One AsyncSession can only run one statement at a time, so dashboards that issue
+four unrelated SELECTs pay the sum of their latencies. ``run_parallel_reads`` gives
+each query its own session and runs them with ``asyncio.gather``; wall time
+approaches the slowest query.
+
+All sessions share one Postgres snapshot: the first opens a
+``REPEATABLE READ, READ ONLY`` transaction and exports its snapshot
+(``pg_export_snapshot()``), the rest import it with ``SET TRANSACTION SNAPSHOT``.
+Every query therefore sees the same committed state, as if run on a single session.
+
+The extra connections are capped process-wide (``DB_PARALLEL_READS_MAX_CONNECTIONS``,
+default half of ``DB_POOL_SIZE``) so concurrent dashboards cannot drain the pool under
+the requests that are already holding a session. A call that does not fit under the
+cap does not wait: it runs its queries sequentially on the caller's session.
+
+Only use this for reads that do not depend on uncommitted writes in the caller's
+session — those writes are invisible to the other connections. ORM objects come back
+detached with the attributes they were loaded with (they are expunged before the snapshot
+transaction is rolled back), so eager-load anything the caller touches.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+ReadQuery = Callable[[AsyncSession], Awaitable[Any]]
+
+_SNAPSHOT_TXN = "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"
+
+# Connections currently held by parallel reads in this process (event loop is single-threaded).
+_connections_in_use = 0
+
+
+def parallel_reads_enabled() -> bool:
+    return settings.db_parallel_reads and settings.database_url.startswith("postgresql+asyncpg://")
+
+
+def max_parallel_connections() -> int:
+    """Connection budget for parallel reads; always below ``DB_POOL_SIZE``."""
+    cap = settings.db_parallel_reads_max_connections or settings.db_pool_size // 2
+    return max(0, min(cap, settings.db_pool_size - 1))
+
+
+@asynccontextmanager
+async def _reserve_connections(n: int) -> AsyncIterator[bool]:
+    """Take ``n`` connection slots if they are all free right now; yields whether it did."""
+    global _connections_in_use
+    if _connections_in_use + n > max_parallel_connections():
+        yield False
+        return
+    _connections_in_use += n
+    try:
+        yield True
+    finally:
+        _connections_in_use -= n
+
+
+async def run_parallel_reads(db: AsyncSession, *queries: ReadQuery) -> tuple[Any, ...]:
+    """
+    Await ``queries`` concurrently, one pooled connection each, under one read-only snapshot.
+
+    Falls back to running them one after another on ``db`` when parallel reads are
+    disabled (``DB_PARALLEL_READS=false``), there is nothing to overlap, or the
+    process-wide connection budget is spent.
+    """
+    if len(queries) < 2 or not parallel_reads_enabled():
+        return tuple([await q(db) for q in queries])
+    async with _reserve_connections(len(queries)) as reserved:
+        if not reserved:
+            return tuple([await q(db) for q in queries])
+        return await _run_on_snapshot(queries)
+
+
+async def _run_on_snapshot(queries: tuple[ReadQuery, ...]) -> tuple[Any, ...]:
+    from app.common.database.session import async_session_factory
+
+    factory = async_session_factory()
+    async with AsyncExitStack() as stack:
+        sessions = [await stack.enter_async_context(factory()) for _ in queries]
+        leader = sessions[0]
+        await leader.execute(text(_SNAPSHOT_TXN))
+        snapshot_id = (await leader.execute(text("SELECT pg_export_snapshot()"))).scalar_one()
+
+        async def _join(session: AsyncSession) -> None:
+            await session.execute(text(_SNAPSHOT_TXN))
+            # snapshot ids are server-generated ("00000003-0000001B-1"); SET does not take binds.
+            await session.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+
+        await asyncio.gather(*(_join(s) for s in sessions[1:]))
+        try:
+            return tuple(
+                await asyncio.gather(*(q(s) for q, s in zip(queries, sessions)))
+            )
+        finally:
+            for s in sessions:
+                # Detach first: a rollback expires every instance still in the session,
+                # and the results could no longer be read once it is closed.
+                s.expunge_all()
+                await s.rollback()
@@ -17,3 +17,13 @@ class EmailNotConfiguredError(EmailError):
 
 class EmailDeliveryError(EmailError):
     """SMTP accepted the connection but delivery failed."""
+
+    def __init__(self, message: str, *, status_code: int | None = None) -> None:
+        super().__init__(message)
+        # Provider HTTP status when known (Resend); None for SMTP / network errors.
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        code = self.status_code
+        return code is None or code == 429 or code >= 500
@@ -0,0 +1,260 @@
+"""
+Postgres-backed email outbox (queue operations).
+
+Producers insert rows with ``enqueue_emails`` inside their own transaction, so an
+email is queued only if the thing that caused it was committed. The sender worker
+(``app.common.email.worker``) claims batches with ``FOR UPDATE SKIP LOCKED``, sends
+them, and records outcomes here; several workers can drain the same table safely.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import Integer, Select, String, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.email_outbox import (
+    OUTBOX_CANCELLED,
+    OUTBOX_FAILED,
+    OUTBOX_PENDING,
+    OUTBOX_SENDING,
+    OUTBOX_SENT,
+    OUTBOX_SKIPPED,
+    EmailOutbox,
+)
+from app.models.enums import NotificationDeliveryStatus
+from app.models.notification import Notification
+
+logger = logging.getLogger("email.outbox")
+
+ENQUEUE_CHUNK_SIZE = 1000
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class DeliveryResult:
+    """Outcome of one outbox row after a send attempt."""
+
+    outbox_id: int
+    sent: bool
+    skipped: bool = False
+    provider: Optional[str] = None
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+    retryable: bool = True
+
+
+async def enqueue_emails(db: AsyncSession, messages: Iterable[dict[str, Any]]) -> int:
+    """
+    Insert outbox rows (``idempotency_key``, ``to_email``, ``subject``, bodies, …).
+
+    Rows whose ``idempotency_key`` already exists are skipped. Returns rows inserted.
+    """
+    inserted = 0
+    chunk: list[dict[str, Any]] = []
+
+    async def _flush() -> int:
+        if not chunk:
+            return 0
+        stmt = (
+            pg_insert(EmailOutbox)
+            .values(chunk)
+            .on_conflict_do_nothing(index_elements=["idempotency_key"])
+            .returning(EmailOutbox.id)
+        )
+        n = len((await db.execute(stmt)).scalars().all())
+        chunk.clear()
+        return n
+
+    for msg in messages:
+        chunk.append({"status": OUTBOX_PENDING, "attempt_count": 0, **msg})
+        if len(chunk) >= ENQUEUE_CHUNK_SIZE:
+            inserted += await _flush()
+    inserted += await _flush()
+    return inserted
+
+
+async def enqueue_from_select(db: AsyncSession, columns: Sequence[str], rows: Select) -> int:
+    """
+    ``INSERT INTO email_outbox (columns…) SELECT …`` — fan-out without loading recipients.
+
+    ``rows`` must select values for ``columns`` in order (including ``idempotency_key``).
+    """
+    stmt = (
+        pg_insert(EmailOutbox)
+        .from_select(
+            [*columns, "status", "attempt_count"],
+            rows.add_columns(literal(OUTBOX_PENDING, String), literal(0, Integer)),
+        )
+        .on_conflict_do_nothing(index_elements=["idempotency_key"])
+    )
+    result = await db.execute(stmt)
+    return max(0, result.rowcount or 0)
+
+
+async def recover_stale(db: AsyncSession) -> int:
+    """Return rows stuck in ``sending`` (worker died mid-batch) to the queue."""
+    cutoff = utcnow() - timedelta(seconds=settings.email_outbox_stale_seconds)
+    result = await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.status == OUTBOX_SENDING, EmailOutbox.claimed_at < cutoff)
+        .values(status=OUTBOX_PENDING, claimed_at=None, next_attempt_at=utcnow())
+        .returning(EmailOutbox.id)
+    )
+    ids = list(result.scalars().all())
+    if ids:
+        logger.warning("email_outbox_stale_requeued count=%s", len(ids))
+    return len(ids)
+
+
+async def claim_batch(db: AsyncSession, limit: int) -> list[EmailOutbox]:
+    """Atomically move up to ``limit`` due rows to ``sending`` (SKIP LOCKED)."""
+    now = utcnow()
+    due = (
+        select(EmailOutbox.id)
+        .where(EmailOutbox.status == OUTBOX_PENDING, EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.id.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(due))
+        .values(
+            status=OUTBOX_SENDING,
+            claimed_at=now,
+            attempt_count=EmailOutbox.attempt_count + 1,
+            updated_at=now,
+        )
+        .returning(EmailOutbox)
+        .execution_options(synchronize_session=False)
+    )
+    rows = sorted(result.scalars().all(), key=lambda r: r.id)
+    if rows:
+        logger.info("email_outbox_claimed count=%s first_id=%s", len(rows), rows[0].id)
+    return rows
+
+
+def _retry_backoff_seconds(attempt_count: int) -> int:
+    return min(1800, 30 * 2 ** max(0, attempt_count - 1))
+
+
+async def record_results(
+    db: AsyncSession,
+    rows: Sequence[EmailOutbox],
+    results: Sequence[DeliveryResult],
+) -> None:
+    """Persist send outcomes; failed rows are re-queued with backoff until max attempts."""
+    attempts = {r.id: int(r.attempt_count or 0) for r in rows}
+    now = utcnow()
+    params: list[dict[str, Any]] = []
+    for res in results:
+        if res.sent or res.skipped:
+            params.append(
+                {
+                    "id": res.outbox_id,
+                    "status": OUTBOX_SKIPPED if res.skipped else OUTBOX_SENT,
+                    "provider": res.provider,
+                    "provider_message_id": res.message_id[:128] if res.message_id else None,
+                    "last_error": None,
+                    "sent_at": now,
+                    "claimed_at": None,
+                }
+            )
+            continue
+        attempt = attempts.get(res.outbox_id, 1)
+        give_up = not res.retryable or attempt >= settings.email_outbox_max_attempts
+        params.append(
+            {
+                "id": res.outbox_id,
+                "status": OUTBOX_FAILED if give_up else OUTBOX_PENDING,
+                "provider": res.provider,
+                "provider_message_id": None,
+                "last_error": (res.error or "unknown")[:2000],
+                "sent_at": None,
+                "claimed_at": None,
+                "next_attempt_at": now + timedelta(seconds=_retry_backoff_seconds(attempt)),
+            }
+        )
+    if params:
+        # Bulk UPDATE by primary key (executemany); split by key shape.
+        with_retry = [p for p in params if "next_attempt_at" in p]
+        done = [p for p in params if "next_attempt_at" not in p]
+        for batch in (done, with_retry):
+            if batch:
+                await db.execute(update(EmailOutbox), batch)
+    failed = sum(1 for r in results if not (r.sent or r.skipped))
+    logger.info(
+        "email_outbox_results sent=%s failed=%s", len(results) - failed, failed
+    )
+
+
+async def cancel_for_notification(db: AsyncSession, notification_id: int) -> int:
+    result = await db.execute(
+        update(EmailOutbox)
+        .where(
+            EmailOutbox.notification_id == notification_id,
+            EmailOutbox.status == OUTBOX_PENDING,
+        )
+        .values(status=OUTBOX_CANCELLED, updated_at=utcnow())
+        .returning(EmailOutbox.id)
+    )
+    return len(result.scalars().all())
+
+
+def delivery_status_for(*, sent: int, failed: int, open_: int) -> str:
+    if open_ > 0:
+        return NotificationDeliveryStatus.SENDING.value
+    if failed == 0:
+        return NotificationDeliveryStatus.SENT.value
+    if sent == 0:
+        return NotificationDeliveryStatus.FAILED.value
+    return NotificationDeliveryStatus.PARTIAL.value
+
+
+async def refresh_notification_progress(
+    db: AsyncSession, notification_ids: Iterable[int]
+) -> None:
+    """Write outbox counts back to ``notifications`` (sent / failed / delivery_status)."""
+    ids = sorted({int(i) for i in notification_ids if i is not None})
+    if not ids:
+        return
+    stmt = (
+        select(
+            EmailOutbox.notification_id,
+            func.count().filter(EmailOutbox.status.in_([OUTBOX_SENT, OUTBOX_SKIPPED])).label("sent"),
+            func.count().filter(EmailOutbox.status == OUTBOX_FAILED).label("failed"),
+            func.count()
+            .filter(EmailOutbox.status.in_([OUTBOX_PENDING, OUTBOX_SENDING]))
+            .label("open"),
+        )
+        .where(EmailOutbox.notification_id.in_(ids))
+        .where(EmailOutbox.status != OUTBOX_CANCELLED)
+        .group_by(EmailOutbox.notification_id)
+    )
+    for row in (await db.execute(stmt)).all():
+        await db.execute(
+            update(Notification)
+            .where(Notification.id == row.notification_id)
+            .where(Notification.delivery_status != NotificationDeliveryStatus.CANCELLED.value)
+            .values(
+                emails_sent=int(row.sent),
+                emails_failed=int(row.failed),
+                delivery_status=delivery_status_for(
+                    sent=int(row.sent),
+                    failed=int(row.failed),
+                    open_=int(row.open),
+                ),
+            )
+        )
@@ -174,12 +174,19 @@ async def _smtp_send_once(
     )
 
 
-async def _send_via_resend(payload: OutgoingEmail) -> EmailSendResult:
-    """Send via Resend HTTPS API — works from Railway where Gmail SMTP does not."""
+def _resend_api_key() -> str:
     api_key = (settings.resend_api_key or "").strip()
     if not api_key:
         raise EmailNotConfiguredError("RESEND_API_KEY is not set.")
+    return api_key
+
+
+def _resend_timeout() -> float:
+    return float(min(max(settings.smtp_timeout_seconds, 8), 30))
+
 
+def _resend_body(payload: OutgoingEmail) -> dict:
+    """Resend JSON for one message (also one element of a ``/emails/batch`` call)."""
     sender = payload.from_address or _default_from_address()
     if not sender.email:
         raise EmailNotConfiguredError("EMAIL_FROM_ADDRESS is not set.")
@@ -203,8 +210,25 @@ async def _send_via_resend(payload: OutgoingEmail) -> EmailSendResult:
         reply = EmailAddress(email=settings.email_reply_to)
     if reply is not None:
         body["reply_to"] = _format_address(reply)
+    return body
 
-    timeout = float(min(max(settings.smtp_timeout_seconds, 8), 30))
+
+def _resend_error_detail(resp: httpx.Response) -> str:
+    detail = resp.text
+    try:
+        data = resp.json()
+        detail = data.get("message") or data.get("error") or detail
+    except Exception:
+        pass
+    return detail
+
+
+async def _send_via_resend(payload: OutgoingEmail) -> EmailSendResult:
+    """Send via Resend HTTPS API — works from Railway where Gmail SMTP does not."""
+    api_key = _resend_api_key()
+    body = _resend_body(payload)
+
+    timeout = _resend_timeout()
     try:
         async with httpx.AsyncClient(timeout=timeout) as client:
             resp = await client.post(
@@ -223,19 +247,16 @@ async def _send_via_resend(payload: OutgoingEmail) -> EmailSendResult:
         raise EmailDeliveryError(f"Resend API request failed: {exc}") from exc
 
     if resp.status_code >= 400:
-        detail = resp.text
-        try:
-            data = resp.json()
-            detail = data.get("message") or data.get("error") or detail
-        except Exception:
-            pass
+        detail = _resend_error_detail(resp)
         logger.error(
             "email_resend_failed status=%s to=%s detail=%s",
             resp.status_code,
             [a.email for a in payload.to],
             detail,
         )
-        raise EmailDeliveryError(f"Resend failed ({resp.status_code}): {detail}")
+        raise EmailDeliveryError(
+            f"Resend failed ({resp.status_code}): {detail}", status_code=resp.status_code
+        )
 
     message_id = None
     try:
@@ -0,0 +1,194 @@
+"""
+Long-lived email transports for bulk sending (email outbox worker).
+
+``send_email`` opens a fresh SMTP connection / httpx client per message, which is fine
+for a single invite but dominates a 5,000-recipient announcement. These transports
+keep one connection open across many messages:
+
+- ``SmtpSession`` — one authenticated ``aiosmtplib.SMTP`` connection, reconnected
+  lazily after a drop; tries ports in ``_smtp_attempts()`` order.
+- ``ResendBatchClient`` — one ``httpx.AsyncClient`` posting up to 100 messages per
+  ``/emails/batch`` call, with an ``Idempotency-Key`` header so a retried batch is
+  not delivered twice.
+- ``RateLimiter`` — async token bucket shared by every sender of one provider.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import ssl
+import time
+from collections.abc import Sequence
+from email.message import EmailMessage
+from typing import Optional
+
+import aiosmtplib
+import httpx
+
+from app.common.email.exceptions import EmailDeliveryError, EmailNotConfiguredError
+from app.common.email.sender import (
+    _all_envelope_recipients,
+    _build_mime_message,
+    _resend_api_key,
+    _resend_body,
+    _resend_error_detail,
+    _resend_timeout,
+    _smtp_attempts,
+)
+from app.common.email.types import OutgoingEmail
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RESEND_BATCH_URL = "https://api.resend.com/emails/batch"
+RESEND_BATCH_MAX = 100
+
+
+class RateLimiter:
+    """Token bucket: at most ``rate`` acquisitions per second, bursts up to ``burst``."""
+
+    def __init__(self, rate: float, *, burst: Optional[float] = None) -> None:
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SmtpSession:
+    """One SMTP connection reused across messages; call ``close()`` when done."""
+
+    def __init__(self) -> None:
+        self._client: Optional[aiosmtplib.SMTP] = None
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        if not settings.smtp_host or not settings.smtp_password:
+            raise EmailNotConfiguredError("SMTP_HOST / SMTP_PASSWORD missing.")
+        last_exc: BaseException | None = None
+        for port, start_tls, use_ssl in _smtp_attempts():
+            client = aiosmtplib.SMTP(
+                hostname=settings.smtp_host,
+                port=port,
+                username=settings.smtp_username or None,
+                password=settings.smtp_password or None,
+                use_tls=use_ssl,
+                start_tls=start_tls,
+                tls_context=ssl.create_default_context() if (start_tls or use_ssl) else None,
+                timeout=settings.smtp_timeout_seconds,
+            )
+            try:
+                await client.connect()
+                self._client = client
+                return client
+            except Exception as exc:
+                last_exc = exc
+                logger.warning(
+                    "email_smtp_session_connect_failed host=%s port=%s err=%s",
+                    settings.smtp_host,
+                    port,
+                    exc,
+                )
+                client.close()
+        raise EmailDeliveryError(
+            f"Failed to connect to {settings.smtp_host}: {last_exc}"
+        ) from last_exc
+
+    async def send(self, payload: OutgoingEmail) -> Optional[str]:
+        """Send one message; reconnects once if the server dropped the connection."""
+        mime: EmailMessage = _build_mime_message(payload)
+        recipients = _all_envelope_recipients(payload)
+        for attempt in range(2):
+            client = self._client if self._client and self._client.is_connected else None
+            if client is None:
+                client = await self._connect()
+            try:
+                await client.send_message(mime, recipients=recipients)
+                return str(mime["Message-ID"]) if mime["Message-ID"] else None
+            except aiosmtplib.SMTPServerDisconnected as exc:
+                self._client = None
+                if attempt:
+                    raise EmailDeliveryError(f"SMTP connection dropped: {exc}") from exc
+            except aiosmtplib.SMTPException as exc:
+                raise EmailDeliveryError(f"SMTP send failed: {exc}") from exc
+        return None
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        if client is not None and client.is_connected:
+            try:
+                await client.quit()
+            except Exception:
+                client.close()
+
+
+class ResendBatchClient:
+    """Shared httpx client for Resend batch sends; use as ``async with``."""
+
+    def __init__(self) -> None:
+        self._api_key = _resend_api_key()
+        self._client = httpx.AsyncClient(timeout=_resend_timeout())
+
+    async def __aenter__(self) -> "ResendBatchClient":
+        return self
+
+    async def __aexit__(self, *_exc: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def send_batch(
+        self,
+        payloads: Sequence[OutgoingEmail],
+        *,
+        idempotency_key: str,
+    ) -> list[Optional[str]]:
+        """POST up to 100 messages at once; returns provider ids in input order."""
+        if len(payloads) > RESEND_BATCH_MAX:
+            raise ValueError(f"Resend batch is limited to {RESEND_BATCH_MAX} messages.")
+        try:
+            resp = await self._client.post(
+                RESEND_BATCH_URL,
+                headers={
+                    "Authorization": f"Bearer {self._api_key}",
+                    "Content-Type": "application/json",
+                    "Idempotency-Key": idempotency_key[:256],
+                },
+                json=[_resend_body(p) for p in payloads],
+            )
+        except httpx.HTTPError as exc:
+            raise EmailDeliveryError(f"Resend batch request failed: {exc}") from exc
+
+        if resp.status_code >= 400:
+            detail = _resend_error_detail(resp)
+            logger.error(
+                "email_resend_batch_failed status=%s size=%s detail=%s",
+                resp.status_code,
+                len(payloads),
+                detail,
+            )
+            raise EmailDeliveryError(
+                f"Resend batch failed ({resp.status_code}): {detail}",
+                status_code=resp.status_code,
+            )
+
+        ids: list[Optional[str]] = [None] * len(payloads)
+        try:
+            for i, item in enumerate((resp.json() or {}).get("data") or []):
+                if i < len(ids):
+                    ids[i] = str(item.get("id") or "") or None
+        except Exception:
+            pass
+        return ids
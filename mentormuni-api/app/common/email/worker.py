@@ -0,0 +1,284 @@
+"""
+Email outbox sender — drains ``email_outbox`` in batches.
+
+Runs inside the API process by default (``start_email_outbox_worker`` from the app
+lifespan) or as its own process: ``python -m app.common.email.worker`` with
+``EMAIL_OUTBOX_IN_PROCESS=false`` on the web service. Both can run at once; claims
+use ``SKIP LOCKED`` so a row is only ever sent by one worker.
+
+Per batch: Resend when configured (≤100 messages per ``/emails/batch`` request,
+``email_outbox_concurrency`` requests in flight, ``EMAIL_RESEND_RATE_PER_SECOND``),
+otherwise SMTP over ``email_outbox_concurrency`` reused connections
+(``EMAIL_SMTP_RATE_PER_SECOND`` across all of them). Outcomes are committed per
+message (SMTP) or per request (Resend) as they complete, so a later failure in the
+same batch never re-queues a row that was already sent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import signal
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Optional
+
+from app.common.email import outbox
+from app.common.email.exceptions import EmailDeliveryError, EmailError
+from app.common.email.outbox import DeliveryResult
+from app.common.email.sender import _has_resend, _has_smtp
+from app.common.email.transport import (
+    RESEND_BATCH_MAX,
+    RateLimiter,
+    ResendBatchClient,
+    SmtpSession,
+)
+from app.common.email.types import EmailAddress, OutgoingEmail
+from app.core.config import settings
+from app.models.email_outbox import EmailOutbox
+
+logger = logging.getLogger("email.worker")
+
+_task: Optional[asyncio.Task] = None
+_stop = False
+_limiters: dict[str, RateLimiter] = {}
+
+ResultSink = Callable[[list[DeliveryResult]], Awaitable[None]]
+
+
+def _limiter(provider: str) -> RateLimiter:
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        rate = (
+            settings.email_resend_rate_per_second
+            if provider == "resend"
+            else settings.email_smtp_rate_per_second
+        )
+        limiter = _limiters[provider] = RateLimiter(rate)
+    return limiter
+
+
+def _to_payload(row: EmailOutbox) -> OutgoingEmail:
+    return OutgoingEmail(
+        to=[EmailAddress(email=row.to_email, name=row.to_name)],
+        subject=row.subject,
+        text_body=row.text_body,
+        html_body=row.html_body,
+    )
+
+
+def _failed(row_id: int, exc: BaseException, provider: Optional[str]) -> DeliveryResult:
+    retryable = exc.retryable if isinstance(exc, EmailDeliveryError) else not isinstance(exc, ValueError)
+    return DeliveryResult(
+        outbox_id=row_id, sent=False, provider=provider, error=str(exc), retryable=retryable
+    )
+
+
+def batch_idempotency_key(rows: Sequence[EmailOutbox]) -> str:
+    """Stable per set of outbox rows — a retried identical batch is deduped by Resend."""
+    digest = hashlib.sha256("|".join(r.idempotency_key for r in rows).encode()).hexdigest()
+    return f"outbox-{digest}"
+
+
+async def _send_resend(rows: Sequence[EmailOutbox], emit: ResultSink) -> None:
+    invalid: list[DeliveryResult] = []
+    sendable: list[tuple[EmailOutbox, OutgoingEmail]] = []
+    for row in rows:
+        try:
+            sendable.append((row, _to_payload(row)))
+        except ValueError as exc:
+            invalid.append(_failed(row.id, exc, "resend"))
+    if invalid:
+        await emit(invalid)
+
+    chunks = [sendable[i : i + RESEND_BATCH_MAX] for i in range(0, len(sendable), RESEND_BATCH_MAX)]
+    sem = asyncio.Semaphore(settings.email_outbox_concurrency)
+    limiter = _limiter("resend")
+
+    async with ResendBatchClient() as client:
+
+        async def _one(chunk: list[tuple[EmailOutbox, OutgoingEmail]]) -> None:
+            async with sem:
+                await limiter.acquire()
+                try:
+                    ids = await client.send_batch(
+                        [p for _, p in chunk],
+                        idempotency_key=batch_idempotency_key([r for r, _ in chunk]),
+                    )
+                except Exception as exc:
+                    if not isinstance(exc, EmailError):
+                        logger.exception("email_resend_batch_failed size=%s", len(chunk))
+                    await emit([_failed(r.id, exc, "resend") for r, _ in chunk])
+                    return
+                await emit(
+                    [
+                        DeliveryResult(outbox_id=r.id, sent=True, provider="resend", message_id=mid)
+                        for (r, _), mid in zip(chunk, ids)
+                    ]
+                )
+
+        await asyncio.gather(*(_one(c) for c in chunks))
+
+
+async def _send_smtp(rows: Sequence[EmailOutbox], emit: ResultSink) -> None:
+    queue: asyncio.Queue[EmailOutbox] = asyncio.Queue()
+    for row in rows:
+        queue.put_nowait(row)
+    limiter = _limiter("smtp")
+
+    async def _drain() -> None:
+        session = SmtpSession()
+        try:
+            while not queue.empty():
+                row = queue.get_nowait()
+                await limiter.acquire()
+                try:
+                    mid = await session.send(_to_payload(row))
+                    result = DeliveryResult(
+                        outbox_id=row.id, sent=True, provider="smtp", message_id=mid
+                    )
+                except Exception as exc:
+                    if not isinstance(exc, (EmailError, ValueError)):
+                        logger.exception("email_smtp_send_failed outbox_id=%s", row.id)
+                    result = _failed(row.id, exc, "smtp")
+                await emit([result])
+        finally:
+            await session.close()
+
+    workers = min(settings.email_outbox_concurrency, len(rows))
+    await asyncio.gather(*(_drain() for _ in range(workers)))
+
+
+async def deliver(
+    rows: Sequence[EmailOutbox], *, on_results: Optional[ResultSink] = None
+) -> list[DeliveryResult]:
+    """
+    Send claimed rows with the configured provider; send failures never raise.
+
+    ``on_results`` is awaited with each message's (SMTP) or request's (Resend) outcomes
+    before the sender moves on; errors it raises propagate and leave the remaining rows
+    claimed for stale recovery.
+    """
+    results: list[DeliveryResult] = []
+
+    async def _emit(part: list[DeliveryResult]) -> None:
+        results.extend(part)
+        if on_results is not None:
+            await on_results(part)
+
+    if not settings.email_enabled:
+        await _emit([DeliveryResult(outbox_id=r.id, sent=False, skipped=True) for r in rows])
+        return results
+    try:
+        if not settings.email_from_address:
+            raise EmailDeliveryError("EMAIL_FROM_ADDRESS is missing.")
+        if _has_resend():
+            await _send_resend(rows, _emit)
+        elif _has_smtp():
+            await _send_smtp(rows, _emit)
+        else:
+            raise EmailDeliveryError(
+                "No email transport configured (RESEND_API_KEY / SMTP_PASSWORD)."
+            )
+    except Exception as exc:
+        logger.exception("email_outbox_deliver_failed size=%s", len(rows))
+        done = {r.outbox_id for r in results}
+        await _emit([_failed(r.id, exc, None) for r in rows if r.id not in done])
+    return results
+
+
+async def drain_once(*, batch_size: Optional[int] = None) -> int:
+    """Claim, send and record one batch (outcomes committed as they arrive). Returns rows processed."""
+    from app.common.database.session import async_session_factory
+
+    factory = async_session_factory()
+    async with factory() as db:
+        await outbox.recover_stale(db)
+        rows = await outbox.claim_batch(db, batch_size or settings.email_outbox_batch_size)
+        await db.commit()
+    if not rows:
+        return 0
+
+    async def _record(part: list[DeliveryResult]) -> None:
+        async with factory() as db:
+            await outbox.record_results(db, rows, part)
+            await db.commit()
+
+    await deliver(rows, on_results=_record)
+    async with factory() as db:
+        await outbox.refresh_notification_progress(db, (r.notification_id for r in rows))
+        await db.commit()
+    return len(rows)
+
+
+async def _loop() -> None:
+    while not _stop:
+        try:
+            if await drain_once():
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("email_outbox_iteration_failed")
+        await asyncio.sleep(settings.email_outbox_poll_seconds)
+
+
+def start_email_outbox_worker() -> Optional[asyncio.Task]:
+    """Start the in-process sender; safe to call once from app lifespan."""
+    global _task
+    if _task and not _task.done():
+        return _task
+    if not settings.is_database_configured or not settings.email_outbox_in_process:
+        logger.info("Skipping in-process email outbox worker")
+        return None
+    _task = asyncio.create_task(_loop(), name="email-outbox-sender")
+    logger.info("Started email outbox worker (poll %ss)", settings.email_outbox_poll_seconds)
+    return _task
+
+
+async def stop_email_outbox_worker() -> None:
+    global _task
+    if _task and not _task.done():
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+    _task = None
+
+
+def _request_stop(*_args: object) -> None:
+    global _stop
+    _stop = True
+    logger.info("email_worker_stop_requested")
+
+
+async def run_worker_loop() -> None:
+    from app.common.database.session import close_db, init_db
+
+    await init_db()
+    logger.info(
+        "email_worker_started batch=%s concurrency=%s",
+        settings.email_outbox_batch_size,
+        settings.email_outbox_concurrency,
+    )
+    await _loop()
+    await close_db()
+    logger.info("email_worker_stopped")
+
+
+def main() -> None:
+    # Ensure all ORM tables are registered before outbox FKs resolve.
+    import app.models  # noqa: F401
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+    asyncio.run(run_worker_loop())
+
+
+if __name__ == "__main__":
+    main()
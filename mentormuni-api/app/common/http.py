@@ -0,0 +1,13 @@
+"""Small HTTP helpers shared by routers (conditional requests)."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """True when an ``If-None-Match`` header names ``etag`` (weak or strong) or ``*``."""
+    if not header:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return "*" in tags or etag in tags
@@ -0,0 +1,52 @@
+"""Opaque keyset cursors for newest-first list endpoints.
+
+A cursor encodes the (created_at, id) of the last row the client saw. The next
+page is ``WHERE (created_at, id) < (:ts, :id) ORDER BY created_at DESC, id DESC``,
+which stays O(page) on an index instead of O(offset).
+"""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class CursorError(ValueError):
+    """Raised when a client sends a cursor we did not issue.
+
+    Not caught by the list services: the app-level handler in ``app.main`` turns it into
+    the same 400 on every cursor-paginated endpoint.
+    """
+
+    status_code = 400
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{int(row_id)}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts_raw, id_raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(ts_raw), int(id_raw)
+    except (ValueError, UnicodeError) as exc:
+        raise CursorError("Invalid cursor.") from exc
+
+
+def keyset_before(created_col, id_col, cursor: str) -> ColumnElement[bool]:
+    """Predicate selecting rows strictly after ``cursor`` in (created_at DESC, id DESC) order."""
+    ts, row_id = decode_cursor(cursor)
+    return or_(created_col < ts, and_(created_col == ts, id_col < row_id))
+
+
+def next_cursor_for(rows: list, limit: int, *, created_attr: str = "created_at") -> str | None:
+    """Cursor for the page after ``rows`` (fetched with ``limit + 1``), or None on the last page."""
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(getattr(last, created_attr), last.id)
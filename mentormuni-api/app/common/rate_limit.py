@@ -1,4 +1,4 @@
-"""Shared SlowAPI limiter instance for app + routers.
+"""Shared SlowAPI limiter instance for app + routers, plus the async limit store.
 
 Default API budget: 100 requests/minute per client key.
 
@@ -6,18 +6,53 @@ Keying strategy (campus-safe):
 - Prefer Authorization Bearer token fingerprint so 500–1000 students behind one
   college NAT do not share a single IP bucket.
 - Fall back to remote IP for unauthenticated / public routes.
+
+Storage (``RATE_LIMIT_STORAGE_URI``; unset = ``postgres`` when a database is configured,
+else ``memory://``):
+- ``memory://`` — per process; each uvicorn worker / replica keeps its own counters, so
+  the effective limit is N × the configured one.
+- ``redis://…`` / ``rediss://…`` / ``memcached://…`` — shared across workers for both the
+  SlowAPI decorators and the coding run/submit limits (needs the client package:
+  ``redis`` / ``pymemcache``).
+- ``postgres`` — coding limits use a token bucket in ``rate_limit_buckets`` (one UPSERT
+  per hit, no extra service). SlowAPI needs a synchronous store, so its decorators stay
+  in memory with this setting.
+
+``check_rate_limit_config`` refuses to start with ``WEB_CONCURRENCY > 1`` while the SlowAPI
+decorators are in memory (``postgres`` or ``memory://``): the 100/minute budget would
+silently become per worker. Use a ``redis://`` / ``memcached://`` store there.
+
+A shared store that errors (Redis / Postgres down) degrades the coding limits to
+per-process memory counters instead of failing the request, as SlowAPI does.
 """
 
 from __future__ import annotations
 
 import hashlib
+import logging
+import math
+import time
+from typing import Optional, Protocol
 
+from limits import RateLimitItemPerSecond
+from limits.aio.strategies import MovingWindowRateLimiter
+from limits.storage import storage_from_string
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from sqlalchemy import text
 from starlette.requests import Request
 
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
 # Product default for student-portal / interview-ready / mentor API calls.
 DEFAULT_API_LIMIT = "100/minute"
+POSTGRES_STORAGE = "postgres"
+MEMORY_STORAGE = "memory://"
+# Idle buckets (full again long ago) are pruned once every this many hits.
+PRUNE_EVERY_HITS = 1000
+PRUNE_IDLE_SECONDS = 24 * 3600
 
 
 def rate_limit_key(request: Request) -> str:
@@ -31,4 +66,133 @@ def rate_limit_key(request: Request) -> str:
     return get_remote_address(request)
 
 
-limiter = Limiter(key_func=rate_limit_key, default_limits=[DEFAULT_API_LIMIT])
+def _configured_storage_uri() -> str:
+    uri = settings.rate_limit_storage_uri
+    if not uri:
+        return POSTGRES_STORAGE if settings.is_database_configured else MEMORY_STORAGE
+    return uri
+
+
+def _slowapi_storage_uri() -> str:
+    uri = _configured_storage_uri()
+    return MEMORY_STORAGE if uri == POSTGRES_STORAGE else uri
+
+
+def check_rate_limit_config() -> None:
+    """Fail at startup instead of running per-worker SlowAPI limits (called from the app lifespan)."""
+    if _slowapi_storage_uri().startswith(MEMORY_STORAGE) and settings.web_concurrency > 1:
+        raise RuntimeError(
+            f"RATE_LIMIT_STORAGE_URI={_configured_storage_uri()} keeps the SlowAPI limits in "
+            f"process memory; with WEB_CONCURRENCY={settings.web_concurrency} set it to a "
+            "shared redis:// or memcached:// store."
+        )
+
+
+limiter = Limiter(
+    key_func=rate_limit_key,
+    default_limits=[DEFAULT_API_LIMIT],
+    storage_uri=_slowapi_storage_uri(),
+    # A shared-store outage degrades to per-process limits instead of failing requests.
+    in_memory_fallback_enabled=True,
+    swallow_errors=True,
+)
+
+
+class RateLimitStore(Protocol):
+    async def hit(self, key: str, *, limit: int, window_seconds: int) -> Optional[int]:
+        """Consume one unit; None when allowed, else seconds until a retry can succeed."""
+        ...
+
+
+class LimitsRateLimitStore:
+    """Moving-window limits on a ``limits`` async storage (memory, Redis, Memcached)."""
+
+    def __init__(self, uri: str) -> None:
+        self.uri = uri
+        self._limiter = MovingWindowRateLimiter(storage_from_string(f"async+{uri}"))
+
+    async def hit(self, key: str, *, limit: int, window_seconds: int) -> Optional[int]:
+        item = RateLimitItemPerSecond(limit, window_seconds)
+        if await self._limiter.hit(item, key):
+            return None
+        stats = await self._limiter.get_window_stats(item, key)
+        return max(1, math.ceil(stats.reset_time - time.time()))
+
+
+# Refill, then consume one token only if one is available. When the bucket is empty the
+# conflict UPDATE is skipped (WHERE fails), nothing is returned and the row is untouched.
+_TOKEN_BUCKET_UPSERT = text(
+    """
+    INSERT INTO rate_limit_buckets AS b (bucket_key, tokens, updated_at)
+    VALUES (:key, :capacity - 1, now())
+    ON CONFLICT (bucket_key) DO UPDATE
+    SET tokens = LEAST(
+            :capacity,
+            b.tokens + EXTRACT(EPOCH FROM (now() - b.updated_at)) * :rate
+        ) - 1,
+        updated_at = now()
+    WHERE LEAST(
+            :capacity,
+            b.tokens + EXTRACT(EPOCH FROM (now() - b.updated_at)) * :rate
+        ) >= 1
+    RETURNING b.tokens
+    """
+)
+
+
+class PostgresRateLimitStore:
+    """Token bucket per key in ``rate_limit_buckets``; one UPSERT per hit."""
+
+    def __init__(self) -> None:
+        self._hits = 0
+
+    async def hit(self, key: str, *, limit: int, window_seconds: int) -> Optional[int]:
+        from app.common.database.session import get_engine
+
+        rate = limit / window_seconds
+        params = {"key": key, "capacity": float(limit), "rate": rate}
+        self._hits += 1
+        # Own short transaction: the bucket row lock must not live as long as the request,
+        # and a request that later rolls back still spent its attempt.
+        async with get_engine().begin() as conn:
+            allowed = (await conn.execute(_TOKEN_BUCKET_UPSERT, params)).first() is not None
+            if self._hits % PRUNE_EVERY_HITS == 0:
+                await conn.execute(
+                    text(
+                        "DELETE FROM rate_limit_buckets "
+                        "WHERE updated_at < now() - make_interval(secs => :idle)"
+                    ),
+                    {"idle": PRUNE_IDLE_SECONDS},
+                )
+        return None if allowed else max(1, math.ceil(1 / rate))
+
+
+class FallbackRateLimitStore:
+    """Shared store with a per-process memory fallback for when it raises."""
+
+    def __init__(self, primary: RateLimitStore, fallback: Optional[RateLimitStore] = None) -> None:
+        self.primary = primary
+        self.fallback = fallback or LimitsRateLimitStore(MEMORY_STORAGE)
+
+    async def hit(self, key: str, *, limit: int, window_seconds: int) -> Optional[int]:
+        try:
+            return await self.primary.hit(key, limit=limit, window_seconds=window_seconds)
+        except Exception as exc:
+            logger.warning("rate_limit_store_unavailable store=%s err=%s", type(self.primary).__name__, exc)
+            return await self.fallback.hit(key, limit=limit, window_seconds=window_seconds)
+
+
+_store: Optional[RateLimitStore] = None
+
+
+def get_rate_limit_store() -> RateLimitStore:
+    global _store
+    if _store is None:
+        uri = _configured_storage_uri()
+        if uri == POSTGRES_STORAGE and settings.is_database_configured:
+            _store = FallbackRateLimitStore(PostgresRateLimitStore())
+        elif uri.startswith("memory://"):
+            _store = LimitsRateLimitStore(uri)
+        else:
+            _store = FallbackRateLimitStore(LimitsRateLimitStore(uri))
+    return _store
@@ -0,0 +1,192 @@
+"""
+Single-leader background scheduler for periodic "process due rows" jobs.
+
+Every uvicorn worker runs the app lifespan, so a plain ``asyncio`` loop there runs
+once per worker and all of them race on the same rows. ``LeaderScheduler`` instead:
+
+- elects one leader per job with a session-level Postgres advisory lock held on a
+  dedicated AUTOCOMMIT connection (followers retry every ``follower_poll_seconds``
+  and take over if the leader's connection goes away);
+- drains the backlog: ``run_batch`` is called in its own transaction until it
+  returns fewer rows than ``batch_size`` (claims should use ``FOR UPDATE SKIP
+  LOCKED`` so a second process, e.g. a deploy overlap, never double-processes);
+- sleeps until the earliest due row reported by ``next_due`` (clamped to
+  ``[min_sleep_seconds, max_sleep_seconds]``) instead of a fixed interval;
+  ``wake()`` cuts the sleep short when new work is scheduled in-process.
+
+Jobs are plain ``SchedulerJob`` values, so Fear → Fearless notifications, White Board
+and roadmap jobs can share the same component.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger("scheduler")
+
+RunBatch = Callable[[AsyncSession, int], Awaitable[int]]
+NextDue = Callable[[AsyncSession], Awaitable[Optional[datetime]]]
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a job name."""
+    return int.from_bytes(hashlib.sha256(f"scheduler:{name}".encode()).digest()[:8], "big", signed=True)
+
+
+@dataclass(frozen=True)
+class SchedulerJob:
+    name: str
+    # Process up to ``batch_size`` due rows in the given session; return how many.
+    run_batch: RunBatch
+    # Earliest pending due time (naive = UTC), or None when nothing is scheduled.
+    next_due: NextDue
+    batch_size: int = 200
+    min_sleep_seconds: float = 1.0
+    max_sleep_seconds: float = 60.0
+    follower_poll_seconds: float = 30.0
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
+class LeaderScheduler:
+    def __init__(self, job: SchedulerJob) -> None:
+        self.job = job
+        self.lock_key = advisory_lock_key(job.name)
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    # --- lifecycle -------------------------------------------------------
+
+    def start(self) -> Optional[asyncio.Task]:
+        if self._task and not self._task.done():
+            return self._task
+        if not settings.is_database_configured:
+            logger.info("scheduler_skipped job=%s reason=no_database", self.job.name)
+            return None
+        self._task = asyncio.create_task(self._run(), name=f"scheduler-{self.job.name}")
+        logger.info("scheduler_started job=%s", self.job.name)
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self.is_leader = False
+
+    def wake(self) -> None:
+        """Re-check due rows now (e.g. right after scheduling something sooner)."""
+        self._wake.set()
+
+    # --- leadership ------------------------------------------------------
+
+    @asynccontextmanager
+    async def _leadership(self) -> AsyncIterator[tuple[bool, Optional[AsyncConnection]]]:
+        """Yield ``(is_leader, lock_connection)`` for one election round."""
+        if not settings.database_url.startswith("postgresql"):
+            # No advisory locks (local SQLite) — single process, always leader.
+            yield True, None
+            return
+
+        from app.common.database.session import get_engine
+
+        conn = await get_engine().connect()
+        try:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            got = (
+                await conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": self.lock_key})
+            ).scalar()
+            if not got:
+                yield False, None
+                return
+            self.is_leader = True
+            logger.info("scheduler_leader_acquired job=%s", self.job.name)
+            try:
+                yield True, conn
+            finally:
+                self.is_leader = False
+                try:
+                    await conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": self.lock_key})
+                except Exception:
+                    pass  # connection gone — Postgres already released the lock
+        finally:
+            await conn.close()
+
+    # --- loop ------------------------------------------------------------
+
+    async def _sleep(self, seconds: float) -> None:
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, seconds))
+        except asyncio.TimeoutError:
+            pass
+
+    async def drain(self) -> int:
+        """Run batches until fewer than ``batch_size`` rows were due. Returns total processed."""
+        from app.common.database.session import async_session_factory
+
+        factory = async_session_factory()
+        total = 0
+        while True:
+            async with factory() as db:
+                try:
+                    n = await self.job.run_batch(db, self.job.batch_size)
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+            total += n
+            if n < self.job.batch_size:
+                return total
+
+    async def next_delay(self) -> float:
+        from app.common.database.session import async_session_factory
+
+        async with async_session_factory()() as db:
+            due = await self.job.next_due(db)
+        if due is None:
+            return self.job.max_sleep_seconds
+        wait = (_as_utc(due) - datetime.now(timezone.utc)).total_seconds()
+        return min(self.job.max_sleep_seconds, max(self.job.min_sleep_seconds, wait))
+
+    async def _lead(self, lock_conn: Optional[AsyncConnection]) -> None:
+        while True:
+            if lock_conn is not None:
+                # Lost the lock connection → lost leadership; re-elect.
+                await lock_conn.execute(text("SELECT 1"))
+            processed = await self.drain()
+            if processed:
+                logger.info("scheduler_drained job=%s processed=%s", self.job.name, processed)
+            await self._sleep(await self.next_delay())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self._leadership() as (leader, lock_conn):
+                    if not leader:
+                        await self._sleep(self.job.follower_poll_seconds)
+                        continue
+                    await self._lead(lock_conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("scheduler_iteration_failed job=%s", self.job.name)
+                await self._sleep(self.job.max_sleep_seconds)
@@ -2,14 +2,49 @@
 Password hashing helpers (bcrypt via passlib).
 
 Never store plain-text passwords. Always store password_hash.
+
+bcrypt is deliberately slow (~250 ms at cost 12) and releases the GIL while hashing, so
+request handlers use the ``*_async`` variants: they run on a dedicated, bounded thread
+pool instead of blocking the event loop (or starving the default ``to_thread`` executor).
+
+- at most ``password_hash_workers`` hashes run at once and ``password_hash_max_queue``
+  wait; beyond that ``PasswordHasherBusyError`` is raised (→ 503 + Retry-After) so a
+  credential-stuffing burst cannot queue unbounded work;
+- ``stats()`` reports queue depth and queue/run time (exposed on ``/health``);
+- ``verify_password_and_update_async`` also returns a fresh hash when the stored one was
+  made with a lower cost than ``password_bcrypt_rounds`` (rehash-on-login).
+
+The sync ``hash_password`` / ``verify_password`` remain for scripts and seeding.
 """
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
 from passlib.context import CryptContext
 
-# bcrypt is the industry default for password hashes.
-_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# bcrypt is the industry default for password hashes. Hashes below the configured cost
+# report needs_update=True and are upgraded on the next successful login.
+_pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.password_bcrypt_rounds,
+    bcrypt__min_rounds=settings.password_bcrypt_rounds,
+)
+
+
+class PasswordHasherBusyError(Exception):
+    def __init__(self, retry_after: int = 2) -> None:
+        super().__init__("Password hashing is at capacity.")
+        self.retry_after = retry_after
 
 
 def hash_password(plain_password: str) -> str:
@@ -22,3 +57,124 @@ def verify_password(plain_password: str, password_hash: str) -> bool:
     if not plain_password or not password_hash:
         return False
     return _pwd_context.verify(plain_password, password_hash)
+
+
+def verify_password_and_update(
+    plain_password: str, password_hash: str
+) -> tuple[bool, Optional[str]]:
+    """(matches, new_hash) — new_hash is set only when the stored hash needs a rehash."""
+    if not plain_password or not password_hash:
+        return False, None
+    return _pwd_context.verify_and_update(plain_password, password_hash)
+
+
+class PasswordHasher:
+    """Bounded thread pool for bcrypt work with queue-time metrics."""
+
+    def __init__(self, *, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_ms_total = 0.0
+        self.queue_ms_max = 0.0
+        self.run_ms_total = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def stats(self) -> dict[str, Any]:
+        done = self.completed or 1
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_queue_ms": round(self.queue_ms_total / done, 2),
+            "max_queue_ms": round(self.queue_ms_max, 2),
+            "avg_run_ms": round(self.run_ms_total / done, 2),
+        }
+
+    def _ensure(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._in_flight >= self.capacity:
+            self.rejected += 1
+            logger.warning("password_hasher_saturated %s", self.stats())
+            raise PasswordHasherBusyError()
+        self._in_flight += 1
+        submitted = time.perf_counter()
+        started: list[float] = []
+
+        def _timed() -> Any:
+            started.append(time.perf_counter())
+            return fn(*args)
+
+        try:
+            result = await asyncio.wrap_future(self._ensure().submit(_timed))
+            finished = time.perf_counter()
+            queue_ms = (started[0] - submitted) * 1000
+            self.completed += 1
+            self.queue_ms_total += queue_ms
+            self.queue_ms_max = max(self.queue_ms_max, queue_ms)
+            self.run_ms_total += (finished - started[0]) * 1000
+            return result
+        finally:
+            self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _hasher
+    if _hasher is None:
+        _hasher = PasswordHasher(
+            workers=settings.password_hash_workers,
+            max_queue=settings.password_hash_max_queue,
+        )
+    return _hasher
+
+
+def shutdown_password_hasher() -> None:
+    if _hasher is not None:
+        _hasher.shutdown()
+
+
+async def hash_password_async(plain_password: str) -> str:
+    return await get_password_hasher().run(hash_password, plain_password)
+
+
+async def verify_password_async(plain_password: str, password_hash: str) -> bool:
+    if not plain_password or not password_hash:
+        return False
+    return await get_password_hasher().run(verify_password, plain_password, password_hash)
+
+
+async def verify_password_and_update_async(
+    plain_password: str, password_hash: str
+) -> tuple[bool, Optional[str]]:
+    """Verify off the loop; new_hash is None unless rehash-on-login is on and needed."""
+    if not plain_password or not password_hash:
+        return False, None
+    ok, new_hash = await get_password_hasher().run(
+        verify_password_and_update, plain_password, password_hash
+    )
+    if not settings.password_rehash_on_login:
+        new_hash = None
+    return ok, new_hash
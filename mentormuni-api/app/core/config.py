@@ -26,6 +26,18 @@ class Settings(BaseSettings):
     llm_timeout_seconds: int = Field(default=120, ge=15, le=600)
     # Resume ATS: enrich summary/fixes/strengths with OpenAI (scores stay heuristic). Set false to skip LLM.
     resume_ats_use_llm: bool = Field(default=True)
+    # Resume ATS parsing + heuristic scoring run in a process pool (never on the event loop).
+    # Uploads beyond workers + max_queue get 503; a job over the timeout recycles the pool.
+    resume_ats_pool_workers: int = Field(default=2, ge=1, le=16)
+    resume_ats_pool_max_queue: int = Field(default=8, ge=0, le=256)
+    resume_ats_job_timeout_seconds: float = Field(default=20.0, ge=1, le=120)
+    # Address-space cap per pool process (RLIMIT_AS, Linux). 0 disables the cap.
+    resume_ats_worker_memory_mb: int = Field(default=768, ge=0, le=8192)
+    # Resume ATS result cache: per-process LRU (extracted text + analyses). With
+    # RESUME_ATS_CACHE_POSTGRES=true, analyses are also shared via resume_analysis_cache.
+    resume_ats_cache_max_entries: int = Field(default=512, ge=0, le=50_000)
+    resume_ats_cache_ttl_seconds: int = Field(default=7 * 24 * 3600, ge=60, le=90 * 24 * 3600)
+    resume_ats_cache_postgres: bool = Field(default=False)
     # OPTIMIZATION: Skip skill validation LLM call (saves 2-3s per request)
     skip_skill_validation: bool = Field(default=True)
     # OpenAI Realtime voice interview (GA). Override via REALTIME_MODEL if needed.
@@ -59,7 +71,30 @@ class Settings(BaseSettings):
     coding_job_max_attempts: int = Field(default=5, ge=1, le=20)
     coding_job_poll_interval_ms: int = Field(default=1500, ge=200, le=10_000)
     coding_job_stale_seconds: int = Field(default=300, ge=30, le=3600)
+    # Worker lane: "judge" (runs/submissions/analysis), "practice" (LLM practice generation)
+    # or "all". Practice jobs take minutes; a separate lane keeps them from queueing runs.
+    coding_worker_lane: str = Field(default="all")
+    coding_practice_max_concurrent_jobs: int = Field(default=2, ge=1, le=16)
+    # Whole LLM call for one practice problem; kept under coding_job_stale_seconds so a
+    # slow generation is never requeued (and generated twice) by stale recovery.
+    coding_practice_generate_timeout_seconds: int = Field(default=150, ge=15, le=1800)
+    # Judge0 poll statuses are buffered; coding_jobs.provider_* is written at most this often.
+    coding_provider_meta_flush_ms: int = Field(default=2000, ge=0, le=60_000)
+    # Run/submission progress over NOTIFY coding_progress → SSE (GET …/events). Streams send
+    # a keepalive (and re-check the DB) every keepalive interval and close after max seconds.
+    coding_progress_notify: bool = Field(default=True)
+    coding_stream_keepalive_seconds: float = Field(default=15.0, ge=1, le=60)
+    coding_stream_max_seconds: int = Field(default=600, ge=30, le=3600)
+    # Student assessment listing is cached per (org, filters) for this long (0 disables);
+    # publishing / assessment edits clear it in the same process.
+    coding_catalog_cache_seconds: int = Field(default=60, ge=0, le=3600)
     coding_execution_provider: str = Field(default="judge0")
+    # Worker cache of test-case bundles per problem version (text bytes budget). With
+    # CODING_TESTCASE_BUNDLE_DIR set, bundles ≥ the threshold are stored there compressed
+    # and memory-mapped instead of held in memory.
+    coding_testcase_cache_max_mb: int = Field(default=64, ge=0, le=4096)
+    coding_testcase_bundle_dir: str = Field(default="")
+    coding_testcase_disk_threshold_kb: int = Field(default=256, ge=1, le=1_048_576)
 
     # --- Phase 1: Database ---
     # Railway injects this. Locally set in .env.
@@ -70,6 +105,12 @@ class Settings(BaseSettings):
     db_pool_size: int = Field(default=20, ge=5, le=100)
     db_max_overflow: int = Field(default=40, ge=0, le=200)
     db_pool_timeout_seconds: int = Field(default=30, ge=5, le=120)
+    # Dashboards fan independent SELECTs out over separate pooled connections
+    # (one shared read-only snapshot). Set false to run them sequentially on one session.
+    db_parallel_reads: bool = Field(default=True)
+    # Process-wide cap on connections those fan-outs may hold at once (0 → DB_POOL_SIZE / 2).
+    # Calls that would exceed it run sequentially on the request session instead.
+    db_parallel_reads_max_connections: int = Field(default=0, ge=0, le=100)
 
     # --- Phase 1: Platform API key (frontend ↔ backend) ---
     # Long random secret. Frontend sends it on every request via X-API-Key.
@@ -127,6 +168,49 @@ class Settings(BaseSettings):
     email_from_address: str = Field(default="mentormuniteam@gmail.com")
     email_from_name: str = Field(default="MentorMuni Team")
     email_reply_to: str = Field(default="mentormuniteam@gmail.com")
+    # Email outbox sender (bulk notification email). Runs inside the API process unless
+    # EMAIL_OUTBOX_IN_PROCESS=false and the `email_worker` Procfile process is deployed.
+    email_outbox_in_process: bool = Field(default=True)
+    email_outbox_poll_seconds: float = Field(default=2.0, ge=0.2, le=60)
+    email_outbox_batch_size: int = Field(default=200, ge=1, le=2000)
+    email_outbox_concurrency: int = Field(default=4, ge=1, le=32)
+    email_outbox_max_attempts: int = Field(default=5, ge=1, le=20)
+    email_outbox_stale_seconds: int = Field(default=300, ge=30, le=3600)
+    # Per-provider send rates (Resend: requests/s, each request is a batch of ≤100).
+    email_resend_rate_per_second: float = Field(default=2.0, gt=0, le=100)
+    email_smtp_rate_per_second: float = Field(default=5.0, gt=0, le=100)
+    # Rate-limit storage shared by SlowAPI and the coding run/submit limits. memory:// is
+    # per process; redis://host:6379/0 (needs `redis`) is shared across workers and
+    # replicas; "postgres" keeps coding limits in rate_limit_buckets (SlowAPI stays local).
+    # Unset: "postgres" when DATABASE_URL is set, else memory://. SlowAPI in process
+    # memory is refused at startup with WEB_CONCURRENCY > 1.
+    rate_limit_storage_uri: str = Field(
+        default="", pattern=r"^(|postgres|memory://.*|rediss?://.*|memcached://.*)$"
+    )
+    # bcrypt cost for new hashes; older hashes below it are upgraded on login when
+    # PASSWORD_REHASH_ON_LOGIN=true. Hashing runs on a bounded thread pool: logins beyond
+    # workers + max_queue get 503 + Retry-After instead of queueing without limit.
+    password_bcrypt_rounds: int = Field(default=12, ge=10, le=15)
+    password_rehash_on_login: bool = Field(default=True)
+    password_hash_workers: int = Field(default=4, ge=1, le=32)
+    password_hash_max_queue: int = Field(default=64, ge=0, le=1024)
+    # Content-addressed blob store (Help Center screenshots). "s3" works with any
+    # S3-compatible bucket (AWS, R2, MinIO) and needs `boto3` installed. "local" writes under
+    # BLOB_STORE_LOCAL_DIR: not shared between instances and wiped on redeploy unless a
+    # volume is mounted there. Unset means "local" in development; outside development it
+    # must be set explicitly, and "local" is refused with WEB_CONCURRENCY > 1.
+    blob_store_backend: str = Field(default="", pattern="^(|local|s3)$")
+    blob_store_local_dir: str = Field(default="var/blobs")
+    blob_store_s3_bucket: str = Field(default="")
+    blob_store_s3_prefix: str = Field(default="blobs/")
+    blob_store_s3_endpoint_url: str = Field(default="")
+    blob_store_s3_region: str = Field(default="auto")
+    blob_store_s3_access_key_id: str = Field(default="")
+    blob_store_s3_secret_access_key: str = Field(default="")
+    # Longest edge of generated attachment thumbnails (needs Pillow; else originals are served).
+    blob_thumbnail_max_px: int = Field(default=320, ge=64, le=1024)
+    # Uvicorn worker processes (uvicorn reads the same variable); startup checks use it.
+    web_concurrency: int = Field(default=1, ge=1)
     # Env-specific portal URL for activation links (override on Railway if needed).
     org_portal_base_url: str = Field(default="https://www.mentormuni.com")
     tpo_activation_path: str = Field(default="/activate-tpo")
@@ -186,12 +270,16 @@ class Settings(BaseSettings):
             )
         return secret
 
+    @property
+    def is_development_env(self) -> bool:
+        return (self.app_env or "").lower() in {"development", "dev", "local", "test"}
+
     @property
     def demo_student_auth_allowed(self) -> bool:
         """True only when explicitly enabled and env is development-like."""
         if not self.enable_demo_student_auth:
             return False
-        return (self.app_env or "").lower() in {"development", "dev", "local", "test"}
+        return self.is_development_env
 
 
 @lru_cache
@@ -5,6 +5,7 @@ from __future__ import annotations
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.common.database.parallel import run_parallel_reads
 from app.common.tenant.context import TenantContext
 from app.dashboard.schemas import DashboardIdentityResponse, DepartmentFunnelRow
 from app.models.department import Department
@@ -13,6 +14,42 @@ from app.models.role import Role
 from app.models.user import User
 
 
+class FunnelCounts:
+    """
+    (department_id, role_code, status) → count, pivoted once from the GROUP BY rows.
+
+    Role and role+status totals are accumulated in the same pass so every lookup the
+    dashboard makes is a dict hit instead of a scan over all rows.
+    """
+
+    __slots__ = ("cells", "by_role_status", "by_role")
+
+    def __init__(self) -> None:
+        self.cells: dict[tuple[int | None, str, str], int] = {}
+        self.by_role_status: dict[tuple[str, str], int] = {}
+        self.by_role: dict[str, int] = {}
+
+    @classmethod
+    def from_rows(cls, rows) -> "FunnelCounts":
+        out = cls()
+        cells, by_role_status, by_role = out.cells, out.by_role_status, out.by_role
+        for r in rows:
+            cnt = int(r.cnt)
+            cells[(r.department_id, r.role_code, r.status)] = cnt
+            rs = (r.role_code, r.status)
+            by_role_status[rs] = by_role_status.get(rs, 0) + cnt
+            by_role[r.role_code] = by_role.get(r.role_code, 0) + cnt
+        return out
+
+    def get(self, dept_id: int | None, role: str, status: str) -> int:
+        return self.cells.get((dept_id, role, status), 0)
+
+    def sum_role(self, role: str, status: str | None = None) -> int:
+        if status is None:
+            return self.by_role.get(role, 0)
+        return self.by_role_status.get((role, status), 0)
+
+
 def _menu_for_role(role: str) -> list[str]:
     if role == RoleCode.ORG_ADMIN.value:
         return [
@@ -70,8 +107,6 @@ async def get_identity_dashboard(
     if dept_scope_id is not None:
         dept_stmt = dept_stmt.where(Department.id == dept_scope_id)
 
-    departments = list((await db.execute(dept_stmt)).scalars().all())
-
     # Counts by role+status (+department)
     count_stmt = (
         select(
@@ -88,40 +123,30 @@ async def get_identity_dashboard(
     if dept_scope_id is not None:
         count_stmt = count_stmt.where(User.department_id == dept_scope_id)
 
-    rows = (await db.execute(count_stmt)).all()
+    async def _departments(session: AsyncSession) -> list[Department]:
+        return list((await session.execute(dept_stmt)).scalars().all())
 
-    # Aggregate helpers
-    def _get(dept_id: int | None, role: str, status: str) -> int:
-        for r in rows:
-            if r.department_id == dept_id and r.role_code == role and r.status == status:
-                return int(r.cnt)
-        return 0
+    async def _counts(session: AsyncSession) -> list:
+        return list((await session.execute(count_stmt)).all())
 
-    def _sum_role(role: str, status: str | None = None, dept_id: int | None = ...) -> int:
-        total = 0
-        for r in rows:
-            if r.role_code != role:
-                continue
-            if status is not None and r.status != status:
-                continue
-            if dept_id is not ... and r.department_id != dept_id:
-                continue
-            total += int(r.cnt)
-        return total
+    departments, rows = await run_parallel_reads(db, _departments, _counts)
+
+    # One pass: per-cell counts + role totals (dict lookups below, no row scans).
+    counts = FunnelCounts.from_rows(rows)
 
     by_department: list[DepartmentFunnelRow] = []
     departments_without_hod = 0
     for d in departments:
         hod_count = (
-            _get(d.id, RoleCode.DEPARTMENT_ADMIN.value, UserStatus.ACTIVE.value)
-            + _get(d.id, RoleCode.DEPARTMENT_ADMIN.value, UserStatus.INVITED.value)
+            counts.get(d.id, RoleCode.DEPARTMENT_ADMIN.value, UserStatus.ACTIVE.value)
+            + counts.get(d.id, RoleCode.DEPARTMENT_ADMIN.value, UserStatus.INVITED.value)
         )
         if hod_count == 0:
             departments_without_hod += 1
-        pending = _get(d.id, RoleCode.STUDENT.value, UserStatus.PENDING.value)
-        active = _get(d.id, RoleCode.STUDENT.value, UserStatus.ACTIVE.value)
-        rejected = _get(d.id, RoleCode.STUDENT.value, UserStatus.REJECTED.value)
-        blocked = _get(d.id, RoleCode.STUDENT.value, UserStatus.BLOCKED.value)
+        pending = counts.get(d.id, RoleCode.STUDENT.value, UserStatus.PENDING.value)
+        active = counts.get(d.id, RoleCode.STUDENT.value, UserStatus.ACTIVE.value)
+        rejected = counts.get(d.id, RoleCode.STUDENT.value, UserStatus.REJECTED.value)
+        blocked = counts.get(d.id, RoleCode.STUDENT.value, UserStatus.BLOCKED.value)
         by_department.append(
             DepartmentFunnelRow(
                 department_id=d.id,
@@ -137,10 +162,10 @@ async def get_identity_dashboard(
             )
         )
 
-    students_pending = _sum_role(RoleCode.STUDENT.value, UserStatus.PENDING.value)
-    students_active = _sum_role(RoleCode.STUDENT.value, UserStatus.ACTIVE.value)
-    students_rejected = _sum_role(RoleCode.STUDENT.value, UserStatus.REJECTED.value)
-    students_blocked = _sum_role(RoleCode.STUDENT.value, UserStatus.BLOCKED.value)
+    students_pending = counts.sum_role(RoleCode.STUDENT.value, UserStatus.PENDING.value)
+    students_active = counts.sum_role(RoleCode.STUDENT.value, UserStatus.ACTIVE.value)
+    students_rejected = counts.sum_role(RoleCode.STUDENT.value, UserStatus.REJECTED.value)
+    students_blocked = counts.sum_role(RoleCode.STUDENT.value, UserStatus.BLOCKED.value)
 
     return DashboardIdentityResponse(
         organization_id=org_id,
@@ -149,7 +174,7 @@ async def get_identity_dashboard(
         menu=menu,
         departments_total=len(departments),
         departments_without_hod=departments_without_hod,
-        hods_total=_sum_role(RoleCode.DEPARTMENT_ADMIN.value),
+        hods_total=counts.sum_role(RoleCode.DEPARTMENT_ADMIN.value),
         students_total=students_pending
         + students_active
         + students_rejected
@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 from typing import Any, Optional
 
 from openai import AsyncOpenAI
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -1162,25 +1162,45 @@ class InterventionService:
             "status": status,
         }
 
-    async def dispatch_due_notifications(self, db: AsyncSession) -> int:
-        """Mark due private notifications as sent. Returns count dispatched."""
+    async def dispatch_due_notifications(self, db: AsyncSession, *, limit: int = 200) -> int:
+        """Mark up to ``limit`` due private notifications as sent. Returns count dispatched.
+
+        Rows are claimed oldest-due first with ``FOR UPDATE SKIP LOCKED`` so overlapping
+        dispatchers (e.g. during a deploy) never pick the same notification.
+        """
         now = utc_now()
-        due = list(
-            (
-                await db.execute(
-                    select(PrivateStudentNotification).where(
-                        PrivateStudentNotification.sent_date.is_(None),
-                        PrivateStudentNotification.scheduled_date <= now,
-                    ).limit(200)
-                )
-            ).scalars().all()
+        claim = (
+            select(PrivateStudentNotification.id)
+            .where(
+                PrivateStudentNotification.sent_date.is_(None),
+                PrivateStudentNotification.scheduled_date <= now,
+            )
+            .order_by(PrivateStudentNotification.scheduled_date, PrivateStudentNotification.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
         )
-        for n in due:
-            n.sent_date = now
-        if due:
-            await db.flush()
-            logger.info("Dispatched %s Fear → Fearless notifications", len(due))
-        return len(due)
+        result = await db.execute(
+            update(PrivateStudentNotification)
+            .where(PrivateStudentNotification.id.in_(claim))
+            .values(sent_date=now)
+            .returning(PrivateStudentNotification.id)
+            .execution_options(synchronize_session=False)
+        )
+        count = len(result.scalars().all())
+        if count:
+            logger.info("Dispatched %s Fear → Fearless notifications", count)
+        return count
+
+    async def next_notification_due(self, db: AsyncSession) -> Optional[datetime]:
+        """Earliest ``scheduled_date`` still waiting to be sent (naive UTC), if any."""
+        return (
+            await db.execute(
+                select(func.min(PrivateStudentNotification.scheduled_date)).where(
+                    PrivateStudentNotification.sent_date.is_(None)
+                )
+            )
+        ).scalar_one_or_none()
 
     async def list_notifications(
         self,
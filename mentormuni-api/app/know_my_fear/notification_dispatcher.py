@@ -1,66 +1,55 @@
-"""Background dispatcher for private Fear → Fearless notifications."""
+"""Background dispatcher for private Fear → Fearless notifications.
+
+Runs on the shared ``LeaderScheduler``: only one uvicorn worker (the advisory-lock
+holder) dispatches, the backlog is drained in ``BATCH_SIZE`` claims, and the next
+tick is scheduled from the earliest pending ``scheduled_date`` (at most
+``POLL_SECONDS`` away).
+"""
 
 from __future__ import annotations
 
 import asyncio
 import logging
+from datetime import datetime
 from typing import Optional
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.scheduler import LeaderScheduler, SchedulerJob
+
 logger = logging.getLogger(__name__)
 
-_task: Optional[asyncio.Task] = None
 POLL_SECONDS = 60
+BATCH_SIZE = 200
 
 
-def _db_ready() -> bool:
-    try:
-        from app.core.config import settings
+async def _run_batch(db: AsyncSession, limit: int) -> int:
+    from app.know_my_fear.intervention_service import InterventionService
 
-        return bool(settings.is_database_configured)
-    except Exception:
-        return False
+    return await InterventionService().dispatch_due_notifications(db, limit=limit)
 
 
-async def _loop() -> None:
-    from app.common.database.session import async_session_factory
+async def _next_due(db: AsyncSession) -> Optional[datetime]:
     from app.know_my_fear.intervention_service import InterventionService
 
-    service = InterventionService()
-    while True:
-        try:
-            if _db_ready():
-                factory = async_session_factory()
-                async with factory() as db:
-                    count = await service.dispatch_due_notifications(db)
-                    await db.commit()
-                    if count:
-                        logger.info("Fear → Fearless: sent %s due notifications", count)
-        except asyncio.CancelledError:
-            raise
-        except Exception:
-            logger.exception("Fear → Fearless notification dispatcher failed")
-        await asyncio.sleep(POLL_SECONDS)
+    return await InterventionService().next_notification_due(db)
+
+
+scheduler = LeaderScheduler(
+    SchedulerJob(
+        name="fear-to-fearless-notifications",
+        run_batch=_run_batch,
+        next_due=_next_due,
+        batch_size=BATCH_SIZE,
+        max_sleep_seconds=POLL_SECONDS,
+    )
+)
 
 
 def start_notification_dispatcher() -> Optional[asyncio.Task]:
     """Start background loop; safe to call once from app lifespan."""
-    global _task
-    if _task and not _task.done():
-        return _task
-    if not _db_ready():
-        logger.info("Skipping Fear → Fearless notification dispatcher (no DATABASE_URL)")
-        return None
-    _task = asyncio.create_task(_loop(), name="fear-to-fearless-notifications")
-    logger.info("Started Fear → Fearless notification dispatcher (every %ss)", POLL_SECONDS)
-    return _task
+    return scheduler.start()
 
 
 async def stop_notification_dispatcher() -> None:
-    global _task
-    if _task and not _task.done():
-        _task.cancel()
-        try:
-            await _task
-        except asyncio.CancelledError:
-            pass
-    _task = None
+    await scheduler.stop()
@@ -20,11 +20,19 @@ from typing import Optional
 
 from fastapi import Depends, FastAPI, File, Form, HTTPException, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
+from app.common.blobs import check_blob_store_config
 from app.common.deps import require_api_key
-from app.common.rate_limit import limiter
+from app.common.pagination import CursorError
+from app.common.rate_limit import check_rate_limit_config, limiter
+from app.common.security.passwords import (
+    PasswordHasherBusyError,
+    get_password_hasher,
+    shutdown_password_hasher,
+)
 
 from app.schemas.ai import (
     SkillReadinessPlanRequest,
@@ -49,6 +57,7 @@ from app.services.llm import LLMService
 from app.services.evaluator import EvaluatorService
 from app.services.voice_interview import VoiceInterviewService
 from app.services import resume_ats as resume_ats_service
+from app.services import resume_ats_cache, resume_ats_pool
 from app.core.config import settings
 from app.common.database import close_db, init_db
 from app.auth.router import router as auth_router
@@ -71,6 +80,8 @@ from app.know_my_fear.router_v2 import router as know_my_fear_router
 from app.know_my_fear.router_v2 import legacy_router as know_my_fear_legacy_router
 from app.know_my_fear.intervention_router import router as intervention_router
 from app.know_my_fear.intervention_router import legacy_router as intervention_legacy_router
+from app.common.email.worker import start_email_outbox_worker, stop_email_outbox_worker
+from app.organizations.students_import import start_import_job_recovery, stop_import_job_recovery
 from app.know_my_fear.notification_dispatcher import (
     start_notification_dispatcher,
     stop_notification_dispatcher,
@@ -80,6 +91,7 @@ from app.org_performance.router import ai_router as org_performance_ai_router
 from app.student_company_prep.router import router as student_company_prep_router
 from app.company_intelligence.router import router as company_intelligence_router
 from app.coding.router import router as coding_router
+from app.coding.streaming import hub as coding_progress_hub
 from app.platform_support.router import router as support_tenant_router
 from app.platform_support.platform_router import router as support_platform_router
 from app.whiteboard.router import router as whiteboard_router
@@ -87,11 +99,21 @@ from app.whiteboard.router import router as whiteboard_router
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
-    """Warm DB engine on startup; run Fear → Fearless notification dispatcher; dispose on shutdown."""
+    """Warm DB engine + resume ATS pool; run Fear → Fearless dispatcher + email outbox sender + import-job recovery; dispose on shutdown."""
+    check_blob_store_config()
+    check_rate_limit_config()
     await init_db()
     start_notification_dispatcher()
+    start_email_outbox_worker()
+    start_import_job_recovery()
+    resume_ats_pool.get_resume_ats_pool().warm()
     yield
+    await stop_email_outbox_worker()
+    await stop_import_job_recovery()
     await stop_notification_dispatcher()
+    resume_ats_pool.shutdown_resume_ats_pool()
+    shutdown_password_hasher()
+    await coding_progress_hub.stop()
     await close_db()
 
 
@@ -101,6 +123,21 @@ app = FastAPI(title="MentorMuni API", version="1.0.0", lifespan=lifespan)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+
+@app.exception_handler(CursorError)
+async def _cursor_error_handler(_request: Request, exc: CursorError):
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)})
+
+
+@app.exception_handler(PasswordHasherBusyError)
+async def _password_hasher_busy_handler(_request: Request, exc: PasswordHasherBusyError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many sign-in attempts in progress. Please retry shortly."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -156,6 +193,10 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "version": "1.0.0",
+        "resume_ats_pool": resume_ats_pool.get_resume_ats_pool().stats(),
+        "resume_ats_cache": resume_ats_cache.get_resume_ats_cache().stats(),
+        "password_hasher": get_password_hasher().stats(),
+        "coding_progress_hub": coding_progress_hub.stats(),
     }
 
 
@@ -355,6 +396,7 @@ async def voice_interview_analyze(request: Request, body: VoiceInterviewAnalyzeR
     responses={
         413: {"description": "File too large"},
         429: {"description": "Rate limit exceeded"},
+        503: {"description": "Resume analysis pool saturated (see Retry-After)"},
     },
 )
 @limiter.limit("100/minute")
@@ -370,6 +412,7 @@ async def resume_ats(
     Upload a resume (PDF, DOC, or DOCX) and receive ATS-style scores and keyword feedback.
     Multipart form fields: `file`, `target_role`; optional `candidate_type`, `experience_years`, `job_description`.
     Scores and keyword lists are heuristic; summary/fixes/strengths are enriched via OpenAI when enabled.
+    Repeat uploads of the same file with the same inputs are served from the analysis cache.
     """
     tr = (target_role or "").strip()
     if not tr:
@@ -400,16 +443,26 @@ async def resume_ats(
 
     name = (file.filename or "resume").strip() or "resume"
     try:
-        text = resume_ats_service.extract_text(name, raw)
-        payload = resume_ats_service.analyze_resume(
-            text,
+        payload = await resume_ats_cache.analyze_upload(
+            name,
+            raw,
             tr,
             candidate_type=ct,
             experience_years=experience_years,
             job_description=jd,
         )
-        payload = await resume_ats_service.enrich_analysis_with_llm(payload, text, tr, job_description=jd)
         return ResumeAtsResponse(**payload)
+    except resume_ats_pool.ResumeAtsBusyError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Resume analysis is busy right now. Please try again in a few seconds.",
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    except resume_ats_pool.ResumeAtsTimeoutError as e:
+        raise HTTPException(
+            status_code=422,
+            detail="This file took too long to read. Try exporting it as a simpler PDF or DOCX.",
+        ) from e
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e)) from e
     except HTTPException:
@@ -35,10 +35,15 @@ from app.models.role_permission import RolePermission
 from app.models.audit_log import AuditLog
 from app.models.notification import Notification
 from app.models.notification_recipient import NotificationRecipient
+from app.models.email_outbox import EmailOutbox
+from app.models.notification_inbox_counter import NotificationInboxCounter
 from app.models.workspace_item import WorkspaceItem
 from app.models.upcoming_drive import UpcomingDrive
 from app.models.platform_support import PlatformSupportTicket, PlatformSupportReply
 from app.models.whiteboard import WhiteboardMentorship, WhiteboardNote
+from app.models.student_import_job import StudentImportJob
+from app.models.resume_analysis_cache import ResumeAnalysisCacheEntry
+from app.models.rate_limit_bucket import RateLimitBucket
 from app.student_roadmap.models import (
     StudentAssessmentResult,
     StudentGeneratedRoadmap,
@@ -83,12 +88,17 @@ __all__ = [
     "AuditLog",
     "Notification",
     "NotificationRecipient",
+    "EmailOutbox",
+    "NotificationInboxCounter",
     "WorkspaceItem",
     "UpcomingDrive",
     "PlatformSupportTicket",
     "PlatformSupportReply",
     "WhiteboardNote",
     "WhiteboardMentorship",
+    "StudentImportJob",
+    "ResumeAnalysisCacheEntry",
+    "RateLimitBucket",
     "StudentRoadmapWeek",
     "StudentRoadmapStep",
     "StudentAssessmentResult",
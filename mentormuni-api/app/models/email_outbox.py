@@ -0,0 +1,74 @@
+"""email_outbox — durable queue of outbound emails drained by the email sender worker."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.common.database.base import Base
+
+OUTBOX_PENDING = "pending"
+OUTBOX_SENDING = "sending"
+OUTBOX_SENT = "sent"
+OUTBOX_SKIPPED = "skipped"  # EMAIL_ENABLED=false — counted as delivered
+OUTBOX_FAILED = "failed"
+OUTBOX_CANCELLED = "cancelled"
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    # Unique per logical message (e.g. "notification:42:user:7") — re-enqueue is a no-op.
+    idempotency_key: Mapped[str] = mapped_column(String(200), nullable=False, unique=True)
+    organization_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    notification_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("notifications.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    user_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    to_email: Mapped[str] = mapped_column(String(320), nullable=False)
+    to_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    subject: Mapped[str] = mapped_column(String(500), nullable=False)
+    text_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    html_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default=OUTBOX_PENDING)
+    provider: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    provider_message_id: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    attempt_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Optional
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -52,6 +52,12 @@ class Notification(Base):
     delivery_status: Mapped[str] = mapped_column(
         String(32), nullable=False, default="queued", server_default="queued"
     )
+    # notification_recipients rows written at create (avoids loading recipients to count)
+    recipient_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Email fan-out progress — written by the email outbox worker as rows settle.
+    emails_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    emails_sent: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    emails_failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     metadata_json: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
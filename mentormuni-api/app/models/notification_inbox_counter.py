@@ -0,0 +1,29 @@
+"""notification_inbox_counters — per-user unread badge count (one row per user)."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.common.database.base import Base
+
+
+class NotificationInboxCounter(Base):
+    """Maintained by notifications.service on fan-out, read, mark-all-read and cancel."""
+
+    __tablename__ = "notification_inbox_counters"
+
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
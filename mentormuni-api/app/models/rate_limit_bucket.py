@@ -0,0 +1,25 @@
+"""rate_limit_buckets — token buckets for RATE_LIMIT_STORAGE_URI=postgres.
+
+Written only through the single UPSERT in ``app.common.rate_limit``; the model exists so
+Alembic autogenerate and metadata stay in sync.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.common.database.base import Base
+
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+
+    # e.g. "coding:run:<student_id>"
+    bucket_key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
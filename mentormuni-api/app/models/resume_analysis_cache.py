@@ -0,0 +1,26 @@
+"""resume_analysis_cache — optional shared tier of the resume ATS result cache.
+
+Holds file-hash → text-hash mappings and analysis payloads only; resume text itself
+is never persisted (it stays in the per-process LRU).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.common.database.base import Base
+
+
+class ResumeAnalysisCacheEntry(Base):
+    __tablename__ = "resume_analysis_cache"
+
+    # "<kind>:<sha256>" — kind is file | heuristic | enriched.
+    cache_key: Mapped[str] = mapped_column(String(96), primary_key=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,79 @@
+"""student_import_jobs — progress for background bulk student imports (Org Portal)."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.common.database.base import Base
+
+IMPORT_JOB_QUEUED = "queued"
+IMPORT_JOB_RUNNING = "running"
+IMPORT_JOB_COMPLETED = "completed"
+IMPORT_JOB_FAILED = "failed"
+
+
+class StudentImportJob(Base):
+    __tablename__ = "student_import_jobs"
+    __table_args__ = (
+        Index(
+            "ix_student_import_jobs_active",
+            "status",
+            "updated_at",
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    organization_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    department_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("departments.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    created_by: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default=IMPORT_JOB_QUEUED)
+    source: Mapped[str] = mapped_column(String(32), nullable=False, default="import")
+    auto_enroll: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    send_invite_email: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    total_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    processed_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    skipped_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    emails_queued: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # First N row errors only ({row, email, message}); error_count has the full tally.
+    errors_json: Mapped[list[dict[str, Any]]] = mapped_column(
+        JSONB, nullable=False, default=list, server_default="[]"
+    )
+    failure_message: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # {"rows": [...], "csv_text": "..."} until the job finishes, so a job interrupted by a
+    # restart resumes after ``processed_rows`` (each chunk commits with its progress).
+    input_json: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -62,6 +62,10 @@ class CampusNotificationItem(BaseModel):
     delivery_status: str
     created_by: Optional[int] = None
     recipients_estimated: int = 0
+    # Email outbox progress (delivery_status summarizes these)
+    emails_total: int = 0
+    emails_sent: int = 0
+    emails_failed: int = 0
 
 
 class CampusNotificationListResponse(BaseModel):
@@ -4,6 +4,8 @@ Notification routes.
 POST   /notifications
 GET    /notifications
 GET    /notifications/inbox
+GET    /notifications/inbox/unread-count
+PUT    /notifications/inbox/read-all
 PUT    /notifications/{id}
 DELETE /notifications/{id}
 PUT    /notifications/{id}/read
@@ -11,7 +13,7 @@ PUT    /notifications/{id}/read
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.authz import require_permission
@@ -21,6 +23,8 @@ from app.common.tenant.deps import get_tenant_context
 from app.notifications import service as notif_service
 from app.notifications.schemas import (
     InboxItem,
+    InboxMarkAllReadResponse,
+    InboxUnreadCount,
     NotificationCreate,
     NotificationListResponse,
     NotificationResponse,
@@ -46,7 +50,7 @@ def _to_response(n) -> NotificationResponse:
         status=n.status,
         metadata_json=n.metadata_json,
         created_at=n.created_at,
-        recipient_count=len(n.recipients) if n.recipients is not None else 0,
+        recipient_count=n.recipient_count or 0,
     )
 
 
@@ -91,10 +95,21 @@ async def list_notifications(
 
 @router.get("/inbox", response_model=list[InboxItem])
 async def my_inbox(
+    response: Response,
+    status: str | None = Query(default=None, pattern="^(UNREAD|READ)$"),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     ctx: TenantContext = Depends(get_tenant_context),
 ) -> list[InboxItem]:
-    rows = await notif_service.inbox_for_user(db, user_id=ctx.user_id)
+    try:
+        rows, next_cursor = await notif_service.inbox_for_user(
+            db, user_id=ctx.user_id, status=status, limit=limit, cursor=cursor
+        )
+    except notif_service.NotificationError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [
         InboxItem(
             notification_id=r.notification_id,
@@ -108,6 +123,23 @@ async def my_inbox(
     ]
 
 
+@router.get("/inbox/unread-count", response_model=InboxUnreadCount)
+async def my_unread_count(
+    db: AsyncSession = Depends(get_db),
+    ctx: TenantContext = Depends(get_tenant_context),
+) -> InboxUnreadCount:
+    return InboxUnreadCount(unread=await notif_service.unread_count(db, user_id=ctx.user_id))
+
+
+@router.put("/inbox/read-all", response_model=InboxMarkAllReadResponse)
+async def mark_all_notifications_read(
+    db: AsyncSession = Depends(get_db),
+    ctx: TenantContext = Depends(get_tenant_context),
+) -> InboxMarkAllReadResponse:
+    updated = await notif_service.mark_all_read(db, user_id=ctx.user_id)
+    return InboxMarkAllReadResponse(updated=updated, unread=0)
+
+
 @router.put("/{notification_id}", response_model=NotificationResponse)
 async def update_notification(
     notification_id: int,
@@ -51,3 +51,12 @@ class InboxItem(BaseModel):
     status: str
     read_at: Optional[datetime] = None
     created_at: datetime
+
+
+class InboxUnreadCount(BaseModel):
+    unread: int = 0
+
+
+class InboxMarkAllReadResponse(BaseModel):
+    updated: int = 0
+    unread: int = 0
@@ -1,18 +1,18 @@
-"""Notification service — create + fan-out recipients + campus email queue."""
+"""Notification service — create + fan-out recipients + campus email outbox."""
 
 from __future__ import annotations
 
 import logging
 from datetime import date, datetime, time, timezone
 
-from sqlalchemy import select
+from sqlalchemy import BigInteger, Integer, Select, String, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager
 
 from app.common.audit import write_audit
-from app.common.database.session import async_session_factory
-from app.common.email import send_simple_email
-from app.common.email.exceptions import EmailError
+from app.common.email import outbox as email_outbox
+from app.common.pagination import keyset_before, next_cursor_for
 from app.common.tenant.context import TenantContext
 from app.models.enums import (
     NotificationAudience,
@@ -24,6 +24,7 @@ from app.models.enums import (
     UserStatus,
 )
 from app.models.notification import Notification
+from app.models.notification_inbox_counter import NotificationInboxCounter
 from app.models.notification_recipient import NotificationRecipient
 from app.models.role import Role
 from app.models.user import User
@@ -59,19 +60,19 @@ def stored_audience(fe: str) -> str:
     return _FE_TO_STORED.get(fe.lower().strip(), NotificationAudience.ORG.value)
 
 
-async def _resolve_recipient_ids(
-    db: AsyncSession,
+# Explicit USERS audiences are inserted with multi-row VALUES in chunks of this size.
+RECIPIENT_INSERT_CHUNK = 1000
+
+
+def _audience_user_ids(
     *,
     organization_id: int,
     audience: str,
     department_id: int | None,
-    user_ids: list[int] | None = None,
-) -> list[int]:
-    if audience == NotificationAudience.USERS.value:
-        return list(dict.fromkeys(user_ids or []))
-
+) -> Select:
+    """``SELECT users.id`` for an ORG / DEPARTMENT / HODS audience (set-based fan-out)."""
     if audience == NotificationAudience.HODS.value:
-        stmt = (
+        return (
             select(User.id)
             .join(Role, User.role_id == Role.id)
             .where(User.organization_id == organization_id)
@@ -79,7 +80,6 @@ async def _resolve_recipient_ids(
             .where(User.status.in_([UserStatus.ACTIVE.value, UserStatus.INVITED.value]))
             .where(Role.role_code == RoleCode.DEPARTMENT_ADMIN.value)
         )
-        return list((await db.execute(stmt)).scalars().all())
 
     stmt = (
         select(User.id)
@@ -91,7 +91,59 @@ async def _resolve_recipient_ids(
     )
     if audience == NotificationAudience.DEPARTMENT.value:
         stmt = stmt.where(User.department_id == department_id)
-    return list((await db.execute(stmt)).scalars().all())
+    return stmt
+
+
+async def _fan_out_recipients(
+    db: AsyncSession,
+    *,
+    notification_id: int,
+    organization_id: int,
+    audience: str,
+    department_id: int | None,
+    user_ids: list[int] | None = None,
+) -> int:
+    """
+    Insert ``notification_recipients`` rows without loading users or ORM objects.
+
+    Audience queries run as one ``INSERT … SELECT``; explicit user lists as chunked
+    multi-row inserts. Returns the number of recipients written.
+    """
+    unread = NotificationRecipientStatus.UNREAD.value
+    if audience == NotificationAudience.USERS.value:
+        ids = list(dict.fromkeys(user_ids or []))
+        written = 0
+        for start in range(0, len(ids), RECIPIENT_INSERT_CHUNK):
+            chunk = ids[start : start + RECIPIENT_INSERT_CHUNK]
+            result = await db.execute(
+                pg_insert(NotificationRecipient)
+                .values(
+                    [
+                        {"notification_id": notification_id, "user_id": uid, "status": unread}
+                        for uid in chunk
+                    ]
+                )
+                .on_conflict_do_nothing(constraint="uq_notification_recipients_notif_user")
+            )
+            written += max(0, result.rowcount or 0)
+        return written
+
+    audience_ids = _audience_user_ids(
+        organization_id=organization_id, audience=audience, department_id=department_id
+    ).subquery()
+    result = await db.execute(
+        pg_insert(NotificationRecipient)
+        .from_select(
+            ["notification_id", "user_id", "status"],
+            select(
+                literal(notification_id, BigInteger),
+                audience_ids.c.id,
+                literal(unread, String),
+            ),
+        )
+        .on_conflict_do_nothing(constraint="uq_notification_recipients_notif_user")
+    )
+    return max(0, result.rowcount or 0)
 
 
 async def create_notification(
@@ -154,22 +206,16 @@ async def create_notification(
     db.add(notif)
     await db.flush()
 
-    recipient_user_ids = await _resolve_recipient_ids(
+    notif.recipient_count = await _fan_out_recipients(
         db,
+        notification_id=notif.id,
         organization_id=ctx.organization_id,
         audience=audience,
         department_id=department_id,
         user_ids=user_ids,
     )
-
-    for uid in recipient_user_ids:
-        db.add(
-            NotificationRecipient(
-                notification_id=notif.id,
-                user_id=uid,
-                status=NotificationRecipientStatus.UNREAD.value,
-            )
-        )
+    if notif.recipient_count:
+        await _shift_unread_for_notification(db, notif.id, 1)
     await db.flush()
 
     await write_audit(
@@ -182,17 +228,14 @@ async def create_notification(
         payload={
             "audience": audience,
             "kind": kind_norm,
-            "recipients": len(recipient_user_ids),
+            "recipients": notif.recipient_count,
             "delivery_status": delivery_status,
         },
     )
 
-    result = await db.execute(
-        select(Notification)
-        .where(Notification.id == notif.id)
-        .options(selectinload(Notification.recipients))
-    )
-    return result.scalar_one()
+    # Server defaults (created_at) — recipients are never loaded here.
+    await db.refresh(notif)
+    return notif
 
 
 async def create_campus_notification(
@@ -224,7 +267,7 @@ async def create_campus_notification(
         event_date=event_date,
         delivery_status=NotificationDeliveryStatus.QUEUED.value,
     )
-    return notif, len(notif.recipients or [])
+    return notif, notif.recipient_count
 
 
 async def list_notifications(
@@ -236,7 +279,6 @@ async def list_notifications(
         select(Notification)
         .where(Notification.organization_id == organization_id)
         .where(Notification.deleted_at.is_(None))
-        .options(selectinload(Notification.recipients))
         .order_by(Notification.id.desc())
     )
     items = list((await db.execute(stmt)).scalars().unique().all())
@@ -248,7 +290,6 @@ async def get_notification(db: AsyncSession, notification_id: int) -> Notificati
         select(Notification)
         .where(Notification.id == notification_id)
         .where(Notification.deleted_at.is_(None))
-        .options(selectinload(Notification.recipients))
     )
     notif = result.scalar_one_or_none()
     if notif is None:
@@ -256,40 +297,111 @@ async def get_notification(db: AsyncSession, notification_id: int) -> Notificati
     return notif
 
 
+def _is_visible(notif: Notification) -> bool:
+    """Shown in inboxes (and counted in unread badges)."""
+    return notif.deleted_at is None and notif.status == NotificationStatus.ACTIVE.value
+
+
+async def _shift_unread_for_notification(
+    db: AsyncSession, notification_id: int, delta: int
+) -> None:
+    """Add ``delta`` (±1) to the unread counter of every UNREAD recipient of one notification."""
+    unread_users = (
+        select(NotificationRecipient.user_id)
+        .where(NotificationRecipient.notification_id == notification_id)
+        .where(NotificationRecipient.status == NotificationRecipientStatus.UNREAD.value)
+    )
+    if delta > 0:
+        ins = pg_insert(NotificationInboxCounter).from_select(
+            ["user_id", "unread_count"],
+            # Fixed lock order so concurrent fan-outs to overlapping audiences cannot deadlock.
+            unread_users.add_columns(literal(delta, Integer)).order_by(
+                NotificationRecipient.user_id
+            ),
+        )
+        await db.execute(
+            ins.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    "unread_count": NotificationInboxCounter.unread_count
+                    + ins.excluded.unread_count,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+        return
+    await db.execute(
+        update(NotificationInboxCounter)
+        .where(NotificationInboxCounter.user_id.in_(unread_users))
+        .values(
+            unread_count=func.greatest(0, NotificationInboxCounter.unread_count + delta),
+            updated_at=func.now(),
+        )
+    )
+
+
 async def update_notification(
     db: AsyncSession,
     notification_id: int,
     **fields: object,
 ) -> Notification:
     notif = await get_notification(db, notification_id)
+    was_visible = _is_visible(notif)
     for key, value in fields.items():
         if value is None:
             continue
         setattr(notif, key, value)
     await db.flush()
+    if _is_visible(notif) != was_visible:
+        await _shift_unread_for_notification(db, notification_id, -1 if was_visible else 1)
     return await get_notification(db, notification_id)
 
 
 async def soft_delete_notification(db: AsyncSession, notification_id: int) -> Notification:
     notif = await get_notification(db, notification_id)
+    if _is_visible(notif):
+        await _shift_unread_for_notification(db, notification_id, -1)
     notif.deleted_at = datetime.now(timezone.utc)
     notif.status = NotificationStatus.INACTIVE.value
     notif.delivery_status = NotificationDeliveryStatus.CANCELLED.value
+    await email_outbox.cancel_for_notification(db, notification_id)
     await db.flush()
     return notif
 
 
-async def inbox_for_user(db: AsyncSession, *, user_id: int) -> list[NotificationRecipient]:
-    result = await db.execute(
+async def inbox_for_user(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    status: str | None = None,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> tuple[list[NotificationRecipient], str | None]:
+    """Newest-first inbox page (keyset on recipient created_at, id). Returns (rows, next_cursor)."""
+    stmt = (
         select(NotificationRecipient)
         .join(Notification, NotificationRecipient.notification_id == Notification.id)
         .where(NotificationRecipient.user_id == user_id)
         .where(Notification.deleted_at.is_(None))
         .where(Notification.status == NotificationStatus.ACTIVE.value)
-        .options(selectinload(NotificationRecipient.notification))
-        .order_by(NotificationRecipient.id.desc())
+        .options(contains_eager(NotificationRecipient.notification))
+        .order_by(NotificationRecipient.created_at.desc(), NotificationRecipient.id.desc())
+        .limit(limit + 1)
     )
-    return list(result.scalars().unique().all())
+    if status:
+        stmt = stmt.where(NotificationRecipient.status == status)
+    if cursor:
+        stmt = stmt.where(
+            keyset_before(NotificationRecipient.created_at, NotificationRecipient.id, cursor)
+        )
+    rows = list((await db.execute(stmt)).scalars().all())
+    return rows[:limit], next_cursor_for(rows, limit)
+
+
+async def unread_count(db: AsyncSession, *, user_id: int) -> int:
+    """Bell badge — one primary-key lookup."""
+    counter = await db.get(NotificationInboxCounter, user_id)
+    return int(counter.unread_count) if counter is not None else 0
 
 
 async def mark_read(
@@ -299,123 +411,115 @@ async def mark_read(
     user_id: int,
 ) -> NotificationRecipient:
     result = await db.execute(
-        select(NotificationRecipient).where(
+        select(NotificationRecipient)
+        .join(Notification, NotificationRecipient.notification_id == Notification.id)
+        .where(
             NotificationRecipient.notification_id == notification_id,
             NotificationRecipient.user_id == user_id,
         )
+        .options(contains_eager(NotificationRecipient.notification))
     )
     row = result.scalar_one_or_none()
     if row is None:
         raise NotificationError("Inbox item not found.", status_code=404)
+    if row.status == NotificationRecipientStatus.UNREAD.value and _is_visible(row.notification):
+        await db.execute(
+            update(NotificationInboxCounter)
+            .where(NotificationInboxCounter.user_id == user_id)
+            .values(
+                unread_count=func.greatest(0, NotificationInboxCounter.unread_count - 1),
+                updated_at=func.now(),
+            )
+        )
     row.status = NotificationRecipientStatus.READ.value
     row.read_at = datetime.now(timezone.utc)
     await db.flush()
     return row
 
 
-async def deliver_notification_emails(notification_id: int) -> None:
-    """Background email fan-out. Updates delivery_status; never blocks the create API."""
-    factory = async_session_factory()
-    async with factory() as db:
-        try:
-            result = await db.execute(
-                select(Notification)
-                .where(Notification.id == notification_id)
-                .options(selectinload(Notification.recipients))
-            )
-            notif = result.scalar_one_or_none()
-            if notif is None or notif.deleted_at is not None:
-                return
-            if notif.delivery_status == NotificationDeliveryStatus.CANCELLED.value:
-                return
-
-            notif.delivery_status = NotificationDeliveryStatus.SENDING.value
-            await db.commit()
-
-            recipient_ids = [r.user_id for r in (notif.recipients or [])]
-            if not recipient_ids:
-                notif.delivery_status = NotificationDeliveryStatus.SENT.value
-                await db.commit()
-                return
-
-            users_result = await db.execute(
-                select(User).where(User.id.in_(recipient_ids)).where(User.deleted_at.is_(None))
-            )
-            users = list(users_result.scalars().all())
-
-            kind_label = (notif.kind or "announcement").capitalize()
-            date_line = ""
-            if notif.event_date:
-                date_line = f"\nDate: {notif.event_date.date().isoformat()}"
-
-            subject = f"[MentorMuni] {kind_label}: {notif.title}"
-            sent = 0
-            failed = 0
-            for user in users:
-                if not user.email:
-                    continue
-                text = (
-                    f"Hi {user.first_name or 'there'},\n\n"
-                    f"{notif.title}\n"
-                    f"{date_line}\n\n"
-                    f"{notif.body}\n\n"
-                    f"— MentorMuni Campus"
-                )
-                try:
-                    result_email = await send_simple_email(
-                        to_email=user.email,
-                        to_name=f"{user.first_name} {user.last_name}".strip() or None,
-                        subject=subject,
-                        text_body=text,
-                    )
-                    if result_email.sent or result_email.skipped:
-                        sent += 1
-                    else:
-                        failed += 1
-                except EmailError as exc:
-                    failed += 1
-                    logger.warning(
-                        "notification_email_failed notification_id=%s user_id=%s err=%s",
-                        notification_id,
-                        user.id,
-                        exc,
-                    )
-                except Exception as exc:
-                    failed += 1
-                    logger.warning(
-                        "notification_email_unexpected notification_id=%s user_id=%s err=%s",
-                        notification_id,
-                        user.id,
-                        exc,
-                    )
+async def mark_all_read(db: AsyncSession, *, user_id: int) -> int:
+    """Mark every unread inbox row read in one UPDATE and zero the badge. Returns rows updated."""
+    result = await db.execute(
+        update(NotificationRecipient)
+        .where(NotificationRecipient.user_id == user_id)
+        .where(NotificationRecipient.status == NotificationRecipientStatus.UNREAD.value)
+        .values(status=NotificationRecipientStatus.READ.value, read_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(NotificationInboxCounter)
+        .where(NotificationInboxCounter.user_id == user_id)
+        .values(unread_count=0, updated_at=func.now())
+    )
+    return max(0, result.rowcount or 0)
+
+
+def _notification_email_tail(notif: Notification) -> str:
+    """Email text after the per-user ``Hi <first name>,`` greeting."""
+    date_line = ""
+    if notif.event_date:
+        date_line = f"\nDate: {notif.event_date.date().isoformat()}"
+    return (
+        f",\n\n"
+        f"{notif.title}\n"
+        f"{date_line}\n\n"
+        f"{notif.body}\n\n"
+        f"— MentorMuni Campus"
+    )
 
-            await db.refresh(notif)
-            if notif.delivery_status == NotificationDeliveryStatus.CANCELLED.value:
-                await db.commit()
-                return
-            if failed == 0:
-                notif.delivery_status = NotificationDeliveryStatus.SENT.value
-            elif sent == 0:
-                notif.delivery_status = NotificationDeliveryStatus.FAILED.value
-            else:
-                notif.delivery_status = NotificationDeliveryStatus.PARTIAL.value
-            await db.commit()
-            logger.info(
-                "notification_delivery_done id=%s sent=%s failed=%s status=%s",
-                notification_id,
-                sent,
-                failed,
-                notif.delivery_status,
-            )
-        except Exception:
-            logger.exception("notification_delivery_crashed id=%s", notification_id)
-            try:
-                await db.rollback()
-                n = await db.get(Notification, notification_id)
-                if n is not None:
-                    n.delivery_status = NotificationDeliveryStatus.FAILED.value
-                    await db.commit()
-            except Exception:
-                logger.exception(
-                    "notification_delivery_status_update_failed id=%s", notification_id
-                )
+
+async def enqueue_notification_emails(db: AsyncSession, notif: Notification) -> int:
+    """
+    Queue one outbox email per recipient in the caller's transaction.
+
+    One ``INSERT … SELECT`` over notification_recipients ⨝ users; the email outbox
+    worker sends them and writes progress back to ``delivery_status`` /
+    ``emails_sent`` / ``emails_failed``.
+    """
+    kind_label = (notif.kind or "announcement").capitalize()
+    subject = f"[MentorMuni] {kind_label}: {notif.title}"
+    first = func.coalesce(func.nullif(User.first_name, ""), "there")
+    rows = (
+        select(
+            func.concat("notification:", notif.id, ":user:", User.id),
+            literal(notif.organization_id, BigInteger),
+            literal(notif.id, BigInteger),
+            User.id,
+            User.email,
+            func.nullif(
+                func.btrim(
+                    func.concat(
+                        func.coalesce(User.first_name, ""), " ", func.coalesce(User.last_name, "")
+                    )
+                ),
+                "",
+            ),
+            literal(subject[:500], String),
+            func.concat("Hi ", first, _notification_email_tail(notif)),
+        )
+        .join(NotificationRecipient, NotificationRecipient.user_id == User.id)
+        .where(NotificationRecipient.notification_id == notif.id)
+        .where(User.deleted_at.is_(None))
+        .where(User.email.is_not(None))
+        .where(User.email != "")
+    )
+    queued = await email_outbox.enqueue_from_select(
+        db,
+        [
+            "idempotency_key",
+            "organization_id",
+            "notification_id",
+            "user_id",
+            "to_email",
+            "to_name",
+            "subject",
+            "text_body",
+        ],
+        rows,
+    )
+    notif.emails_total = (notif.emails_total or 0) + queued
+    if not notif.emails_total:
+        notif.delivery_status = NotificationDeliveryStatus.SENT.value
+    await db.flush()
+    logger.info("notification_emails_queued id=%s queued=%s", notif.id, queued)
+    return queued
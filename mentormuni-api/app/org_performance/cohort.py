@@ -0,0 +1,187 @@
+"""
+Column-major cohort frame for TPO/HOD analytics.
+
+``get_performance_summary`` used to walk the scorecard list once per statistic —
+bands, pillar means, each department, each area board, leaders, at-risk — and
+recompute ``_area_score`` for every student on every pass. ``CohortFrame`` extracts
+each metric once into a compact ``array('d')`` column (NaN = not scored) indexed by
+row position, so summaries, department group-bys, percentiles, histograms and
+top/bottom-k all read the same columns.
+
+Ordering matches the list-based code it replaces: rows keep scorecard order, and
+``top_k`` / ``bottom_k`` are ``heapq.nlargest`` / ``nsmallest`` (stable, equal to
+``sorted(...)[:k]``), so leaderboards tie-break exactly as before.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+from typing import Any, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+_NAN = float("nan")
+
+READINESS_STRONG = 75.0
+READINESS_MID = 50.0
+DEFAULT_PERCENTILES: tuple[int, ...] = (10, 25, 50, 75, 90)
+# 10-point buckets: [0,10), [10,20), … [90,100]
+DEFAULT_HISTOGRAM_EDGES: tuple[float, ...] = tuple(float(x) for x in range(10, 100, 10))
+
+Rows = Optional[Sequence[int]]
+
+
+def _round1(value: float) -> float:
+    return round(value, 1)
+
+
+class CohortFrame(Generic[T]):
+    """Score columns for a list of rows (scorecards), built once per summary."""
+
+    __slots__ = ("rows", "_cols")
+
+    def __init__(self, rows: Sequence[T], cols: dict[str, array]) -> None:
+        self.rows = rows
+        self._cols = cols
+
+    @classmethod
+    def build(
+        cls,
+        rows: Sequence[T],
+        columns: Mapping[str, Callable[[T], Optional[float]]],
+    ) -> "CohortFrame[T]":
+        cols: dict[str, array] = {}
+        for name, extract in columns.items():
+            col = array("d", bytes(8 * len(rows)))
+            for i, row in enumerate(rows):
+                v = extract(row)
+                col[i] = _NAN if v is None else float(v)
+            cols[name] = col
+        return cls(rows, cols)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return tuple(self._cols)
+
+    def column(self, name: str) -> array:
+        return self._cols[name]
+
+    # --- row selection ---------------------------------------------------
+
+    def group_by(self, key: Callable[[T], Hashable]) -> dict[Any, array]:
+        """Row indices per key value (e.g. department id), in row order."""
+        groups: dict[Any, array] = {}
+        for i, row in enumerate(self.rows):
+            k = key(row)
+            idx = groups.get(k)
+            if idx is None:
+                idx = groups[k] = array("I")
+            idx.append(i)
+        return groups
+
+    def present(self, name: str, rows: Rows = None) -> list[int]:
+        """Row indices that have a value in column ``name``."""
+        col = self._cols[name]
+        it = range(len(col)) if rows is None else rows
+        return [i for i in it if not math.isnan(col[i])]
+
+    def values(self, name: str, rows: Rows = None) -> list[float]:
+        col = self._cols[name]
+        it = range(len(col)) if rows is None else rows
+        return [v for v in (col[i] for i in it) if not math.isnan(v)]
+
+    # --- reductions ------------------------------------------------------
+
+    def count(self, name: str, rows: Rows = None) -> int:
+        return len(self.present(name, rows))
+
+    def total(self, name: str, rows: Rows = None) -> float:
+        return sum(self.values(name, rows))
+
+    def mean(self, name: str, rows: Rows = None) -> Optional[float]:
+        """Mean rounded to one decimal (same rounding as the dashboards' ``_mean``)."""
+        vals = self.values(name, rows)
+        if not vals:
+            return None
+        return _round1(sum(vals) / len(vals))
+
+    def percentiles(
+        self,
+        name: str,
+        qs: Iterable[int] = DEFAULT_PERCENTILES,
+        rows: Rows = None,
+    ) -> dict[str, Optional[float]]:
+        """Linear-interpolated percentiles (``p50`` = median), rounded to one decimal."""
+        vals = sorted(self.values(name, rows))
+        out: dict[str, Optional[float]] = {}
+        for q in qs:
+            if not vals:
+                out[f"p{q}"] = None
+                continue
+            pos = (len(vals) - 1) * (q / 100.0)
+            lo = int(pos)
+            hi = min(lo + 1, len(vals) - 1)
+            out[f"p{q}"] = _round1(vals[lo] + (vals[hi] - vals[lo]) * (pos - lo))
+        return out
+
+    def histogram(
+        self,
+        name: str,
+        edges: Sequence[float] = DEFAULT_HISTOGRAM_EDGES,
+        rows: Rows = None,
+    ) -> list[int]:
+        """Counts per bucket; ``len(edges) + 1`` buckets split at each edge (left-closed)."""
+        counts = [0] * (len(edges) + 1)
+        for v in self.values(name, rows):
+            counts[bisect_right(edges, v)] += 1
+        return counts
+
+    def bands(
+        self,
+        name: str,
+        rows: Rows = None,
+        *,
+        strong: float = READINESS_STRONG,
+        mid: float = READINESS_MID,
+    ) -> tuple[int, int, int]:
+        """(strong, mid, weak) counts for scored rows: ≥strong, ≥mid, below mid."""
+        s = m = w = 0
+        for v in self.values(name, rows):
+            if v >= strong:
+                s += 1
+            elif v >= mid:
+                m += 1
+            else:
+                w += 1
+        return s, m, w
+
+    # --- ranking ---------------------------------------------------------
+
+    def top_k(self, name: str, k: int, rows: Rows = None) -> list[tuple[int, float]]:
+        """Highest ``k`` (row index, value) pairs; ties keep row order."""
+        col = self._cols[name]
+        return heapq.nlargest(
+            k, ((i, col[i]) for i in self.present(name, rows)), key=lambda p: p[1]
+        )
+
+    def bottom_k(
+        self,
+        name: str,
+        k: int,
+        rows: Rows = None,
+        *,
+        below: Optional[float] = None,
+    ) -> list[tuple[int, float]]:
+        """Lowest ``k`` (row index, value) pairs, optionally only values ``< below``."""
+        col = self._cols[name]
+        pairs: Iterable[tuple[int, float]] = ((i, col[i]) for i in self.present(name, rows))
+        if below is not None:
+            pairs = [(i, v) for i, v in pairs if v < below]
+        return heapq.nsmallest(k, pairs, key=lambda p: p[1])
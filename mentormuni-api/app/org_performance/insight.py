@@ -21,6 +21,7 @@ Given ONLY the metrics JSON below, write a decision brief with full clarity for
 
 Rules:
 - Use ONLY the provided numbers. Do not invent departments, students, or scores.
+- Use distributions (percentiles, 10-point histograms) to describe spread, not just averages.
 - Cover readiness bands, test completion (given vs remaining), pillar strengths and preparation gaps,
   top performers vs less-prepared students, and shortlist readiness when present.
 - Never call students "weak". Say they are less prepared / need more practice.
@@ -199,6 +200,21 @@ def _metrics_for_llm(
             for b in summary.area_boards
             if not focus_area or focus_area == "overall" or b.area == focus_area
         ],
+        "distributions": [
+            {
+                "area": x.area,
+                "students_scored": x.students_scored,
+                "p10": x.p10,
+                "p25": x.p25,
+                "p50": x.p50,
+                "p75": x.p75,
+                "p90": x.p90,
+                "histogram_10pt": x.histogram,
+            }
+            for x in summary.distributions
+            if x.students_scored
+            and (not focus_area or focus_area == "overall" or x.area in (focus_area, "overall"))
+        ],
         "at_risk_count": len(summary.at_risk),
     }
     if include_leaderboard:
@@ -274,6 +290,7 @@ def _heuristic_insight(
     board = next((b for b in summary.area_boards if b.area == focus), None)
     if board is None:
         board = next((b for b in summary.area_boards if b.area == "overall"), None)
+    spread = next((d for d in summary.distributions if d.area == "overall"), None)
 
     summary_text = (
         f"{scope} avg readiness is {avg if avg is not None else 'n/a'}% with "
@@ -284,6 +301,10 @@ def _heuristic_insight(
         f"{weak} are less prepared (<50%). "
         f"Top prep gap: {gap}. Strength: {strength}."
     )
+    if spread is not None and spread.p50 is not None:
+        summary_text += (
+            f" Median readiness is {spread.p50}% (middle half {spread.p25}–{spread.p75}%)."
+        )
     actions = list(clarity.priorities) if clarity.priorities else [
         f"Assign targeted practice for the {weak} less-prepared students (focus: {gap})",
         "Run a skills or interview mock sprint for the developing band (50–74%)",
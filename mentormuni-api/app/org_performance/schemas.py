@@ -90,6 +90,20 @@ class AreaBoard(BaseModel):
     less_prepared: list[RankedStudent] = Field(default_factory=list)
 
 
+class ScoreDistribution(BaseModel):
+    """Percentiles + 10-point histogram for one area (cohort spread, not just the mean)."""
+
+    area: str
+    label: str
+    students_scored: int = 0
+    p10: Optional[float] = None
+    p25: Optional[float] = None
+    p50: Optional[float] = None
+    p75: Optional[float] = None
+    p90: Optional[float] = None
+    histogram: list[int] = Field(default_factory=list)  # [0,10), [10,20), … [90,100]
+
+
 class LevelFunnelItem(BaseModel):
     level: int
     label: str
@@ -197,6 +211,7 @@ class PerformanceSummaryOut(BaseModel):
     at_risk: list[LeaderboardEntry] = Field(default_factory=list)
     area_leaders: list[AreaLeader] = Field(default_factory=list)
     area_boards: list[AreaBoard] = Field(default_factory=list)
+    distributions: list[ScoreDistribution] = Field(default_factory=list)
     clarity: ClarityBoard = Field(default_factory=ClarityBoard)
     board_limit: int = 10
     active_7d: int = 0
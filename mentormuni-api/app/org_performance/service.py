@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from collections import Counter, defaultdict
+from collections.abc import Callable
 from datetime import date, datetime, timezone
 from typing import Any, Optional
 
@@ -11,12 +12,14 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.common.database.parallel import run_parallel_reads
 from app.common.tenant.context import TenantContext
 from app.models.department import Department
 from app.models.enums import RoleCode, UserStatus
 from app.models.role import Role
 from app.models.upcoming_drive import UpcomingDrive
 from app.models.user import User
+from app.org_performance.cohort import READINESS_MID, CohortFrame
 from app.org_performance.schemas import (
     AreaBoard,
     AreaLeader,
@@ -29,6 +32,7 @@ from app.org_performance.schemas import (
     PerformanceSummaryOut,
     PillarAverages,
     RankedStudent,
+    ScoreDistribution,
     ScorecardListOut,
     StudentScorecard,
     TestsAggregate,
@@ -199,31 +203,36 @@ def _to_ranked(card: StudentScorecard, rank: int, score: Optional[float]) -> Ran
     )
 
 
-def _build_area_boards(cards: list[StudentScorecard], *, limit: int) -> list[AreaBoard]:
+def _cohort_frame(cards: list[StudentScorecard]) -> CohortFrame[StudentScorecard]:
+    """One column per area (``overall`` = readiness) plus mock and test counts."""
+    columns: dict[str, Callable[[StudentScorecard], Optional[float]]] = {
+        area: (lambda c, a=area: _area_score(c, a)) for area in AREA_META
+    }
+    columns["mock"] = lambda c: c.mock_score
+    columns["tests_done"] = lambda c: c.tests_done
+    columns["tests_remaining"] = lambda c: c.tests_remaining
+    return CohortFrame.build(cards, columns)
+
+
+def _build_area_boards(frame: CohortFrame[StudentScorecard], *, limit: int) -> list[AreaBoard]:
     boards: list[AreaBoard] = []
     for area, meta in AREA_META.items():
-        scored_pairs: list[tuple[StudentScorecard, float]] = []
-        for c in cards:
-            score = _area_score(c, area)
-            if score is None:
-                continue
-            scored_pairs.append((c, float(score)))
-        scored_pairs.sort(key=lambda x: x[1], reverse=True)
-        top = [_to_ranked(c, i + 1, s) for i, (c, s) in enumerate(scored_pairs[:limit])]
-        prep_sorted = sorted(scored_pairs, key=lambda x: x[1])
+        top = [
+            _to_ranked(frame.rows[i], rank, s)
+            for rank, (i, s) in enumerate(frame.top_k(area, limit), start=1)
+        ]
         # Prefer less-prepared (<55) when available, else bottom of ranked list
-        prep_pool = [(c, s) for c, s in prep_sorted if s < 55] or prep_sorted
+        prep = frame.bottom_k(area, limit, below=55) or frame.bottom_k(area, limit)
         less_prepared = [
-            _to_ranked(c, i + 1, s)
-            for i, (c, s) in enumerate(prep_pool[:limit])
+            _to_ranked(frame.rows[i], rank, s) for rank, (i, s) in enumerate(prep, start=1)
         ]
         boards.append(
             AreaBoard(
                 area=area,
                 label=meta["label"],
                 description=meta["description"],
-                students_scored=len(scored_pairs),
-                avg_score=_mean([s for _, s in scored_pairs]),
+                students_scored=frame.count(area),
+                avg_score=frame.mean(area),
                 top=top,
                 less_prepared=less_prepared,
             )
@@ -231,6 +240,21 @@ def _build_area_boards(cards: list[StudentScorecard], *, limit: int) -> list[Are
     return boards
 
 
+def _build_distributions(frame: CohortFrame[StudentScorecard]) -> list[ScoreDistribution]:
+    out: list[ScoreDistribution] = []
+    for area, meta in AREA_META.items():
+        out.append(
+            ScoreDistribution(
+                area=area,
+                label=meta["label"],
+                students_scored=frame.count(area),
+                histogram=frame.histogram(area),
+                **frame.percentiles(area),
+            )
+        )
+    return out
+
+
 def _build_level_funnel(cards: list[StudentScorecard]) -> list[LevelFunnelItem]:
     total = len(cards) or 1
     out: list[LevelFunnelItem] = []
@@ -265,19 +289,21 @@ def _build_level_funnel(cards: list[StudentScorecard]) -> list[LevelFunnelItem]:
     return out
 
 
-def _build_tests_aggregate(cards: list[StudentScorecard]) -> TestsAggregate:
-    if not cards:
+def _build_tests_aggregate(frame: CohortFrame[StudentScorecard]) -> TestsAggregate:
+    n = len(frame)
+    if not n:
         return TestsAggregate(tools_total=TOOLS_TOTAL)
-    done_vals = [c.tests_done for c in cards]
-    rem_vals = [c.tests_remaining for c in cards]
+    done = frame.column("tests_done")
+    total_done = int(frame.total("tests_done"))
+    total_remaining = int(frame.total("tests_remaining"))
     return TestsAggregate(
         tools_total=TOOLS_TOTAL,
-        avg_tests_done=round(sum(done_vals) / len(cards), 2),
-        avg_tests_remaining=round(sum(rem_vals) / len(cards), 2),
-        students_all_done=sum(1 for c in cards if c.tests_done >= TOOLS_TOTAL),
-        students_none_done=sum(1 for c in cards if c.tests_done <= 0),
-        total_completions=sum(done_vals),
-        total_remaining=sum(rem_vals),
+        avg_tests_done=round(total_done / n, 2),
+        avg_tests_remaining=round(total_remaining / n, 2),
+        students_all_done=sum(1 for v in done if v >= TOOLS_TOTAL),
+        students_none_done=sum(1 for v in done if v <= 0),
+        total_completions=total_done,
+        total_remaining=total_remaining,
     )
 
 
@@ -745,10 +771,14 @@ async def list_scorecards(
 
     students = await _student_query(db, ctx.organization_id, dept_id)
     user_ids = [u.id for u in students]
-    weeks = await _weeks_by_user(db, user_ids)
-    attempts = await _attempt_counts(db, user_ids)
-    coding_best = await _best_coding_scores(db, user_ids)
-    results_by_user = await _latest_result_raw_by_user(db, user_ids)
+    # Independent reads — one pooled connection each, same snapshot.
+    weeks, attempts, coding_best, results_by_user = await run_parallel_reads(
+        db,
+        lambda s: _weeks_by_user(s, user_ids),
+        lambda s: _attempt_counts(s, user_ids),
+        lambda s: _best_coding_scores(s, user_ids),
+        lambda s: _latest_result_raw_by_user(s, user_ids),
+    )
     items = [
         _scorecard_from_week(
             u,
@@ -779,20 +809,15 @@ async def get_performance_summary(
     if scope == "department":
         dept_id = ctx.department_id
 
-    scored = [c for c in cards.items if c.readiness is not None]
-    bands = PerformanceBands(unscored=len(cards.items) - len(scored))
-    for c in scored:
-        r = float(c.readiness or 0)
-        if r >= 75:
-            bands.strong += 1
-        elif r >= 50:
-            bands.mid += 1
-        else:
-            bands.weak += 1
+    frame = _cohort_frame(cards.items)
+    scored_n = frame.count("overall")
+    strong, mid, weak = frame.bands("overall")
+    bands = PerformanceBands(
+        strong=strong, mid=mid, weak=weak, unscored=len(cards.items) - scored_n
+    )
 
     gap_counter: Counter[str] = Counter()
     strength_counter: Counter[str] = Counter()
-    pillar_vals: dict[str, list[float]] = defaultdict(list)
     active_7d = 0
     inactive_14d = 0
     never_started = 0
@@ -803,14 +828,6 @@ async def get_performance_summary(
             gap_counter[g] += 1
         for s in c.strengths:
             strength_counter[s] += 1
-        for pillar in ("aptitude", "skills", "interview", "snap"):
-            v = _pillar_score(c.scores_by_tool, pillar)
-            if v is not None:
-                pillar_vals[pillar].append(v)
-        if c.technical_score is not None:
-            pillar_vals["technical"].append(float(c.technical_score))
-        if c.communication_score is not None:
-            pillar_vals["communication"].append(float(c.communication_score))
 
         if c.activity_status == "never":
             never_started += 1
@@ -822,48 +839,47 @@ async def get_performance_summary(
             idle_count += 1
 
     pillars = PillarAverages(
-        aptitude=_mean(pillar_vals["aptitude"]),
-        skills=_mean(pillar_vals["skills"]),
-        interview=_mean(pillar_vals["interview"]),
-        snap=_mean(pillar_vals["snap"]),
-        communication=_mean(pillar_vals["communication"]),
-        technical=_mean(pillar_vals["technical"]),
-        shortlist=_mean(
-            [float(c.shortlist_score) for c in cards.items if c.shortlist_score is not None]
-        ),
+        aptitude=frame.mean("aptitude"),
+        skills=frame.mean("skills"),
+        interview=frame.mean("interview"),
+        snap=frame.mean("snap"),
+        communication=frame.mean("communication"),
+        technical=frame.mean("technical"),
+        shortlist=frame.mean("shortlist"),
     )
 
     top_gaps = [
-        GapStrengthItem(label=k, count=v, share_pct=_pct(v, max(1, len(scored))))
+        GapStrengthItem(label=k, count=v, share_pct=_pct(v, max(1, scored_n)))
         for k, v in gap_counter.most_common(8)
     ]
     top_strengths = [
-        GapStrengthItem(label=k, count=v, share_pct=_pct(v, max(1, len(scored))))
+        GapStrengthItem(label=k, count=v, share_pct=_pct(v, max(1, scored_n)))
         for k, v in strength_counter.most_common(8)
     ]
 
     # Always honor TPO department filter (and HOD scope) — never leak other depts' zeros
-    depts = await _departments(db, ctx.organization_id, dept_id)
-    hod_map = await _hod_status_map(db, ctx.organization_id)
-    by_dept_cards: dict[Optional[int], list[StudentScorecard]] = defaultdict(list)
-    for c in cards.items:
-        by_dept_cards[c.department_id].append(c)
+    org_id = ctx.organization_id
+    reads = [
+        lambda s: _departments(s, org_id, dept_id),
+        lambda s: _hod_status_map(s, org_id),
+        lambda s: _pending_invites(s, org_id, dept_id),
+    ]
+    if scope == "organization":
+        # Campus drives stay org-wide for TPO context even when a dept filter is on
+        reads.append(lambda s: _upcoming_drives(s, org_id))
+    depts, hod_map, pending, *drive_count = await run_parallel_reads(db, *reads)
+    drives = drive_count[0] if drive_count else 0
+    rows_by_dept = frame.group_by(lambda c: c.department_id)
 
     by_department: list[DeptPerformanceRow] = []
     for d in depts:
-        rows = by_dept_cards.get(d.id, [])
-        scored_rows = [r for r in rows if r.readiness is not None]
-        strong = mid = weak = active = inactive = never = 0
+        idx = rows_by_dept.get(d.id, ())
+        scored_in_dept = frame.count("overall", idx)
+        strong, mid, weak = frame.bands("overall", idx)
+        active = inactive = never = 0
         dept_gap_counter: Counter[str] = Counter()
-        for r in scored_rows:
-            val = float(r.readiness or 0)
-            if val >= 75:
-                strong += 1
-            elif val >= 50:
-                mid += 1
-            else:
-                weak += 1
-        for r in rows:
+        for i in idx:
+            r = frame.rows[i]
             if r.activity_status == "active":
                 active += 1
             elif r.activity_status == "inactive":
@@ -877,18 +893,18 @@ async def get_performance_summary(
                 id=d.id,
                 code=d.code,
                 name=d.name,
-                students=len(rows),
-                scored_students=len(scored_rows),
-                coverage_pct=_pct(len(scored_rows), len(rows)),
-                avg_readiness=_mean([float(r.readiness) for r in scored_rows if r.readiness is not None]),
-                avg_mock=_mean([float(r.mock_score) for r in scored_rows if r.mock_score is not None]),
+                students=len(idx),
+                scored_students=scored_in_dept,
+                coverage_pct=_pct(scored_in_dept, len(idx)),
+                avg_readiness=frame.mean("overall", idx),
+                avg_mock=frame.mean("mock", idx),
                 strong=strong,
                 mid=mid,
                 weak=weak,
                 active_7d=active,
                 inactive_14d=inactive,
                 never_started=never,
-                avg_tests_done=_mean([float(r.tests_done) for r in rows]) if rows else None,
+                avg_tests_done=frame.mean("tests_done", idx) if idx else None,
                 top_gap=dept_gap_counter.most_common(1)[0][0] if dept_gap_counter else None,
                 hod_status=hod_map.get(d.id),
             )
@@ -922,27 +938,20 @@ async def get_performance_summary(
             days_inactive=c.days_inactive,
         )
 
-    ranked = sorted(scored, key=lambda c: float(c.readiness or 0), reverse=True)
-    leaders = [to_leader(c) for c in ranked[:leaderboard_limit]]
+    leaders = [to_leader(frame.rows[i]) for i, _ in frame.top_k("overall", leaderboard_limit)]
     at_risk = [
-        to_leader(c)
-        for c in sorted(scored, key=lambda c: float(c.readiness or 0))[:leaderboard_limit]
-        if float(c.readiness or 0) < 50
+        to_leader(frame.rows[i])
+        for i, _ in frame.bottom_k("overall", leaderboard_limit, below=READINESS_MID)
     ]
 
     area_leaders: list[AreaLeader] = []
     for area, meta in AREA_META.items():
         if area == "overall":
             continue
-        best: Optional[tuple[StudentScorecard, float]] = None
-        for c in cards.items:
-            score = _area_score(c, area)
-            if score is None:
-                continue
-            if best is None or score > best[1]:
-                best = (c, float(score))
+        best = frame.top_k(area, 1)
         if best:
-            c, score = best
+            i, score = best[0]
+            c = frame.rows[i]
             area_leaders.append(
                 AreaLeader(
                     area=area,
@@ -957,23 +966,19 @@ async def get_performance_summary(
             area_leaders.append(AreaLeader(area=area, label=meta["label"]))
 
     board_n = max(3, min(50, int(board_limit or 10)))
-    area_boards = _build_area_boards(cards.items, limit=board_n)
+    area_boards = _build_area_boards(frame, limit=board_n)
+    distributions = _build_distributions(frame)
     level_funnel = _build_level_funnel(cards.items)
-    tests_agg = _build_tests_aggregate(cards.items)
-
-    pending = await _pending_invites(db, ctx.organization_id, dept_id)
-    # Campus drives stay org-wide for TPO context even when a dept filter is on
-    drives = await _upcoming_drives(db, ctx.organization_id) if scope == "organization" else 0
+    tests_agg = _build_tests_aggregate(frame)
 
     total_n = len(cards.items)
-    scored_n = len(scored)
     coverage_pct = _pct(scored_n, total_n)
     drive_ready_pct = _pct(bands.strong, total_n)
     drive_ready_of_scored_pct = _pct(bands.strong, scored_n)
-    avg_readiness = _mean([float(c.readiness) for c in scored if c.readiness is not None])
-    avg_mock = _mean([float(c.mock_score) for c in scored if c.mock_score is not None])
+    avg_readiness = frame.mean("overall")
+    avg_mock = frame.mean("mock")
     tool_coverage = _build_tool_coverage(cards.items)
-    coding_done = sum(1 for c in cards.items if (c.scores_by_tool or {}).get("coding") is not None)
+    coding_done = frame.count("coding")
     if total_n:
         tool_coverage.append(
             ToolCoverageItem(
@@ -1031,6 +1036,7 @@ async def get_performance_summary(
         at_risk=at_risk,
         area_leaders=area_leaders,
         area_boards=area_boards,
+        distributions=distributions,
         clarity=clarity,
         board_limit=board_n,
         active_7d=active_7d,
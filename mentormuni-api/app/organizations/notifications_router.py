@@ -6,12 +6,13 @@ GET    /organizations/notifications
 DELETE /organizations/notifications/{id}
 
 Auth: X-API-Key + tenant JWT with SEND_NOTIFICATION (ORG_ADMIN).
-Create returns immediately with delivery_status=queued; emails send in background.
+Create returns immediately with delivery_status=queued; emails go to the email outbox
+in the same transaction and the outbox worker sends them.
 """
 
 from __future__ import annotations
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.authz import require_permission
@@ -51,14 +52,16 @@ def _to_item(n) -> CampusNotificationItem:
         created_at=n.created_at,
         delivery_status=getattr(n, "delivery_status", None) or "queued",
         created_by=n.created_by,
-        recipients_estimated=len(n.recipients) if n.recipients is not None else 0,
+        recipients_estimated=n.recipient_count or 0,
+        emails_total=n.emails_total or 0,
+        emails_sent=n.emails_sent or 0,
+        emails_failed=n.emails_failed or 0,
     )
 
 
 @router.post("", response_model=CampusNotificationCreateResponse, status_code=201)
 async def create_campus_notification(
     body: CampusNotificationCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     ctx: TenantContext = Depends(require_permission("SEND_NOTIFICATION")),
 ) -> CampusNotificationCreateResponse:
@@ -73,12 +76,11 @@ async def create_campus_notification(
             department_id=body.department_id,
             event_date=body.date,
         )
+        # Durable: committed with the notification, sent by the email outbox worker.
+        await notif_service.enqueue_notification_emails(db, notif)
     except notif_service.NotificationError as exc:
         raise HTTPException(status_code=exc.status_code, detail=exc.message) from exc
 
-    # Return fast — email fan-out after response (own DB session).
-    background_tasks.add_task(notif_service.deliver_notification_emails, notif.id)
-
     return CampusNotificationCreateResponse(
         id=notif.id,
         delivery_status=getattr(notif, "delivery_status", None) or "queued",
@@ -0,0 +1,636 @@
+"""
+Bulk student import — set-based inserts, one conflict probe per chunk.
+
+Replaces the per-row ``create_user`` loop for CSV / row imports:
+
+1. Rows are stream-parsed and processed in chunks of ``IMPORT_CHUNK_SIZE``.
+2. Each chunk issues one ``SELECT email, username … WHERE email IN (…) OR username IN (…)``.
+3. New users go in with one ``INSERT … ON CONFLICT DO NOTHING RETURNING id``, and their
+   per-user ``USER_CREATE`` audit rows with one multi-row INSERT.
+4. An aggregated ``student.import`` audit row is written per import.
+5. Set-password emails are queued on the email outbox by ``queue_setup_emails`` in the
+   same transaction as the users (and their token hashes), which audits
+   ``student.set_password_link`` per user. The outbox worker sends and retries them.
+
+Small imports run in-request (``POST /organizations/students/import``). Large files go
+through ``StudentImportJob`` (``POST /organizations/students/import-jobs``) and are
+polled. The job keeps its input in ``input_json`` and commits progress per chunk, emails
+included; a job left queued or running by a restart is resumed after ``processed_rows``
+by the ``student-import-recovery`` scheduler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import hashlib
+import io
+import logging
+import secrets
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.common.audit import write_audit
+from app.common.email.outbox import enqueue_emails
+from app.common.email.templates import render_student_activation_email
+from app.common.organization_access import (
+    OrganizationAccessError,
+    ensure_organization_accepts_registration,
+)
+from app.common.scheduler import LeaderScheduler, SchedulerJob
+from app.models.audit_log import AuditLog
+from app.models.department import Department
+from app.models.enums import OrganizationType, RoleCode, UserStatus
+from app.models.organization import Organization
+from app.models.role import Role
+from app.models.student_import_job import (
+    IMPORT_JOB_COMPLETED,
+    IMPORT_JOB_FAILED,
+    IMPORT_JOB_QUEUED,
+    IMPORT_JOB_RUNNING,
+    StudentImportJob,
+)
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 500
+MAX_STORED_ERRORS = 500
+ACTIVATION_HOURS = 72
+# A running job commits progress at least once per chunk; one idle this long was interrupted.
+IMPORT_JOB_STALE_SECONDS = 600
+# Queued jobs whose BackgroundTask never started (process died right after the request).
+IMPORT_JOB_PICKUP_SECONDS = 60
+RECOVERY_POLL_SECONDS = 120
+
+
+class StudentImportError(Exception):
+    def __init__(self, message: str, *, status_code: int = 400) -> None:
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class SetupEmail:
+    """Raw token for the setup link; only the queued email carries it (users keep the hash)."""
+
+    user_id: int
+    raw_token: str
+    expires: datetime
+    email: str = ""
+    row: int | None = None
+
+
+@dataclass
+class ImportTarget:
+    """Everything validated once per import instead of once per row."""
+
+    organization_id: int
+    department_id: int
+    role_id: int
+    actor_user_id: int
+    status: str
+    source: str
+    auto_enroll: bool
+    send_invite_email: bool
+
+
+@dataclass
+class ChunkOutcome:
+    user_ids: list[int] = field(default_factory=list)
+    skipped: int = 0
+    errors: list[dict] = field(default_factory=list)
+    emails: list[SetupEmail] = field(default_factory=list)
+    processed: int = 0
+
+
+def _hash_token(raw: str) -> str:
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def iter_csv_rows(csv_text: str) -> Iterator[dict]:
+    """Stream rows out of ``csv_text``; row numbers are 1-based file lines (header = 1)."""
+    reader = csv.DictReader(io.StringIO(csv_text))
+    if not reader.fieldnames:
+        raise StudentImportError("CSV is empty or missing headers.", status_code=422)
+    field_map = {h.strip().lower(): h for h in reader.fieldnames}
+    for i, row in enumerate(reader, start=2):
+        def cell(*keys: str) -> str:
+            for k in keys:
+                raw = field_map.get(k)
+                if raw and row.get(raw):
+                    return str(row.get(raw) or "").strip()
+            return ""
+
+        email = cell("email")
+        if not email:
+            continue
+        name = cell("name", "full_name")
+        if not name:
+            fn = cell("first_name")
+            ln = cell("last_name")
+            name = f"{fn} {ln}".strip()
+        batch_raw = cell("batch_year", "batch", "year")
+        batch_year = int(batch_raw) if batch_raw.isdigit() else None
+        yield {
+            "email": email,
+            "name": name or None,
+            "roll_number": cell("roll_number", "roll", "roll_no", "college_id") or None,
+            "batch_year": batch_year,
+            "row": i,
+        }
+
+
+def iter_import_rows(rows: list[dict] | None, csv_text: str | None) -> Iterator[dict]:
+    for idx, row in enumerate(rows or []):
+        yield {**row, "row": row.get("row", idx + 1)}
+    if csv_text:
+        yield from iter_csv_rows(csv_text)
+
+
+def chunked(items: Iterable[dict], size: int = IMPORT_CHUNK_SIZE) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def resolve_target(
+    db: AsyncSession,
+    *,
+    organization_id: int,
+    department_id: int,
+    actor_user_id: int,
+    source: str,
+    auto_enroll: bool,
+    send_invite_email: bool,
+) -> ImportTarget:
+    """Org / department / role checks ``create_user`` would otherwise repeat per row."""
+    org = await db.get(Organization, organization_id)
+    if org is None:
+        raise StudentImportError("Organization not found.", status_code=404)
+    try:
+        ensure_organization_accepts_registration(org)
+    except OrganizationAccessError as exc:
+        raise StudentImportError(exc.message, status_code=exc.status_code) from exc
+    if org.organization_type == OrganizationType.PUBLIC.value:
+        raise StudentImportError("Bulk import is only available for college organizations.")
+
+    dept = await db.get(Department, department_id)
+    if dept is None or dept.organization_id != org.id or dept.deleted_at is not None:
+        raise StudentImportError("department_id does not belong to this organization.")
+
+    role_id = (
+        await db.execute(select(Role.id).where(Role.role_code == RoleCode.STUDENT.value))
+    ).scalar_one_or_none()
+    if role_id is None:
+        raise StudentImportError(f"Unknown role_code: {RoleCode.STUDENT.value}")
+
+    # Same status rule as create_user for staff-added students without a password.
+    invite = auto_enroll or send_invite_email
+    return ImportTarget(
+        organization_id=org.id,
+        department_id=dept.id,
+        role_id=int(role_id),
+        actor_user_id=actor_user_id,
+        status=UserStatus.INVITED.value if invite else UserStatus.PENDING.value,
+        source=source,
+        auto_enroll=auto_enroll,
+        send_invite_email=send_invite_email,
+    )
+
+
+def _unique_username(base: str, taken: set[str]) -> str:
+    if base not in taken:
+        return base
+    while True:
+        candidate = f"{base}.{secrets.token_hex(2)}"
+        if candidate not in taken:
+            return candidate
+
+
+async def import_chunk(
+    db: AsyncSession,
+    target: ImportTarget,
+    rows: list[dict],
+    *,
+    seen_emails: set[str],
+) -> ChunkOutcome:
+    """Validate, conflict-check and insert one chunk. ``seen_emails`` dedupes across chunks."""
+    from app.organizations.students_service import _split_name, _username_from_email
+
+    out = ChunkOutcome(processed=len(rows))
+    candidates: list[tuple[dict, str]] = []
+    for row in rows:
+        email = str(row.get("email") or "").lower().strip()
+        row_num = row.get("row")
+        if not email or "@" not in email:
+            out.errors.append({"row": row_num, "email": email, "message": "Invalid email"})
+            continue
+        if email in seen_emails:
+            out.skipped += 1
+            out.errors.append({"row": row_num, "email": email, "message": "Duplicate row in file."})
+            continue
+        seen_emails.add(email)
+        candidates.append((row, email))
+    if not candidates:
+        return out
+
+    emails = [e for _, e in candidates]
+    base_usernames = {e: _username_from_email(e) for e in emails}
+    clash_rows = (
+        await db.execute(
+            select(User.email, User.username).where(
+                User.organization_id == target.organization_id,
+                or_(
+                    User.email.in_(emails),
+                    User.username.in_(set(base_usernames.values())),
+                ),
+            )
+        )
+    ).all()
+    taken_emails = {r.email for r in clash_rows}
+    taken_usernames = {r.username for r in clash_rows}
+
+    now = datetime.now(timezone.utc)
+    expires = now + timedelta(hours=ACTIVATION_HOURS)
+    invite = target.status == UserStatus.INVITED.value
+    values: list[dict] = []
+    tokens: dict[str, str] = {}
+    row_by_email: dict[str, int | None] = {}
+    for row, email in candidates:
+        row_by_email[email] = row.get("row")
+        if email in taken_emails:
+            out.skipped += 1
+            out.errors.append(
+                {
+                    "row": row.get("row"),
+                    "email": email,
+                    "message": "Email or username already exists in this organization.",
+                }
+            )
+            continue
+        username = _unique_username(base_usernames[email], taken_usernames)
+        taken_usernames.add(username)
+        first_name, last_name = _split_name(row.get("name"), email)
+        roll = row.get("roll_number")
+        batch = row.get("batch_year")
+        raw_token = secrets.token_urlsafe(32) if invite else None
+        if raw_token:
+            tokens[email] = raw_token
+        values.append(
+            {
+                "organization_id": target.organization_id,
+                "department_id": target.department_id,
+                "role_id": target.role_id,
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": email,
+                "username": username,
+                "password_hash": None,
+                "status": target.status,
+                "activation_token_hash": _hash_token(raw_token) if raw_token else None,
+                "activation_expires_at": expires if raw_token else None,
+                "must_change_password": False,
+                "roll_number": str(roll).strip() if roll else None,
+                "batch_year": int(batch) if batch is not None else None,
+            }
+        )
+    if not values:
+        return out
+
+    table = User.__table__
+    stmt = (
+        pg_insert(table)
+        .values(values)
+        .on_conflict_do_nothing()
+        .returning(table.c.id, table.c.email)
+    )
+    inserted = (await db.execute(stmt)).all()
+    inserted_emails = {r.email for r in inserted}
+    for v in values:
+        if v["email"] not in inserted_emails:
+            # Lost a race with a concurrent insert between the probe and the INSERT.
+            out.skipped += 1
+            out.errors.append(
+                {
+                    "row": row_by_email.get(v["email"]),
+                    "email": v["email"],
+                    "message": "Email or username already exists in this organization.",
+                }
+            )
+    for r in inserted:
+        out.user_ids.append(int(r.id))
+        raw = tokens.get(r.email)
+        if raw:
+            out.emails.append(
+                SetupEmail(
+                    user_id=int(r.id),
+                    raw_token=raw,
+                    expires=expires,
+                    email=r.email,
+                    row=row_by_email.get(r.email),
+                )
+            )
+    if inserted:
+        # Same per-user entry create_user writes, one multi-row INSERT per chunk.
+        await db.execute(
+            insert(AuditLog),
+            [
+                {
+                    "organization_id": target.organization_id,
+                    "actor_user_id": target.actor_user_id,
+                    "action": "USER_CREATE",
+                    "entity_type": "user",
+                    "entity_id": int(r.id),
+                    "payload_json": {
+                        "role_code": RoleCode.STUDENT.value,
+                        "status": target.status,
+                        "auto_enroll": invite,
+                    },
+                }
+                for r in inserted
+            ],
+        )
+    return out
+
+
+async def write_import_audit(
+    db: AsyncSession,
+    target: ImportTarget,
+    *,
+    created: int,
+    skipped: int,
+    errors: int,
+    job_id: int | None = None,
+) -> None:
+    payload = {
+        "created": created,
+        "skipped": skipped,
+        "errors": errors,
+        "send_invite_email": target.send_invite_email or target.auto_enroll,
+        "auto_enroll": target.auto_enroll,
+        "source": target.source,
+    }
+    if job_id is not None:
+        payload["job_id"] = job_id
+    await write_audit(
+        db,
+        organization_id=target.organization_id,
+        actor_user_id=target.actor_user_id,
+        action="student.import",
+        entity_type="department",
+        entity_id=target.department_id,
+        payload=payload,
+    )
+
+
+async def load_users(db: AsyncSession, user_ids: list[int]) -> list[User]:
+    if not user_ids:
+        return []
+    result = await db.execute(
+        select(User)
+        .where(User.id.in_(user_ids))
+        .options(selectinload(User.department))
+        .order_by(User.id)
+    )
+    return list(result.scalars().all())
+
+
+async def queue_setup_emails(
+    db: AsyncSession,
+    emails: list[SetupEmail],
+    *,
+    actor_user_id: int | None,
+    source: str = "import",
+) -> int:
+    """
+    Queue set-password emails for freshly INVITED students on the email outbox.
+
+    Runs in the caller's transaction, so the emails commit together with the users and
+    their token hashes (a crash cannot leave a stored hash whose link was never sent).
+    Writes one ``student.set_password_link`` audit row per student. Returns rows queued.
+    """
+    if not emails:
+        return 0
+    result = await db.execute(
+        select(User)
+        .where(User.id.in_([e.user_id for e in emails]))
+        .options(selectinload(User.organization), selectinload(User.department))
+    )
+    users = {u.id: u for u in result.scalars().all()}
+    messages: list[dict] = []
+    for e in emails:
+        user = users.get(e.user_id)
+        if user is None:
+            continue
+        content = render_student_activation_email(
+            first_name=user.first_name,
+            last_name=user.last_name,
+            username=user.username,
+            organization_name=user.organization.name,
+            department_name=user.department.name if user.department else None,
+            raw_token=e.raw_token,
+            expires_at=e.expires,
+        )
+        messages.append(
+            {
+                # One per issued token: re-queueing the same link is a no-op.
+                "idempotency_key": f"student-setup:{user.id}:{_hash_token(e.raw_token)[:32]}",
+                "organization_id": user.organization_id,
+                "user_id": user.id,
+                "to_email": user.email,
+                "to_name": f"{user.first_name} {user.last_name}".strip() or None,
+                "subject": content.subject[:500],
+                "text_body": content.text_body,
+                "html_body": content.html_body,
+            }
+        )
+    if not messages:
+        return 0
+    queued = await enqueue_emails(db, messages)
+    await db.execute(
+        insert(AuditLog),
+        [
+            {
+                "organization_id": m["organization_id"],
+                "actor_user_id": actor_user_id,
+                "action": "student.set_password_link",
+                "entity_type": "user",
+                "entity_id": m["user_id"],
+                "payload_json": {"email_queued": True, "source": source},
+            }
+            for m in messages
+        ],
+    )
+    return queued
+
+
+def _resume_after(rows: Iterable[dict], done: int, seen_emails: set[str]) -> Iterator[dict]:
+    """Skip the ``done`` rows already committed, re-adding their emails to ``seen_emails``."""
+    for i, row in enumerate(rows):
+        if i < done:
+            email = str(row.get("email") or "").lower().strip()
+            if email and "@" in email:
+                seen_emails.add(email)
+            continue
+        yield row
+
+
+def _recoverable(now: datetime):
+    return or_(
+        and_(
+            StudentImportJob.status == IMPORT_JOB_QUEUED,
+            StudentImportJob.created_at < now - timedelta(seconds=IMPORT_JOB_PICKUP_SECONDS),
+        ),
+        and_(
+            StudentImportJob.status == IMPORT_JOB_RUNNING,
+            StudentImportJob.updated_at < now - timedelta(seconds=IMPORT_JOB_STALE_SECONDS),
+        ),
+    )
+
+
+async def claim_import_job(db: AsyncSession, job_id: int) -> bool:
+    """Queued (or stale running) → running, atomically: one runner per job."""
+    now = datetime.now(timezone.utc)
+    claimed = (
+        await db.execute(
+            update(StudentImportJob)
+            .where(
+                StudentImportJob.id == job_id,
+                or_(StudentImportJob.status == IMPORT_JOB_QUEUED, _recoverable(now)),
+            )
+            .values(status=IMPORT_JOB_RUNNING, updated_at=func.now())
+            .returning(StudentImportJob.id)
+        )
+    ).scalar_one_or_none()
+    return claimed is not None
+
+
+async def run_import_job(job_id: int) -> None:
+    """
+    Run (or resume) one import job: one transaction per chunk so progress is visible
+    while polling, and a restart loses at most the chunk in flight. A chunk's setup
+    emails are queued in its transaction, so resuming after it never skips them.
+    """
+    from app.common.database.session import async_session_factory
+
+    factory = async_session_factory()
+    async with factory() as db:
+        if not await claim_import_job(db, job_id):
+            await db.rollback()
+            return
+        await db.commit()
+        job = await db.get(StudentImportJob, job_id)
+        if job is None:
+            return
+        try:
+            if job.department_id is None or job.created_by is None or job.input_json is None:
+                raise StudentImportError("Import input is no longer available.")
+            target = await resolve_target(
+                db,
+                organization_id=job.organization_id,
+                department_id=job.department_id,
+                actor_user_id=job.created_by,
+                source=job.source,
+                auto_enroll=job.auto_enroll,
+                send_invite_email=job.send_invite_email,
+            )
+            data = job.input_json
+            seen: set[str] = set()
+            errors: list[dict] = list(job.errors_json or [])
+            rows = _resume_after(
+                iter_import_rows(data.get("rows"), data.get("csv_text")), job.processed_rows, seen
+            )
+            for chunk in chunked(rows):
+                outcome = await import_chunk(db, target, chunk, seen_emails=seen)
+                errors.extend(outcome.errors)
+                job.processed_rows += outcome.processed
+                job.created_count += len(outcome.user_ids)
+                job.skipped_count += outcome.skipped
+                job.error_count += len(outcome.errors)
+                job.emails_queued += len(outcome.emails)
+                job.errors_json = errors[:MAX_STORED_ERRORS]
+                await queue_setup_emails(
+                    db, outcome.emails, actor_user_id=target.actor_user_id, source=target.source
+                )
+                await db.commit()
+
+            await write_import_audit(
+                db,
+                target,
+                created=job.created_count,
+                skipped=job.skipped_count,
+                errors=job.error_count,
+                job_id=job.id,
+            )
+            job.status = IMPORT_JOB_COMPLETED
+            job.finished_at = datetime.now(timezone.utc)
+            job.input_json = None
+            await db.commit()
+        except Exception as exc:
+            logger.exception("student_import_job_failed id=%s", job_id)
+            await db.rollback()
+            job = await db.get(StudentImportJob, job_id)
+            if job is None:
+                return
+            job.status = IMPORT_JOB_FAILED
+            job.failure_message = (
+                exc.message if isinstance(exc, StudentImportError) else "Import failed."
+            )[:500]
+            job.finished_at = datetime.now(timezone.utc)
+            job.input_json = None
+            await db.commit()
+
+
+async def _recover_batch(db: AsyncSession, limit: int) -> int:
+    ids = list(
+        (
+            await db.execute(
+                select(StudentImportJob.id)
+                .where(_recoverable(datetime.now(timezone.utc)))
+                .order_by(StudentImportJob.id)
+                .limit(limit)
+            )
+        ).scalars()
+    )
+    await db.commit()  # imports use their own sessions; hold nothing here meanwhile
+    for job_id in ids:
+        logger.warning("student_import_job_resumed id=%s", job_id)
+        await run_import_job(job_id)
+    return len(ids)
+
+
+async def _recovery_next_due(db: AsyncSession) -> datetime | None:
+    return None  # interrupted jobs are rare; poll every RECOVERY_POLL_SECONDS
+
+
+recovery_scheduler = LeaderScheduler(
+    SchedulerJob(
+        name="student-import-recovery",
+        run_batch=_recover_batch,
+        next_due=_recovery_next_due,
+        batch_size=1,
+        max_sleep_seconds=RECOVERY_POLL_SECONDS,
+        follower_poll_seconds=RECOVERY_POLL_SECONDS,
+    )
+)
+
+
+def start_import_job_recovery() -> asyncio.Task | None:
+    return recovery_scheduler.start()
+
+
+async def stop_import_job_recovery() -> None:
+    await recovery_scheduler.stop()
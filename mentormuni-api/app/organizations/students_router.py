@@ -6,12 +6,13 @@ Roster · invite · import · approve/reject · patch · delete
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.authz import require_permission
 from app.common.deps import get_db, require_api_key
 from app.common.tenant.context import TenantContext
+from app.organizations import students_import as bulk_import
 from app.organizations import students_service as svc
 from app.organizations.students_schemas import (
     OrgInviteListResponse,
@@ -21,6 +22,7 @@ from app.organizations.students_schemas import (
     StudentApproveResponse,
     StudentDecisionRequest,
     StudentDeleteResponse,
+    StudentImportJobResponse,
     StudentImportRequest,
     StudentImportResult,
     StudentInviteRequest,
@@ -42,6 +44,10 @@ router = APIRouter(
 @router.get("", response_model=OrgStudentListResponse)
 async def list_students(
     department_id: int | None = Query(default=None),
+    status: str | None = Query(default=None, description="active | invited | blocked"),
+    q: str | None = Query(default=None, max_length=128, description="Name, email or roll number"),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     ctx: TenantContext = Depends(
         require_permission(
@@ -52,10 +58,22 @@ async def list_students(
         )
     ),
 ) -> OrgStudentListResponse:
-    items, total = await svc.list_roster(db, ctx, department_id=department_id)
+    try:
+        items, total, next_cursor = await svc.list_roster(
+            db,
+            ctx,
+            department_id=department_id,
+            status=status,
+            search=q,
+            limit=limit,
+            cursor=cursor,
+        )
+    except svc.StudentPortalError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message) from exc
     return OrgStudentListResponse(
         items=[OrgStudentResponse.model_validate(i) for i in items],
         total=total,
+        next_cursor=next_cursor,
     )
 
 
@@ -63,17 +81,30 @@ async def list_students(
 async def list_invites(
     status: str | None = Query(default="pending"),
     department_id: int | None = Query(default=None),
+    q: str | None = Query(default=None, max_length=128, description="Name, email or roll number"),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     ctx: TenantContext = Depends(
         require_permission("APPROVE_STUDENT", "UPLOAD_STUDENTS", "VIEW_ALL_STUDENTS", "VIEW_DEPARTMENT_STUDENTS")
     ),
 ) -> OrgInviteListResponse:
-    items, total = await svc.list_invites(
-        db, ctx, status=status, department_id=department_id
-    )
+    try:
+        items, total, next_cursor = await svc.list_invites(
+            db,
+            ctx,
+            status=status,
+            department_id=department_id,
+            search=q,
+            limit=limit,
+            cursor=cursor,
+        )
+    except svc.StudentPortalError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message) from exc
     return OrgInviteListResponse(
         items=[OrgInviteResponse.model_validate(i) for i in items],
         total=total,
+        next_cursor=next_cursor,
     )
 
 
@@ -160,13 +191,8 @@ async def create_student_manual(
     )
 
 
-@router.post("/import", response_model=StudentImportResult, status_code=201)
-async def import_students(
-    body: StudentImportRequest,
-    db: AsyncSession = Depends(get_db),
-    ctx: TenantContext = Depends(require_permission("UPLOAD_STUDENTS")),
-) -> StudentImportResult:
-    rows = [
+def _import_rows(body: StudentImportRequest) -> list[dict]:
+    return [
         {
             "email": str(r.email),
             "name": r.name,
@@ -175,6 +201,15 @@ async def import_students(
         }
         for r in body.rows
     ]
+
+
+@router.post("/import", response_model=StudentImportResult, status_code=201)
+async def import_students(
+    body: StudentImportRequest,
+    db: AsyncSession = Depends(get_db),
+    ctx: TenantContext = Depends(require_permission("UPLOAD_STUDENTS")),
+) -> StudentImportResult:
+    rows = _import_rows(body)
     try:
         result = await svc.import_students(
             db,
@@ -207,6 +242,47 @@ async def import_students(
     )
 
 
+@router.post("/import-jobs", response_model=StudentImportJobResponse, status_code=202)
+async def start_import_job(
+    body: StudentImportRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    ctx: TenantContext = Depends(require_permission("UPLOAD_STUDENTS")),
+) -> StudentImportJobResponse:
+    """Large CSV import — returns a job id immediately; poll GET /import-jobs/{job_id}."""
+    rows = _import_rows(body)
+    try:
+        job = await svc.start_import_job(
+            db,
+            ctx,
+            department_id=body.department_id,
+            rows=rows,
+            csv_text=body.csv_text,
+            send_invite_email=body.send_invite_email,
+            source=body.source,
+            auto_enroll=body.auto_enroll,
+            skip_approval=body.skip_approval,
+        )
+    except svc.StudentPortalError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message) from exc
+    # Runs after get_db commits the queued job; recovery picks it up if this process dies.
+    background_tasks.add_task(bulk_import.run_import_job, job.id)
+    return StudentImportJobResponse.model_validate(job)
+
+
+@router.get("/import-jobs/{job_id}", response_model=StudentImportJobResponse)
+async def get_import_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    ctx: TenantContext = Depends(require_permission("UPLOAD_STUDENTS")),
+) -> StudentImportJobResponse:
+    try:
+        job = await svc.get_import_job(db, ctx, job_id=job_id)
+    except svc.StudentPortalError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.message) from exc
+    return StudentImportJobResponse.model_validate(job)
+
+
 @router.post("/invites/{invite_id}/approve", response_model=StudentApproveResponse)
 async def approve_invite(
     invite_id: int,
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional, Union
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class StudentInviteRequest(BaseModel):
@@ -101,6 +101,8 @@ class StudentDeleteResponse(BaseModel):
 class OrgStudentListResponse(BaseModel):
     items: list[OrgStudentResponse]
     total: int
+    # Opaque keyset cursor; pass back as ?cursor= for the next page. None on the last page.
+    next_cursor: Optional[str] = None
 
 
 class OrgInviteResponse(BaseModel):
@@ -121,6 +123,7 @@ class OrgInviteResponse(BaseModel):
 class OrgInviteListResponse(BaseModel):
     items: list[OrgInviteResponse]
     total: int
+    next_cursor: Optional[str] = None
 
 
 class StudentInviteResult(BaseModel):
@@ -144,6 +147,26 @@ class StudentImportResult(BaseModel):
     message: str = ""
 
 
+class StudentImportJobResponse(BaseModel):
+    """Background import progress (poll until status is completed | failed)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    status: str  # queued | running | completed | failed
+    department_id: Optional[int] = None
+    total_rows: int
+    processed_rows: int
+    created_count: int
+    skipped_count: int
+    error_count: int
+    emails_queued: int
+    errors: list[dict] = Field(default_factory=list, validation_alias="errors_json")
+    failure_message: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
 class StudentDecisionRequest(BaseModel):
     """Approve / deny pending enrollment. Frontend always sends send_email: true."""
 
@@ -2,18 +2,22 @@
 
 from __future__ import annotations
 
-import csv
-import io
 import re
 import secrets
 from datetime import datetime
 
+from sqlalchemy import func, literal_column, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.common.audit import write_audit
+from app.common.pagination import keyset_before, next_cursor_for
 from app.common.tenant.context import TenantContext
 from app.models.enums import RoleCode, UserStatus
+from app.models.role import Role
+from app.models.student_import_job import IMPORT_JOB_QUEUED, StudentImportJob
 from app.models.user import User
+from app.organizations import students_import as bulk_import
 from app.users import service as user_service
 
 
@@ -178,29 +182,136 @@ def _resolve_department_id(ctx: TenantContext, department_id: int | None) -> int
     return department_id
 
 
-async def list_roster(
-    db: AsyncSession,
+_ROSTER_STATUSES = (
+    UserStatus.ACTIVE.value,
+    UserStatus.INVITED.value,
+    UserStatus.BLOCKED.value,
+)
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _student_filters(
     ctx: TenantContext,
     *,
-    department_id: int | None = None,
-) -> tuple[list[dict], int]:
+    department_id: int | None,
+    statuses: tuple[str, ...],
+    search: str | None,
+) -> list:
+    """WHERE clauses shared by the page query and its count (role filter via join on Role)."""
     dept = department_id
     if not ctx.sees_all_students:
         dept = ctx.department_id
+    clauses = [
+        User.organization_id == ctx.organization_id,
+        User.deleted_at.is_(None),
+        Role.role_code == RoleCode.STUDENT.value,
+        User.status.in_(statuses),
+    ]
+    if dept is not None:
+        clauses.append(User.department_id == dept)
+    term = (search or "").strip()
+    if term:
+        # Matches the pg_trgm GIN indexes from migration 0025 (expression must stay identical).
+        pattern = _like_pattern(term)
+        full_name = User.first_name.op("||")(literal_column("' '")).op("||")(User.last_name)
+        clauses.append(
+            or_(
+                full_name.ilike(pattern, escape="\\"),
+                User.email.ilike(pattern, escape="\\"),
+                User.roll_number.ilike(pattern, escape="\\"),
+            )
+        )
+    return clauses
 
-    items, total = await user_service.list_users(
-        db,
-        organization_id=ctx.organization_id,
-        department_id=dept,
-        role_code=RoleCode.STUDENT.value,
+
+async def _student_page(
+    db: AsyncSession,
+    ctx: TenantContext,
+    *,
+    department_id: int | None,
+    statuses: tuple[str, ...],
+    search: str | None,
+    limit: int,
+    cursor: str | None,
+) -> tuple[list[User], int, str | None]:
+    """Keyset page on (created_at DESC, id DESC) plus an index-only count of the full match."""
+    clauses = _student_filters(
+        ctx, department_id=department_id, statuses=statuses, search=search
+    )
+    stmt = (
+        select(User)
+        .join(Role, User.role_id == Role.id)
+        .where(*clauses)
+        .options(selectinload(User.department))
+        .order_by(User.created_at.desc(), User.id.desc())
+        .limit(limit + 1)
     )
+    if cursor:
+        stmt = stmt.where(keyset_before(User.created_at, User.id, cursor))
+    rows = list((await db.execute(stmt)).scalars().all())
+
+    count_stmt = (
+        select(func.count(User.id))
+        .select_from(User)
+        .join(Role, User.role_id == Role.id)
+        .where(*clauses)
+    )
+    total = int((await db.execute(count_stmt)).scalar_one())
+    return rows[:limit], total, next_cursor_for(rows, limit)
+
+
+def _roster_statuses(status: str | None) -> tuple[str, ...]:
+    if not status:
+        return _ROSTER_STATUSES
+    wanted = status.strip().upper()
+    if wanted in {"DISABLED", "INACTIVE"}:
+        wanted = UserStatus.BLOCKED.value
+    if wanted not in _ROSTER_STATUSES:
+        raise StudentPortalError(
+            "status must be active, invited or blocked.", status_code=422
+        )
+    return (wanted,)
+
+
+def _invite_statuses(status: str | None) -> tuple[str, ...]:
+    if not status:
+        return (UserStatus.PENDING.value,)
+    s = status.strip().lower()
+    if s == "pending":
+        return (UserStatus.PENDING.value,)
+    if s == "rejected":
+        return (UserStatus.REJECTED.value,)
+    if s == "approved":
+        # approved queue already moved to roster — return INVITED+ACTIVE if asked
+        return (UserStatus.ACTIVE.value, UserStatus.INVITED.value)
+    return (status.strip().upper(),)
+
+
+async def list_roster(
+    db: AsyncSession,
+    ctx: TenantContext,
+    *,
+    department_id: int | None = None,
+    status: str | None = None,
+    search: str | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> tuple[list[dict], int, str | None]:
     # Roster = enrolled (ACTIVE or INVITED awaiting password). Exclude PENDING queue + REJECTED.
-    roster = [
-        to_student_row(u)
-        for u in items
-        if u.status in {UserStatus.ACTIVE.value, UserStatus.INVITED.value, UserStatus.BLOCKED.value}
-    ]
-    return roster, len(roster)
+    users, total, next_cursor = await _student_page(
+        db,
+        ctx,
+        department_id=department_id,
+        statuses=_roster_statuses(status),
+        search=search,
+        limit=limit,
+        cursor=cursor,
+    )
+    return [to_student_row(u) for u in users], total, next_cursor
 
 
 async def list_invites(
@@ -209,42 +320,20 @@ async def list_invites(
     *,
     status: str | None = "pending",
     department_id: int | None = None,
-) -> tuple[list[dict], int]:
-    dept = department_id
-    if not ctx.sees_all_students:
-        dept = ctx.department_id
-
-    status_filter = None
-    if status:
-        s = status.strip().lower()
-        if s == "pending":
-            status_filter = UserStatus.PENDING.value
-        elif s == "rejected":
-            status_filter = UserStatus.REJECTED.value
-        elif s == "approved":
-            # approved queue already moved to roster — return INVITED+ACTIVE if asked
-            status_filter = None
-        else:
-            status_filter = status.upper()
-
-    items, _ = await user_service.list_users(
+    search: str | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> tuple[list[dict], int, str | None]:
+    users, total, next_cursor = await _student_page(
         db,
-        organization_id=ctx.organization_id,
-        department_id=dept,
-        status=status_filter,
-        role_code=RoleCode.STUDENT.value,
+        ctx,
+        department_id=department_id,
+        statuses=_invite_statuses(status),
+        search=search,
+        limit=limit,
+        cursor=cursor,
     )
-    if status and status.strip().lower() == "approved":
-        items = [
-            u
-            for u in items
-            if u.status in {UserStatus.ACTIVE.value, UserStatus.INVITED.value}
-        ]
-    elif status is None or status.strip().lower() == "pending":
-        items = [u for u in items if u.status == UserStatus.PENDING.value]
-
-    rows = [to_invite_row(u) for u in items]
-    return rows, len(rows)
+    return [to_invite_row(u) for u in users], total, next_cursor
 
 
 async def _create_student_user(
@@ -479,42 +568,6 @@ async def create_manual(
     }
 
 
-def _parse_csv_rows(csv_text: str) -> list[dict]:
-    reader = csv.DictReader(io.StringIO(csv_text))
-    if not reader.fieldnames:
-        raise StudentPortalError("CSV is empty or missing headers.", status_code=422)
-    field_map = {h.strip().lower(): h for h in reader.fieldnames}
-    rows: list[dict] = []
-    for i, row in enumerate(reader, start=2):
-        def cell(*keys: str) -> str:
-            for k in keys:
-                raw = field_map.get(k)
-                if raw and row.get(raw):
-                    return str(row.get(raw) or "").strip()
-            return ""
-
-        email = cell("email")
-        if not email:
-            continue
-        name = cell("name", "full_name")
-        if not name:
-            fn = cell("first_name")
-            ln = cell("last_name")
-            name = f"{fn} {ln}".strip()
-        batch_raw = cell("batch_year", "batch", "year")
-        batch_year = int(batch_raw) if batch_raw.isdigit() else None
-        rows.append(
-            {
-                "email": email,
-                "name": name or None,
-                "roll_number": cell("roll_number", "roll", "roll_no", "college_id") or None,
-                "batch_year": batch_year,
-                "row": i,
-            }
-        )
-    return rows
-
-
 async def import_students(
     db: AsyncSession,
     ctx: TenantContext,
@@ -527,91 +580,67 @@ async def import_students(
     auto_enroll: bool = False,
     skip_approval: bool = False,
 ) -> dict:
+    """
+    In-request bulk import (set-based). Setup emails are queued on the email outbox in
+    this transaction and sent by the outbox worker once it commits, so the response never
+    waits on delivery and carries no activation secrets (M2); a student whose email fails
+    later gets a new link from resend setup link.
+    """
     dept_id = _resolve_department_id(ctx, department_id)
     enroll = _wants_auto_enroll(auto_enroll=auto_enroll, skip_approval=skip_approval)
     # Auto-enroll implies setup email; otherwise honor explicit send_invite_email.
     do_email = enroll or bool(send_invite_email)
 
-    parsed = list(rows or [])
-    if csv_text:
-        parsed.extend(_parse_csv_rows(csv_text))
-    if not parsed:
+    try:
+        target = await bulk_import.resolve_target(
+            db,
+            organization_id=ctx.organization_id,
+            department_id=dept_id,
+            actor_user_id=ctx.user_id,
+            source=source,
+            auto_enroll=enroll,
+            send_invite_email=do_email,
+        )
+        seen: set[str] = set()
+        user_ids: list[int] = []
+        skipped = 0
+        errors: list[dict] = []
+        setup_emails: list[bulk_import.SetupEmail] = []
+        any_rows = False
+        for chunk in bulk_import.chunked(bulk_import.iter_import_rows(rows, csv_text)):
+            any_rows = True
+            outcome = await bulk_import.import_chunk(db, target, chunk, seen_emails=seen)
+            user_ids.extend(outcome.user_ids)
+            skipped += outcome.skipped
+            errors.extend(outcome.errors)
+            setup_emails.extend(outcome.emails)
+    except bulk_import.StudentImportError as exc:
+        raise StudentPortalError(exc.message, status_code=exc.status_code) from exc
+    if not any_rows:
         raise StudentPortalError("No rows to import.", status_code=422)
 
-    created = 0
-    updated = 0
-    skipped = 0
-    errors: list[dict] = []
-    items: list[dict] = []
-
-    for idx, row in enumerate(parsed):
-        email = str(row.get("email") or "").lower().strip()
-        row_num = row.get("row", idx + 1)
-        if not email or "@" not in email:
-            errors.append({"row": row_num, "email": email, "message": "Invalid email"})
-            continue
-        first_name, last_name = _split_name(row.get("name"), email)
-        username = _username_from_email(email)
-        roll = row.get("roll_number")
-        batch = row.get("batch_year")
-        try:
-            user, raw_token, expires = await _create_student_user(
-                db,
-                ctx,
-                first_name=first_name,
-                last_name=last_name,
-                email_norm=email,
-                username=username,
-                dept_id=dept_id,
-                roll_number=str(roll) if roll else None,
-                batch_year=int(batch) if batch is not None else None,
-                auto_enroll=enroll or do_email,
-            )
-        except user_service.UserServiceError as exc:
-            skipped += 1
-            errors.append({"row": row_num, "email": email, "message": exc.message})
-            continue
-
-        created += 1
-        if enroll or do_email:
-            user, token, setup_url, _ = await _email_setup_for_invited(
-                db, user=user, raw_token=raw_token, expires=expires, actor=ctx.user
-            )
-            items.append(
-                to_student_row(
-                    user,
-                    source=source,
-                    setup_url=setup_url,
-                    activation_token=token,
-                )
-            )
-        else:
-            items.append(to_invite_row(user, source=source))
-
-    await write_audit(
-        db,
-        organization_id=ctx.organization_id,
-        actor_user_id=ctx.user_id,
-        action="student.import",
-        entity_type="department",
-        entity_id=dept_id,
-        payload={
-            "created": created,
-            "skipped": skipped,
-            "errors": len(errors),
-            "send_invite_email": do_email,
-            "auto_enroll": enroll,
-        },
+    created = len(user_ids)
+    await bulk_import.write_import_audit(
+        db, target, created=created, skipped=skipped, errors=len(errors)
     )
+    users = await bulk_import.load_users(db, user_ids)
+    if do_email:
+        await bulk_import.queue_setup_emails(
+            db, setup_emails, actor_user_id=ctx.user_id, source=source
+        )
+        items = [to_student_row(u, source=source) for u in users]
+    else:
+        items = [to_invite_row(u, source=source) for u in users]
+
     if enroll:
-        message = f"Import complete. {created} student(s) on the roster."
+        message = f"Import complete. {created} student(s) on the roster; setup emails queued."
     elif do_email:
-        message = f"Import complete. {created} student(s) approved with setup email."
+        message = f"Import complete. {created} student(s) approved; setup emails queued."
     else:
         message = f"Import complete. {created} student(s) queued for approval."
     return {
         "created": created,
-        "updated": updated,
+        "updated": 0,
         "skipped": skipped,
         "errors": errors,
         "items": items,
@@ -619,6 +648,72 @@ async def import_students(
     }
 
 
+async def start_import_job(
+    db: AsyncSession,
+    ctx: TenantContext,
+    *,
+    department_id: int,
+    rows: list[dict] | None = None,
+    csv_text: str | None = None,
+    send_invite_email: bool = False,
+    source: str = "import",
+    auto_enroll: bool = False,
+    skip_approval: bool = False,
+) -> StudentImportJob:
+    """
+    Validate up front, record a queued job with its input; the router runs
+    ``run_import_job`` in the background (recovery resumes it after a restart).
+    """
+    dept_id = _resolve_department_id(ctx, department_id)
+    enroll = _wants_auto_enroll(auto_enroll=auto_enroll, skip_approval=skip_approval)
+    do_email = enroll or bool(send_invite_email)
+    try:
+        await bulk_import.resolve_target(
+            db,
+            organization_id=ctx.organization_id,
+            department_id=dept_id,
+            actor_user_id=ctx.user_id,
+            source=source,
+            auto_enroll=enroll,
+            send_invite_email=do_email,
+        )
+        total = sum(1 for _ in bulk_import.iter_import_rows(rows, csv_text))
+    except bulk_import.StudentImportError as exc:
+        raise StudentPortalError(exc.message, status_code=exc.status_code) from exc
+    if not total:
+        raise StudentPortalError("No rows to import.", status_code=422)
+
+    job = StudentImportJob(
+        organization_id=ctx.organization_id,
+        department_id=dept_id,
+        created_by=ctx.user_id,
+        status=IMPORT_JOB_QUEUED,
+        source=source,
+        auto_enroll=enroll,
+        send_invite_email=do_email,
+        total_rows=total,
+        input_json={"rows": rows or [], "csv_text": csv_text},
+    )
+    db.add(job)
+    await db.flush()
+    await db.refresh(job)
+    return job
+
+
+async def get_import_job(
+    db: AsyncSession,
+    ctx: TenantContext,
+    *,
+    job_id: int,
+) -> StudentImportJob:
+    job = await db.get(StudentImportJob, job_id)
+    if job is None or job.organization_id != ctx.organization_id:
+        raise StudentPortalError("Import job not found.", status_code=404)
+    if not ctx.sees_all_students and job.department_id != ctx.department_id:
+        raise StudentPortalError("Outside your department.", status_code=403)
+    return job
+
+
 async def approve_invite(
     db: AsyncSession,
     ctx: TenantContext,
@@ -775,7 +870,6 @@ async def patch_student(
     student_id: int,
     fields: dict,
 ) -> dict:
-    from sqlalchemy import select
     from sqlalchemy.exc import IntegrityError
 
     from app.departments import service as dept_service
@@ -12,6 +12,7 @@ from fastapi import HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.common.database.parallel import run_parallel_reads
 from app.core.config import settings
 from app.models.user import User
 from app.personal_mentor.prompt import render_personal_mentor_voice_prompt
@@ -165,8 +166,6 @@ class PersonalMentorService:
         top_weaknesses: list[str] = []
         plan_status = None
         plan_summary = None
-        next_drive = None
-        recent_coding: list[dict[str, Any]] = []
 
         try:
             analysis = await roadmap_service.get_analysis(db, user)
@@ -178,25 +177,34 @@ class PersonalMentorService:
         except Exception:
             logger.debug("mentor: analysis unavailable", exc_info=True)
 
-        try:
-            plan = await roadmap_service.get_latest_plan(db, user)
+        # Analysis may create the week row, so it stays on the request session; the
+        # remaining loaders are plain reads and run concurrently on pooled connections.
+        async def _plan(session: AsyncSession) -> Any:
+            try:
+                return await roadmap_service.get_latest_plan(session, user)
+            except Exception:
+                return None
+
+        async def _drive(session: AsyncSession) -> Optional[dict[str, Any]]:
+            try:
+                return await _load_next_drive(session, user)
+            except Exception:
+                logger.debug("mentor: drives unavailable", exc_info=True)
+                return None
+
+        async def _coding(session: AsyncSession) -> list[dict[str, Any]]:
+            try:
+                return await _load_recent_coding(session, user)
+            except Exception:
+                logger.debug("mentor: coding unavailable", exc_info=True)
+                return []
+
+        plan, next_drive, recent_coding = await run_parallel_reads(db, _plan, _drive, _coding)
+        if plan is not None:
             plan_status = plan.status
             plan_summary = plan.summary
             if not plan_summary and isinstance(plan.plan, dict):
                 plan_summary = plan.plan.get("baseline_summary") or plan.plan.get("title")
-        except Exception:
-            plan_status = None
-            plan_summary = None
-
-        try:
-            next_drive = await _load_next_drive(db, user)
-        except Exception:
-            logger.debug("mentor: drives unavailable", exc_info=True)
-
-        try:
-            recent_coding = await _load_recent_coding(db, user)
-        except Exception:
-            logger.debug("mentor: coding unavailable", exc_info=True)
 
         return {
             "student_name": name,
@@ -18,7 +18,11 @@ from app.common.organization_access import (
     reject_create_public_as_suspended,
     reject_suspend_if_public,
 )
-from app.common.security.passwords import hash_password, verify_password
+from app.common.security.passwords import (
+    hash_password_async,
+    verify_password_and_update_async,
+    verify_password_async,
+)
 from app.models.enums import (
     OrgAdminTitle,
     OrganizationStatus,
@@ -65,10 +69,15 @@ async def authenticate_platform_user(
         select(PlatformUser).where(PlatformUser.email == email.lower().strip())
     )
     user = result.scalar_one_or_none()
-    if user is None or not verify_password(password, user.password_hash):
+    if user is None:
+        raise PlatformError("Invalid credentials.", status_code=401)
+    ok, new_hash = await verify_password_and_update_async(password, user.password_hash)
+    if not ok:
         raise PlatformError("Invalid credentials.", status_code=401)
     if user.status != PlatformUserStatus.ACTIVE.value:
         raise PlatformError("Account is inactive.", status_code=403)
+    if new_hash:
+        user.password_hash = new_hash  # cost raised since this hash was made
     return user
 
 
@@ -79,9 +88,9 @@ async def change_platform_password(
     current_password: str,
     new_password: str,
 ) -> None:
-    if not verify_password(current_password, user.password_hash):
+    if not await verify_password_async(current_password, user.password_hash):
         raise PlatformError("Current password is incorrect.")
-    user.password_hash = hash_password(new_password)
+    user.password_hash = await hash_password_async(new_password)
     user.must_change_password = False
     await db.flush()
 
@@ -848,7 +857,7 @@ async def activate_tpo(
         except OrganizationAccessError as exc:
             raise PlatformError(exc.message, status_code=exc.status_code) from exc
 
-    user.password_hash = hash_password(new_password)
+    user.password_hash = await hash_password_async(new_password)
     user.status = UserStatus.ACTIVE.value
     user.activation_token_hash = None
     user.activation_expires_at = None
@@ -875,7 +884,7 @@ async def create_platform_user(db: AsyncSession, **fields: object) -> PlatformUs
     user = PlatformUser(
         name=str(fields["name"]).strip(),
         email=email,
-        password_hash=hash_password(str(fields["password"])),
+        password_hash=await hash_password_async(str(fields["password"])),
         role=str(fields["role"]),
         status=PlatformUserStatus.ACTIVE.value,
         must_change_password=True,
@@ -897,7 +906,7 @@ async def update_platform_user(db: AsyncSession, user_id: int, **fields: object)
         raise PlatformError("Platform user not found.", status_code=404)
 
     if "password" in fields and fields["password"]:
-        user.password_hash = hash_password(str(fields["password"]))
+        user.password_hash = await hash_password_async(str(fields["password"]))
         user.must_change_password = True
     if "email" in fields and fields["email"] is not None:
         new_email = str(fields["email"]).lower().strip()
@@ -0,0 +1,46 @@
+"""
+Move inline base64 Help Center screenshots into the blob store.
+
+    python -m app.platform_support.backfill_attachments
+
+Idempotent: replies already holding ``sha256`` entries are skipped, and blobs are
+content-addressed so a re-run never duplicates data. Entries whose base64 does not
+decode stay inline and are listed by reply id; exits 2 when any remain.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+
+# Ensure all ORM tables are registered before reply FKs resolve.
+import app.models  # noqa: F401
+
+from app.common.database.session import async_session_factory, close_db, init_db
+from app.core.config import settings
+from app.platform_support.service import move_inline_attachments
+
+
+async def main() -> int:
+    logging.basicConfig(level=logging.INFO)
+    if not settings.is_database_configured:
+        print("DATABASE_URL missing", file=sys.stderr)
+        return 1
+    await init_db()
+    async with async_session_factory()() as db:
+        report = await move_inline_attachments(db)
+    await close_db()
+    print(f"moved {report.attachments_moved} attachments on {report.replies_updated} replies")
+    if report.undecodable:
+        print(
+            f"left {report.undecodable} undecodable attachments inline on replies "
+            f"{report.undecodable_reply_ids}",
+            file=sys.stderr,
+        )
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.enums import PlatformRole
@@ -29,6 +29,21 @@ def _http(exc: svc.SupportError) -> HTTPException:
     return HTTPException(status_code=exc.status_code, detail=exc.message)
 
 
+async def _attachment(
+    request: Request,
+    db: AsyncSession,
+    *,
+    ticket_id: int,
+    sha256: str,
+    thumbnail: bool,
+) -> Response:
+    try:
+        item = await svc.find_attachment(db, ticket_id=ticket_id, sha256=sha256)
+        return await svc.attachment_response(request, item, thumbnail=thumbnail)
+    except svc.SupportError as exc:
+        raise _http(exc) from exc
+
+
 def _staff_user():
     return require_platform_roles(
         PlatformRole.PLATFORM_ADMIN.value,
@@ -105,3 +120,25 @@ async def close_ticket(
     except svc.SupportError as exc:
         raise _http(exc) from exc
     return TicketDetailOut.model_validate(svc.serialize_ticket(ticket, for_reporter=False))
+
+
+@router.get("/tickets/{ticket_id}/attachments/{sha256}")
+async def get_attachment(
+    ticket_id: int,
+    sha256: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _user: PlatformUser = Depends(_staff_user()),
+) -> Response:
+    return await _attachment(request, db, ticket_id=ticket_id, sha256=sha256, thumbnail=False)
+
+
+@router.get("/tickets/{ticket_id}/attachments/{sha256}/thumbnail")
+async def get_attachment_thumbnail(
+    ticket_id: int,
+    sha256: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _user: PlatformUser = Depends(_staff_user()),
+) -> Response:
+    return await _attachment(request, db, ticket_id=ticket_id, sha256=sha256, thumbnail=True)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.deps import get_current_active_user, get_db, require_api_key
@@ -27,6 +27,23 @@ def _http(exc: svc.SupportError) -> HTTPException:
     return HTTPException(status_code=exc.status_code, detail=exc.message)
 
 
+async def _attachment(
+    request: Request,
+    db: AsyncSession,
+    *,
+    ticket_id: int,
+    sha256: str,
+    thumbnail: bool,
+    user_id: int,
+) -> Response:
+    try:
+        await svc.get_my_ticket_id(db, ticket_id=ticket_id, user_id=user_id)
+        item = await svc.find_attachment(db, ticket_id=ticket_id, sha256=sha256)
+        return await svc.attachment_response(request, item, thumbnail=thumbnail)
+    except svc.SupportError as exc:
+        raise _http(exc) from exc
+
+
 @router.post("/tickets", response_model=TicketDetailOut, status_code=201)
 async def create_ticket(
     body: TicketCreateIn,
@@ -108,3 +125,29 @@ async def close_ticket(
     except svc.SupportError as exc:
         raise _http(exc) from exc
     return TicketDetailOut.model_validate(svc.serialize_ticket(ticket, for_reporter=True))
+
+
+@router.get("/tickets/{ticket_id}/attachments/{sha256}")
+async def get_attachment(
+    ticket_id: int,
+    sha256: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_active_user),
+) -> Response:
+    return await _attachment(
+        request, db, ticket_id=ticket_id, sha256=sha256, thumbnail=False, user_id=user.id
+    )
+
+
+@router.get("/tickets/{ticket_id}/attachments/{sha256}/thumbnail")
+async def get_attachment_thumbnail(
+    ticket_id: int,
+    sha256: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_active_user),
+) -> Response:
+    return await _attachment(
+        request, db, ticket_id=ticket_id, sha256=sha256, thumbnail=True, user_id=user.id
+    )
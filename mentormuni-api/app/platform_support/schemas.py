@@ -15,7 +15,13 @@ class AttachmentIn(BaseModel):
 class AttachmentOut(BaseModel):
     filename: str
     content_type: str
-    data_base64: str
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    # Fetch with the same auth headers as the ticket (ETag / Range aware).
+    url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    # Only for legacy rows not yet moved to the blob store.
+    data_base64: Optional[str] = None
 
 
 class TicketCreateIn(BaseModel):
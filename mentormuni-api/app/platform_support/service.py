@@ -1,15 +1,32 @@
-"""Help Center tickets. Platform views never include reporter name or email."""
+"""Help Center tickets. Platform views never include reporter name or email.
+
+Screenshots live in the content-addressed blob store (``app.common.blobs``); a reply's
+``attachments_json`` only keeps ``{sha256, filename, content_type, size}`` per image.
+Rows written before that may still carry inline ``data_base64`` until
+``python -m app.platform_support.backfill_attachments`` has moved them out.
+"""
 
 from __future__ import annotations
 
 import base64
 import binascii
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import func, select
+from fastapi import Request, Response
+from sqlalchemy import Text, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
+
+from app.common.blobs import (
+    BlobNotFoundError,
+    blob_response,
+    ensure_thumbnail,
+    get_blob_store,
+)
+from app.common.blobs.thumbnails import THUMBNAIL_CONTENT_TYPE
+from app.core.config import settings
 
 from app.models.enums import RoleCode, SupportCategory, SupportSourcePortal, SupportTicketStatus
 from app.models.platform_support import PlatformSupportReply, PlatformSupportTicket
@@ -79,12 +96,71 @@ def normalize_attachments(raw: list | None) -> list[dict]:
             {
                 "filename": filename or "screenshot.png",
                 "content_type": "image/jpeg" if content_type == "image/jpg" else content_type,
-                "data_base64": data,
+                "data": decoded,
             }
         )
     return cleaned
 
 
+async def store_attachments(raw: list | None) -> list[dict]:
+    """Validate uploads, write the bytes to the blob store, return row metadata."""
+    store = get_blob_store()
+    stored: list[dict] = []
+    for item in normalize_attachments(raw):
+        ref = await store.put(item["data"], content_type=item["content_type"])
+        stored.append(
+            {
+                "sha256": ref.key,
+                "filename": item["filename"],
+                "content_type": item["content_type"],
+                "size": ref.size,
+            }
+        )
+    return stored
+
+
+def _attachment_base(ticket_id: int, *, for_reporter: bool) -> str:
+    prefix = "/support" if for_reporter else "/platform/support"
+    return f"{prefix}/tickets/{ticket_id}/attachments"
+
+
+def serialize_attachment(item: dict, *, base_url: str) -> dict:
+    sha = item.get("sha256")
+    out = {
+        "filename": item.get("filename") or "screenshot.png",
+        "content_type": item.get("content_type") or "image/png",
+        "size": item.get("size"),
+        "sha256": sha,
+        "url": None,
+        "thumbnail_url": None,
+        "data_base64": None,
+    }
+    if sha:
+        out["url"] = f"{base_url}/{sha}"
+        out["thumbnail_url"] = f"{base_url}/{sha}/thumbnail"
+    else:
+        # Not yet moved to the blob store.
+        out["data_base64"] = item.get("data_base64") or ""
+    return out
+
+
+# Columns the ticket list views actually render (see ``_ticket_preview``).
+_PREVIEW_COLUMNS = (
+    PlatformSupportTicket.id,
+    PlatformSupportTicket.subject,
+    PlatformSupportTicket.status,
+    PlatformSupportTicket.category,
+    PlatformSupportTicket.organization_id,
+    PlatformSupportTicket.organization_name,
+    PlatformSupportTicket.organization_code,
+    PlatformSupportTicket.source_portal,
+    PlatformSupportTicket.reporter_role_code,
+    PlatformSupportTicket.created_at,
+    PlatformSupportTicket.updated_at,
+    PlatformSupportTicket.closed_at,
+)
+
+
 def _ticket_preview(ticket: PlatformSupportTicket, reply_count: int = 0) -> dict:
     return {
         "id": ticket.id,
@@ -110,17 +186,12 @@ def serialize_reply(reply: PlatformSupportReply, *, for_reporter: bool) -> dict:
         label = "You"
     else:
         label = "Reporter"
-    attachments = []
-    for item in reply.attachments_json or []:
-        if not isinstance(item, dict):
-            continue
-        attachments.append(
-            {
-                "filename": item.get("filename") or "screenshot.png",
-                "content_type": item.get("content_type") or "image/png",
-                "data_base64": item.get("data_base64") or "",
-            }
-        )
+    base_url = _attachment_base(reply.ticket_id, for_reporter=for_reporter)
+    attachments = [
+        serialize_attachment(item, base_url=base_url)
+        for item in reply.attachments_json or []
+        if isinstance(item, dict)
+    ]
     return {
         "id": reply.id,
         "author_kind": reply.author_kind,
@@ -155,7 +226,7 @@ async def create_ticket(
     org = user.organization
     if not org:
         raise SupportError("Your account is not linked to an organization.", 400)
-    files = normalize_attachments(attachments)
+    files = await store_attachments(attachments)
     ticket = PlatformSupportTicket(
         organization_id=user.organization_id,
         organization_name=org.name,
@@ -191,6 +262,7 @@ async def list_my_tickets(db: AsyncSession, *, user_id: int) -> list[tuple[Platf
     rows = (
         await db.execute(
             select(PlatformSupportTicket, count_sq)
+            .options(load_only(*_PREVIEW_COLUMNS))
             .where(PlatformSupportTicket.reporter_user_id == user_id)
             .order_by(PlatformSupportTicket.updated_at.desc())
         )
@@ -211,7 +283,7 @@ async def list_platform_tickets(
         .correlate(PlatformSupportTicket)
         .scalar_subquery()
     )
-    q = select(PlatformSupportTicket, count_sq)
+    q = select(PlatformSupportTicket, count_sq).options(load_only(*_PREVIEW_COLUMNS))
     if status:
         q = q.where(PlatformSupportTicket.status == status)
     if source_portal:
@@ -243,6 +315,115 @@ async def get_my_ticket(db: AsyncSession, *, ticket_id: int, user_id: int) -> Pl
     return ticket
 
 
+async def find_attachment(db: AsyncSession, *, ticket_id: int, sha256: str) -> dict:
+    """Attachment metadata if ``sha256`` belongs to a reply on this ticket, else 404."""
+    rows = (
+        await db.execute(
+            select(PlatformSupportReply.attachments_json).where(
+                PlatformSupportReply.ticket_id == ticket_id,
+                PlatformSupportReply.attachments_json.is_not(None),
+            )
+        )
+    ).scalars()
+    for items in rows:
+        for item in items or []:
+            if isinstance(item, dict) and item.get("sha256") == sha256:
+                return item
+    raise SupportError("Attachment not found.", 404)
+
+
+async def attachment_response(request: Request, item: dict, *, thumbnail: bool = False) -> Response:
+    """Stream an attachment (or its cached thumbnail) with ETag / Range handling."""
+    store = get_blob_store()
+    key = item["sha256"]
+    content_type = item.get("content_type") or "image/png"
+    if thumbnail:
+        thumb = await ensure_thumbnail(store, key, settings.blob_thumbnail_max_px)
+        if thumb:
+            key, content_type = thumb, THUMBNAIL_CONTENT_TYPE
+    try:
+        return await blob_response(
+            request, store, key, content_type=content_type, filename=item.get("filename")
+        )
+    except BlobNotFoundError as exc:
+        raise SupportError("Attachment not found.", 404) from exc
+
+
+async def get_my_ticket_id(db: AsyncSession, *, ticket_id: int, user_id: int) -> int:
+    """Ownership check without loading replies (attachment downloads)."""
+    found = (
+        await db.execute(
+            select(PlatformSupportTicket.id).where(
+                PlatformSupportTicket.id == ticket_id,
+                PlatformSupportTicket.reporter_user_id == user_id,
+            )
+        )
+    ).scalar_one_or_none()
+    if found is None:
+        raise SupportError("Ticket not found.", 404)
+    return found
+
+
+@dataclass
+class InlineAttachmentMove:
+    replies_updated: int = 0
+    attachments_moved: int = 0
+    # Items whose ``data_base64`` does not decode; left inline for manual review.
+    undecodable: int = 0
+    undecodable_reply_ids: list[int] = field(default_factory=list)
+
+
+async def move_inline_attachments(db: AsyncSession, *, batch_size: int = 100) -> InlineAttachmentMove:
+    """Move legacy ``data_base64`` screenshots into the blob store."""
+    store = get_blob_store()
+    report = InlineAttachmentMove()
+    last_id = 0
+    while True:
+        replies = list(
+            (
+                await db.execute(
+                    select(PlatformSupportReply)
+                    .where(
+                        PlatformSupportReply.id > last_id,
+                        cast(PlatformSupportReply.attachments_json, Text).like('%"data_base64"%'),
+                    )
+                    .order_by(PlatformSupportReply.id)
+                    .limit(batch_size)
+                )
+            ).scalars()
+        )
+        if not replies:
+            return report
+        for reply in replies:
+            last_id = reply.id
+            items: list[dict] = []
+            moved = 0
+            for item in reply.attachments_json or []:
+                if isinstance(item, dict) and item.get("data_base64") and not item.get("sha256"):
+                    try:
+                        data = base64.b64decode(item["data_base64"], validate=True)
+                    except (binascii.Error, ValueError):
+                        items.append(item)
+                        report.undecodable += 1
+                        if report.undecodable_reply_ids[-1:] != [reply.id]:
+                            report.undecodable_reply_ids.append(reply.id)
+                        continue
+                    ref = await store.put(data, content_type=item.get("content_type"))
+                    moved += 1
+                    item = {
+                        "sha256": ref.key,
+                        "filename": item.get("filename") or "screenshot.png",
+                        "content_type": item.get("content_type") or "image/png",
+                        "size": ref.size,
+                    }
+                items.append(item)
+            if moved:
+                reply.attachments_json = items
+                report.replies_updated += 1
+                report.attachments_moved += moved
+        await db.commit()
+
+
 async def add_reply(
     db: AsyncSession,
     *,
@@ -255,7 +436,7 @@ async def add_reply(
 ) -> PlatformSupportTicket:
     if ticket.status == SupportTicketStatus.CLOSED.value:
         raise SupportError("This ticket is closed.")
-    files = normalize_attachments(attachments)
+    files = await store_attachments(attachments)
     db.add(
         PlatformSupportReply(
             ticket_id=ticket.id,
@@ -8,6 +8,8 @@ import re
 import shutil
 import subprocess
 import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, List, Optional, Set, Tuple
 
@@ -330,24 +332,26 @@ def extract_text(filename: str, content: bytes) -> str:
 
 
 def _tokenize_role(role: str) -> List[str]:
-    raw = re.findall(r"[a-z0-9+#.]+", role.lower())
+    raw = _ROLE_TOKEN_RE.findall(role.lower())
     terms: List[str] = []
     for t in raw:
         if len(t) < 2 or t in _STOPWORDS:
             continue
         terms.append(t)
-    if re.search(r"machine\s+learning", role, re.I) and "learning" in terms and "machine" not in terms:
+    if _MACHINE_LEARNING_RE.search(role) and "learning" in terms and "machine" not in terms:
         terms.insert(0, "machine")
     return list(dict.fromkeys(terms))
 
 
+@lru_cache(maxsize=2048)
+def _term_pattern(term: str) -> re.Pattern[str]:
+    return re.compile(rf"(?<!\w){re.escape(term)}(?!\w)", re.IGNORECASE)
+
+
 def _word_boundary_match(haystack: str, term: str) -> bool:
     if len(term) < 2:
         return False
-    try:
-        return re.search(rf"(?<!\w){re.escape(term)}(?!\w)", haystack, re.IGNORECASE) is not None
-    except re.error:
-        return term.lower() in haystack.lower()
+    return _term_pattern(term).search(haystack) is not None
 
 
 def _role_bank_keywords(target_role: str) -> List[str]:
@@ -366,7 +370,7 @@ def _jd_keywords(job_description: str, max_terms: int = 12) -> List[str]:
     """Extract searchable terms from an optional job description."""
     if not (job_description or "").strip():
         return []
-    raw = re.findall(r"[a-z0-9+#./-]+", job_description.lower())
+    raw = _JD_TOKEN_RE.findall(job_description.lower())
     terms: List[str] = []
     for t in raw:
         if len(t) < 2 or t in _STOPWORDS:
@@ -398,33 +402,14 @@ def _build_keyword_targets(target_role: str, job_description: Optional[str] = No
     return combined[:18]
 
 
-def _keyword_analysis(
-    resume_lower: str,
-    target_role: str,
-    job_description: Optional[str] = None,
-) -> Tuple[int, List[str], List[str]]:
-    primary = _build_keyword_targets(target_role, job_description)
-
-    matched: List[str] = []
-    missing: List[str] = []
-    for p in primary:
-        family = {p} | _KEYWORD_ALIASES.get(p, set())
-        if any(_word_boundary_match(resume_lower, w) for w in family):
-            matched.append(p)
-        else:
-            missing.append(p)
-
-    score = int(round(100 * len(matched) / max(len(primary), 1)))
-    return score, matched, missing
-
-
-_SECTION_PATTERNS = (
-    r"\bexperience\b",
-    r"\beducation\b",
-    r"\bskills?\b",
-    r"\bprojects?\b",
-    r"\bsummary\b",
-    r"\bwork\b",
+# Section headings as word sets (each entry is one section; any word counts as a hit).
+_SECTION_WORDS = (
+    frozenset({"experience"}),
+    frozenset({"education"}),
+    frozenset({"skill", "skills"}),
+    frozenset({"project", "projects"}),
+    frozenset({"summary"}),
+    frozenset({"work"}),
 )
 
 _ACTION_VERBS = (
@@ -445,47 +430,184 @@ _ACTION_VERBS = (
     "created",
     "managed",
 )
+_ACTION_VERB_SET = frozenset(_ACTION_VERBS)
+
+# Compiled once; every scorer reads from ``_ResumeFeatures`` instead of re-scanning.
+_WORD_RE = re.compile(r"\w+")
+_SIMPLE_TERM_RE = re.compile(r"\w+")
+_ROLE_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+_JD_TOKEN_RE = re.compile(r"[a-z0-9+#./-]+")
+_MACHINE_LEARNING_RE = re.compile(r"machine\s+learning", re.I)
+_EMAIL_RE = re.compile(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}", re.I)
+_PHONE_RE = re.compile(r"(\+?\d[\d\s\-\(\)]{7,}\d)")
+_BULLET_RE = re.compile(r"^(?:[\-\u2022\u2023\*]\s+|\d+[\.)]\s+)")
+_PERCENT_RE = re.compile(r"\d+\s*%")
+_MONEY_RE = re.compile(r"\$\s*\d|\d+\s*k\b|\d+\s*m\b")
+_DURATION_RE = re.compile(r"\d+\s*\+?\s*(years?|yrs?|months?)\b")
+_YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+_SKILLISH_RE = re.compile(
+    r"\b(skills?|technologies|tech stack|programming|languages?|frameworks?|tools?)\b"
+)
+_TIMELINE_WORDS = frozenset(
+    {"present", "current", "intern", "internship", "engineer", "developer", "analyst"}
+)
+_SUMMARY_RE = re.compile(
+    r"\b(summary|professional summary|career summary|objective|profile)\b|\babout me\b"
+)
+_TITLE_RE = re.compile(r"\b(engineer|developer|analyst|intern|manager|designer)\b")
+_SUMMARY_LINE_EXCLUDE_RE = re.compile(r"@|linkedin|github|phone|\d{10}", re.I)
+_EXPERIENCE_RE = re.compile(r"\b(experience|work history|employment)\b")
+_DEGREE_RE = re.compile(
+    r"\b(b\.?tech|b\.?e\.?|m\.?tech|bachelor|master|degree|university|college|cgpa|gpa)\b"
+)
+_SKILLS_BLOCK_RE = re.compile(
+    r"(?:^|\n)\s*(?:skills?|technical skills?|key skills?|technologies|tech stack)\s*[:\-]?\s*\n?([\s\S]{0,2500})",
+    re.I,
+)
+_SKILLS_BLOCK_END_RE = re.compile(
+    r"\n\s*(?:experience|education|projects?|certifications?|achievements?|summary)\b", re.I
+)
+_STUDENT_RE = re.compile(r"\b(intern(ship)?|fresher|student|b\.?tech|college|university)\b")
+_EXPERIENCED_RE = re.compile(r"\b\d+\+?\s*(years?|yrs?)\s+(of\s+)?experience\b")
+
+
+def _section_hit_count(tokens: frozenset[str]) -> int:
+    return sum(1 for words in _SECTION_WORDS if not words.isdisjoint(tokens))
+
+
+def _count_skills_in(lower: str) -> int:
+    m = _SKILLS_BLOCK_RE.search(lower)
+    if not m:
+        return 0
+    # Stop at next major section heading
+    block = _SKILLS_BLOCK_END_RE.split(m.group(1), maxsplit=1)[0]
+    items: Set[str] = set()
+    for ln in block.splitlines():
+        ln = ln.strip().lstrip("-•*·").strip()
+        if not ln or len(ln) < 2:
+            continue
+        if "," in ln:
+            for part in ln.split(","):
+                p = part.strip()
+                if 2 <= len(p) <= 40:
+                    items.add(p.lower())
+        elif 2 <= len(ln) <= 40:
+            items.add(ln.lower())
+    return len(items)
+
+
+@dataclass(frozen=True)
+class _ResumeFeatures:
+    """Everything the scorers need, computed in one pass over the resume text."""
+
+    text: str
+    lower: str
+    lines: Tuple[str, ...]  # stripped, non-empty
+    tokens: frozenset[str]
+    head_section_hits: int  # within the first 120 lines
+    section_hits: int
+    has_email: bool
+    has_phone: bool
+    has_profile_link: bool
+    bullets: int
+    letters: int
+    skills_n: int
+    has_summary: bool
+    verb_hits: int
+    long_lines: int
+
+    def has_term(self, term: str) -> bool:
+        """Word-boundary match: token lookup for plain words, cached regex otherwise."""
+        if len(term) < 2:
+            return False
+        if _SIMPLE_TERM_RE.fullmatch(term):
+            return term in self.tokens
+        return _term_pattern(term).search(self.lower) is not None
+
+    @property
+    def letter_ratio(self) -> float:
+        return self.letters / max(len(self.text), 1)
+
+
+def _resume_features(text: str) -> _ResumeFeatures:
+    lower = text.lower()
+    lines = tuple(ln.strip() for ln in text.splitlines() if ln.strip())
+    tokens = frozenset(_WORD_RE.findall(lower))
+    section_hits = _section_hit_count(tokens)
+    if len(lines) > 120:
+        head_tokens = frozenset(_WORD_RE.findall("\n".join(lines[:120]).lower()))
+        head_section_hits = _section_hit_count(head_tokens)
+    else:
+        head_section_hits = section_hits
+    return _ResumeFeatures(
+        text=text,
+        lower=lower,
+        lines=lines,
+        tokens=tokens,
+        head_section_hits=head_section_hits,
+        section_hits=section_hits,
+        has_email=_EMAIL_RE.search(text) is not None,
+        has_phone=_PHONE_RE.search(text) is not None,
+        has_profile_link=not tokens.isdisjoint({"linkedin", "github"}),
+        bullets=sum(1 for ln in lines if _BULLET_RE.match(ln)),
+        letters=sum(1 for c in text if c.isalpha()),
+        skills_n=_count_skills_in(lower),
+        has_summary=_SUMMARY_RE.search(lower) is not None,
+        verb_hits=len(_ACTION_VERB_SET & tokens),
+        long_lines=sum(1 for ln in lines if len(ln) > 40),
+    )
+
+
+# Bank / alias terms that are not plain words ("ci/cd", "power bi") compile at import.
+for _term in {t for kws in _ROLE_KEYWORD_BANK.values() for t in kws} | {
+    a for aliases in _KEYWORD_ALIASES.values() for a in aliases
+}:
+    if not _SIMPLE_TERM_RE.fullmatch(_term):
+        _term_pattern(_term)
+
+
+def _keyword_analysis(
+    features: _ResumeFeatures,
+    target_role: str,
+    job_description: Optional[str] = None,
+) -> Tuple[int, List[str], List[str]]:
+    primary = _build_keyword_targets(target_role, job_description)
+
+    matched: List[str] = []
+    missing: List[str] = []
+    for p in primary:
+        family = {p} | _KEYWORD_ALIASES.get(p, set())
+        if any(features.has_term(w) for w in family):
+            matched.append(p)
+        else:
+            missing.append(p)
 
+    score = int(round(100 * len(matched) / max(len(primary), 1)))
+    return score, matched, missing
 
-def _is_likely_resume(text: str) -> tuple[bool, str]:
+
+def _is_likely_resume(f: _ResumeFeatures) -> tuple[bool, str]:
     """
     Lightweight resume classifier to block arbitrary PDFs from being scored as resumes.
     Deterministic and fast: requires multiple resume-structure signals.
     """
-    t = (text or "").strip()
-    if len(t) < 200:
+    if len(f.text.strip()) < 200:
         return False, "The uploaded file does not look like a resume (too little structured content)."
 
-    lower = t.lower()
-
-    has_email = re.search(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}", t, re.I) is not None
-    has_phone = re.search(r"(\+?\d[\d\s\-\(\)]{7,}\d)", t) is not None
-    section_hits = sum(1 for p in _SECTION_PATTERNS if re.search(p, lower))
-    has_skillish = re.search(
-        r"\b(skills?|technologies|tech stack|programming|languages?|frameworks?|tools?)\b",
-        lower,
-    ) is not None
-    has_timeline = re.search(
-        r"\b(19|20)\d{2}\b|\b(present|current)\b|\b(intern(ship)?|engineer|developer|analyst)\b",
-        lower,
-    ) is not None
-    bulletish = sum(
-        1
-        for ln in t.splitlines()
-        if re.match(r"^\s*[\-\u2022\u2023\*]\s+", ln) or re.match(r"^\s*\d+[\.)]\s+", ln)
-    )
+    has_skillish = _SKILLISH_RE.search(f.lower) is not None
+    has_timeline = _YEAR_RE.search(f.lower) is not None or not _TIMELINE_WORDS.isdisjoint(f.tokens)
 
     score = 0
-    score += 2 if has_email else 0
-    score += 2 if has_phone else 0
-    score += min(4, section_hits)  # up to 4 points
+    score += 2 if f.has_email else 0
+    score += 2 if f.has_phone else 0
+    score += min(4, f.section_hits)  # up to 4 points
     score += 1 if has_skillish else 0
     score += 1 if has_timeline else 0
-    score += 1 if bulletish >= 2 else 0
+    score += 1 if f.bullets >= 2 else 0
 
     # Require evidence from multiple independent resume signals.
     # Typical resumes pass comfortably; random docs rarely satisfy this.
-    if score >= 6 and section_hits >= 2 and (has_email or has_phone):
+    if score >= 6 and f.section_hits >= 2 and (f.has_email or f.has_phone):
         return True, ""
     return (
         False,
@@ -493,56 +615,47 @@ def _is_likely_resume(text: str) -> tuple[bool, str]:
     )
 
 
-def _formatting_score(text: str) -> int:
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+def _formatting_score(f: _ResumeFeatures) -> int:
     score = 35
-    if len(lines) >= 8:
+    if len(f.lines) >= 8:
         score += 15
-    if len(lines) >= 20:
+    if len(f.lines) >= 20:
         score += 10
-    joined = "\n".join(lines[:120]).lower()
-    if re.search(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}", text, re.I):
+    if f.has_email:
         score += 12
-    section_hits = sum(1 for p in _SECTION_PATTERNS if re.search(p, joined))
-    score += min(18, section_hits * 4)
-    bulletish = sum(1 for ln in lines if re.match(r"^[\-\u2022\u2023\*]\s+", ln) or re.match(r"^\d+[\.)]\s+", ln))
-    score += min(12, bulletish * 2)
-    if 400 <= len(text) <= 12000:
+    score += min(18, f.head_section_hits * 4)
+    score += min(12, f.bullets * 2)
+    if 400 <= len(f.text) <= 12000:
         score += 8
     return max(0, min(100, score))
 
 
-def _impact_score(text: str) -> int:
-    lower = text.lower()
+def _impact_score(f: _ResumeFeatures) -> int:
     score = 30
-    if re.search(r"\d+\s*%", text):
+    if _PERCENT_RE.search(f.text):
         score += 12
-    if re.search(r"\$\s*\d|\d+\s*k\b|\d+\s*m\b", lower):
+    if _MONEY_RE.search(f.lower):
         score += 8
-    if re.search(r"\d+\s*\+?\s*(years?|yrs?|months?)\b", lower):
+    if _DURATION_RE.search(f.lower):
         score += 10
-    verb_hits = sum(1 for v in _ACTION_VERBS if re.search(rf"\b{v}\b", lower))
-    score += min(30, verb_hits * 4)
-    if len([ln for ln in text.splitlines() if len(ln.strip()) > 40]) >= 3:
+    score += min(30, f.verb_hits * 4)
+    if f.long_lines >= 3:
         score += 10
     return max(0, min(100, score))
 
 
-def _ats_parse_score(text: str) -> int:
-    lower = text.lower()
+def _ats_parse_score(f: _ResumeFeatures) -> int:
     score = 40
     # Section signals
-    if any(re.search(p, lower) for p in _SECTION_PATTERNS):
+    if f.section_hits:
         score += 20
     # Not mostly non-letters
-    letters = sum(1 for c in text if c.isalpha())
-    if len(text) > 50 and letters / max(len(text), 1) > 0.45:
+    if len(f.text) > 50 and f.letter_ratio > 0.45:
         score += 15
     # Contact / structure
-    if re.search(r"\b(linkedin|github)\b", lower):
+    if f.has_profile_link:
         score += 10
-    lines = [ln for ln in text.splitlines() if ln.strip()]
-    if len(lines) >= 5:
+    if len(f.lines) >= 5:
         score += 10
     return max(0, min(100, score))
 
@@ -564,43 +677,11 @@ def _visibility_band(score: int) -> str:
 
 
 def _count_skills(text: str) -> int:
-    lower = text.lower()
-    m = re.search(
-        r"(?:^|\n)\s*(?:skills?|technical skills?|key skills?|technologies|tech stack)\s*[:\-]?\s*\n?([\s\S]{0,2500})",
-        lower,
-        re.I,
-    )
-    if not m:
-        return 0
-    block = m.group(1)
-    # Stop at next major section heading
-    block = re.split(
-        r"\n\s*(?:experience|education|projects?|certifications?|achievements?|summary)\b",
-        block,
-        maxsplit=1,
-        flags=re.I,
-    )[0]
-    items: Set[str] = set()
-    for ln in block.splitlines():
-        ln = ln.strip().lstrip("-•*·").strip()
-        if not ln or len(ln) < 2:
-            continue
-        if "," in ln:
-            for part in ln.split(","):
-                p = part.strip()
-                if 2 <= len(p) <= 40:
-                    items.add(p.lower())
-        elif 2 <= len(ln) <= 40:
-            items.add(ln.lower())
-    return len(items)
+    return _count_skills_in(text.lower())
 
 
 def _has_summary_section(text: str) -> bool:
-    lower = text.lower()
-    return bool(
-        re.search(r"\b(summary|professional summary|career summary|objective|profile)\b", lower)
-        or re.search(r"\babout me\b", lower)
-    )
+    return _SUMMARY_RE.search(text.lower()) is not None
 
 
 def _headline_matches_role(text: str, target_role: str) -> bool:
@@ -613,38 +694,38 @@ def _headline_matches_role(text: str, target_role: str) -> bool:
     return hits >= max(1, len(tokens) // 2)
 
 
-def _section_scores(text: str, target_role: str) -> dict[str, int]:
-    lower = text.lower()
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+def _section_scores(f: _ResumeFeatures, target_role: str, *, headline_ok: bool) -> dict[str, int]:
+    lower = f.lower
+    lines = f.lines
 
     contact = 0
-    if re.search(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}", text, re.I):
+    if f.has_email:
         contact += 45
-    if re.search(r"(\+?\d[\d\s\-\(\)]{7,}\d)", text):
+    if f.has_phone:
         contact += 35
-    if re.search(r"\b(linkedin|github)\b", lower):
+    if f.has_profile_link:
         contact += 20
 
     headline = 25
     if lines and len(lines[0]) <= 90:
         headline += 20
-    if _headline_matches_role(text, target_role):
+    if headline_ok:
         headline += 35
-    elif re.search(r"\b(engineer|developer|analyst|intern|manager|designer)\b", lower[:500]):
+    elif _TITLE_RE.search(lower[:500]):
         headline += 15
 
     summary = 20
-    if _has_summary_section(text):
+    if f.has_summary:
         summary += 45
     summary_lines = [
         ln
         for ln in lines[:25]
-        if 40 <= len(ln) <= 220 and not re.search(r"@|linkedin|github|phone|\d{10}", ln, re.I)
+        if 40 <= len(ln) <= 220 and not _SUMMARY_LINE_EXCLUDE_RE.search(ln)
     ]
     if summary_lines:
         summary += min(35, len(summary_lines) * 12)
 
-    skills_n = _count_skills(text)
+    skills_n = f.skills_n
     if skills_n >= 12:
         skills = 95
     elif skills_n >= 10:
@@ -657,21 +738,16 @@ def _section_scores(text: str, target_role: str) -> dict[str, int]:
         skills = 25
 
     experience = 20
-    if re.search(r"\b(experience|work history|employment)\b", lower):
+    if _EXPERIENCE_RE.search(lower):
         experience += 30
-    bullets = sum(
-        1
-        for ln in lines
-        if re.match(r"^[\-\u2022\u2023\*]\s+", ln) or re.match(r"^\d+[\.)]\s+", ln)
-    )
-    experience += min(35, bullets * 4)
-    if re.search(r"\b(19|20)\d{2}\b", lower) and re.search(r"\b(present|current)\b", lower):
+    experience += min(35, f.bullets * 4)
+    if _YEAR_RE.search(lower) and not f.tokens.isdisjoint({"present", "current"}):
         experience += 15
 
     education = 20
-    if re.search(r"\beducation\b", lower):
+    if "education" in f.tokens:
         education += 45
-    if re.search(r"\b(b\.?tech|b\.?e\.?|m\.?tech|bachelor|master|degree|university|college|cgpa|gpa)\b", lower):
+    if _DEGREE_RE.search(lower):
         education += 35
 
     return {
@@ -684,11 +760,10 @@ def _section_scores(text: str, target_role: str) -> dict[str, int]:
     }
 
 
-def _format_warnings(text: str) -> List[dict[str, str]]:
+def _format_warnings(f: _ResumeFeatures) -> List[dict[str, str]]:
     warnings: List[dict[str, str]] = []
-    letters = sum(1 for c in text if c.isalpha())
-    ratio = letters / max(len(text), 1)
-    if len(text) > 50 and ratio < 0.35:
+    text_len = len(f.text)
+    if text_len > 50 and f.letter_ratio < 0.35:
         warnings.append(
             {
                 "code": "image_heavy",
@@ -696,7 +771,7 @@ def _format_warnings(text: str) -> List[dict[str, str]]:
                 "severity": "fail",
             }
         )
-    if len(text) > 14_000:
+    if text_len > 14_000:
         warnings.append(
             {
                 "code": "too_long",
@@ -704,7 +779,7 @@ def _format_warnings(text: str) -> List[dict[str, str]]:
                 "severity": "warn",
             }
         )
-    if len(text) < 400:
+    if text_len < 400:
         warnings.append(
             {
                 "code": "too_short",
@@ -712,8 +787,7 @@ def _format_warnings(text: str) -> List[dict[str, str]]:
                 "severity": "warn",
             }
         )
-    section_hits = sum(1 for p in _SECTION_PATTERNS if re.search(p, text.lower()))
-    if section_hits < 3:
+    if f.section_hits < 3:
         warnings.append(
             {
                 "code": "missing_sections",
@@ -721,7 +795,7 @@ def _format_warnings(text: str) -> List[dict[str, str]]:
                 "severity": "fail",
             }
         )
-    skills_n = _count_skills(text)
+    skills_n = f.skills_n
     if skills_n < 6:
         warnings.append(
             {
@@ -733,13 +807,19 @@ def _format_warnings(text: str) -> List[dict[str, str]]:
     return warnings
 
 
-def _naukri_checklist(text: str, target_role: str, impact: int) -> List[dict[str, Any]]:
-    skills_n = _count_skills(text)
-    has_summary = _has_summary_section(text)
-    headline_ok = _headline_matches_role(text, target_role)
-    has_contact = bool(re.search(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}", text, re.I))
-    has_exp = bool(re.search(r"\b(experience|projects?)\b", text.lower()))
-    has_edu = bool(re.search(r"\beducation\b", text.lower()))
+def _naukri_checklist(
+    f: _ResumeFeatures,
+    target_role: str,
+    impact: int,
+    *,
+    headline_ok: bool,
+    format_warnings: List[dict[str, str]],
+) -> List[dict[str, Any]]:
+    skills_n = f.skills_n
+    has_summary = f.has_summary
+    has_contact = f.has_email
+    has_exp = not f.tokens.isdisjoint({"experience", "project", "projects"})
+    has_edu = "education" in f.tokens
     has_metrics = impact >= 65
 
     def _status(passed: bool, partial: bool = False) -> str:
@@ -789,7 +869,7 @@ def _naukri_checklist(text: str, target_role: str, impact: int) -> List[dict[str
         },
         {
             "item": "ATS-friendly text format",
-            "status": _status(not any(w["severity"] == "fail" for w in _format_warnings(text))),
+            "status": _status(not any(w["severity"] == "fail" for w in format_warnings)),
             "detail": "Single-column PDF/DOCX; avoid image-only layouts.",
         },
     ]
@@ -833,9 +913,9 @@ def _infer_candidate_type(experience_years: Optional[int], text: str) -> Optiona
     if experience_years is not None:
         return "college_student" if experience_years <= 1 else "experienced"
     lower = text.lower()
-    if re.search(r"\b(intern(ship)?|fresher|student|b\.?tech|college|university)\b", lower):
+    if _STUDENT_RE.search(lower):
         return "college_student"
-    if re.search(r"\b\d+\+?\s*(years?|yrs?)\s+(of\s+)?experience\b", lower):
+    if _EXPERIENCED_RE.search(lower):
         return "experienced"
     return None
 
@@ -896,7 +976,7 @@ def _build_strengths(
     matched: List[str],
     formatting: int,
     impact: int,
-    text: str,
+    has_email: bool,
 ) -> List[str]:
     strengths: List[str] = []
     if matched:
@@ -905,7 +985,7 @@ def _build_strengths(
         strengths.append("Readable structure with sections and bullets.")
     if impact >= 68:
         strengths.append("Evidence of measurable or action-oriented statements.")
-    if re.search(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}", text, re.I):
+    if has_email:
         strengths.append("Contact information is present for recruiters.")
     if not strengths:
         strengths.append("Resume length is sufficient for ATS text extraction.")
@@ -939,24 +1019,27 @@ def analyze_resume(
     experience_years: Optional[int] = None,
     job_description: Optional[str] = None,
 ) -> dict:
-    ok_resume, reason = _is_likely_resume(text)
+    features = _resume_features(text)
+    ok_resume, reason = _is_likely_resume(features)
     if not ok_resume:
         raise ValueError(reason)
 
     tr = (target_role or "").strip() or "Software Developer"
-    resume_lower = text.lower()
 
     resolved_type = (candidate_type or "").strip() or _infer_candidate_type(experience_years, text)
-    kw_score, matched, missing = _keyword_analysis(resume_lower, tr, job_description)
-    fmt = _formatting_score(text)
-    imp = _impact_score(text)
-    ats = _ats_parse_score(text)
+    kw_score, matched, missing = _keyword_analysis(features, tr, job_description)
+    fmt = _formatting_score(features)
+    imp = _impact_score(features)
+    ats = _ats_parse_score(features)
     overall = _overall_weighted(kw_score, fmt, imp, ats, resolved_type)
-    sections = _section_scores(text, tr)
-    fmt_warnings = _format_warnings(text)
-    checklist = _naukri_checklist(text, tr, imp)
+    headline_ok = _headline_matches_role(text, tr)
+    sections = _section_scores(features, tr, headline_ok=headline_ok)
+    fmt_warnings = _format_warnings(features)
+    checklist = _naukri_checklist(
+        features, tr, imp, headline_ok=headline_ok, format_warnings=fmt_warnings
+    )
     naukri = _naukri_readiness(overall, sections)
-    skills_n = _count_skills(text)
+    skills_n = features.skills_n
 
     payload: dict[str, Any] = {
         "score": overall,
@@ -969,7 +1052,7 @@ def analyze_resume(
         "matched_keywords": matched,
         "missing_keywords": missing,
         "fixes": _build_fixes(missing, fmt, imp, ats),
-        "strengths": _build_strengths(matched, fmt, imp, text),
+        "strengths": _build_strengths(matched, fmt, imp, features.has_email),
         "portal_tips": _default_portal_tips(missing, tr),
         "section_scores": sections,
         "naukri_checklist": checklist,
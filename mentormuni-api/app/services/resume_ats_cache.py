@@ -0,0 +1,270 @@
+"""
+Resume ATS result cache.
+
+Students re-upload the same file with different roles; recruiters run one file against
+several JDs. Two key spaces avoid redoing work:
+
+- ``file``: SHA-256 of the uploaded bytes (+ extension) → extracted text (LRU only) and
+  the text's SHA-256 (LRU + shared tier);
+- ``heuristic`` / ``enriched``: SHA-256 over (text hash, target role, candidate type,
+  experience, JD hash, ``ANALYSIS_VERSION``) → ``analyze_resume`` payload and the
+  ``enrich_analysis_with_llm`` payload.
+
+A repeat request therefore skips parsing, scoring and the LLM call. The per-process LRU
+is always on (``RESUME_ATS_CACHE_MAX_ENTRIES`` per key space, 0 disables caching);
+``RESUME_ATS_CACHE_POSTGRES=true`` adds the ``resume_analysis_cache`` table as a
+shared tier across workers and deploys. Resume text is never written to that table.
+Cache failures are logged and ignored — they never fail the upload.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Generic, Optional, TypeVar
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.services import resume_ats as resume_ats_service
+from app.services import resume_ats_pool
+
+logger = logging.getLogger(__name__)
+
+# Bump when analyze_resume scoring or the enrichment prompt changes meaningfully.
+ANALYSIS_VERSION = 1
+KIND_FILE = "file"
+KIND_HEURISTIC = "heuristic"
+KIND_ENRICHED = "enriched"
+# Expired shared-tier rows are pruned once every this many writes.
+PRUNE_EVERY_WRITES = 500
+
+V = TypeVar("V")
+
+
+def sha256_hex(data: bytes | str) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_cache_key(filename: str, content: bytes) -> str:
+    # Extraction depends on the extension as well as the bytes.
+    suffix = Path(filename or "").suffix.lower()
+    return sha256_hex(suffix.encode() + b"\0" + content)
+
+
+def analysis_cache_key(
+    text_sha256: str,
+    target_role: str,
+    *,
+    candidate_type: Optional[str],
+    experience_years: Optional[int],
+    job_description: Optional[str],
+) -> str:
+    jd = (job_description or "").strip()
+    parts = [
+        ANALYSIS_VERSION,
+        text_sha256,
+        (target_role or "").strip().lower(),
+        (candidate_type or "").strip().lower().replace(" ", "_"),
+        experience_years,
+        sha256_hex(jd) if jd else None,
+    ]
+    return sha256_hex(json.dumps(parts, separators=(",", ":")))
+
+
+class LruCache(Generic[V]):
+    """Bounded LRU with a per-entry TTL (monotonic clock)."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[str, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[V]:
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, value: V) -> None:
+        if self.max_entries <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+
+class ResumeAnalysisCache:
+    def __init__(self, *, max_entries: int, ttl_seconds: int, use_postgres: bool) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.use_postgres = use_postgres
+        self.texts: LruCache[str] = LruCache(max_entries, ttl_seconds)
+        self.entries: LruCache[Any] = LruCache(max_entries * 3, ttl_seconds)
+        self._writes = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "texts": len(self.texts),
+            "entries": len(self.entries),
+            "hits": self.texts.hits + self.entries.hits,
+            "misses": self.texts.misses + self.entries.misses,
+        }
+
+    # --- shared tier -------------------------------------------------------
+
+    async def _shared_get(self, key: str) -> Optional[Any]:
+        if not (self.use_postgres and settings.is_database_configured):
+            return None
+        from app.common.database.session import async_session_factory
+        from app.models.resume_analysis_cache import ResumeAnalysisCacheEntry as Entry
+
+        try:
+            async with async_session_factory()() as db:
+                return (
+                    await db.execute(
+                        select(Entry.payload).where(
+                            Entry.cache_key == key,
+                            Entry.expires_at > datetime.now(timezone.utc),
+                        )
+                    )
+                ).scalar_one_or_none()
+        except Exception:
+            logger.warning("resume_ats_cache_read_failed", exc_info=True)
+            return None
+
+    async def _shared_put(self, key: str, payload: Any) -> None:
+        if not (self.use_postgres and settings.is_database_configured):
+            return
+        from app.common.database.session import async_session_factory
+        from app.models.resume_analysis_cache import ResumeAnalysisCacheEntry as Entry
+
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+        stmt = pg_insert(Entry).values(cache_key=key, payload=payload, expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Entry.cache_key],
+            set_={"payload": stmt.excluded.payload, "expires_at": stmt.excluded.expires_at},
+        )
+        self._writes += 1
+        try:
+            async with async_session_factory()() as db:
+                await db.execute(stmt)
+                if self._writes % PRUNE_EVERY_WRITES == 0:
+                    await db.execute(delete(Entry).where(Entry.expires_at <= now))
+                await db.commit()
+        except Exception:
+            logger.warning("resume_ats_cache_write_failed", exc_info=True)
+
+    # --- lookups -----------------------------------------------------------
+
+    async def get(self, kind: str, key: str) -> Optional[Any]:
+        full = f"{kind}:{key}"
+        value = self.entries.get(full)
+        if value is None:
+            value = await self._shared_get(full)
+            if value is not None:
+                self.entries.put(full, value)
+        return value
+
+    async def put(self, kind: str, key: str, value: Any) -> None:
+        if self.entries.max_entries <= 0:
+            return
+        full = f"{kind}:{key}"
+        self.entries.put(full, value)
+        await self._shared_put(full, value)
+
+
+_cache: Optional[ResumeAnalysisCache] = None
+
+
+def get_resume_ats_cache() -> ResumeAnalysisCache:
+    global _cache
+    if _cache is None:
+        _cache = ResumeAnalysisCache(
+            max_entries=settings.resume_ats_cache_max_entries,
+            ttl_seconds=settings.resume_ats_cache_ttl_seconds,
+            use_postgres=settings.resume_ats_cache_postgres,
+        )
+    return _cache
+
+
+async def analyze_upload(
+    filename: str,
+    content: bytes,
+    target_role: str,
+    *,
+    candidate_type: Optional[str] = None,
+    experience_years: Optional[int] = None,
+    job_description: Optional[str] = None,
+) -> dict[str, Any]:
+    """Full resume ATS payload (heuristic + LLM enrichment), served from cache when possible."""
+    cache = get_resume_ats_cache()
+    use_llm = settings.resume_ats_use_llm
+    file_key = file_cache_key(filename, content)
+    inputs = {
+        "candidate_type": candidate_type,
+        "experience_years": experience_years,
+        "job_description": job_description,
+    }
+
+    text = cache.texts.get(file_key)
+    text_sha: Optional[str] = sha256_hex(text) if text is not None else None
+    if text_sha is None:
+        mapped = await cache.get(KIND_FILE, file_key)
+        text_sha = mapped.get("text_sha256") if isinstance(mapped, dict) else None
+
+    heuristic: Optional[dict[str, Any]] = None
+    key: Optional[str] = None
+    if text_sha is not None:
+        key = analysis_cache_key(text_sha, target_role, **inputs)
+        if use_llm:
+            enriched = await cache.get(KIND_ENRICHED, key)
+            if enriched is not None:
+                return enriched
+        heuristic = await cache.get(KIND_HEURISTIC, key)
+        if heuristic is not None and not use_llm:
+            return heuristic
+
+    if text is None and heuristic is None:
+        text, heuristic = await resume_ats_pool.extract_and_analyze(
+            filename, content, target_role, **inputs
+        )
+    elif text is None:
+        text = await resume_ats_pool.extract_text(filename, content)
+    elif heuristic is None:
+        heuristic = await resume_ats_pool.analyze(text, target_role, **inputs)
+
+    text_sha = sha256_hex(text)
+    key = analysis_cache_key(text_sha, target_role, **inputs)
+    cache.texts.put(file_key, text)
+    await cache.put(KIND_FILE, file_key, {"text_sha256": text_sha})
+    await cache.put(KIND_HEURISTIC, key, heuristic)
+    if not use_llm:
+        return heuristic
+
+    enriched = await resume_ats_service.enrich_analysis_with_llm(
+        heuristic, text, target_role, job_description=job_description
+    )
+    # enrich_analysis_with_llm returns the same dict on any LLM failure — don't pin that.
+    if enriched is not heuristic:
+        await cache.put(KIND_ENRICHED, key, enriched)
+    return enriched
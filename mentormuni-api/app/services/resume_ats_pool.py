@@ -0,0 +1,279 @@
+"""
+Process pool for resume ATS extraction + heuristic scoring.
+
+``extract_text`` (pypdf page walk, python-docx, ``antiword`` subprocess) and
+``analyze_resume`` (regex scoring) are CPU-bound and synchronous; run inline they
+stall the event loop for every request on the worker. Here they run in a bounded
+``ProcessPoolExecutor``:
+
+- at most ``resume_ats_pool_workers`` jobs run and ``resume_ats_pool_max_queue`` wait;
+  anything beyond that is rejected with ``ResumeAtsBusyError`` (→ 503 + Retry-After);
+- a job still running after ``resume_ats_job_timeout_seconds`` raises
+  ``ResumeAtsTimeoutError`` and the pool is recycled: new jobs go to a fresh pool while
+  the old one drains in the background (its other in-flight jobs finish normally), then
+  its remaining processes are killed, so a pathological PDF cannot pin a worker forever;
+- each pool process caps its address space (``resume_ats_worker_memory_mb``); an
+  allocation past the cap surfaces as the usual "could not read" 422;
+- ``stats()`` reports queue depth and outcome counters (exposed on ``/health``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.services import resume_ats as resume_ats_service
+
+logger = logging.getLogger(__name__)
+
+# Recycle pool processes periodically so parser memory growth cannot accumulate.
+MAX_TASKS_PER_CHILD = 200
+
+
+class ResumeAtsBusyError(Exception):
+    def __init__(self, retry_after: int = 5) -> None:
+        super().__init__("Resume analysis is at capacity.")
+        self.retry_after = retry_after
+
+
+class ResumeAtsTimeoutError(Exception):
+    pass
+
+
+def _limit_memory(max_bytes: int) -> None:
+    """Pool initializer: cap this process's address space (no-op off Linux)."""
+    if max_bytes <= 0:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    cap = max_bytes if hard == resource.RLIM_INFINITY else min(max_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (cap, hard))
+
+
+def extract_and_analyze_sync(
+    filename: str,
+    content: bytes,
+    target_role: str,
+    candidate_type: Optional[str],
+    experience_years: Optional[int],
+    job_description: Optional[str],
+) -> tuple[str, dict[str, Any]]:
+    """Runs inside a pool process."""
+    text = resume_ats_service.extract_text(filename, content)
+    payload = resume_ats_service.analyze_resume(
+        text,
+        target_role,
+        candidate_type=candidate_type,
+        experience_years=experience_years,
+        job_description=job_description,
+    )
+    return text, payload
+
+
+def analyze_sync(
+    text: str,
+    target_role: str,
+    candidate_type: Optional[str],
+    experience_years: Optional[int],
+    job_description: Optional[str],
+) -> dict[str, Any]:
+    """Runs inside a pool process (text already extracted / cached)."""
+    return resume_ats_service.analyze_resume(
+        text,
+        target_role,
+        candidate_type=candidate_type,
+        experience_years=experience_years,
+        job_description=job_description,
+    )
+
+
+class ResumeAtsPool:
+    def __init__(
+        self,
+        *,
+        workers: int,
+        max_queue: int,
+        job_timeout_seconds: float,
+        memory_mb: int = 0,
+    ) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.job_timeout_seconds = job_timeout_seconds
+        self.memory_bytes = memory_mb * 1024 * 1024
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Futures submitted per executor and not yet returned to their caller.
+        self._pending: dict[ProcessPoolExecutor, set[Future]] = {}
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.recycles = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "recycles": self.recycles,
+        }
+
+    def _ensure(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            methods = multiprocessing.get_all_start_methods()
+            # Never fork the threaded server process.
+            ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=ctx,
+                initializer=_limit_memory,
+                initargs=(self.memory_bytes,),
+                max_tasks_per_child=MAX_TASKS_PER_CHILD,
+            )
+        return self._executor
+
+    def _recycle(self, executor: ProcessPoolExecutor, *, stuck: Optional[Future] = None) -> None:
+        """Swap in a fresh pool on the next job and drain ``executor`` in the background."""
+        if self._executor is not executor:
+            return  # already replaced by a concurrent failure
+        self._executor = None
+        self.recycles += 1
+        others = {f for f in self._pending.pop(executor, set()) if f is not stuck}
+        threading.Thread(
+            target=self._drain,
+            args=(executor, others),
+            name="resume-ats-pool-drain",
+            daemon=True,
+        ).start()
+
+    def _drain(self, executor: ProcessPoolExecutor, others: set[Future]) -> None:
+        """Let the old pool's other jobs finish (bounded by the job timeout), then reclaim it."""
+        wait(others, timeout=self.job_timeout_seconds)
+        # Whatever is still running is the stuck job (or one whose caller already timed out).
+        for proc in list((getattr(executor, "_processes", None) or {}).values()):
+            try:
+                if proc.is_alive():
+                    proc.kill()
+            except Exception:
+                pass
+        executor.shutdown(wait=True, cancel_futures=True)
+        logger.info("resume_ats_pool_drained")
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._in_flight >= self.capacity:
+            self.rejected += 1
+            logger.warning("resume_ats_pool_saturated %s", self.stats())
+            raise ResumeAtsBusyError(retry_after=max(1, int(self.job_timeout_seconds // 4)))
+        self._in_flight += 1
+        executor = self._ensure()
+        fut: Optional[Future] = None
+        try:
+            fut = executor.submit(fn, *args)
+            self._pending.setdefault(executor, set()).add(fut)
+            result = await asyncio.wait_for(asyncio.wrap_future(fut), self.job_timeout_seconds)
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError as exc:
+            self.timeouts += 1
+            # Still queued → just drop it; running → kill the pool to reclaim the process.
+            if fut is None or not fut.cancel():
+                logger.warning("resume_ats_job_timeout recycling pool %s", self.stats())
+                self._recycle(executor, stuck=fut)
+            raise ResumeAtsTimeoutError("Resume analysis timed out.") from exc
+        except BrokenProcessPool as exc:
+            self.crashes += 1
+            self._recycle(executor)
+            raise ResumeAtsBusyError() from exc
+        finally:
+            self._in_flight -= 1
+            pending = self._pending.get(executor)
+            if pending is not None and fut is not None:
+                pending.discard(fut)
+
+    def warm(self) -> None:
+        """Start the pool processes now so the first upload does not pay for spawning them."""
+        executor = self._ensure()
+        for _ in range(self.workers):
+            executor.submit(int)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._pending.pop(self._executor, None)
+            self._executor = None
+
+
+_pool: Optional[ResumeAtsPool] = None
+
+
+def get_resume_ats_pool() -> ResumeAtsPool:
+    global _pool
+    if _pool is None:
+        _pool = ResumeAtsPool(
+            workers=settings.resume_ats_pool_workers,
+            max_queue=settings.resume_ats_pool_max_queue,
+            job_timeout_seconds=settings.resume_ats_job_timeout_seconds,
+            memory_mb=settings.resume_ats_worker_memory_mb,
+        )
+    return _pool
+
+
+def shutdown_resume_ats_pool() -> None:
+    if _pool is not None:
+        _pool.shutdown()
+
+
+async def extract_and_analyze(
+    filename: str,
+    content: bytes,
+    target_role: str,
+    *,
+    candidate_type: Optional[str] = None,
+    experience_years: Optional[int] = None,
+    job_description: Optional[str] = None,
+) -> tuple[str, dict[str, Any]]:
+    """Extracted text + heuristic ATS payload, computed off the event loop."""
+    return await get_resume_ats_pool().run(
+        extract_and_analyze_sync,
+        filename,
+        content,
+        target_role,
+        candidate_type,
+        experience_years,
+        job_description,
+    )
+
+
+async def extract_text(filename: str, content: bytes) -> str:
+    return await get_resume_ats_pool().run(resume_ats_service.extract_text, filename, content)
+
+
+async def analyze(
+    text: str,
+    target_role: str,
+    *,
+    candidate_type: Optional[str] = None,
+    experience_years: Optional[int] = None,
+    job_description: Optional[str] = None,
+) -> dict[str, Any]:
+    return await get_resume_ats_pool().run(
+        analyze_sync, text, target_role, candidate_type, experience_years, job_description
+    )
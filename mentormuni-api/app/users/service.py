@@ -21,7 +21,7 @@ from app.common.organization_access import (
     OrganizationAccessError,
     ensure_organization_accepts_registration,
 )
-from app.common.security.passwords import hash_password
+from app.common.security.passwords import hash_password_async
 from app.models.department import Department
 from app.models.enums import OrganizationType, RoleCode, UserStatus
 from app.models.organization import Organization
@@ -255,13 +255,13 @@ async def create_user(
     elif status == UserStatus.ACTIVE.value:
         if not password:
             raise UserServiceError("password is required for this role/status.", status_code=422)
-        password_hash = hash_password(password)
+        password_hash = await hash_password_async(password)
         raw_token = None
         expires = None
         activation_hash = None
     else:
         # PENDING — no token until approve
-        password_hash = hash_password(password) if password else None
+        password_hash = await hash_password_async(password) if password else None
         raw_token = None
         expires = None
         activation_hash = None
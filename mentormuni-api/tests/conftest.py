@@ -1,12 +1,14 @@
-"""Pytest configuration for coding Phase 3 tests."""
+"""Pytest configuration and shared fakes."""
 
 from __future__ import annotations
 
 import os
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 # mentormuni-api/ on path
 _ROOT = Path(__file__).resolve().parents[1]
@@ -22,3 +24,70 @@ def pytest_configure(config: pytest.Config) -> None:
 def database_url() -> str | None:
     url = (os.getenv("TEST_DATABASE_URL") or os.getenv("DATABASE_URL") or "").strip()
     return url or None
+
+
+class _Scalars(list):
+    def all(self) -> list:
+        return list(self)
+
+
+class FakeAsyncSession:
+    """Stand-in for ``AsyncSession``: records statements and transaction calls, no database.
+
+    ``execute`` returns a result over ``rows`` (``.all()``, ``.scalars()``) and ``scalar``
+    (``.scalar_one_or_none()`` / ``.scalar_one()``). With ``batches``, each ``execute`` takes the next batch as
+    its rows instead (empty once exhausted), e.g. for keyset loops.
+    """
+
+    def __init__(self, rows=(), *, scalar=None, batches=None) -> None:
+        self.rows = list(rows)
+        self.scalar = scalar
+        self.batches = [list(b) for b in batches] if batches is not None else None
+        self.statements: list = []
+        self.added: list = []
+        self.flushes = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_exc) -> None:
+        await self.close()
+
+    async def execute(self, stmt, *args, **kwargs):
+        self.statements.append(stmt)
+        rows = self.rows
+        if self.batches is not None:
+            rows = self.batches.pop(0) if self.batches else []
+        return SimpleNamespace(
+            all=lambda: list(rows),
+            scalars=lambda: _Scalars(rows),
+            scalar_one_or_none=lambda: self.scalar,
+            scalar_one=lambda: self.scalar,
+            rowcount=len(rows),
+        )
+
+    def add(self, obj) -> None:
+        self.added.append(obj)
+
+    async def flush(self) -> None:
+        self.flushes += 1
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def sql(self, index: int = 0) -> str:
+        return str(self.statements[index].compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def fake_session() -> type[FakeAsyncSession]:
+    return FakeAsyncSession
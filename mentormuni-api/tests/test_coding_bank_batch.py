@@ -0,0 +1,221 @@
+"""Batch curriculum runner: bounded concurrency, LLM budget, checkpoint/resume, live index."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from _helpers import FakeReferenceExecutor, minimal_contract
+
+from app.coding import enums
+from app.coding.enums import GenerationRunStatus
+from app.coding.execution.types import SingleExecutionResult
+from app.coding.models import CodingGenerationRun
+from app.coding_bank.batch import BatchGenerationRunner
+from app.coding_bank.curriculum import GenerationSpec
+from app.coding_bank.schemas import GeneratedProblemContract
+from app.coding_bank.service import CodingBankService
+from app.coding_bank.validators.duplicate import ExistingProblemRef
+from app.coding_bank.validators.pipeline import ProblemValidator
+from app.coding_bank.validators.reference import ProviderReferenceExecutor
+from app.coding_bank.validators.types import ValidationReport
+
+
+def _spec(i: int) -> GenerationSpec:
+    return GenerationSpec(
+        slot_id=f"slot-{i}",
+        difficulty="easy",
+        topic="hashing",
+        pattern="hash-map",
+        expected_time_complexity="O(n)",
+        expected_space_complexity="O(n)",
+    )
+
+
+def _contract(i: int, *, same_content: bool = False) -> GeneratedProblemContract:
+    overrides = {"slug": f"pair-sum-ledger-{i}"}
+    if not same_content:
+        overrides["title"] = f"Ledger Puzzle Number {i} " + "x" * i
+        overrides["problem_statement"] = (
+            f"Variant {i}: " + " ".join(f"token{i}_{k}" for k in range(40))
+        )
+    return GeneratedProblemContract.model_validate(minimal_contract(**overrides))
+
+
+class _Db:
+    def __init__(self) -> None:
+        self.commits = 0
+        self.rollbacks = 0
+
+    def flush(self) -> None:
+        pass
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+class _Generator:
+    model = "fake"
+
+    def __init__(self, *, same_content: bool = False) -> None:
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.same_content = same_content
+
+    async def generate_one(self, spec, *, avoid_titles=None, avoid_slugs=None, company_name=None):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return _contract(int(spec.slot_id.split("-")[1]), same_content=self.same_content)
+
+
+class _PassValidator:
+    async def validate(self, contract, *, existing=None):
+        return contract, ValidationReport(verdict="pass", quality_score=90.0)
+
+
+def _service(generator, validator) -> CodingBankService:
+    service = CodingBankService(_Db(), generator=generator, validator=validator)
+    service.list_existing_refs = lambda: []  # type: ignore[method-assign]
+    service.list_slugs = lambda: set()  # type: ignore[method-assign]
+    ids = iter(range(100, 200))
+    recorded: list[tuple[str, bool]] = []
+
+    def _record(contract, report, *, run):
+        recorded.append((contract.slug, report.ok))
+        run.generated_count = int(run.generated_count or 0) + 1
+        return type("P", (), {"id": next(ids)})()
+
+    service.record_validated = _record  # type: ignore[method-assign]
+    service.recorded = recorded  # type: ignore[attr-defined]
+    return service
+
+
+def _run() -> CodingGenerationRun:
+    return CodingGenerationRun(
+        id=1,
+        status=GenerationRunStatus.PENDING.value,
+        prompt_version="p",
+        model="fake",
+        config_json={},
+        generated_count=0,
+    )
+
+
+def test_runner_fans_out_under_concurrency_and_checkpoints_every_slot():
+    gen = _Generator()
+    service = _service(gen, _PassValidator())
+    run = _run()
+    runner = BatchGenerationRunner(service, concurrency=3)
+    outcomes = asyncio.run(runner.run(run, [_spec(i) for i in range(7)]))
+    assert all(o.passed and o.error is None for o in outcomes)
+    assert 1 < gen.max_active <= 3
+    progress = run.config_json["progress"]
+    assert len(progress["done"]) == 7 and progress["llm_calls"] == 7
+    assert run.status == GenerationRunStatus.SUCCEEDED.value
+    assert service.db.commits == 8  # one per slot + final
+
+
+def test_budget_stops_the_run_and_resume_skips_finished_slots():
+    gen = _Generator()
+    service = _service(gen, _PassValidator())
+    run = _run()
+    specs = [_spec(i) for i in range(5)]
+    first = asyncio.run(BatchGenerationRunner(service, concurrency=2, max_llm_calls=3).run(run, specs))
+    assert sum(o.error is None for o in first) == 3
+    assert run.status == GenerationRunStatus.RUNNING.value
+    asyncio.run(BatchGenerationRunner(service, concurrency=2).run(run, specs))
+    assert gen.calls == 5
+    assert len(run.config_json["progress"]["done"]) == 5
+    assert run.status == GenerationRunStatus.SUCCEEDED.value
+
+
+def test_sibling_slots_see_each_other_in_the_duplicate_check():
+    gen = _Generator(same_content=True)
+    service = _service(gen, ProblemValidator(executor=FakeReferenceExecutor()))
+    run = _run()
+    asyncio.run(BatchGenerationRunner(service, concurrency=2).run(run, [_spec(1), _spec(2)]))
+    # Same statement, different slugs: whichever lands second is a duplicate.
+    assert sorted(ok for _slug, ok in service.recorded) == [False, True]
+
+
+def test_duplicate_check_scores_only_index_candidates():
+    scored: list[list[int]] = []
+
+    class _Spy(_PassValidator):
+        async def validate(self, contract, *, existing=None):
+            scored.append([r.id for r in existing])
+            return await super().validate(contract, existing=existing)
+
+    def _ref(problem_id: int, title: str, statement: str) -> ExistingProblemRef:
+        return ExistingProblemRef(id=problem_id, title=title, statement=statement, topic=None, pattern=None)
+
+    same = _contract(2)
+    bank = [
+        _ref(1, "Rotate a Matrix", "Rotate an n by n grid clockwise in place."),
+        _ref(2, same.title, same.problem_statement),
+        _ref(3, "Longest Bracket Run", "Find the longest valid bracket substring."),
+    ]
+    service = _service(_Generator(), _Spy())
+    service.list_existing_refs = lambda: bank  # type: ignore[method-assign]
+    asyncio.run(BatchGenerationRunner(service, concurrency=1).run(_run(), [_spec(2)]))
+    # Unrelated bank problems never reach the SequenceMatcher scan.
+    assert scored == [[2]]
+
+
+def test_database_error_cancels_sibling_slots_and_rolls_back():
+    gen = _Generator()
+    service = _service(gen, _PassValidator())
+    started: list[str] = []
+
+    class _SlowValidator:
+        async def validate(self, contract, *, existing=None):
+            started.append(contract.slug)
+            if contract.slug != "pair-sum-ledger-0":
+                await asyncio.sleep(10)
+            return contract, ValidationReport(verdict="pass", quality_score=90.0)
+
+    def _fail(contract, report, *, run):
+        raise OperationalError("INSERT", {}, Exception("connection lost"))
+
+    service.validator = _SlowValidator()
+    service.record_validated = _fail  # type: ignore[method-assign]
+    run = _run()
+    with pytest.raises(OperationalError):
+        asyncio.run(BatchGenerationRunner(service, concurrency=3).run(run, [_spec(i) for i in range(3)]))
+    assert len(started) == 3  # siblings were in flight, then cancelled rather than awaited
+    assert service.db.rollbacks == 1 and service.db.commits == 0
+    assert "progress" not in run.config_json
+
+
+def test_provider_reference_executor_maps_provider_results():
+    class _Provider:
+        name = "fake"
+
+        async def execute_one(self, *, source_code, language_id, stdin, expected_output, **_kw):
+            assert language_id == 71 and expected_output is None
+            if stdin == "boom":
+                return SingleExecutionResult(
+                    status=enums.TestResultStatus.ERROR, verdict=enums.Verdict.RUNTIME_ERROR, error_type="runtime_error"
+                )
+            return SingleExecutionResult(status=enums.TestResultStatus.PASSED, verdict=enums.Verdict.ACCEPTED, stdout="3\n")
+
+    executor = ProviderReferenceExecutor(_Provider())
+
+    async def main():
+        ok = await executor.run_stdin(language="python", source_code="print(3)", stdin="")
+        bad = await executor.run_stdin(language="python", source_code="x", stdin="boom")
+        cpp = await executor.run_stdin(language="cpp", source_code="x", stdin="")
+        return ok, bad, cpp
+
+    ok, bad, cpp = asyncio.run(main())
+    assert ok.ok and ok.stdout == "3\n"
+    assert not bad.ok and bad.error == "runtime_error"
+    assert not cpp.ok and cpp.error.startswith("unsupported_language")
@@ -0,0 +1,185 @@
+"""LSH duplicate index: same verdicts as the brute-force scan, on far fewer candidates."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from _helpers import minimal_contract
+
+from app.coding_bank.curriculum import GenerationSpec
+from app.coding_bank.schemas import GeneratedProblemContract
+from app.coding_bank.service import CodingBankService
+from app.coding_bank.similarity_index import candidates_select
+from app.coding_bank.validators.duplicate import DuplicateDetector, ExistingProblemRef, content_fingerprint
+from app.coding_bank.validators.similarity import (
+    BANDS,
+    InMemorySimilarityIndex,
+    problem_band_keys,
+)
+
+_BANK = [
+    ("Pair Sum Ledger", "You are given an array of integers representing daily ledger deltas and a target "
+     "balance change T. Return indices of two distinct days whose deltas sum to T. "
+     "If multiple answers exist, return any one pair."),
+    ("Longest Calm Streak", "A sensor reports n temperature readings. Find the length of the longest "
+     "contiguous window in which the difference between the maximum and minimum reading is at most k."),
+    ("Balanced Bracket Repair", "Given a string of round, square and curly brackets, return the minimum "
+     "number of insertions needed so that every prefix can be extended into a balanced sequence."),
+    ("Warehouse Robot Paths", "A robot starts at the top-left cell of an r by c grid with blocked cells "
+     "and moves only right or down. Count the distinct paths to the bottom-right cell modulo 1e9+7."),
+    ("Meeting Room Allocation", "Given start and end times of n meetings, compute the minimum number of "
+     "rooms required so that no two overlapping meetings share a room."),
+    ("Rotated Catalog Search", "A sorted catalog of distinct product ids was rotated at an unknown pivot. "
+     "Given a query id, return its position in the rotated array or -1 in logarithmic time."),
+    ("Cheapest Courier Route", "Cities are connected by weighted one-way roads. Find the minimum delivery "
+     "cost from city s to city t using at most k intermediate stops, or -1 if unreachable."),
+    ("Anagram Buckets", "Group a list of lowercase words so that words which are anagrams of each other "
+     "appear in the same bucket; return the buckets in any order."),
+    ("Kth Largest Score", "Scores stream in one at a time. After each insertion report the k-th largest "
+     "score seen so far, or -1 while fewer than k scores have arrived."),
+    ("Island Perimeter Audit", "A binary matrix marks land cells with 1. Compute the total perimeter of "
+     "all islands, where cells connect horizontally and vertically only."),
+    ("Coin Change Ways", "Given coin denominations and an amount, return the number of combinations of "
+     "coins that make up exactly that amount; each coin may be used unlimited times."),
+    ("Trie Prefix Counter", "Support inserting words and answering how many inserted words start with a "
+     "given prefix, with up to 1e5 operations in total."),
+]
+
+# (title, statement, expected duplicate-of index into _BANK or None)
+_LABELED = [
+    (_BANK[0][0], _BANK[0][1], 0),  # exact copy → fingerprint
+    ("Pair-Sum Ledger!", _BANK[0][1].upper(), 0),  # punctuation / case only
+    ("Ledger Pair Sums", _BANK[0][1].replace("daily", "weekly").replace("any one", "one"), 0),
+    ("Longest Calm Streaks", "Totally different wording about prefix sums over ledger rows.", 1),  # title
+    ("Calm Window", _BANK[1][1].replace("sensor", "thermometer").replace("at most k", "no more than k"), 1),
+    ("Robot Grid Routes", _BANK[3][1].replace("robot", "rover").replace("modulo 1e9+7", "mod 1e9+7"), 3),
+    ("Courier Route With Stops", "Cities are linked by weighted directed roads. Find the minimum delivery "
+     "cost from city s to city t using at most k intermediate stops, or -1 if it cannot be reached.", 6),
+    ("Sliding Median", "Maintain the median of the last w numbers of a stream as the window slides.", None),
+    ("Coin Change Minimum", "Given coin denominations and an amount, return the fewest coins needed to "
+     "make the amount, or -1 if impossible.", None),
+    ("Bracket Depth", "Return the maximum nesting depth of a valid parentheses string.", None),
+    ("Meeting Rooms Free Slots", "Given busy intervals for several people, list every common free "
+     "interval of positive length.", None),
+]
+
+
+def _ref(i: int, title: str, statement: str) -> ExistingProblemRef:
+    return ExistingProblemRef(
+        id=i + 1,
+        title=title,
+        statement=statement,
+        topic="hashing",
+        pattern="hash-map",
+        fingerprint=content_fingerprint(title, statement, "hashing", "hash-map"),
+    )
+
+
+def _contract(title: str, statement: str) -> GeneratedProblemContract:
+    return GeneratedProblemContract.model_validate(
+        minimal_contract(title=title, problem_statement=statement)
+    )
+
+
+_REFS = [_ref(i, t, s) for i, (t, s) in enumerate(_BANK)]
+
+
+@pytest.mark.parametrize(("title", "statement", "expected"), _LABELED, ids=[t for t, _s, _e in _LABELED])
+def test_indexed_verdicts_match_brute_force_on_labeled_set(title, statement, expected):
+    index = InMemorySimilarityIndex(_REFS)
+    detector = DuplicateDetector()
+    contract = _contract(title, statement)
+    fp = content_fingerprint(title, statement, contract.primary_topic(), contract.primary_pattern())
+
+    brute, _s, _r = detector.find_duplicate(contract, _REFS)
+    candidates = index.candidates(title, statement, fingerprint=fp)
+    indexed, _s, _r = detector.find_duplicate(contract, candidates)
+
+    assert (brute.id if brute else None) == (_REFS[expected].id if expected is not None else None)
+    assert (indexed.id if indexed else None) == (brute.id if brute else None)
+    assert len(candidates) <= 3  # the detector no longer scans the whole bank
+
+
+def test_remove_drops_problem_from_candidates():
+    index = InMemorySimilarityIndex(_REFS)
+    title, statement = _BANK[4]
+    assert _REFS[4].id in [r.id for r in index.candidates(title, statement)]
+    index.remove(_REFS[4].id)
+    assert _REFS[4].id not in [r.id for r in index.candidates(title, statement)]
+    assert len(index) == len(_REFS) - 1
+
+
+def test_band_keys_are_stable_signed_bigints():
+    keys = problem_band_keys(*_BANK[0])
+    assert keys == problem_band_keys(*_BANK[0])
+    assert len(keys) == 2 * BANDS
+    assert all(0 <= k < 2**63 for k in keys)
+
+
+def test_candidate_select_uses_band_index_and_fingerprint():
+    sql = str(candidates_select("Pair Sum Ledger", _BANK[0][1], "abc").compile(dialect=postgresql.dialect()))
+    assert "coding_problem_lsh_bands.band_key IN" in sql
+    assert "coding_problems.content_fingerprint = " in sql
+    assert "coding_problems.status != " in sql
+
+
+def test_migration_backfill_keys_match_the_app():
+    import importlib.util
+    from pathlib import Path
+
+    path = Path(__file__).resolve().parents[1] / "alembic" / "versions" / "0034_coding_problem_lsh_bands.py"
+    spec = importlib.util.spec_from_file_location("_migration_0034", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    for title, statement in _BANK + [("Édge—Case!!", ""), ("", "")]:
+        assert migration._problem_band_keys(title, statement) == problem_band_keys(title, statement)
+
+
+class _SyncDb:
+    """Sync ``Session`` stand-in: avoid-list query finds nothing; ``scalar`` answers the slug probe."""
+
+    def __init__(self, slug_owner):
+        self.slug_owner = slug_owner
+        self.probes: list[str] = []
+
+    def execute(self, stmt):
+        return SimpleNamespace(all=lambda: [])
+
+    def scalar(self, stmt):
+        self.probes.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return self.slug_owner
+
+    def flush(self):
+        pass
+
+
+@pytest.mark.parametrize("slug_owner", [None, 5])
+def test_generate_slot_checks_slug_bank_wide(slug_owner):
+    class _Generator:
+        model = "fake"
+
+        async def generate_one(self, spec, **_kw):
+            return GeneratedProblemContract.model_validate(minimal_contract())
+
+    db = _SyncDb(slug_owner)
+    service = CodingBankService(db, generator=_Generator())
+    ingested: list[str] = []
+
+    async def _ingest(contract, **_kw):
+        ingested.append(contract.slug)
+        return SimpleNamespace(id=1), None
+
+    service.ingest_and_validate = _ingest  # type: ignore[method-assign]
+    run = SimpleNamespace(status="running", id=1, prompt_version="p", model="fake", generated_count=0)
+    spec = GenerationSpec("s1", "easy", "hashing", "hash-map", "O(n)", "O(n)")
+    asyncio.run(service.generate_slot(run, spec))
+
+    # One lookup on the unique slug index, not limited to the topic avoid-list.
+    assert len(db.probes) == 1 and "WHERE coding_problems.slug = " in db.probes[0]
+    if slug_owner is None:
+        assert ingested == ["pair-sum-ledger"]
+    else:
+        assert ingested[0].startswith("pair-sum-ledger-") and len(ingested[0]) == len("pair-sum-ledger-") + 6
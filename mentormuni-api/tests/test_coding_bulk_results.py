@@ -0,0 +1,54 @@
+"""Per-test results are written as one multi-row UPSERT, not one INSERT per test."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from app.coding import enums
+from app.coding.jobs import handlers
+
+
+def _case(i: int, hidden: bool = False):
+    return SimpleNamespace(id=100 + i, is_hidden=hidden)
+
+
+def _result(i: int, passed: bool = True):
+    return SimpleNamespace(
+        status=enums.TestResultStatus.PASSED if passed else enums.TestResultStatus.FAILED,
+        execution_time_ms=i,
+        memory_used_kb=1024,
+        stdout="out" * 3000,
+        error_type=None,
+        error_message=None,
+    )
+
+
+def test_rows_truncate_and_hide_output():
+    cases = [_case(0), _case(1, hidden=True)]
+    rows = handlers.build_test_result_rows(9, cases, [_result(0), _result(1, passed=False)])
+    assert [r["test_case_id"] for r in rows] == [100, 101]
+    assert len(rows[0]["actual_output"]) == 4000
+    assert rows[1]["actual_output"] is None
+    assert rows[1]["status"] == enums.TestResultStatus.FAILED.value
+
+
+def test_sixty_results_are_one_statement(fake_session):
+    cases = [_case(i, hidden=i >= 10) for i in range(60)]
+    rows = handlers.build_test_result_rows(9, cases, [_result(i) for i in range(60)])
+    db = fake_session()
+    asyncio.run(handlers.persist_test_results(db, 9, rows))
+    assert len(db.statements) == 1
+    sql = db.sql()
+    assert sql.startswith("INSERT INTO coding_test_results")
+    assert "ON CONFLICT ON CONSTRAINT uq_coding_test_results_submission_case DO UPDATE" in sql
+
+
+def test_retry_prunes_stale_rows_then_upserts(monkeypatch, fake_session):
+    monkeypatch.setattr(handlers, "RESULT_INSERT_CHUNK", 25)
+    rows = handlers.build_test_result_rows(9, [_case(i) for i in range(60)], [_result(i) for i in range(60)])
+    db = fake_session()
+    asyncio.run(handlers.persist_test_results(db, 9, rows, replace_existing=True))
+    assert db.sql().startswith("DELETE FROM coding_test_results")
+    assert "NOT IN" in db.sql()
+    assert len(db.statements) == 1 + 3  # delete + ceil(60 / 25) inserts
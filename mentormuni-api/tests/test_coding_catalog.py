@@ -0,0 +1,86 @@
+"""Assessment catalog: one windowed query, SQL filters, per-org cache + ETag."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.coding import catalog
+from app.coding import service as coding_service
+from app.coding.catalog import CatalogCache, CatalogKey, catalog_query
+from app.coding.schemas import AssessmentListOut
+
+
+def _sql(key: CatalogKey) -> str:
+    return str(
+        catalog_query(key).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def _key(**kw) -> CatalogKey:
+    base = dict(organization_id=None, org_feature=False, company_key=None, topic=None, difficulty=None)
+    base.update(kw)
+    return CatalogKey(**base)
+
+
+def test_catalog_is_one_statement_with_window_functions_and_sql_topic_filter():
+    sql = _sql(_key(topic="graphs"))
+    assert "row_number() OVER (PARTITION BY coding_assessment_problems.assessment_id" in sql
+    assert "count(*) OVER (PARTITION BY coding_assessment_problems.assessment_id)" in sql
+    assert "ranked.rn = 1" in sql
+    assert "lower(ranked.topic) LIKE" in sql and "graphs" in sql
+    # Only platform assessments without an org feature.
+    assert "coding_assessments.organization_id IS NULL" in sql
+    assert "coding_assessments.organization_id =" not in sql
+
+
+def test_org_scoped_assessments_need_matching_org_with_feature():
+    assert "coding_assessments.organization_id = 9" not in _sql(_key(organization_id=9))
+    assert "coding_assessments.organization_id = 9" in _sql(_key(organization_id=9, org_feature=True))
+
+
+def test_cache_returns_same_entry_and_etag_until_cleared():
+    cache = CatalogCache(ttl_seconds=60)
+    key = _key(organization_id=3, org_feature=True)
+    entry = cache.put(key, AssessmentListOut(items=[], company_key=None))
+    assert cache.get(key) is entry
+    assert entry.etag.startswith('"') and entry.etag == catalog.catalog_etag(entry.payload)
+    assert cache.get(_key(organization_id=4)) is None
+    cache.clear()
+    assert cache.get(key) is None
+    assert cache.stats() == {"entries": 0, "hits": 1, "misses": 2}
+
+
+def test_listing_builds_once_per_org_and_filters(monkeypatch):
+    cache = CatalogCache(ttl_seconds=60)
+    monkeypatch.setattr(coding_service, "get_catalog_cache", lambda: cache)
+    feature_checks: list[int] = []
+    built: list[CatalogKey] = []
+
+    async def _feature(_db, org_id):
+        feature_checks.append(org_id)
+        return True
+
+    async def _rows(_db, key):
+        built.append(key)
+        return []
+
+    monkeypatch.setattr(coding_service, "org_has_coding_feature", _feature)
+    monkeypatch.setattr(coding_service, "catalog_rows", _rows)
+    user = SimpleNamespace(role=SimpleNamespace(role_code="STUDENT"), organization_id=5)
+
+    async def main():
+        first = await coding_service.assessment_catalog(None, user, topic=" Arrays ")
+        second = await coding_service.assessment_catalog(None, user, topic="arrays")
+        assert first is second
+        await coding_service.assessment_catalog(None, user, topic="graphs")
+
+    asyncio.run(main())
+    assert [k.topic for k in built] == ["arrays", "graphs"]
+    assert built[0].org_feature is True and built[0].organization_id == 5
+    # The org feature is looked up once per request, never per assessment.
+    assert feature_checks == [5, 5, 5]
@@ -0,0 +1,244 @@
+"""Queued practice generation: dedupe per key, worker outcome, pollable/streamable handle."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.coding import practice
+from app.coding import router as coding_router
+from app.coding import streaming as coding_streaming
+from app.coding.browse_schemas import PracticeGenerationOut, PracticeResolveOut, PracticeResolveRequest
+from app.coding.enums import JobStatus, JobType
+from app.coding.jobs import queue as job_queue
+from app.coding.jobs.progress import KIND_PRACTICE, job_target
+from app.coding.models import CodingJob
+from app.common.database import session as db_session
+
+_STUDENT = SimpleNamespace(id=7, role=SimpleNamespace(role_code="STUDENT"), organization_id=None)
+
+
+def _job(status: str = JobStatus.PENDING.value, **payload) -> CodingJob:
+    base = {"topic": "Hashing", "difficulty": "easy", "company_key": None, "dedupe_key": "hashing|easy|"}
+    base.update(payload)
+    return CodingJob(
+        id=41, job_type=JobType.PRACTICE_GENERATE.value, status=status, payload_json=base, attempt_count=1
+    )
+
+
+def _resolve_out() -> PracticeResolveOut:
+    return PracticeResolveOut(
+        source="generated",
+        assessment_id=3,
+        assessment_slug="practice-hashing-easy",
+        title="Hashing · Easy practice",
+        topic="Hashing",
+        difficulty="easy",
+        problem_count=1,
+        generated=True,
+    )
+
+
+def _enqueue_spy(monkeypatch) -> list[dict]:
+    calls: list[dict] = []
+
+    async def _enqueue(db, *, job_type, student_id=None, payload=None, **_kw):
+        calls.append(payload)
+        return CodingJob(id=99, job_type=job_type.value, status=JobStatus.PENDING.value, payload_json=payload)
+
+    monkeypatch.setattr(job_queue, "enqueue_job", _enqueue)
+    return calls
+
+
+def test_bank_miss_queues_a_job_and_returns_a_handle(monkeypatch, fake_session):
+    calls = _enqueue_spy(monkeypatch)
+    monkeypatch.setattr(practice.settings, "openai_api_key", "sk-test")
+
+    async def _miss(db, **_kw):
+        return [], None
+
+    monkeypatch.setattr(practice, "_match_bank", _miss)
+    db = fake_session()
+    body = PracticeResolveRequest(topic="hash map", difficulty="Beginner", company_key="Acme")
+    out = asyncio.run(practice.resolve_practice(db, _STUDENT, body))
+    assert isinstance(out, PracticeGenerationOut)
+    assert (out.job_id, out.status, out.deduplicated) == (99, "pending", False)
+    assert calls[0]["dedupe_key"] == "hashing|easy|acme"
+    assert db.commits == 1
+
+
+def test_concurrent_request_for_same_key_joins_the_running_job(monkeypatch, fake_session):
+    calls = _enqueue_spy(monkeypatch)
+    db = fake_session(scalar=_job(JobStatus.RUNNING.value))
+    out = asyncio.run(
+        practice.enqueue_practice_generation(
+            db, _STUDENT, topic="Hashing", difficulty="easy", company_key=None, company_name=None
+        )
+    )
+    assert calls == []
+    assert (out.job_id, out.status, out.deduplicated) == (41, "running", True)
+    # The joiner may now poll / stream the shared job.
+    assert db.scalar.payload_json["requested_by"] == [7]
+
+
+def test_generation_handle_is_scoped_to_requesters(fake_session):
+    db = fake_session(scalar=_job())
+    asyncio.run(practice.get_practice_generation(db, _STUDENT, 41))
+    sql = db.sql()
+    assert "coding_jobs.student_id = " in sql
+    assert "coding_jobs.payload_json[%(payload_json_1)s::TEXT] @> " in sql
+
+
+def test_generation_commits_claim_and_times_out_as_retryable(monkeypatch, fake_session):
+    monkeypatch.setattr(practice.settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(practice.settings, "coding_practice_generate_timeout_seconds", 15)
+    monkeypatch.setattr(practice.settings, "coding_job_stale_seconds", 30)
+    monkeypatch.setattr(practice, "notify_progress", lambda payload: asyncio.sleep(0))
+    db = fake_session()
+    committed_before_call: list[int] = []
+
+    async def _slow(self, spec, **_kw):
+        committed_before_call.append(db.commits)
+        await asyncio.sleep(60)
+
+    async def _instant_timeout(aw, timeout):
+        assert timeout == 15  # min(configured, stale / 2)
+        aw.close()
+        raise asyncio.TimeoutError
+
+    monkeypatch.setattr(practice.CodingProblemGenerator, "generate_one", _slow)
+    monkeypatch.setattr(practice.asyncio, "wait_for", _instant_timeout)
+    with pytest.raises(practice.PracticeGenerationError) as exc:
+        asyncio.run(
+            practice._generate_and_publish(
+                db, _job(), topic="Hashing", difficulty="easy", company_key=None, company_name=None
+            )
+        )
+    assert exc.value.retryable and "timed out" in str(exc.value)
+    assert db.commits == 1
+
+
+def test_worker_publishes_and_stores_the_result(monkeypatch, fake_session):
+    monkeypatch.setattr(practice.settings, "openai_api_key", "sk-test")
+
+    async def _miss(db, **_kw):
+        return [], None
+
+    async def _generate(db, job, **_kw):
+        return (SimpleNamespace(id=5), SimpleNamespace(id=50))
+
+    async def _out(db, matched, **kw):
+        assert kw["generated"] and kw["source"] == "generated"
+        return _resolve_out()
+
+    monkeypatch.setattr(practice, "_match_bank", _miss)
+    monkeypatch.setattr(practice, "_generate_and_publish", _generate)
+    monkeypatch.setattr(practice, "_practice_out", _out)
+    job = _job()
+    asyncio.run(practice.run_practice_generation(fake_session(), job))
+    assert job.status == JobStatus.SUCCEEDED.value
+    handle = practice._generation_out(job)
+    assert handle.status == "succeeded" and handle.result.assessment_slug == "practice-hashing-easy"
+
+
+def test_joiner_during_generation_keeps_access_to_the_result(monkeypatch, fake_session):
+    monkeypatch.setattr(practice.settings, "openai_api_key", "sk-test")
+    row = {"topic": "Hashing", "difficulty": "easy", "company_key": None, "dedupe_key": "hashing|easy|"}
+    row["requested_by"] = [7]
+    joiner = SimpleNamespace(id=8, role=_STUDENT.role, organization_id=None)
+    joiner_db = fake_session(scalar=_job(JobStatus.RUNNING.value, requested_by=[7]))
+
+    def _apply(stmt) -> None:
+        # The UPDATE's SET payload_json = payload_json || <patch>, evaluated against ``row``.
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        params = compiled.params
+        if "jsonb_build_object" in str(compiled):  # requested_by append
+            row["requested_by"] = [*row.get("requested_by", []), *params["param_2"]]
+        else:
+            row.update(params["param_1"])
+
+    async def _miss(db, **_kw):
+        return [], None
+
+    async def _generate(db, job, **_kw):
+        # Another student asks for the same key while the LLM call is in flight.
+        await practice.enqueue_practice_generation(
+            joiner_db, joiner, topic="Hashing", difficulty="easy", company_key=None, company_name=None
+        )
+        _apply(joiner_db.statements[-1])
+        return (SimpleNamespace(id=5), SimpleNamespace(id=50))
+
+    async def _out(db, matched, **kw):
+        return _resolve_out()
+
+    monkeypatch.setattr(practice, "_match_bank", _miss)
+    monkeypatch.setattr(practice, "_generate_and_publish", _generate)
+    monkeypatch.setattr(practice, "_practice_out", _out)
+    worker_db = fake_session()
+    job = _job(requested_by=[7])
+    asyncio.run(practice.run_practice_generation(worker_db, job))
+    (result_write,) = worker_db.statements
+    _apply(result_write)
+
+    assert row["requested_by"] == [7, 8]
+    stored = _job(JobStatus.SUCCEEDED.value, **row)
+    assert practice._generation_out(stored).result.assessment_slug == "practice-hashing-easy"
+
+
+def test_worker_failure_without_retry_surfaces_error(monkeypatch, fake_session):
+    monkeypatch.setattr(practice.settings, "openai_api_key", "sk-test")
+
+    async def _miss(db, **_kw):
+        return [], None
+
+    async def _generate(db, job, **_kw):
+        raise practice.PracticeGenerationError("failed validation guardrails", retryable=False)
+
+    monkeypatch.setattr(practice, "_match_bank", _miss)
+    monkeypatch.setattr(practice, "_generate_and_publish", _generate)
+    job = _job()
+    asyncio.run(practice.run_practice_generation(fake_session(), job))
+    handle = practice._generation_out(job)
+    assert job.status == JobStatus.DEAD.value
+    assert handle.status == "failed" and "guardrails" in handle.error and handle.result is None
+
+
+def test_practice_jobs_stream_under_their_own_kind():
+    assert job_target(_job()) == (KIND_PRACTICE, 41)
+
+
+def test_practice_stream_releases_request_session_first(monkeypatch, fake_session):
+    monkeypatch.setattr(coding_streaming, "hub", coding_streaming.ProgressHub())
+    monkeypatch.setattr(db_session, "async_session_factory", lambda: fake_session)
+    request_db = fake_session(scalar=_job())
+    reads: list[bool] = []
+
+    async def _state(db, user, job_id):
+        reads.append(request_db.closed and db is not request_db)
+        return practice._generation_out(_job(JobStatus.SUCCEEDED.value, result=_resolve_out().model_dump())), True
+
+    monkeypatch.setattr(coding_router.coding_practice, "practice_generation_stream_state", _state)
+
+    async def main():
+        response = await coding_router.stream_practice_generation(41, db=request_db, user=_STUDENT)
+        assert request_db.closed and reads == []
+        return [c async for c in response.body_iterator]
+
+    chunks = asyncio.run(main())
+    assert chunks[0].startswith("event: snapshot") and reads and all(reads)
+
+
+def test_worker_lanes_split_practice_from_judge_jobs():
+    def _sql(lane):
+        stmt = select(CodingJob.id).where(job_queue.lane_filter(lane))
+        return str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "coding_jobs.job_type IN" in _sql(job_queue.LANE_PRACTICE)
+    assert "coding_jobs.job_type NOT IN" in _sql(job_queue.LANE_JUDGE)
+    assert "job_type" not in _sql(job_queue.LANE_ALL)
+    with pytest.raises(ValueError):
+        job_queue.lane_filter("llm")
@@ -0,0 +1,99 @@
+"""Provider progress coalescing: Judge0 polls no longer flush coding_jobs per poll."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from app.coding.jobs import progress as progress_mod
+from app.coding.jobs.progress import ProviderProgress, latest_progress
+
+
+class _Db:
+    def __init__(self) -> None:
+        self.flushes = 0
+
+    async def flush(self) -> None:
+        self.flushes += 1
+
+
+def _job(job_id: int = 101):
+    return SimpleNamespace(
+        id=job_id,
+        job_type="submit_evaluate",
+        run_id=None,
+        submission_id=55,
+        provider=None,
+        provider_submission_token=None,
+        provider_status=None,
+        updated_at=None,
+    )
+
+
+def _simulate(sink: ProviderProgress, tests: int, polls: int) -> None:
+    async def main():
+        for t in range(tests):
+            token = f"tok-{t}"
+            await sink("judge0", token, "created")
+            for p in range(polls):
+                await sink("judge0", token, "Processing" if p < polls - 1 else "Accepted")
+        sink.finish()
+
+    asyncio.run(main())
+
+
+def test_polls_are_coalesced_to_an_order_of_magnitude_fewer_writes():
+    db, job = _Db(), _job()
+    sink = ProviderProgress(db, job, total_cases=15, min_interval_ms=60_000)
+    _simulate(sink, tests=15, polls=5)
+    assert sink.updates == 90
+    assert db.flushes <= 9
+    # Final state is staged on the job for the following mark_* flush.
+    assert job.provider == "judge0"
+    assert job.provider_submission_token == "tok-14"
+    assert job.provider_status == "Accepted"
+
+
+def test_notify_once_per_started_test_case():
+    sent: list[dict] = []
+
+    async def notify(payload: dict) -> None:
+        sent.append(payload)
+
+    sink = ProviderProgress(_Db(), _job(104), total_cases=15, min_interval_ms=60_000, notify=notify)
+    _simulate(sink, tests=15, polls=5)
+    assert len(sent) == 15
+    assert sent[-1]["kind"] == "submission" and sent[-1]["id"] == 55
+    assert sent[-1]["cases_started"] == 15 and sent[-1]["total_cases"] == 15
+
+
+def test_poll_errors_are_written_immediately():
+    db, job = _Db(), _job(102)
+    sink = ProviderProgress(db, job, min_interval_ms=60_000)
+
+    async def main():
+        await sink("judge0", "t", "created")
+        await sink("judge0", "t", "Processing")
+        before = db.flushes
+        await sink("judge0", "t", "poll_error_502")
+        assert db.flushes == before + 1
+        assert job.provider_status == "poll_error_502"
+
+    asyncio.run(main())
+
+
+def test_progress_channel_tracks_cases_and_finish():
+    progress_mod._channel.clear()
+    db, job = _Db(), _job(103)
+    sink = ProviderProgress(db, job, total_cases=3, min_interval_ms=0)
+
+    async def main():
+        await sink("judge0", "a", "created")
+        await sink("judge0", "b", "Processing")
+        live = latest_progress(103)
+        assert live is not None and live.cases_started == 2 and live.total_cases == 3
+        assert not live.finished
+        sink.finish()
+        assert latest_progress(103).finished
+
+    asyncio.run(main())
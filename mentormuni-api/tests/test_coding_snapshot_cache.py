@@ -0,0 +1,106 @@
+"""Attempt snapshot memoization: keyed by assessment + link/version stamp, one-query cold path."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.coding import service as coding_service
+from app.coding.snapshots import SnapshotCache, SnapshotKey
+
+_TS = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _assessment(**kw):
+    base = dict(
+        id=1,
+        slug="arrays-easy",
+        title="Arrays",
+        duration_minutes=45,
+        allowed_languages_json=["python"],
+        company_key=None,
+        company_name="Acme",
+        role_name="SDE",
+        evidence_confidence=0.5,
+        difficulty="easy",
+        updated_at=_TS,
+    )
+    base.update(kw)
+    return SimpleNamespace(**base)
+
+
+def _row(problem_id: int, version_id: int, *, status: str = "published", order: int = 0):
+    link = SimpleNamespace(order_index=order, points=100.0)
+    problem = SimpleNamespace(
+        id=problem_id,
+        status=status,
+        current_version_id=version_id,
+        company_name=None,
+        role_name=None,
+    )
+    version = SimpleNamespace(
+        id=version_id,
+        version_number=1,
+        title=f"P{problem_id}",
+        difficulty="easy",
+        topic="arrays",
+        pattern="two pointers",
+    )
+    return link, problem, version
+
+
+def _key(version_id: int) -> SnapshotKey:
+    return SnapshotKey(1, _TS, ((10, 5, 0, 100.0, "published", version_id),))
+
+
+def test_cached_snapshot_is_reused_until_the_stamp_changes(monkeypatch):
+    cache = SnapshotCache()
+    monkeypatch.setattr(coding_service, "get_snapshot_cache", lambda: cache)
+    stamps = iter([_key(50), _key(50), _key(51)])
+    built: list[int] = []
+
+    async def _stamp(_db, _a):
+        return next(stamps)
+
+    async def _rows(_db, _aid):
+        built.append(1)
+        return [_row(5, 50 + len(built) - 1)]
+
+    monkeypatch.setattr(coding_service, "snapshot_key", _stamp)
+    monkeypatch.setattr(coding_service, "snapshot_rows", _rows)
+
+    async def main():
+        a = _assessment()
+        first = await coding_service._attempt_snapshot(None, a)
+        second = await coding_service._attempt_snapshot(None, a)
+        assert second is first
+        third = await coding_service._attempt_snapshot(None, a)
+        assert third is not first
+        assert third.snapshot_json["problems"][0]["problem_version_id"] == 51
+
+    asyncio.run(main())
+    assert len(built) == 2
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 2}
+
+
+def test_snapshot_payload_falls_back_to_assessment_company_and_rejects_drafts(monkeypatch):
+    async def _rows(_db, _aid):
+        return [_row(5, 50), _row(6, 60, order=1)]
+
+    monkeypatch.setattr(coding_service, "snapshot_rows", _rows)
+    payload = asyncio.run(coding_service._build_snapshot_payload(None, _assessment()))
+    assert [p.problem_version_id for p in payload.problems] == [50, 60]
+    assert payload.problems[0].company_name == "Acme"
+    assert payload.why_this_matters and "arrays" in payload.why_this_matters
+
+    async def _draft_rows(_db, _aid):
+        return [_row(5, 50, status="draft")]
+
+    monkeypatch.setattr(coding_service, "snapshot_rows", _draft_rows)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(coding_service._build_snapshot_payload(None, _assessment()))
+    assert exc.value.status_code == 400
@@ -0,0 +1,123 @@
+"""Run/submission SSE: hub fan-out and stream lifecycle (no DB; events injected)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from pydantic import BaseModel
+
+from app.coding import router as coding_router
+from app.coding import streaming
+from app.coding.jobs.progress import latest_progress
+from app.common.database import session as db_session
+
+
+class _Snap(BaseModel):
+    id: int
+    execution_status: str
+
+
+def _events(chunks: list[str]) -> list[tuple[str, dict]]:
+    out = []
+    for chunk in chunks:
+        if chunk.startswith(":"):
+            out.append(("keepalive", {}))
+            continue
+        head, data = chunk.strip().split("\n")
+        out.append((head.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return out
+
+
+def test_stream_emits_snapshot_progress_and_done(monkeypatch):
+    monkeypatch.setattr(streaming, "hub", streaming.ProgressHub())
+    states = iter([("queued", False), ("completed", True)])
+
+    async def load():
+        status, finished = next(states)
+        return _Snap(id=5, execution_status=status), finished
+
+    async def main():
+        chunks: list[str] = []
+
+        async def consume():
+            async for chunk in streaming.event_stream("run", 5, load):
+                chunks.append(chunk)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        progress = {"event": "progress", "kind": "run", "id": 5, "job_id": 9, "cases_started": 1}
+        streaming.hub.dispatch(json.dumps(progress))
+        streaming.hub.dispatch(json.dumps({**progress, "id": 6}))  # other run: not delivered
+        streaming.hub.dispatch(json.dumps({"event": "done", "kind": "run", "id": 5, "job_id": 9}))
+        await asyncio.wait_for(task, 1.0)
+        return chunks
+
+    events = _events(asyncio.run(main()))
+    assert [e[0] for e in events] == ["snapshot", "progress", "done"]
+    assert events[1][1]["cases_started"] == 1
+    assert events[2][1]["execution_status"] == "completed"
+    assert streaming.hub.stats()["streams"] == 0
+    # Hub events also refresh the process-local progress channel.
+    assert latest_progress(9).finished
+
+
+def test_finished_snapshot_closes_immediately(monkeypatch):
+    monkeypatch.setattr(streaming, "hub", streaming.ProgressHub())
+
+    async def load():
+        return _Snap(id=1, execution_status="completed"), True
+
+    async def main():
+        return [c async for c in streaming.event_stream("submission", 1, load)]
+
+    assert [e[0] for e in _events(asyncio.run(main()))] == ["snapshot", "done"]
+
+
+def test_keepalive_rechecks_db_when_notify_is_missed(monkeypatch):
+    monkeypatch.setattr(streaming, "hub", streaming.ProgressHub())
+    monkeypatch.setattr(streaming.settings, "coding_stream_keepalive_seconds", 0.02)
+    states = iter([("running", False), ("running", False), ("completed", True)])
+
+    async def load():
+        status, finished = next(states)
+        return _Snap(id=2, execution_status=status), finished
+
+    async def main():
+        return [c async for c in streaming.event_stream("run", 2, load)]
+
+    assert [e[0] for e in _events(asyncio.run(main()))] == ["snapshot", "keepalive", "done"]
+
+
+def test_bad_payloads_are_ignored():
+    hub = streaming.ProgressHub()
+    hub.dispatch("not json")
+    hub.dispatch(json.dumps({"event": "progress"}))
+    assert hub.delivered == 0
+
+
+def test_request_session_is_closed_before_first_event(monkeypatch, fake_session):
+    monkeypatch.setattr(streaming, "hub", streaming.ProgressHub())
+    request_db = fake_session()
+    reads: list[tuple[bool, int, bool]] = []
+
+    async def get_run(db, user, run_id):
+        assert db is request_db
+
+    async def run_stream_state(db, user, run_id):
+        reads.append((db is request_db, request_db.commits, request_db.closed))
+        return _Snap(id=run_id, execution_status="completed"), True
+
+    monkeypatch.setattr(coding_router.coding_service, "get_run", get_run)
+    monkeypatch.setattr(coding_router.coding_service, "run_stream_state", run_stream_state)
+    monkeypatch.setattr(db_session, "async_session_factory", lambda: fake_session)
+
+    async def main():
+        response = await coding_router.stream_run_events(5, db=request_db, user=SimpleNamespace(id=7))
+        assert request_db.closed and reads == []
+        return [c async for c in response.body_iterator]
+
+    assert [e[0] for e in _events(asyncio.run(main()))] == ["snapshot", "done"]
+    # Every snapshot came from a fresh short session, after the request one was released.
+    assert reads and all(r == (False, 1, True) for r in reads)
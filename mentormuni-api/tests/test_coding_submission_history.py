@@ -0,0 +1,77 @@
+"""Submission history: one joined select per page, keyset cursor, SQL filters."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.coding import service as coding_service
+from app.common.pagination import CursorError, decode_cursor, encode_cursor
+
+_T0 = datetime(2026, 3, 1, tzinfo=timezone.utc)
+_STUDENT = SimpleNamespace(id=7, role=SimpleNamespace(role_code="STUDENT"), organization_id=None)
+
+
+def _row(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=1000 - i,
+        attempt_id=1,
+        assessment_id=2,
+        problem_id=3,
+        language_code="python",
+        execution_status="completed",
+        verdict="accepted",
+        analysis_status="ready",
+        score=100.0,
+        submitted_at=_T0 - timedelta(minutes=i),
+        assessment_slug="arrays",
+        assessment_title="Arrays",
+        company_name="Acme",
+        role_name="SDE",
+        problem_title="Two Sum",
+    )
+
+
+@pytest.mark.parametrize("page_rows", [0, 1, 20, 51])
+def test_history_page_is_one_query_regardless_of_rows(page_rows, fake_session):
+    db = fake_session([_row(i) for i in range(page_rows)])
+    out = asyncio.run(coding_service.list_submissions(db, _STUDENT, limit=50))
+    assert len(db.statements) == 1
+    assert len(out.items) == min(page_rows, 50)
+    if page_rows > 50:
+        assert decode_cursor(out.next_cursor) == (out.items[-1].submitted_at, out.items[-1].id)
+    else:
+        assert out.next_cursor is None
+
+
+def test_history_select_projects_summary_columns_and_pushes_filters(fake_session):
+    db = fake_session()
+    asyncio.run(
+        coding_service.list_submissions(
+            db,
+            _STUDENT,
+            verdict="Accepted",
+            language_code="PYTHON",
+            submitted_from=_T0 - timedelta(days=7),
+            submitted_to=_T0,
+            company_key="acme",
+            cursor=encode_cursor(_T0, 99),
+        )
+    )
+    sql = db.sql()
+    assert "source_code" not in sql
+    assert "LEFT OUTER JOIN coding_assessments" in sql
+    assert "LEFT OUTER JOIN coding_problem_versions" in sql
+    assert "coding_submissions.verdict = " in sql
+    assert "coding_submissions.language_code = " in sql
+    assert "coding_submissions.submitted_at >= " in sql and "coding_submissions.submitted_at < " in sql
+    assert "ORDER BY coding_submissions.submitted_at DESC, coding_submissions.id DESC" in sql
+
+
+def test_history_rejects_foreign_cursor(fake_session):
+    with pytest.raises(CursorError) as exc:
+        asyncio.run(coding_service.list_submissions(fake_session(), _STUDENT, cursor="%%%"))
+    assert exc.value.status_code == 400
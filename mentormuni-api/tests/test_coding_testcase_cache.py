@@ -0,0 +1,109 @@
+"""Worker test-case bundle cache: stamp reuse, byte budget, mmapped disk bundles."""
+
+from __future__ import annotations
+
+import asyncio
+
+from app.coding.jobs import testcase_cache as tcc
+
+
+def _rows(n: int, size: int = 10) -> list[tcc.CachedTestCase]:
+    return [
+        tcc.CachedTestCase(
+            id=i + 1,
+            input=f"{i}\n" + "x" * size,
+            expected_output=str(i * 2),
+            is_hidden=i % 2 == 1,
+            weight=1.0 + i,
+            order_index=i,
+        )
+        for i in range(n)
+    ]
+
+
+class _FakeCache(tcc.TestCaseBundleCache):
+    """Stamp/rows come from dicts instead of Postgres; counts row loads."""
+
+    def __init__(self, **kw) -> None:
+        super().__init__(**kw)
+        self.stamps: dict[int, str] = {}
+        self.rows: dict[int, list[tcc.CachedTestCase]] = {}
+        self.loads = 0
+
+    async def _stamp(self, db, version_id):
+        return self.stamps[version_id]
+
+    async def _load_rows(self, db, version_id):
+        self.loads += 1
+        return self.rows[version_id]
+
+
+def test_hot_version_loads_rows_once_until_stamp_changes():
+    cache = _FakeCache(max_bytes=1 << 20)
+    cache.stamps[1], cache.rows[1] = "a|3|3", _rows(3)
+
+    async def main():
+        first = await cache.get(None, 1)
+        second = await cache.get(None, 1)
+        assert [c.id for c in second] == [1, 2, 3] and first == second
+        assert cache.loads == 1 and cache.hits == 1
+        cache.stamps[1] = "b|3|3"  # re-published
+        await cache.get(None, 1)
+        assert cache.loads == 2
+
+    asyncio.run(main())
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = _FakeCache(max_bytes=100)
+    for v in (1, 2, 3):
+        cache.stamps[v], cache.rows[v] = "s", _rows(2, size=20)
+
+    async def main():
+        await cache.get(None, 1)
+        await cache.get(None, 2)
+        await cache.get(None, 1)
+        await cache.get(None, 3)  # evicts 2
+        assert cache.stats()["bytes"] <= 100
+        await cache.get(None, 2)
+        assert cache.loads == 4
+
+    asyncio.run(main())
+
+
+def test_large_bundles_are_memory_mapped_from_disk(tmp_path):
+    cache = _FakeCache(max_bytes=1 << 20, disk_dir=str(tmp_path), disk_threshold_bytes=1000)
+    rows = _rows(4, size=5000)
+    cache.stamps[7], cache.rows[7] = "p|4|4", rows
+
+    async def main():
+        cases = await cache.get(None, 7)
+        assert isinstance(cases[0], tcc.MappedTestCase)
+        assert [c.input for c in cases] == [r.input for r in rows]
+        assert [(c.id, c.is_hidden, c.weight) for c in cases] == [
+            (r.id, r.is_hidden, r.weight) for r in rows
+        ]
+        # Only the index counts against the memory budget.
+        assert cache.stats()["bytes"] < 1000
+        # A fresh process finds the bundle on disk without loading rows.
+        other = _FakeCache(max_bytes=1 << 20, disk_dir=str(tmp_path), disk_threshold_bytes=1000)
+        other.stamps[7] = "p|4|4"
+        again = await other.get(None, 7)
+        assert other.loads == 0 and other.disk_hits == 1
+        assert again[3].expected_output == "6"
+
+    asyncio.run(main())
+
+
+def test_invalidate_version_drops_bundle():
+    cache = _FakeCache(max_bytes=1 << 20)
+    cache.stamps[1], cache.rows[1] = "s", _rows(1)
+
+    async def main():
+        await cache.get(None, 1)
+        cache.invalidate_version(1)
+        assert cache.stats()["bundles"] == 0
+        await cache.get(None, 1)
+        assert cache.loads == 2
+
+    asyncio.run(main())
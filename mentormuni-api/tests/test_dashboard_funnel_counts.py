@@ -0,0 +1,29 @@
+"""Identity dashboard funnel pivot."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from app.dashboard.service import FunnelCounts
+
+
+def _row(dept, role, status, cnt):
+    return SimpleNamespace(department_id=dept, role_code=role, status=status, cnt=cnt)
+
+
+def test_pivot_cells_and_totals_in_one_pass() -> None:
+    counts = FunnelCounts.from_rows(
+        [
+            _row(1, "STUDENT", "ACTIVE", 5),
+            _row(1, "STUDENT", "PENDING", 2),
+            _row(2, "STUDENT", "ACTIVE", 3),
+            _row(2, "DEPARTMENT_ADMIN", "INVITED", 1),
+            _row(None, "ORG_ADMIN", "ACTIVE", 1),
+        ]
+    )
+    assert counts.get(1, "STUDENT", "ACTIVE") == 5
+    assert counts.get(3, "STUDENT", "ACTIVE") == 0
+    assert counts.sum_role("STUDENT", "ACTIVE") == 8
+    assert counts.sum_role("STUDENT") == 10
+    assert counts.sum_role("DEPARTMENT_ADMIN") == 1
+    assert counts.sum_role("DEPARTMENT_ADMIN", "ACTIVE") == 0
@@ -0,0 +1,138 @@
+"""Email outbox sender: batching, idempotency, status roll-up (no DB / network)."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.common.email import worker as email_worker
+from app.common.email.exceptions import EmailDeliveryError
+from app.common.email.outbox import delivery_status_for
+from app.core.config import settings
+
+
+def _row(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=i,
+        idempotency_key=f"notification:1:user:{i}",
+        to_email=f"s{i}@x.edu",
+        to_name=None,
+        subject="Hello",
+        text_body="Body",
+        html_body=None,
+    )
+
+
+def test_delivery_status_roll_up() -> None:
+    assert delivery_status_for(sent=3, failed=0, open_=2) == "sending"
+    assert delivery_status_for(sent=3, failed=0, open_=0) == "sent"
+    assert delivery_status_for(sent=2, failed=1, open_=0) == "partial"
+    assert delivery_status_for(sent=0, failed=4, open_=0) == "failed"
+
+
+def test_batch_key_is_stable_per_row_set() -> None:
+    a = email_worker.batch_idempotency_key([_row(1), _row(2)])
+    assert a == email_worker.batch_idempotency_key([_row(1), _row(2)])
+    assert a != email_worker.batch_idempotency_key([_row(1), _row(3)])
+
+
+def test_disabled_email_marks_rows_skipped(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "email_enabled", False)
+    results = asyncio.run(email_worker.deliver([_row(1), _row(2)]))
+    assert [(r.outbox_id, r.skipped) for r in results] == [(1, True), (2, True)]
+
+
+def test_resend_sends_batches_of_100(monkeypatch) -> None:
+    calls: list[int] = []
+
+    class FakeClient:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *_exc):
+            return None
+
+        async def send_batch(self, payloads, *, idempotency_key):
+            calls.append(len(payloads))
+            if len(calls) == 3:
+                raise EmailDeliveryError("rate limited", status_code=429)
+            return [f"id-{i}" for i in range(len(payloads))]
+
+    monkeypatch.setattr(settings, "email_resend_rate_per_second", 100.0)
+    monkeypatch.setattr(email_worker, "_limiters", {})
+    monkeypatch.setattr(email_worker, "ResendBatchClient", FakeClient)
+    results: list = []
+
+    async def _collect(part):
+        results.extend(part)
+
+    asyncio.run(email_worker._send_resend([_row(i) for i in range(250)], _collect))
+
+    assert sorted(calls) == [50, 100, 100]
+    assert len(results) == 250
+    failed = [r for r in results if not r.sent]
+    assert len(failed) == 50 and all(r.retryable for r in failed)
+
+
+def _enable_smtp(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "email_enabled", True)
+    monkeypatch.setattr(settings, "email_from_address", "noreply@x.edu")
+    monkeypatch.setattr(settings, "email_outbox_concurrency", 1)
+    monkeypatch.setattr(settings, "email_smtp_rate_per_second", 100.0)
+    monkeypatch.setattr(email_worker, "_limiters", {})
+    monkeypatch.setattr(email_worker, "_has_resend", lambda: False)
+    monkeypatch.setattr(email_worker, "_has_smtp", lambda: True)
+
+
+def test_unexpected_error_fails_only_that_message(monkeypatch) -> None:
+    _enable_smtp(monkeypatch)
+    recorded: list[list[tuple[int, bool]]] = []
+
+    class FakeSession:
+        async def send(self, payload):
+            # Each earlier outcome is already recorded before the next send starts.
+            assert len(recorded) == int(payload.to[0].email[1]) - 1
+            if payload.to[0].email == "s2@x.edu":
+                raise ConnectionResetError("peer reset")
+            return "mid"
+
+        async def close(self):
+            return None
+
+    async def _record(part):
+        recorded.append([(r.outbox_id, r.sent) for r in part])
+
+    monkeypatch.setattr(email_worker, "SmtpSession", FakeSession)
+    results = asyncio.run(email_worker.deliver([_row(1), _row(2), _row(3)], on_results=_record))
+
+    assert recorded == [[(1, True)], [(2, False)], [(3, True)]]
+    assert [(r.outbox_id, r.sent, r.retryable) for r in results] == [
+        (1, True, True),
+        (2, False, True),
+        (3, True, True),
+    ]
+
+
+def test_recorder_failure_does_not_mark_sent_rows_failed(monkeypatch) -> None:
+    _enable_smtp(monkeypatch)
+    recorded: list[int] = []
+
+    class FakeSession:
+        async def send(self, payload):
+            return "mid"
+
+        async def close(self):
+            return None
+
+    async def _record(part):
+        if recorded:
+            raise RuntimeError("database unavailable")
+        recorded.extend(r.outbox_id for r in part)
+
+    monkeypatch.setattr(email_worker, "SmtpSession", FakeSession)
+    with pytest.raises(RuntimeError):
+        asyncio.run(email_worker.deliver([_row(1), _row(2)], on_results=_record))
+    # Row 1 stays sent; row 2 is left claimed for stale recovery, never recorded as failed.
+    assert recorded == [1]
@@ -0,0 +1,62 @@
+"""Set-based notification recipient fan-out — statement counts at 10k recipients (no DB)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.enums import NotificationAudience
+from app.notifications.service import RECIPIENT_INSERT_CHUNK, _fan_out_recipients
+
+
+class _RecordingSession:
+    def __init__(self, audience_size: int = 0) -> None:
+        self.statements: list[str] = []
+        self.audience_size = audience_size
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.statements.append(str(compiled))
+        rows = len(compiled.params) // 3 if "VALUES" in str(compiled) else self.audience_size
+        return SimpleNamespace(rowcount=rows)
+
+
+def test_org_audience_is_one_insert_select_for_10k() -> None:
+    db = _RecordingSession(audience_size=10_000)
+    t0 = time.perf_counter()
+    written = asyncio.run(
+        _fan_out_recipients(
+            db,
+            notification_id=1,
+            organization_id=7,
+            audience=NotificationAudience.ORG.value,
+            department_id=None,
+        )
+    )
+    elapsed = time.perf_counter() - t0
+    assert written == 10_000
+    assert len(db.statements) == 1
+    sql = db.statements[0]
+    assert sql.startswith("INSERT INTO notification_recipients") and "SELECT" in sql
+    assert "ON CONFLICT" in sql
+    assert elapsed < 1.0
+
+
+def test_explicit_users_insert_in_chunks_for_10k() -> None:
+    db = _RecordingSession()
+    ids = list(range(1, 10_001)) + [5, 6]  # duplicates collapse before insert
+    written = asyncio.run(
+        _fan_out_recipients(
+            db,
+            notification_id=1,
+            organization_id=7,
+            audience=NotificationAudience.USERS.value,
+            department_id=None,
+            user_ids=ids,
+        )
+    )
+    assert written == 10_000
+    assert len(db.statements) == -(-10_000 // RECIPIENT_INSERT_CHUNK)
@@ -0,0 +1,61 @@
+"""Inbox read model: unread counters, mark-all-read, badge lookup (no DB)."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.notification_inbox_counter import NotificationInboxCounter
+from app.notifications.service import (
+    _shift_unread_for_notification,
+    mark_all_read,
+    unread_count,
+)
+
+
+class _RecordingSession:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+        self.gets: list[tuple[type, int]] = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return SimpleNamespace(rowcount=4)
+
+    async def get(self, model, pk):
+        self.gets.append((model, pk))
+        return SimpleNamespace(unread_count=3)
+
+
+def test_fan_out_upserts_counters_in_one_statement() -> None:
+    db = _RecordingSession()
+    asyncio.run(_shift_unread_for_notification(db, 9, 1))
+    assert len(db.statements) == 1
+    sql = db.statements[0]
+    assert sql.startswith("INSERT INTO notification_inbox_counters")
+    assert "ON CONFLICT (user_id) DO UPDATE" in sql
+    assert "notification_inbox_counters.unread_count + excluded.unread_count" in sql
+
+
+def test_cancel_decrements_without_going_negative() -> None:
+    db = _RecordingSession()
+    asyncio.run(_shift_unread_for_notification(db, 9, -1))
+    sql = db.statements[0]
+    assert sql.startswith("UPDATE notification_inbox_counters")
+    assert "greatest" in sql
+
+
+def test_mark_all_read_is_one_recipient_update() -> None:
+    db = _RecordingSession()
+    assert asyncio.run(mark_all_read(db, user_id=5)) == 4
+    recipient_updates = [s for s in db.statements if s.startswith("UPDATE notification_recipients")]
+    assert len(recipient_updates) == 1
+    assert db.statements[-1].startswith("UPDATE notification_inbox_counters")
+
+
+def test_badge_is_primary_key_lookup() -> None:
+    db = _RecordingSession()
+    assert asyncio.run(unread_count(db, user_id=5)) == 3
+    assert db.gets == [(NotificationInboxCounter, 5)] and not db.statements
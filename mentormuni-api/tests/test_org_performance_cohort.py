@@ -0,0 +1,66 @@
+"""Columnar cohort frame for performance summaries (no DB)."""
+
+from __future__ import annotations
+
+from app.org_performance.cohort import CohortFrame
+from app.org_performance.schemas import StudentScorecard
+from app.org_performance.service import _build_area_boards, _build_tests_aggregate, _cohort_frame
+
+
+def _card(i: int, readiness, dept=1, coding=None, tests_done=0) -> StudentScorecard:
+    scores = {"aptitude": readiness} if readiness is not None else {}
+    if coding is not None:
+        scores["coding"] = coding
+    return StudentScorecard(
+        id=i,
+        name=f"S{i}",
+        department_id=dept,
+        readiness=readiness,
+        scores_by_tool=scores,
+        tests_done=tests_done,
+        tests_remaining=8 - tests_done,
+    )
+
+
+def test_reductions_skip_missing_values() -> None:
+    rows = [{"v": 80.0}, {"v": None}, {"v": 40.0}, {"v": 60.0}]
+    frame = CohortFrame.build(rows, {"v": lambda r: r["v"]})
+    assert frame.count("v") == 3
+    assert frame.mean("v") == 60.0
+    assert frame.bands("v") == (1, 1, 1)
+    assert frame.percentiles("v", (0, 50, 100)) == {"p0": 40.0, "p50": 60.0, "p100": 80.0}
+    assert frame.histogram("v", (50.0,)) == [1, 2]
+    assert frame.mean("v", rows=[1]) is None
+
+
+def test_ranking_ties_keep_row_order() -> None:
+    rows = [{"v": 50.0}, {"v": 70.0}, {"v": 50.0}, {"v": 70.0}, {"v": None}]
+    frame = CohortFrame.build(rows, {"v": lambda r: r["v"]})
+    assert [i for i, _ in frame.top_k("v", 3)] == [1, 3, 0]
+    assert [i for i, _ in frame.bottom_k("v", 3)] == [0, 2, 1]
+    assert frame.bottom_k("v", 3, below=40) == []
+
+
+def test_group_by_and_area_boards() -> None:
+    cards = [
+        _card(1, 90.0, dept=1, coding=70.0, tests_done=8),
+        _card(2, 45.0, dept=2, tests_done=2),
+        _card(3, None, dept=1),
+        _card(4, 60.0, dept=2, coding=30.0, tests_done=4),
+    ]
+    frame = _cohort_frame(cards)
+    groups = frame.group_by(lambda c: c.department_id)
+    assert list(groups[1]) == [0, 2] and list(groups[2]) == [1, 3]
+    assert frame.mean("overall", groups[2]) == 52.5
+
+    boards = {b.area: b for b in _build_area_boards(frame, limit=3)}
+    overall = boards["overall"]
+    assert [t.id for t in overall.top] == [1, 4, 2]
+    assert [t.id for t in overall.less_prepared] == [2]
+    assert boards["coding"].students_scored == 2
+    assert [t.id for t in boards["coding"].less_prepared] == [4]
+
+    tests = _build_tests_aggregate(frame)
+    assert tests.total_completions == 14
+    assert tests.students_all_done == 1
+    assert tests.students_none_done == 1
@@ -0,0 +1,99 @@
+"""Keyset cursor helpers shared by roster / inbox / history listings."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import asyncio
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.common.pagination import (
+    CursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_before,
+    next_cursor_for,
+)
+from app.models.user import User
+from app.notifications import service as notif_service
+from app.organizations import students_service
+
+
+def test_cursor_round_trip() -> None:
+    ts = datetime(2026, 3, 1, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+
+
+def test_garbage_cursor_rejected() -> None:
+    with pytest.raises(CursorError):
+        decode_cursor("not-a-cursor")
+
+
+def test_next_cursor_only_when_extra_row_fetched() -> None:
+    ts = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    rows = [SimpleNamespace(id=i, created_at=ts) for i in (5, 4, 3)]
+    assert next_cursor_for(rows, 3) is None
+    assert decode_cursor(next_cursor_for(rows, 2) or "") == (ts, 4)
+
+
+def test_keyset_predicate_is_row_comparison_on_created_and_id() -> None:
+    cursor = encode_cursor(datetime(2026, 3, 1, tzinfo=timezone.utc), 7)
+    sql = str(
+        keyset_before(User.created_at, User.id, cursor).compile(dialect=postgresql.dialect())
+    )
+    assert "users.created_at <" in sql
+    assert "users.id <" in sql
+
+
+_ORG_ADMIN = SimpleNamespace(organization_id=1, department_id=None, sees_all_students=True)
+
+
+def test_bad_cursor_is_one_error_on_every_listing(fake_session) -> None:
+    from app.main import _cursor_error_handler
+
+    with pytest.raises(CursorError) as roster:
+        asyncio.run(students_service.list_roster(fake_session(), _ORG_ADMIN, cursor="%%%"))
+    with pytest.raises(CursorError):
+        asyncio.run(notif_service.inbox_for_user(fake_session(), user_id=1, cursor="%%%"))
+    response = asyncio.run(_cursor_error_handler(None, roster.value))
+    assert response.status_code == 400 and response.body == b'{"detail":"Invalid cursor."}'
+
+
+def test_roster_pages_across_a_created_at_tie(fake_session) -> None:
+    tie = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+    users = [
+        User(id=i, email=f"s{i}@x.edu", first_name="S", last_name=str(i), status="ACTIVE",
+             password_hash="x", organization_id=1, created_at=tie if 2 <= i <= 6 else tie.replace(hour=i))
+        for i in range(1, 9)
+    ]
+    ordered = sorted(users, key=lambda u: (u.created_at, u.id), reverse=True)
+
+    class _Db(fake_session):
+        """Evaluates the roster's keyset page over ``users`` the way Postgres would."""
+
+        async def execute(self, stmt, *args, **kwargs):
+            params = stmt.compile(dialect=postgresql.dialect()).params
+            if "param_1" not in params:  # the count query
+                self.scalar = len(users)
+                return await super().execute(stmt)
+            rows = ordered
+            if "id_1" in params:
+                ts, row_id = params["created_at_1"], params["id_1"]
+                rows = [u for u in rows if u.created_at < ts or (u.created_at == ts and u.id < row_id)]
+            self.rows = rows[: params["param_1"]]
+            return await super().execute(stmt)
+
+    seen: list[int] = []
+    cursor = None
+    for _ in range(len(users)):
+        page, total, cursor = asyncio.run(
+            students_service.list_roster(_Db(), _ORG_ADMIN, limit=2, cursor=cursor)
+        )
+        seen.extend(r["id"] for r in page)
+        if cursor is None:
+            break
+    # Pages split the five-way tie (ids 6..2) without skipping or repeating a student.
+    assert seen == [u.id for u in ordered] and total == len(users)
@@ -0,0 +1,91 @@
+"""run_parallel_reads fallback contract and connection budget (no database required)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.common.database import parallel
+from app.common.database import session as db_session
+from app.common.database.parallel import parallel_reads_enabled, run_parallel_reads
+from app.core.config import settings
+from app.models.department import Department
+
+
+def test_disabled_runs_sequentially_on_caller_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "db_parallel_reads", False)
+    session = object()
+    seen: list[tuple[str, object]] = []
+
+    def query(label: str):
+        async def _q(s):
+            seen.append((label, s))
+            return label
+
+        return _q
+
+    assert parallel_reads_enabled() is False
+    out = asyncio.run(run_parallel_reads(session, query("a"), query("b"), query("c")))  # type: ignore[arg-type]
+    assert out == ("a", "b", "c")
+    assert seen == [("a", session), ("b", session), ("c", session)]
+
+
+def test_connection_budget_stays_below_pool_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "db_pool_size", 20)
+    monkeypatch.setattr(settings, "db_parallel_reads_max_connections", 0)
+    assert parallel.max_parallel_connections() == 10
+    monkeypatch.setattr(settings, "db_parallel_reads_max_connections", 50)
+    assert parallel.max_parallel_connections() == 19
+
+
+def test_spent_budget_runs_sequentially_on_caller_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "db_parallel_reads", True)
+    monkeypatch.setattr(settings, "database_url", "postgresql+asyncpg://u:p@db/app")
+    monkeypatch.setattr(settings, "db_pool_size", 6)
+    monkeypatch.setattr(settings, "db_parallel_reads_max_connections", 0)
+    session = object()
+
+    async def _q(s):
+        assert s is session
+        return parallel._connections_in_use
+
+    async def main():
+        # Another request already holds two of the three slots.
+        async with parallel._reserve_connections(2) as held:
+            assert held
+            return await run_parallel_reads(session, _q, _q)  # type: ignore[arg-type]
+
+    assert asyncio.run(main()) == (2, 2)
+    assert parallel._connections_in_use == 0
+
+
+class _SnapshotSession(AsyncSession):
+    """Real ``AsyncSession`` (identity map, expiry) with the snapshot statements stubbed out."""
+
+    async def execute(self, statement, *args, **kwargs):
+        class _Result:
+            def scalar_one(self):
+                return "00000003-0000001B-1"
+
+        return _Result()
+
+
+def test_snapshot_results_stay_readable_after_the_sessions_close(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "db_parallel_reads", True)
+    monkeypatch.setattr(settings, "database_url", "postgresql+asyncpg://u:p@db/app")
+    monkeypatch.setattr(db_session, "async_session_factory", lambda: _SnapshotSession)
+
+    def load(dept_id: int, name: str):
+        async def _q(s: AsyncSession) -> Department:
+            row = Department(id=dept_id, name=name, code=name, organization_id=1)
+            make_transient_to_detached(row)
+            # Persistent in the snapshot session, as a SELECT would leave it.
+            return await s.merge(row, load=False)
+
+        return _q
+
+    cse, ece = asyncio.run(run_parallel_reads(object(), load(1, "CSE"), load(2, "ECE")))  # type: ignore[arg-type]
+    assert (cse.name, ece.name, ece.code) == ("CSE", "ECE", "ECE")
@@ -0,0 +1,68 @@
+"""Password hashing: off-loop executor, saturation, rehash-on-login."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from passlib.context import CryptContext
+
+from app.common.security import passwords
+from app.common.security.passwords import PasswordHasher, PasswordHasherBusyError
+
+
+def test_async_helpers_roundtrip_off_the_event_loop():
+    async def main():
+        loop_thread = threading.get_ident()
+        seen: list[int] = []
+
+        def _probe(plain: str) -> str:
+            seen.append(threading.get_ident())
+            return passwords.hash_password(plain)
+
+        hasher = PasswordHasher(workers=1, max_queue=4)
+        stored = await hasher.run(_probe, "S3cret!pass")
+        assert seen and seen[0] != loop_thread
+        assert await passwords.verify_password_async("S3cret!pass", stored)
+        assert not await passwords.verify_password_async("wrong", stored)
+        assert not await passwords.verify_password_async("", stored)
+        stats = hasher.stats()
+        assert stats["completed"] == 1 and stats["in_flight"] == 0
+        hasher.shutdown()
+
+    asyncio.run(main())
+
+
+def test_saturated_hasher_rejects_with_retry_after():
+    async def main():
+        release = threading.Event()
+        hasher = PasswordHasher(workers=1, max_queue=1)
+        running = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(PasswordHasherBusyError) as exc:
+            await hasher.run(int)
+        assert exc.value.retry_after > 0
+        release.set()
+        await asyncio.gather(*running)
+        stats = hasher.stats()
+        assert stats["rejected"] == 1 and stats["completed"] == 2
+        assert stats["max_queue_ms"] > 0
+        hasher.shutdown()
+
+    asyncio.run(main())
+
+
+def test_rehash_on_login_when_cost_raised(monkeypatch):
+    weak = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=4).hash("S3cret!pass")
+
+    ok, new_hash = asyncio.run(passwords.verify_password_and_update_async("S3cret!pass", weak))
+    assert ok and new_hash and new_hash != weak
+    assert passwords.verify_password("S3cret!pass", new_hash)
+
+    ok, again = asyncio.run(passwords.verify_password_and_update_async("S3cret!pass", new_hash))
+    assert ok and again is None
+
+    monkeypatch.setattr(passwords.settings, "password_rehash_on_login", False)
+    ok, new_hash = asyncio.run(passwords.verify_password_and_update_async("S3cret!pass", weak))
+    assert ok and new_hash is None
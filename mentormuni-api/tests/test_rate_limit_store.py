@@ -0,0 +1,155 @@
+"""Rate-limit store: moving window via `limits`, coding run/submit hooks, Postgres SQL shape."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.coding import service as coding_service
+from app.coding.enums import AttemptStatus
+from app.coding.schemas import RunCreateRequest, SubmissionCreateRequest
+from app.common import rate_limit
+from app.common.rate_limit import FallbackRateLimitStore, LimitsRateLimitStore
+
+
+def test_memory_store_allows_up_to_limit_then_reports_retry_after():
+    async def main():
+        store = LimitsRateLimitStore("memory://")
+        results = [await store.hit("k", limit=3, window_seconds=60) for _ in range(4)]
+        assert results[:3] == [None, None, None]
+        assert results[3] is not None and 1 <= results[3] <= 60
+        # Keys are independent.
+        assert await store.hit("other", limit=3, window_seconds=60) is None
+
+    asyncio.run(main())
+
+
+def test_coding_rate_limits_use_the_shared_store(monkeypatch):
+    store = LimitsRateLimitStore("memory://")
+    monkeypatch.setattr(coding_service, "get_rate_limit_store", lambda: store)
+
+    class _Limits:
+        run_rate_per_student = 2
+        run_rate_window_seconds = 60
+        submit_rate_per_student = 1
+        submit_rate_window_seconds = 60
+
+    monkeypatch.setattr(coding_service, "get_coding_limits", lambda: _Limits())
+
+    async def main():
+        await coding_service._assert_run_rate_limit(7)
+        await coding_service._assert_run_rate_limit(7)
+        with pytest.raises(HTTPException) as exc:
+            await coding_service._assert_run_rate_limit(7)
+        assert exc.value.status_code == 429
+        assert int(exc.value.headers["Retry-After"]) >= 1
+        # Run and submit budgets are separate buckets.
+        await coding_service._assert_submit_rate_limit(7)
+        with pytest.raises(HTTPException):
+            await coding_service._assert_submit_rate_limit(7)
+
+    asyncio.run(main())
+
+
+def test_postgres_token_bucket_is_a_single_conditional_upsert():
+    sql = str(rate_limit._TOKEN_BUCKET_UPSERT)
+    assert sql.count("INSERT INTO rate_limit_buckets") == 1
+    assert "ON CONFLICT (bucket_key) DO UPDATE" in sql
+    assert "WHERE LEAST(" in sql and "RETURNING" in sql
+
+
+def test_postgres_setting_keeps_slowapi_in_memory(monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_storage_uri", "postgres")
+    assert rate_limit._slowapi_storage_uri() == "memory://"
+
+
+@pytest.mark.parametrize(
+    ("uri", "workers", "fails"),
+    [
+        ("", 2, True),
+        ("postgres", 2, True),
+        ("memory://", 4, True),
+        ("postgres", 1, False),
+        ("redis://cache:6379/0", 4, False),
+    ],
+)
+def test_startup_refuses_per_worker_slowapi_limits(monkeypatch, uri, workers, fails):
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_storage_uri", uri)
+    monkeypatch.setattr(rate_limit.settings, "database_url", "postgresql+asyncpg://db/app")
+    monkeypatch.setattr(rate_limit.settings, "web_concurrency", workers)
+    if fails:
+        with pytest.raises(RuntimeError, match="WEB_CONCURRENCY"):
+            rate_limit.check_rate_limit_config()
+    else:
+        rate_limit.check_rate_limit_config()
+
+
+class _DownStore:
+    async def hit(self, key, *, limit, window_seconds):
+        raise ConnectionError("store unreachable")
+
+
+class _RecordingStore:
+    def __init__(self) -> None:
+        self.keys: list[str] = []
+
+    async def hit(self, key, *, limit, window_seconds):
+        self.keys.append(key)
+        return None
+
+
+def test_store_errors_fall_back_to_process_memory():
+    async def main():
+        store = FallbackRateLimitStore(_DownStore())
+        results = [await store.hit("k", limit=2, window_seconds=60) for _ in range(3)]
+        assert results[:2] == [None, None] and results[2] is not None
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    ("uri", "database_url", "expected"),
+    [
+        ("", "postgresql+asyncpg://db/app", rate_limit.PostgresRateLimitStore),
+        ("", "", LimitsRateLimitStore),
+        ("memory://", "postgresql+asyncpg://db/app", LimitsRateLimitStore),
+    ],
+)
+def test_unset_storage_uses_postgres_buckets_when_a_database_is_configured(monkeypatch, uri, database_url, expected):
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_storage_uri", uri)
+    monkeypatch.setattr(rate_limit.settings, "database_url", database_url)
+    monkeypatch.setattr(rate_limit, "_store", None)
+    store = rate_limit.get_rate_limit_store()
+    assert isinstance(getattr(store, "primary", store), expected)
+    assert rate_limit._slowapi_storage_uri() == "memory://"
+
+
+@pytest.mark.parametrize(
+    ("enqueue", "body_cls"),
+    [(coding_service.enqueue_run, RunCreateRequest), (coding_service.enqueue_submission, SubmissionCreateRequest)],
+    ids=["run", "submit"],
+)
+def test_invalid_requests_do_not_spend_the_budget(monkeypatch, fake_session, enqueue, body_cls):
+    store = _RecordingStore()
+    monkeypatch.setattr(coding_service, "get_rate_limit_store", lambda: store)
+    attempt = SimpleNamespace(id=3, status=AttemptStatus.IN_PROGRESS.value)
+
+    async def _owned(db, user, attempt_id, **_kw):
+        return attempt
+
+    async def _version(db, att, problem_id):
+        return SimpleNamespace(problem_version_id=11)
+
+    monkeypatch.setattr(coding_service, "get_owned_attempt", _owned)
+    monkeypatch.setattr(coding_service, "is_attempt_expired", lambda att, *_a: False)
+    monkeypatch.setattr(coding_service, "_resolve_attempt_problem_version", _version)
+    user = SimpleNamespace(id=7, role=SimpleNamespace(role_code="STUDENT"), organization_id=None)
+    body = body_cls(attempt_id=3, problem_id=5, language_code="cobol", source_code="print(1)")
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(enqueue(fake_session(), user, body))  # no active language row → 400
+    assert exc.value.status_code == 400
+    assert store.keys == []
@@ -0,0 +1,88 @@
+"""Resume ATS result cache: keys, LRU, and skipping parse + LLM on repeats (no DB)."""
+
+from __future__ import annotations
+
+import asyncio
+
+from app.core.config import settings
+from app.services import resume_ats_cache as cache_mod
+from app.services.resume_ats_cache import (
+    LruCache,
+    ResumeAnalysisCache,
+    analysis_cache_key,
+    file_cache_key,
+)
+
+TEXT = "Resume text " * 20
+
+
+def _key(**overrides) -> str:
+    args = {
+        "candidate_type": None,
+        "experience_years": None,
+        "job_description": None,
+    }
+    args.update(overrides)
+    return analysis_cache_key("abc", "Backend Developer", **args)
+
+
+def test_keys_cover_all_analysis_inputs() -> None:
+    base = _key()
+    assert _key() == base
+    assert (
+        analysis_cache_key(
+            "abc", " backend developer ", candidate_type=None, experience_years=None, job_description=None
+        )
+        == base
+    )
+    assert _key(job_description="Kafka + Spring") != base
+    assert _key(experience_years=2) != base
+    assert _key(candidate_type="fresher") != base
+    assert file_cache_key("cv.pdf", b"x") != file_cache_key("cv.docx", b"x")
+
+
+def test_lru_evicts_oldest() -> None:
+    lru: LruCache[int] = LruCache(2, ttl_seconds=60)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1
+    lru.put("c", 3)
+    assert lru.get("b") is None and lru.get("a") == 1 and lru.get("c") == 3
+
+
+def test_repeat_upload_skips_parse_and_llm(monkeypatch) -> None:
+    calls = {"extract_and_analyze": 0, "analyze": 0, "llm": 0}
+
+    async def fake_extract_and_analyze(filename, content, role, **_kw):
+        calls["extract_and_analyze"] += 1
+        return TEXT, {"score": 70, "role": role}
+
+    async def fake_analyze(text, role, **_kw):
+        calls["analyze"] += 1
+        return {"score": 60, "role": role}
+
+    async def fake_enrich(payload, text, role, job_description=None):
+        calls["llm"] += 1
+        return {**payload, "summary": "coached"}
+
+    monkeypatch.setattr(settings, "resume_ats_use_llm", True)
+    monkeypatch.setattr(
+        cache_mod,
+        "_cache",
+        ResumeAnalysisCache(max_entries=16, ttl_seconds=600, use_postgres=False),
+    )
+    monkeypatch.setattr(cache_mod.resume_ats_pool, "extract_and_analyze", fake_extract_and_analyze)
+    monkeypatch.setattr(cache_mod.resume_ats_pool, "analyze", fake_analyze)
+    monkeypatch.setattr(cache_mod.resume_ats_service, "enrich_analysis_with_llm", fake_enrich)
+
+    async def scenario() -> None:
+        first = await cache_mod.analyze_upload("cv.pdf", b"%PDF bytes", "Backend Developer")
+        again = await cache_mod.analyze_upload("cv.pdf", b"%PDF bytes", "Backend Developer")
+        assert first == again == {"score": 70, "role": "Backend Developer", "summary": "coached"}
+        assert calls == {"extract_and_analyze": 1, "analyze": 0, "llm": 1}
+
+        # Same file, new role: text comes from cache, only scoring + LLM rerun.
+        await cache_mod.analyze_upload("cv.pdf", b"%PDF bytes", "Data Analyst")
+        assert calls == {"extract_and_analyze": 1, "analyze": 1, "llm": 2}
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+"""Resume ATS precomputed features: matcher parity with word-boundary regex, one pass."""
+
+from __future__ import annotations
+
+import re
+
+from app.services import resume_ats
+
+RESUME = (
+    "Rahul Verma\nBackend Developer\nrahul@example.com | +91 98765 43210 | github.com/rahul\n"
+    "Summary\nBackend engineer building REST APIs with Java, Spring Boot and PostgreSQL.\n"
+    "Skills\nJava, Spring, SQL, Docker, CI/CD, Power BI, Node.js, C++\n"
+    "Experience\n- Built Kafka pipelines for 40k users at Acme, 2022 - present\n"
+    "- Reduced latency by 35% and scaled microservices\n"
+    "Projects\n1. Placement tracker (React, FastAPI)\n"
+    "Education\nB.Tech Computer Science, ABC University, 2022\n"
+)
+
+
+def _reference(haystack: str, term: str) -> bool:
+    return re.search(rf"(?<!\w){re.escape(term)}(?!\w)", haystack, re.IGNORECASE) is not None
+
+
+def test_has_term_matches_word_boundary_regex() -> None:
+    features = resume_ats._resume_features(RESUME)
+    terms = {t for kws in resume_ats._ROLE_KEYWORD_BANK.values() for t in kws}
+    terms |= {a for aliases in resume_ats._KEYWORD_ALIASES.values() for a in aliases}
+    terms |= {"c++", "node.js", "spring boot", "pipe", "acme", "ci", "a"}
+    for term in sorted(terms):
+        expected = len(term) >= 2 and _reference(features.lower, term)
+        assert features.has_term(term) is expected, term
+
+
+def test_analysis_scans_text_once(monkeypatch) -> None:
+    calls: list[int] = []
+    original = resume_ats._resume_features
+
+    def counting(text: str):
+        calls.append(1)
+        return original(text)
+
+    monkeypatch.setattr(resume_ats, "_resume_features", counting)
+    skills_calls: list[int] = []
+    original_skills = resume_ats._count_skills_in
+    monkeypatch.setattr(
+        resume_ats,
+        "_count_skills_in",
+        lambda lower: skills_calls.append(1) or original_skills(lower),
+    )
+
+    payload = resume_ats.analyze_resume(RESUME, "Backend Developer")
+    assert calls == [1] and skills_calls == [1]
+    assert "java" in payload["matched_keywords"]
+    assert payload["skills_count"] == 8
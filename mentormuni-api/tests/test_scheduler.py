@@ -0,0 +1,91 @@
+"""Leader scheduler: backlog drain, next-tick delay, SKIP LOCKED claim (no DB)."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.common import scheduler as scheduler_mod
+from app.common.scheduler import LeaderScheduler, SchedulerJob, advisory_lock_key
+from app.know_my_fear.intervention_service import InterventionService
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_exc):
+        return None
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        return None
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: [1, 2]))
+
+
+def _patch_factory(monkeypatch, session: _Session) -> None:
+    from app.common.database import session as session_mod
+
+    monkeypatch.setattr(session_mod, "async_session_factory", lambda: (lambda: session))
+
+
+def _job(batches: list[int], due=None) -> SchedulerJob:
+    async def run_batch(_db, limit):
+        assert limit == 10
+        return batches.pop(0)
+
+    async def next_due(_db):
+        return due
+
+    return SchedulerJob(
+        name="test", run_batch=run_batch, next_due=next_due, batch_size=10, max_sleep_seconds=60
+    )
+
+
+def test_drain_keeps_going_while_batches_are_full(monkeypatch) -> None:
+    session = _Session()
+    _patch_factory(monkeypatch, session)
+    sched = LeaderScheduler(_job([10, 10, 3, 99]))
+    assert asyncio.run(sched.drain()) == 23
+    assert session.commits == 3
+
+
+def test_next_delay_follows_earliest_due_row(monkeypatch) -> None:
+    _patch_factory(monkeypatch, _Session())
+    soon = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=20)
+    delay = asyncio.run(LeaderScheduler(_job([], due=soon)).next_delay())
+    assert 15 < delay <= 20
+    assert asyncio.run(LeaderScheduler(_job([], due=None)).next_delay()) == 60
+    overdue = soon - timedelta(hours=1)
+    assert asyncio.run(LeaderScheduler(_job([], due=overdue)).next_delay()) == 1.0
+
+
+def test_lock_keys_are_stable_and_distinct() -> None:
+    assert advisory_lock_key("a") == advisory_lock_key("a")
+    assert advisory_lock_key("a") != advisory_lock_key("b")
+    assert -(2**63) <= advisory_lock_key("a") < 2**63
+
+
+def test_dispatch_claims_with_skip_locked() -> None:
+    session = _Session()
+    assert asyncio.run(InterventionService().dispatch_due_notifications(session, limit=50)) == 2
+    sql = session.statements[0]
+    assert sql.startswith("UPDATE private_student_notifications")
+    assert "FOR UPDATE SKIP LOCKED" in sql and "RETURNING" in sql
+
+
+def test_start_is_noop_without_database(monkeypatch) -> None:
+    monkeypatch.setattr(type(scheduler_mod.settings), "is_database_configured", property(lambda _s: False))
+    assert LeaderScheduler(_job([])).start() is None
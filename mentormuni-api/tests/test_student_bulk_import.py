@@ -0,0 +1,206 @@
+"""Bulk student import: parsing / chunking, chunk outcomes, job resume (no DB)."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.common.database import session as db_session
+from app.models.enums import UserStatus
+from app.organizations import students_import as bulk_import
+from app.organizations.students_import import (
+    ImportTarget,
+    StudentImportError,
+    _resume_after,
+    _unique_username,
+    chunked,
+    iter_csv_rows,
+    iter_import_rows,
+)
+
+_TARGET = ImportTarget(
+    organization_id=3,
+    department_id=4,
+    role_id=5,
+    actor_user_id=9,
+    status=UserStatus.INVITED.value,
+    source="import",
+    auto_enroll=True,
+    send_invite_email=True,
+)
+
+
+def test_rows_and_csv_are_streamed_with_file_line_numbers() -> None:
+    csv_text = "Email,First_Name,Last_Name,Roll\nb@x.edu,Bo,Lee,12\n,,,\nc@x.edu,,,\n"
+    rows = list(iter_import_rows([{"email": "a@x.edu"}], csv_text))
+    assert [r["email"] for r in rows] == ["a@x.edu", "b@x.edu", "c@x.edu"]
+    assert [r["row"] for r in rows] == [1, 2, 4]
+    assert rows[1]["name"] == "Bo Lee"
+    assert rows[1]["roll_number"] == "12"
+
+
+def test_headerless_csv_rejected() -> None:
+    with pytest.raises(StudentImportError):
+        list(iter_csv_rows(""))
+
+
+def test_chunked_preserves_order_and_tail() -> None:
+    sizes = [len(c) for c in chunked(({"i": i} for i in range(1201)), 500)]
+    assert sizes == [500, 500, 201]
+
+
+def test_unique_username_suffixes_only_on_clash() -> None:
+    taken = {"asha"}
+    assert _unique_username("ravi", taken) == "ravi"
+    suffixed = _unique_username("asha", taken)
+    assert suffixed.startswith("asha.") and suffixed not in taken
+
+
+def _insert_params(stmt) -> list[dict]:
+    return stmt.compile(dialect=postgresql.dialect()).params
+
+
+def test_chunk_partial_failure_reports_each_bad_row(fake_session) -> None:
+    rows = [
+        {"email": "ok@x.edu", "name": "Ok Student", "row": 2},
+        {"email": "not-an-email", "row": 3},
+        {"email": "Taken@X.edu", "row": 4},  # already in the org
+        {"email": "raced@x.edu", "row": 5},  # inserted concurrently after the probe
+    ]
+    clash = [SimpleNamespace(email="taken@x.edu", username="taken")]
+    inserted = [SimpleNamespace(id=101, email="ok@x.edu")]
+    db = fake_session(batches=[clash, inserted, []])
+
+    out = asyncio.run(bulk_import.import_chunk(db, _TARGET, rows, seen_emails=set()))
+
+    assert out.processed == 4 and out.user_ids == [101] and out.skipped == 2
+    assert [(e["row"], e["message"]) for e in out.errors] == [
+        (3, "Invalid email"),
+        (4, "Email or username already exists in this organization."),
+        (5, "Email or username already exists in this organization."),
+    ]
+    assert [(e.user_id, e.email, e.row) for e in out.emails] == [(101, "ok@x.edu", 2)]
+    # One probe, one INSERT for both candidates, one USER_CREATE audit row per new user.
+    assert len(db.statements) == 3
+    assert "audit_logs" in db.sql(2)
+
+
+def test_chunk_duplicate_emails_in_file_keep_first_row(fake_session) -> None:
+    rows = [
+        {"email": "dup@x.edu", "row": 2},
+        {"email": "DUP@x.edu ", "row": 3},
+        {"email": "seen@x.edu", "row": 4},  # seen in an earlier chunk
+    ]
+    db = fake_session(batches=[[], [SimpleNamespace(id=7, email="dup@x.edu")], []])
+
+    out = asyncio.run(bulk_import.import_chunk(db, _TARGET, rows, seen_emails={"seen@x.edu"}))
+
+    assert out.user_ids == [7] and out.skipped == 2
+    assert [(e["row"], e["message"]) for e in out.errors] == [
+        (3, "Duplicate row in file."),
+        (4, "Duplicate row in file."),
+    ]
+    values = _insert_params(db.statements[1])
+    assert [v for k, v in values.items() if k.startswith("email")] == ["dup@x.edu"]
+
+
+def test_resume_skips_committed_rows_but_remembers_their_emails() -> None:
+    rows = [{"email": f"s{i}@x.edu"} for i in range(5)] + [{"email": "s1@x.edu"}]
+    seen: set[str] = set()
+    rest = list(_resume_after(iter(rows), 3, seen))
+    assert [r["email"] for r in rest] == ["s3@x.edu", "s4@x.edu", "s1@x.edu"]
+    assert seen == {"s0@x.edu", "s1@x.edu", "s2@x.edu"}
+
+
+def test_claim_only_takes_queued_or_stale_jobs(fake_session) -> None:
+    db = fake_session(scalar=12)
+    assert asyncio.run(bulk_import.claim_import_job(db, 12))
+    sql = db.sql()
+    assert sql.startswith("UPDATE student_import_jobs SET status=")
+    assert "student_import_jobs.updated_at < " in sql and "RETURNING student_import_jobs.id" in sql
+
+
+def _invited(user_id: int, email: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=user_id,
+        email=email,
+        first_name="Asha",
+        last_name="Rao",
+        username=email.split("@")[0],
+        organization_id=3,
+        organization=SimpleNamespace(name="Acme College"),
+        department=SimpleNamespace(name="CSE"),
+    )
+
+
+def test_setup_emails_are_queued_on_the_outbox_not_sent(fake_session) -> None:
+    expires = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    emails = [bulk_import.SetupEmail(user_id=101, raw_token="tok-101", expires=expires, email="a@x.edu")]
+    db = fake_session(batches=[[_invited(101, "a@x.edu")], [SimpleNamespace(id=1)], []])
+
+    assert asyncio.run(bulk_import.queue_setup_emails(db, emails, actor_user_id=9)) == 1
+
+    assert db.sql(1).startswith("INSERT INTO email_outbox")
+    message = {k.rsplit("_m", 1)[0]: v for k, v in _insert_params(db.statements[1]).items()}
+    assert message["idempotency_key"].startswith("student-setup:101:")
+    assert "tok-101" in message["text_body"] and "tok-101" not in message["idempotency_key"]
+    assert "audit_logs" in db.sql(2)
+
+
+def test_job_queues_a_chunks_emails_before_committing_it(monkeypatch, fake_session) -> None:
+    job = SimpleNamespace(
+        id=12,
+        organization_id=3,
+        department_id=4,
+        created_by=9,
+        source="import",
+        auto_enroll=True,
+        send_invite_email=True,
+        input_json={"rows": [{"email": "a@x.edu", "row": 1}], "csv_text": None},
+        errors_json=[],
+        processed_rows=0,
+        created_count=0,
+        skipped_count=0,
+        error_count=0,
+        emails_queued=0,
+        status=None,
+        finished_at=None,
+    )
+    db = fake_session()
+    db.get = lambda _model, _id: asyncio.sleep(0, job)
+    monkeypatch.setattr(db_session, "async_session_factory", lambda: lambda: db)
+    queued_at: list[int] = []
+    setup = bulk_import.SetupEmail(user_id=101, raw_token="t", expires=datetime.now(timezone.utc))
+
+    async def _claim(_db, _job_id):
+        return True
+
+    async def _target(_db, **_kw):
+        return _TARGET
+
+    async def _chunk(_db, _target, rows, *, seen_emails):
+        return bulk_import.ChunkOutcome(user_ids=[101], emails=[setup], processed=len(rows))
+
+    async def _queue(_db, emails, **_kw):
+        assert emails == [setup]
+        queued_at.append(db.commits)
+        return len(emails)
+
+    async def _audit(*_a, **_kw):
+        return None
+
+    monkeypatch.setattr(bulk_import, "claim_import_job", _claim)
+    monkeypatch.setattr(bulk_import, "resolve_target", _target)
+    monkeypatch.setattr(bulk_import, "import_chunk", _chunk)
+    monkeypatch.setattr(bulk_import, "queue_setup_emails", _queue)
+    monkeypatch.setattr(bulk_import, "write_import_audit", _audit)
+
+    asyncio.run(bulk_import.run_import_job(12))
+
+    # Claim committed first; the chunk's emails go in before the chunk's own commit.
+    assert queued_at == [1]
+    assert (job.processed_rows, job.emails_queued, job.status) == (1, 1, bulk_import.IMPORT_JOB_COMPLETED)
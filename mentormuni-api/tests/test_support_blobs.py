@@ -0,0 +1,137 @@
+"""Help Center screenshots in the content-addressed blob store (local backend, no DB)."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from app.common.blobs import LocalBlobStore, blob_response, parse_range, sha256_hex
+from app.common.blobs import store as blob_store
+from app.platform_support import service as svc
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 40
+
+
+def _request(headers: dict[str, str] | None = None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+async def _body(response) -> bytes:
+    chunks = [c async for c in response.body_iterator]
+    return b"".join(chunks)
+
+
+def test_store_is_content_addressed(tmp_path) -> None:
+    store = LocalBlobStore(tmp_path)
+    a = asyncio.run(store.put(PNG_BYTES))
+    b = asyncio.run(store.put(PNG_BYTES))
+    assert a == b and a.key == sha256_hex(PNG_BYTES)
+    assert len([p for p in tmp_path.rglob("*") if p.is_file()]) == 1
+    assert asyncio.run(store.read(a.key)) == PNG_BYTES
+
+
+def test_parse_range() -> None:
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+
+
+def test_blob_response_etag_and_range(tmp_path) -> None:
+    store = LocalBlobStore(tmp_path)
+    key = asyncio.run(store.put(PNG_BYTES)).key
+
+    full = asyncio.run(blob_response(_request(), store, key, content_type="image/png"))
+    assert full.status_code == 200
+    assert full.headers["etag"] == f'"{key}"'
+    assert asyncio.run(_body(full)) == PNG_BYTES
+
+    part = asyncio.run(
+        blob_response(_request({"Range": "bytes=8-15"}), store, key, content_type="image/png")
+    )
+    assert part.status_code == 206
+    assert part.headers["content-range"] == f"bytes 8-15/{len(PNG_BYTES)}"
+    assert asyncio.run(_body(part)) == PNG_BYTES[8:16]
+
+    cached = asyncio.run(
+        blob_response(_request({"If-None-Match": f'"{key}"'}), store, key, content_type="image/png")
+    )
+    assert cached.status_code == 304
+
+    bad = asyncio.run(
+        blob_response(_request({"Range": "bytes=99999-"}), store, key, content_type="image/png")
+    )
+    assert bad.status_code == 416
+
+
+def test_reply_rows_keep_only_metadata(tmp_path, monkeypatch) -> None:
+    store = LocalBlobStore(tmp_path)
+    monkeypatch.setattr(svc, "get_blob_store", lambda: store)
+    upload = {
+        "filename": "bug.png",
+        "content_type": "image/png",
+        "data_base64": base64.b64encode(PNG_BYTES).decode(),
+    }
+    stored = asyncio.run(svc.store_attachments([upload]))
+    assert stored == [
+        {
+            "sha256": sha256_hex(PNG_BYTES),
+            "filename": "bug.png",
+            "content_type": "image/png",
+            "size": len(PNG_BYTES),
+        }
+    ]
+
+    out = svc.serialize_attachment(stored[0], base_url="/support/tickets/7/attachments")
+    assert out["url"] == f"/support/tickets/7/attachments/{stored[0]['sha256']}"
+    assert out["thumbnail_url"].endswith("/thumbnail") and out["data_base64"] is None
+
+    legacy = svc.serialize_attachment(upload, base_url="/support/tickets/7/attachments")
+    assert legacy["url"] is None and legacy["data_base64"] == upload["data_base64"]
+
+
+def test_backfill_leaves_undecodable_items_inline(tmp_path, monkeypatch, fake_session) -> None:
+    store = LocalBlobStore(tmp_path)
+    monkeypatch.setattr(svc, "get_blob_store", lambda: store)
+    good = {"filename": "a.png", "content_type": "image/png", "data_base64": base64.b64encode(PNG_BYTES).decode()}
+    broken = {"filename": "b.png", "content_type": "image/png", "data_base64": "not base64!"}
+    mixed = SimpleNamespace(id=1, attachments_json=[good, broken])
+    only_broken = SimpleNamespace(id=2, attachments_json=[broken])
+    db = fake_session(batches=[[mixed, only_broken]])
+
+    report = asyncio.run(svc.move_inline_attachments(db))
+
+    assert (report.replies_updated, report.attachments_moved) == (1, 1)
+    assert report.undecodable == 2 and report.undecodable_reply_ids == [1, 2]
+    assert mixed.attachments_json[0]["sha256"] == sha256_hex(PNG_BYTES)
+    assert mixed.attachments_json[1] == broken
+    assert only_broken.attachments_json == [broken]
+
+
+@pytest.mark.parametrize(
+    ("env", "backend", "workers", "ok"),
+    [
+        ("development", "", 1, True),
+        ("production", "", 1, False),
+        ("production", "local", 1, True),
+        ("production", "local", 4, False),
+        ("production", "s3", 4, True),
+    ],
+)
+def test_blob_store_config_is_checked_at_startup(monkeypatch, env, backend, workers, ok) -> None:
+    monkeypatch.setattr(blob_store.settings, "app_env", env)
+    monkeypatch.setattr(blob_store.settings, "blob_store_backend", backend)
+    monkeypatch.setattr(blob_store.settings, "blob_store_s3_bucket", "screens")
+    monkeypatch.setattr(blob_store.settings, "web_concurrency", workers)
+    if ok:
+        blob_store.check_blob_store_config()
+    else:
+        with pytest.raises(RuntimeError):
+            blob_store.check_blob_store_config()
@@ -0,0 +1,106 @@
+"""
+Per-resume CPU cost of the resume ATS heuristic scorer (``analyze_resume``).
+
+    cd mentormuni-api
+    python ../scripts/bench_resume_ats.py                       # current code
+    python ../scripts/bench_resume_ats.py --baseline old.py     # + compare to another copy
+
+The corpus is generated deterministically: resumes of different lengths and section
+layouts scored against every role bank, with and without a job description.
+``--baseline`` loads another ``resume_ats.py`` (e.g. ``git show HEAD~1:...``) and
+also checks that both produce identical payloads.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.getcwd())
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+from app.services import resume_ats  # noqa: E402
+
+SKILLS = [
+    "Python", "Java", "Spring Boot", "React", "TypeScript", "Node.js", "SQL", "PostgreSQL",
+    "Docker", "Kubernetes", "AWS", "CI/CD", "Git", "REST APIs", "Kafka", "Pandas",
+    "Power BI", "Tableau", "Selenium", "TestNG", "Kotlin", "Firebase", "Terraform", "Linux",
+]
+VERBS = ["Built", "Designed", "Led", "Reduced", "Improved", "Implemented", "Scaled", "Owned"]
+JDS = [
+    None,
+    "We need a backend engineer with Java, Spring, Kafka, microservices, PostgreSQL and AWS.",
+    "Data analyst: SQL, Excel, Power BI, dashboards, stakeholder reporting, statistics.",
+]
+
+
+def build_corpus(n: int = 60, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    out: list[str] = []
+    for i in range(n):
+        bullets = rng.randint(3, 40)
+        lines = [
+            f"Candidate {i}",
+            f"{rng.choice(['Software Engineer', 'Data Analyst', 'QA Engineer', 'Android Developer'])}",
+            f"candidate{i}@example.com | +91 98{rng.randint(10000000, 99999999)} | linkedin.com/in/c{i}",
+            "",
+            "Professional Summary",
+            "Engineer with hands-on experience building reliable services and data pipelines for users.",
+            "",
+            "Skills",
+            ", ".join(rng.sample(SKILLS, rng.randint(4, 14))),
+            "",
+            "Experience",
+        ]
+        for b in range(bullets):
+            lines.append(
+                f"- {rng.choice(VERBS)} {rng.choice(SKILLS)} module for {rng.randint(2, 90)}k users, "
+                f"cutting latency by {rng.randint(5, 60)}% in {rng.randint(2018, 2025)}"
+            )
+        lines += ["", "Projects", "1. Placement portal using React and FastAPI", "", "Education",
+                  f"B.Tech Computer Science, XYZ University, {rng.randint(2019, 2026)}, CGPA 8.{i % 10}"]
+        out.append("\n".join(lines))
+    return out
+
+
+def _load(path: str):
+    spec = importlib.util.spec_from_file_location("resume_ats_baseline", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run(module, corpus: list[str], roles: list[str]) -> tuple[float, list[dict]]:
+    results: list[dict] = []
+    t0 = time.process_time()
+    for text in corpus:
+        for role in roles:
+            for jd in JDS:
+                results.append(module.analyze_resume(text, role, job_description=jd))
+    elapsed = time.process_time() - t0
+    return elapsed / len(results), results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--baseline", help="path to another resume_ats.py to compare against")
+    parser.add_argument("--resumes", type=int, default=60)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.resumes)
+    roles = [f"{k.title()} Developer" for k in resume_ats._ROLE_KEYWORD_BANK]
+    per, current = _run(resume_ats, corpus, roles)
+    print(f"analyses: {len(current)}  current: {per * 1e6:,.0f} µs CPU per analysis")
+    if args.baseline:
+        base_per, baseline = _run(_load(args.baseline), corpus, roles)
+        same = baseline == current
+        print(f"baseline: {base_per * 1e6:,.0f} µs CPU per analysis  speedup: {base_per / per:.2f}x")
+        print(f"identical payloads: {same}")
+
+
+if __name__ == "__main__":
+    main()
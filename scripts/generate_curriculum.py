@@ -0,0 +1,104 @@
+"""
+Generate a coding-bank curriculum into one ``CodingGenerationRun`` (admin only).
+
+    cd mentormuni-api
+    python ../scripts/generate_curriculum.py                          # new placement_v1 run
+    python ../scripts/generate_curriculum.py --run-id 12              # resume run 12
+    python ../scripts/generate_curriculum.py --max-llm-calls 10 --concurrency 2
+
+References are validated on the student execution provider (Judge0; local Python in
+development) via ``sandboxed_reference_executor``. Problems land in ``pending_review`` /
+``validation_failed`` — nothing is approved or published. A run stopped by
+``--max-llm-calls`` stays ``running``; pass its ``--run-id`` to continue.
+
+``CodingBankService`` uses a synchronous ``Session``, so this needs a sync Postgres
+driver next to asyncpg: ``pip install "psycopg[binary]>=3.1"``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.getcwd())
+
+from openai import AsyncOpenAI  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app.models  # noqa: E402,F401 — register every table before CodingProblem FKs resolve
+from app.coding.enums import GenerationRunStatus  # noqa: E402
+from app.coding.models import CodingGenerationRun  # noqa: E402
+from app.coding_bank.batch import BatchGenerationRunner, sandboxed_reference_executor  # noqa: E402
+from app.coding_bank.generator import CodingProblemGenerator  # noqa: E402
+from app.coding_bank.service import CodingBankService  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+
+def _sync_db_url(url: str) -> str:
+    for prefix in ("postgresql+asyncpg://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix) :]
+    return url
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--run-id", type=int, help="resume this generation run instead of creating one")
+    parser.add_argument("--concurrency", type=int, default=4, help="slots generated at once (default 4)")
+    parser.add_argument("--max-llm-calls", type=int, help="generation calls to spend in this invocation")
+    parser.add_argument("--model", default="gpt-4.1-mini", help="OpenAI model for new runs")
+    parser.add_argument("--created-by", default="generate_curriculum", help="recorded on new runs")
+    return parser.parse_args(argv)
+
+
+async def _generate(service: CodingBankService, run: CodingGenerationRun, args: argparse.Namespace) -> int:
+    runner = BatchGenerationRunner(service, concurrency=args.concurrency, max_llm_calls=args.max_llm_calls)
+    outcomes = await runner.run(run)
+    failed = [o for o in outcomes if o.error is not None]
+    for o in failed:
+        print(f"  {o.slot_id}: {o.error}", file=sys.stderr)
+    print(
+        f"run {run.id}: status={run.status} slots_this_invocation={len(outcomes)} "
+        f"passed={sum(o.passed for o in outcomes)} failed={len(failed)} llm_calls={runner.llm_calls}"
+    )
+    return 1 if run.status == GenerationRunStatus.FAILED.value else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    args = _parse_args(argv)
+    if not settings.database_url:
+        print("DATABASE_URL missing", file=sys.stderr)
+        return 1
+    if not settings.openai_api_key:
+        print("OPENAI_API_KEY missing", file=sys.stderr)
+        return 1
+
+    engine = create_engine(_sync_db_url(settings.database_url), pool_pre_ping=True)
+    Session = sessionmaker(engine, expire_on_commit=False)
+    try:
+        with Session() as db:
+            generator = CodingProblemGenerator(
+                openai_client=AsyncOpenAI(api_key=settings.openai_api_key), model=args.model
+            )
+            service = CodingBankService(db, generator=generator, executor=sandboxed_reference_executor())
+            if args.run_id is not None:
+                run = db.get(CodingGenerationRun, args.run_id)
+                if run is None:
+                    print(f"generation run {args.run_id} not found", file=sys.stderr)
+                    return 1
+            else:
+                run = service.create_generation_run(model=args.model, created_by=args.created_by)
+                db.commit()
+                print(f"created generation run {run.id} ({run.target_count} slots)")
+            return asyncio.run(_generate(service, run, args))
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())